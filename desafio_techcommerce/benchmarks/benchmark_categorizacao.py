@@ -0,0 +1,135 @@
+"""
+🏷️ Benchmark de Categorização - TechCommerce
+Compara a categorização por palavras-chave com laço Python, com uma busca
+por categoria (str.contains) e com o autômato compilado do KeywordCategorizer,
+no catálogo padrão ou em um catálogo sintético com milhares de palavras
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from categorizacao import DEFAULT_CATEGORY_KEYWORDS, KeywordCategorizer
+from geradores import NOMES_PRODUTOS
+
+LETRAS = np.array(list("abcdefghijklmnopqrstuvwxyzçãéô"))
+
+
+def gerar_catalogo(palavras: int, categorias: int = 100, seed: int = 42) -> dict:
+    """Catálogo sintético com ``palavras`` palavras-chave distintas (4 a 9 letras) em ``categorias`` categorias"""
+    rng = np.random.default_rng(seed)
+    distintas = set()
+    while len(distintas) < palavras:
+        distintas.add("".join(rng.choice(LETRAS, rng.integers(4, 10))))
+    catalogo = {}
+    for indice, palavra in enumerate(sorted(distintas)):
+        catalogo.setdefault(f"Categoria {indice % categorias:03d}", []).append(palavra)
+    return catalogo
+
+
+def gerar_nomes(linhas: int, catalogo: dict, seed: int = 7) -> pd.Series:
+    """Nomes distintos de produtos: metade com uma palavra do catálogo, metade só com nomes comuns"""
+    rng = np.random.default_rng(seed)
+    palavras = np.array([palavra for lista in catalogo.values() for palavra in lista], dtype=object)
+    base = NOMES_PRODUTOS[rng.integers(len(NOMES_PRODUTOS), size=linhas)]
+    com_palavra = rng.random(linhas) < 0.5
+    base[com_palavra] = (base[com_palavra] + ' ' +
+                         palavras[rng.integers(len(palavras), size=int(com_palavra.sum()))].astype(object))
+    return pd.Series(base + ' ' + pd.Series(np.arange(linhas)).astype(str).to_numpy(dtype=object), dtype=object)
+
+
+def por_laco(nomes: pd.Series, catalogo: dict) -> list:
+    """Categorização da engine linha a linha: categorias x palavras x substring, nome a nome"""
+    resultado = []
+    for nome in nomes:
+        nome = nome.lower()
+        for categoria, palavras in catalogo.items():
+            if any(palavra in nome for palavra in palavras):
+                resultado.append(categoria)
+                break
+        else:
+            resultado.append(None)
+    return resultado
+
+
+def por_categoria(nomes: pd.Series, catalogo: dict) -> pd.Series:
+    """Uma busca str.contains por categoria sobre os nomes ainda sem categoria"""
+    nomes = nomes.str.lower()
+    encontrada = pd.Series(None, index=nomes.index, dtype=object)
+    for categoria, palavras in catalogo.items():
+        pendentes = encontrada.isna()
+        padrao = '|'.join(re.escape(palavra) for palavra in palavras)
+        encontrada[pendentes] = np.where(nomes[pendentes].str.contains(padrao, regex=True), categoria, None)
+    return encontrada
+
+
+def medir(funcao, *args) -> tuple:
+    """Executa a função e retorna (resultado, segundos)"""
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=5_000_000)
+    parser.add_argument("--palavras", type=int, default=0,
+                        help="Palavras do catálogo sintético (0 = catálogo padrão da engine)")
+    parser.add_argument("--amostra-laco", type=int, default=20_000,
+                        help="Nomes medidos com o laço Python (lento)")
+    parser.add_argument("--sem-por-categoria", action="store_true",
+                        help="Não mede a busca por categoria (lenta em catálogos grandes)")
+    parser.add_argument("--saida", default=None, help="Arquivo JSON para os resultados")
+    args = parser.parse_args()
+
+    catalogo = gerar_catalogo(args.palavras) if args.palavras else DEFAULT_CATEGORY_KEYWORDS
+    nomes = gerar_nomes(args.linhas, catalogo)
+
+    categorizador, compilacao_s = medir(KeywordCategorizer, catalogo)
+    automato, automato_s = medir(categorizador.categorize, nomes)
+
+    amostra = nomes.iloc[:args.amostra_laco]
+    laco, laco_s = medir(por_laco, amostra, catalogo)
+    concordancia = np.mean([a == b for a, b in zip(laco, automato.iloc[:len(amostra)])])
+
+    resultado = {
+        "linhas": len(nomes),
+        "categorias": len(catalogo),
+        "palavras": len(categorizador),
+        "compilacao_s": round(compilacao_s, 3),
+        "automato_s": round(automato_s, 2),
+        "automato_us_por_nome": round(automato_s * 1e6 / len(nomes), 3),
+        "laco_us_por_nome": round(laco_s * 1e6 / len(amostra), 3),
+        "concordancia_com_laco": round(float(concordancia), 4),
+        "categorizados": int(automato.notna().sum()),
+    }
+
+    print(f"{resultado['linhas']:,} nomes | {resultado['categorias']} categorias | "
+          f"{resultado['palavras']:,} palavras (compiladas em {compilacao_s:.2f}s)")
+    print(f"      autômato: {automato_s:>8.2f}s ({resultado['automato_us_por_nome']:.3f} µs/nome)")
+
+    if not args.sem_por_categoria:
+        categoria, categoria_s = medir(por_categoria, nomes, catalogo)
+        resultado["por_categoria_s"] = round(categoria_s, 2)
+        resultado["mesmo_resultado_por_categoria"] = bool(categoria.equals(automato))
+        print(f" por categoria: {categoria_s:>8.2f}s (mesmo resultado: {resultado['mesmo_resultado_por_categoria']})")
+
+    print(f"          laço: {resultado['laco_us_por_nome']:>8.3f} µs/nome ({len(amostra):,} nomes) | "
+          f"concordância {resultado['concordancia_com_laco']:.1%}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+⏱️ Benchmark de Correção - TechCommerce
+Mede tempo e memória de cada correct_* e de cada regra privada sobre os
+quatro datasets sintéticos em várias escalas, guardando os resultados por
+commit para comparar execuções
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from geradores import gerar_datasets, proporcoes
+from metricas import MemoryPeak
+
+MOTORES = ["linha", "vetorizado", "paralelo"]
+DADOS_DIR = os.path.join(BENCH_DIR, 'dados')
+RESULTADOS_DIR = os.path.join(BENCH_DIR, 'resultados')
+
+# Pipelines medidos pelo benchmark; as regras são medidas pela própria engine (engine.metrics)
+PIPELINES = re.compile(r'^correct_(clientes|produtos|vendas|logistica)$')
+
+
+class Medidor:
+    """Envolve os correct_* de uma engine medindo tempo e pico de memória de cada chamada
+
+    A memória vem do tracemalloc (alocações do Python e do numpy), que deixa
+    a execução mais lenta; sem ele só o tempo é medido. MemoryPeak mantém
+    os picos coerentes com as medições das regras feitas dentro da engine.
+    """
+
+    def __init__(self):
+        self.metodos = {}
+
+    def instrumentar(self, engine):
+        """Substitui, na instância, cada correct_* por um invólucro"""
+        for nome in dir(type(engine)):
+            if PIPELINES.match(nome):
+                setattr(engine, nome, self._envolver(nome, getattr(engine, nome)))
+        return engine
+
+    def _envolver(self, nome: str, metodo):
+        @functools.wraps(metodo)
+        def medido(*args, **kwargs):
+            inicio = time.perf_counter()
+            with MemoryPeak() as memoria:
+                resultado = metodo(*args, **kwargs)
+            self._registrar(nome, time.perf_counter() - inicio, memoria.delta)
+            return resultado
+        return medido
+
+    def _registrar(self, nome: str, tempo: float, pico: Optional[int]):
+        medida = self.metodos.setdefault(nome, {"chamadas": 0, "tempo_s": 0.0, "pico_mb": 0.0})
+        medida["chamadas"] += 1
+        medida["tempo_s"] += tempo
+        medida["pico_mb"] = max(medida["pico_mb"], (pico or 0) / 1024 ** 2)
+
+    def resultados(self) -> dict:
+        """Medidas por pipeline, com tempos e picos arredondados"""
+        return {nome: {"chamadas": medida["chamadas"], "tempo_s": round(medida["tempo_s"], 4),
+                       "pico_mb": round(medida["pico_mb"], 1)}
+                for nome, medida in sorted(self.metodos.items())}
+
+
+def _regras(engine) -> dict:
+    """Métricas das regras registradas pela engine, com chaves dataset.regra"""
+    return {f"{regra['dataset']}.{regra['rule']}": {
+                "chamadas": regra["calls"],
+                "tempo_s": round(regra["wall_time_s"], 4),
+                "cpu_s": round(regra["cpu_time_s"], 4),
+                "linhas_lidas": regra["rows_scanned"],
+                "correcoes": regra["rows_changed"],
+                "linhas_removidas": regra["rows_removed"],
+                "pico_mb": round((regra["peak_memory_bytes"] or 0) / 1024 ** 2, 1)}
+            for regra in engine.get_rule_metrics()}
+
+
+def _pico_rss_mb() -> float:
+    """Pico de RSS do processo em MB (ru_maxrss é KB no Linux e bytes no macOS)"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024
+
+
+def _criar_engine(motor: str):
+    """Engine do motor indicado"""
+    from correcao_automatica import DataCorrectionEngine
+    from correcao_vetorizada import VectorizedCorrectionEngine
+    from paralelo import ParallelCorrectionEngine
+
+    return {"linha": DataCorrectionEngine, "vetorizado": VectorizedCorrectionEngine,
+            "paralelo": ParallelCorrectionEngine}[motor]()
+
+
+def executar(motor: str, linhas: int, memoria: bool) -> dict:
+    """Carrega os CSVs da escala e corrige os quatro datasets (roda em processo isolado)"""
+    import logging
+    from armazenamento import READ_OPTIONS
+
+    logging.getLogger('DataCorrection').disabled = True
+    diretorio = os.path.join(DADOS_DIR, f'escala_{linhas}')
+
+    inicio = time.perf_counter()
+    dados = {nome: pd.read_csv(os.path.join(diretorio, f'{nome}.csv'), **opcoes)
+             for nome, opcoes in READ_OPTIONS.items()}
+    carga_s = time.perf_counter() - inicio
+
+    medidor = Medidor()
+    engine = medidor.instrumentar(_criar_engine(motor))
+    if memoria:
+        tracemalloc.start()
+
+    inicio = time.perf_counter()
+    clientes = engine.correct_clientes(dados['clientes'])
+    produtos = engine.correct_produtos(dados['produtos'])
+    vendas = engine.correct_vendas(dados['vendas'], clientes, produtos)
+    logistica = engine.correct_logistica(dados['logistica'], vendas)
+    total_s = time.perf_counter() - inicio
+
+    if memoria:
+        tracemalloc.stop()
+    if hasattr(engine, 'shutdown'):
+        engine.shutdown()
+
+    saida = {'clientes': clientes, 'produtos': produtos, 'vendas': vendas, 'logistica': logistica}
+    return {
+        "motor": motor,
+        "linhas": linhas,
+        "memoria_rastreada": memoria,
+        "carga_s": round(carga_s, 3),
+        "total_s": round(total_s, 3),
+        "pico_rss_mb": round(_pico_rss_mb(), 1),
+        "linhas_entrada": {nome: len(df) for nome, df in dados.items()},
+        "linhas_saida": {nome: len(df) for nome, df in saida.items()},
+        "correcoes": len(engine.correction_log),
+        "metodos": {**medidor.resultados(), **_regras(engine)},
+    }
+
+
+def _commit() -> tuple:
+    """Commit atual (abreviado) e se há alterações não commitadas em src/ ou benchmarks/"""
+    raiz = os.path.join(BENCH_DIR, '..')
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=raiz, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--', 'src', 'benchmarks'], cwd=raiz,
+                                check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "sem-git", True
+    alterado = any(not linha.endswith('.json') for linha in status.splitlines())
+    return commit, alterado
+
+
+def _resolver_commit(referencia: str) -> str:
+    """Abrevia uma referência do git (branch, tag, HEAD~1) para o nome do arquivo de resultados"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', referencia], cwd=BENCH_DIR, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return referencia
+
+
+def salvar(execucoes: list) -> str:
+    """Grava as execuções em resultados/<commit>.json, substituindo as de mesmo motor e escala"""
+    commit, alterado = _commit()
+    caminho = os.path.join(RESULTADOS_DIR, f'{commit}.json')
+
+    anteriores = []
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as f:
+            anteriores = json.load(f)["execucoes"]
+    novas = {(e["motor"], e["linhas"], e["memoria_rastreada"]) for e in execucoes}
+    mantidas = [e for e in anteriores if (e["motor"], e["linhas"], e["memoria_rastreada"]) not in novas]
+
+    os.makedirs(RESULTADOS_DIR, exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump({
+            "commit": commit,
+            "alteracoes_locais": alterado,
+            "data": datetime.now().isoformat(timespec='seconds'),
+            "ambiente": {"python": platform.python_version(), "pandas": pd.__version__,
+                         "numpy": np.__version__, "cpus": os.cpu_count(), "sistema": platform.platform()},
+            "execucoes": sorted(mantidas + execucoes, key=lambda e: (e["motor"], e["linhas"])),
+        }, f, indent=2, ensure_ascii=False)
+    return caminho
+
+
+def comparar(execucoes: list, referencia: str):
+    """Imprime a razão de tempo (atual / referência) por método nas execuções em comum"""
+    caminho = os.path.join(RESULTADOS_DIR, f'{_resolver_commit(referencia)}.json')
+    if not os.path.exists(caminho):
+        print(f"Sem resultados para {referencia} em {caminho}")
+        return
+
+    with open(caminho, encoding='utf-8') as f:
+        base = {(e["motor"], e["linhas"], e["memoria_rastreada"]): e for e in json.load(f)["execucoes"]}
+
+    for execucao in execucoes:
+        anterior = base.get((execucao["motor"], execucao["linhas"], execucao["memoria_rastreada"]))
+        if anterior is None:
+            continue
+        print(f"\n{execucao['motor']} | {execucao['linhas']:,} vendas: "
+              f"{anterior['total_s']:.2f}s -> {execucao['total_s']:.2f}s")
+        for nome, medida in execucao["metodos"].items():
+            antes = anterior["metodos"].get(nome)
+            if antes and antes["tempo_s"] > 0:
+                print(f"  {nome:<48} {antes['tempo_s']:>9.3f}s -> {medida['tempo_s']:>9.3f}s "
+                      f"({medida['tempo_s'] / antes['tempo_s']:.2f}x)")
+
+
+def imprimir(execucao: dict):
+    """Resumo de uma execução, com os métodos do mais lento para o mais rápido"""
+    print(f"\n{execucao['motor']} | {execucao['linhas']:,} vendas | carga {execucao['carga_s']:.2f}s | "
+          f"correção {execucao['total_s']:.2f}s | pico RSS {execucao['pico_rss_mb']:.1f} MB | "
+          f"{execucao['correcoes']:,} correções")
+    metodos = sorted(execucao["metodos"].items(), key=lambda item: -item[1]["tempo_s"])
+    for nome, medida in metodos:
+        memoria = f" | pico {medida['pico_mb']:>9.1f} MB" if execucao["memoria_rastreada"] else ""
+        print(f"  {nome:<48} {medida['tempo_s']:>9.3f}s x{medida['chamadas']}{memoria}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Escalas em número de vendas (clientes e produtos são proporcionais)")
+    parser.add_argument("--motores", nargs="+", default=["vetorizado"], choices=MOTORES)
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="Mede só tempo (o tracemalloc deixa as regras mais lentas)")
+    parser.add_argument("--comparar", default=None, help="Commit cujos resultados servem de referência")
+    parser.add_argument("--nao-salvar", action="store_true", help="Não grava em resultados/<commit>.json")
+    parser.add_argument("--executar", choices=MOTORES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        print(json.dumps(executar(args.executar, args.linhas[0], not args.sem_memoria)))
+        return
+
+    execucoes = []
+    for linhas in args.linhas:
+        diretorio = os.path.join(DADOS_DIR, f'escala_{linhas}')
+        if not os.path.exists(os.path.join(diretorio, 'logistica.csv')):
+            print(f"Gerando {linhas:,} vendas em {diretorio} ({proporcoes(linhas)})...")
+            gerar_datasets(linhas, diretorio)
+
+        # Cada motor e escala roda em um processo novo para que o pico de RSS não se misture
+        for motor in args.motores:
+            comando = [sys.executable, __file__, "--executar", motor, "--linhas", str(linhas)]
+            if args.sem_memoria:
+                comando.append("--sem-memoria")
+            saida = subprocess.run(comando, check=True, capture_output=True, text=True).stdout
+            execucao = json.loads(saida.strip().splitlines()[-1])
+            execucoes.append(execucao)
+            imprimir(execucao)
+
+    if not args.nao_salvar:
+        print(f"\nResultados gravados em {salvar(execucoes)}")
+    if args.comparar:
+        comparar(execucoes, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
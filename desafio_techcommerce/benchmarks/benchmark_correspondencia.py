@@ -0,0 +1,111 @@
+"""
+🔎 Benchmark de Correspondência Fuzzy - TechCommerce
+Compara a varredura com SequenceMatcher e o índice de n-gramas em um
+vocabulário sintético grande (no tamanho da lista de municípios do IBGE)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from correspondencia import NGramIndex, best_match
+
+SILABAS = ["ba", "be", "ca", "co", "da", "de", "fa", "ga", "gu", "ja", "la", "li", "ma", "mi", "na",
+           "no", "pa", "pe", "ra", "ri", "sa", "so", "ta", "te", "tu", "va", "vi", "xa", "zé", "ão"]
+PREFIXOS = ["", "", "", "São ", "Santa ", "Porto ", "Campo ", "Nova ", "Rio "]
+
+
+def gerar_vocabulario(tamanho: int, seed: int = 42) -> list:
+    """Gera nomes distintos no estilo de municípios (prefixo opcional + 2 a 5 sílabas)"""
+    rng = np.random.default_rng(seed)
+    nomes = set()
+    while len(nomes) < tamanho:
+        silabas = rng.choice(SILABAS, rng.integers(2, 6))
+        nome = PREFIXOS[rng.integers(len(PREFIXOS))] + "".join(silabas).capitalize()
+        nomes.add(nome)
+    return sorted(nomes)
+
+
+def gerar_consultas(vocabulario: list, quantidade: int, seed: int = 7) -> list:
+    """Gera consultas sujas: caixa trocada, letras removidas, trocadas ou duplicadas"""
+    rng = np.random.default_rng(seed)
+    consultas = []
+    for nome in rng.choice(vocabulario, quantidade):
+        letras = list(nome.lower() if rng.random() < 0.5 else nome.upper())
+        for _ in range(rng.integers(1, 3)):
+            posicao = rng.integers(len(letras))
+            operacao = rng.integers(3)
+            if operacao == 0 and len(letras) > 3:
+                del letras[posicao]
+            elif operacao == 1:
+                letras[posicao] = SILABAS[rng.integers(len(SILABAS))][0]
+            else:
+                letras.insert(posicao, letras[posicao])
+        consultas.append("".join(letras))
+    return consultas
+
+
+def medir(funcao, consultas: list) -> tuple:
+    """Executa a função em cada consulta e retorna (resultados, ms por consulta)"""
+    inicio = time.perf_counter()
+    resultados = [funcao(consulta) for consulta in consultas]
+    return resultados, (time.perf_counter() - inicio) * 1000 / len(consultas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vocabulario", type=int, default=40_000)
+    parser.add_argument("--consultas", type=int, default=2_000)
+    parser.add_argument("--consultas-varredura", type=int, default=20,
+                        help="Consultas medidas com a varredura completa (lenta)")
+    parser.add_argument("--limiar", type=float, default=0.6)
+    parser.add_argument("--candidatos", type=int, default=50,
+                        help="Candidatos verificados por consulta no índice (precisão x tempo)")
+    parser.add_argument("--saida", default=None, help="Arquivo JSON para os resultados")
+    args = parser.parse_args()
+
+    vocabulario = gerar_vocabulario(args.vocabulario)
+    consultas = gerar_consultas(vocabulario, args.consultas)
+
+    inicio = time.perf_counter()
+    indice = NGramIndex(vocabulario, max_candidates=args.candidatos)
+    construcao_s = time.perf_counter() - inicio
+
+    por_indice, ms_indice = medir(lambda valor: indice.best_match(valor, args.limiar), consultas)
+
+    amostra = consultas[:args.consultas_varredura]
+    por_varredura, ms_varredura = medir(lambda valor: best_match(valor, vocabulario, args.limiar), amostra)
+    concordancia = np.mean([a == b for a, b in zip(por_varredura, por_indice)])
+
+    resultado = {
+        "vocabulario": len(vocabulario),
+        "candidatos": args.candidatos,
+        "consultas_indice": len(consultas),
+        "consultas_varredura": len(amostra),
+        "construcao_indice_s": round(construcao_s, 3),
+        "ms_por_consulta_indice": round(ms_indice, 3),
+        "ms_por_consulta_varredura": round(ms_varredura, 3),
+        "aceleracao": round(ms_varredura / ms_indice, 1),
+        "concordancia_com_varredura": round(float(concordancia), 3),
+    }
+
+    print(f"Vocabulário: {resultado['vocabulario']:,} | índice construído em {construcao_s:.2f}s")
+    print(f"  varredura: {ms_varredura:>9.3f} ms/consulta ({len(amostra)} consultas)")
+    print(f"     índice: {ms_indice:>9.3f} ms/consulta ({len(consultas)} consultas)")
+    print(f" aceleração: {resultado['aceleracao']}x | mesma resposta da varredura em "
+          f"{resultado['concordancia_com_varredura']:.1%} da amostra")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
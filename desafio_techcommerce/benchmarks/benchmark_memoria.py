@@ -0,0 +1,112 @@
+"""
+📏 Benchmark de Memória - TechCommerce
+Mede o pico de RSS de correct_clientes em um arquivo grande de clientes,
+comparando a execução com cópia única na entrada, a execução in-place e a
+carga com tipos compactos (categorias, inteiros anuláveis)
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from geradores import gerar_clientes
+
+MODOS = ["copia", "inplace", "compacto", "linha"]
+
+
+def _rss_atual_mb() -> float:
+    """RSS atual do processo em MB (Linux; 0 se indisponível)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _pico_rss_mb() -> float:
+    """Pico de RSS do processo em MB (ru_maxrss é KB no Linux e bytes no macOS)"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024
+
+
+def executar_modo(modo: str, arquivo: str) -> dict:
+    """Carrega o arquivo e corrige no modo indicado (roda em processo isolado)"""
+    import logging
+    from correcao_automatica import DataCorrectionEngine
+    from armazenamento import schema_dtypes
+    from correcao_vetorizada import VectorizedCorrectionEngine
+
+    logging.getLogger('DataCorrection').disabled = True
+
+    if modo == "compacto":
+        df = pd.read_csv(arquivo, dtype=schema_dtypes('clientes'))
+    else:
+        df = pd.read_csv(arquivo, dtype={'telefone': str})
+    rss_carga = _rss_atual_mb()
+    pico_carga = _pico_rss_mb()
+
+    inicio = time.perf_counter()
+    if modo == "linha":
+        DataCorrectionEngine().correct_clientes(df)
+    else:
+        VectorizedCorrectionEngine().correct_clientes(df, copy=(modo == "copia"))
+    tempo = time.perf_counter() - inicio
+
+    pico_total = _pico_rss_mb()
+    return {
+        "modo": modo,
+        "linhas": len(df),
+        "tempo_s": round(tempo, 2),
+        "rss_apos_carga_mb": round(rss_carga, 1),
+        "pico_carga_mb": round(pico_carga, 1),
+        "pico_total_mb": round(pico_total, 1),
+        "acrescimo_correcao_mb": round(pico_total - rss_carga, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=5_000_000)
+    parser.add_argument("--arquivo", default=None, help="CSV de clientes (gerado se não existir)")
+    parser.add_argument("--modos", nargs="+", default=["copia", "inplace", "compacto"], choices=MODOS)
+    parser.add_argument("--saida", default=None, help="Arquivo JSON para os resultados")
+    parser.add_argument("--executar", choices=MODOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    arquivo = args.arquivo or os.path.join(BENCH_DIR, 'dados', f'clientes_{args.linhas}.csv')
+
+    if args.executar:
+        print(json.dumps(executar_modo(args.executar, arquivo)))
+        return
+
+    if not os.path.exists(arquivo):
+        print(f"Gerando {args.linhas:,} clientes em {arquivo}...")
+        os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+        gerar_clientes(args.linhas).to_csv(arquivo, index=False)
+
+    # Cada modo roda em um processo novo para que o pico de RSS não se misture
+    resultados = []
+    for modo in args.modos:
+        saida = subprocess.run([sys.executable, __file__, "--executar", modo, "--arquivo", arquivo],
+                               check=True, capture_output=True, text=True).stdout
+        resultado = json.loads(saida.strip().splitlines()[-1])
+        resultados.append(resultado)
+        print(f"{modo:>8}: {resultado['tempo_s']:>8.2f}s | após carga {resultado['rss_apos_carga_mb']:>8.1f} MB"
+              f" | pico {resultado['pico_total_mb']:>8.1f} MB | acréscimo {resultado['acrescimo_correcao_mb']:>8.1f} MB")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+🔬 Benchmark do Perfil de Qualidade - TechCommerce
+Gera os quatro datasets em memória com os geradores sintéticos e mede o
+tempo do QualityProfiler por dataset (completude, unicidade, validade,
+faixa e integridade referencial em uma passada por coluna)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from geradores import gerar_clientes, gerar_logistica, gerar_produtos, gerar_vendas, proporcoes
+from perfil import QualityProfiler
+
+
+def gerar_em_memoria(linhas: int, seed: int = 42):
+    """Os quatro datasets para ``linhas`` vendas, sem passar por disco"""
+    tamanhos = proporcoes(linhas)
+    vendas = gerar_vendas(1_000_001, linhas, tamanhos['clientes'], tamanhos['produtos'], seed + 2)
+    return {
+        'clientes': gerar_clientes(tamanhos['clientes'], seed),
+        'produtos': gerar_produtos(tamanhos['produtos'], seed + 1),
+        'vendas': vendas,
+        'logistica': gerar_logistica(vendas, seed + 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Vendas (e entregas) geradas")
+    parser.add_argument("--saida", default=None, help="Arquivo JSON para os resultados")
+    args = parser.parse_args()
+
+    frames = gerar_em_memoria(args.linhas)
+    profiler = QualityProfiler()
+
+    resultado = {"linhas": {nome: len(df) for nome, df in frames.items()}, "segundos": {}}
+    metricas = []
+    for nome, df in frames.items():
+        inicio = time.perf_counter()
+        metricas.extend(profiler.profile_dataset(nome, df, frames))
+        resultado["segundos"][nome] = round(time.perf_counter() - inicio, 2)
+    resultado["segundos"]["total"] = round(sum(resultado["segundos"].values()), 2)
+    resultado["falhas"] = {f"{m['dataset']}.{m['column']}.{m['check']}": m["failed"] for m in metricas if m["failed"]}
+
+    for nome, segundos in resultado["segundos"].items():
+        linhas = resultado["linhas"].get(nome, sum(resultado["linhas"].values()))
+        print(f"{nome:<10} {linhas:>12,} linhas  {segundos:7.2f}s")
+    print(pd.DataFrame(metricas)[["dataset", "column", "check", "failed", "rate"]]
+          .query("failed > 0").to_string(index=False))
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
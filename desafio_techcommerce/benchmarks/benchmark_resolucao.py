@@ -0,0 +1,113 @@
+"""
+🧬 Benchmark de Resolução de Entidades - TechCommerce
+Gera clientes com nomes realistas, injeta o mesmo cliente com outro id (nome
+com erro de digitação, email em outra caixa, telefone formatado) e mede o
+tempo do EntityResolver e a precisão/revocação dos registros fundidos
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from resolucao import EntityResolver
+
+PRIMEIROS_NOMES = np.array(['Ana', 'João', 'Maria', 'Pedro', 'Carlos', 'Fernanda', 'Juliana', 'Marcos', 'Patrícia',
+                            'Eduardo', 'Camila', 'Roberto', 'Luciana', 'Ricardo', 'Beatriz', 'Rafael', 'Larissa',
+                            'Gustavo', 'Aline', 'Bruno', 'Letícia', 'Felipe', 'Gabriela', 'Rodrigo', 'Vanessa',
+                            'Thiago', 'Renata', 'Lucas', 'Mariana', 'Diego', 'Sônia', 'André', 'Cláudia', 'Paulo',
+                            'Tatiane', 'Vinícius', 'Débora', 'Fábio', 'Simone', 'Márcio'], dtype=object)
+SOBRENOMES = np.array(['Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima',
+                       'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares',
+                       'Fernandes', 'Vieira', 'Barbosa', 'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira',
+                       'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas', 'Cardoso', 'Ramos', 'Gonçalves',
+                       'Santana', 'Teixeira', 'Araújo', 'Cavalcanti', 'Monteiro', 'Moura', 'Correia'], dtype=object)
+DOMINIOS = np.array(['gmail.com', 'hotmail.com', 'yahoo.com', 'outlook.com', 'email.com', 'empresa.com.br'],
+                    dtype=object)
+
+
+def gerar_clientes(linhas: int, taxa_duplicatas: float, seed: int = 42):
+    """Clientes com ``taxa_duplicatas`` de recadastros da mesma pessoa; retorna (df, posição original de cada linha)"""
+    rng = np.random.default_rng(seed)
+    originais = int(linhas / (1 + taxa_duplicatas))
+
+    nomes = (PRIMEIROS_NOMES[rng.integers(len(PRIMEIROS_NOMES), size=originais)] + ' ' +
+             SOBRENOMES[rng.integers(len(SOBRENOMES), size=originais)] + ' ' +
+             SOBRENOMES[rng.integers(len(SOBRENOMES), size=originais)])
+    usuarios = pd.Series(nomes).str.lower().str.replace(' ', '.', regex=False).to_numpy(dtype=object)
+    emails = usuarios + pd.Series(rng.integers(1, 1000, originais)).astype(str).to_numpy(dtype=object) + '@' + \
+        DOMINIOS[rng.integers(len(DOMINIOS), size=originais)]
+    telefones = pd.Series(rng.integers(11_900_000_000, 99_999_999_999, originais)).astype(str).to_numpy(dtype=object)
+    nascimentos = (pd.Timestamp('1950-01-01') +
+                   pd.to_timedelta(rng.integers(0, 20_000, originais), unit='D')).strftime('%Y-%m-%d')
+    nascimentos = nascimentos.to_numpy(dtype=object)
+
+    # Recadastros: mesma pessoa com outro id, nome com um caractere trocado e email ou telefone iguais
+    origem = rng.integers(originais, size=linhas - originais)
+    nomes_dup = nomes[origem].copy()
+    for indice, nome in enumerate(nomes_dup):
+        posicao = rng.integers(1, len(nome))
+        nomes_dup[indice] = nome[:posicao] + 'x' + nome[posicao + 1:]
+    emails_dup = np.where(rng.random(len(origem)) < 0.5, pd.Series(emails[origem]).str.upper().to_numpy(dtype=object),
+                          'outro' + pd.Series(origem).astype(str).to_numpy(dtype=object) + '@gmail.com')
+    telefones_dup = '(' + pd.Series(telefones[origem]).str[:2] + ') ' + pd.Series(telefones[origem]).str[2:]
+
+    df = pd.DataFrame({
+        'id_cliente': np.arange(1, linhas + 1),
+        'nome': np.concatenate([nomes, nomes_dup]),
+        'email': np.concatenate([emails, emails_dup]),
+        'telefone': np.concatenate([telefones, telefones_dup.to_numpy(dtype=object)]),
+        'data_nascimento': np.concatenate([nascimentos, nascimentos[origem]]),
+    })
+    return df, np.concatenate([np.arange(originais), origem])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--taxa-duplicatas", type=float, default=0.05)
+    parser.add_argument("--janela", type=int, default=4)
+    parser.add_argument("--saida", default=None, help="Arquivo JSON para os resultados")
+    args = parser.parse_args()
+
+    df, origem = gerar_clientes(args.linhas, args.taxa_duplicatas)
+    resolver = EntityResolver(window=args.janela)
+
+    inicio = time.perf_counter()
+    mantidos = resolver.resolve(df)
+    segundos = time.perf_counter() - inicio
+
+    # Fusão correta: o registro mantido é o original da mesma pessoa
+    fundidos = mantidos != np.arange(len(df))
+    corretos = fundidos & (origem[mantidos] == origem)
+    esperados = int((origem != np.arange(len(df))).sum())
+
+    resultado = {
+        "linhas": len(df),
+        "recadastros": esperados,
+        "janela": args.janela,
+        "segundos": round(segundos, 2),
+        "us_por_linha": round(segundos * 1e6 / len(df), 3),
+        "fundidos": int(fundidos.sum()),
+        "precisao": round(float(corretos.sum() / max(fundidos.sum(), 1)), 4),
+        "revocacao": round(float(corretos.sum() / max(esperados, 1)), 4),
+    }
+    print(f"{resultado['linhas']:,} clientes ({esperados:,} recadastros) em {segundos:.2f}s "
+          f"({resultado['us_por_linha']:.3f} µs/linha)")
+    print(f"fundidos: {resultado['fundidos']:,} | precisão {resultado['precisao']:.1%} | "
+          f"revocação {resultado['revocacao']:.1%}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+🏭 Geradores de Dados Sintéticos - TechCommerce
+Gera clientes, produtos, vendas e logística com o mesmo mix de defeitos do
+demo (ids duplicados, emails vazios ou sem domínio, telefones curtos, preços
+e quantidades negativos, referências órfãs, datas futuras) em qualquer escala
+"""
+
+import os
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Vendas (e entregas) geradas e gravadas por bloco, limitando a memória em 50M linhas
+BLOCO_VENDAS = 2_000_000
+
+# Textos repetidos vêm de pools: cada linha guarda só a referência ao objeto
+DATAS = pd.date_range('2022-01-01', periods=1_200, freq='D').strftime('%Y-%m-%d').to_numpy(dtype=object)
+DATAS_FUTURAS = np.array(['2099-01-01', '2030-06-15', '2045-12-31'], dtype=object)
+
+NOMES_PRODUTOS = np.array(['Smartphone XYZ', 'Notebook ABC', 'Mouse Gamer', 'Teclado Mecânico', 'Monitor 24"',
+                           'Fone Bluetooth', 'Cadeira Escritório', 'Tênis Corrida', 'Livro Python', 'Perfume Floral',
+                           'Pneu Aro 15', 'Vaso Cerâmica', 'Boneca Fashion', 'Bola Futebol', 'Cabo HDMI'], dtype=object)
+CATEGORIAS = np.array(['Eletrônicos', 'Informática', 'Casa', 'Moda', 'Esportes', 'Livros', 'Beleza',
+                       'Automotivo', 'Jardim', 'Brinquedos', '', 'eletronicos', 'Informatica', 'CASA'], dtype=object)
+ATIVOS = np.array(['true', 'false'], dtype=object)
+STATUS_VENDA = np.array(['Concluída', 'Pendente', 'Cancelada', 'Processando', 'concluida', 'Pendnte', 'CANCELADA'],
+                        dtype=object)
+TRANSPORTADORAS = np.array(['Correios', 'Transportadora XYZ', 'Jadlog', 'Loggi', ''], dtype=object)
+STATUS_ENTREGA = np.array(['Entregue', 'Em Trânsito', 'Cancelada', 'Aguardando', 'entrege', 'Em Transito'],
+                          dtype=object)
+
+
+def proporcoes(linhas: int) -> Dict[str, int]:
+    """Tamanho de cada dataset para ``linhas`` vendas (1 cliente a cada 10 vendas, 1 produto a cada 100)"""
+    return {
+        'clientes': max(linhas // 10, 16),
+        'produtos': max(linhas // 100, 20),
+        'vendas': linhas,
+        'logistica': linhas,
+    }
+
+
+def gerar_clientes(n_linhas: int, seed: int = 42) -> pd.DataFrame:
+    """Gera clientes sintéticos com o mesmo mix de defeitos do demo"""
+    rng = np.random.default_rng(seed)
+
+    ids = np.arange(1, n_linhas + 1)
+    duplicados = rng.random(n_linhas) < 0.01
+    ids[duplicados] = rng.integers(1, n_linhas + 1, duplicados.sum())
+    id_texto = pd.Series(ids).astype(str)
+
+    dominios = np.array(['@email.com', '@gmail', '@hotmail', '@teste.co', '@invalid', '@empresa.com.br'])
+    emails = 'cliente' + id_texto + dominios[rng.choice(len(dominios), n_linhas, p=[.9, .02, .02, .02, .02, .02])]
+    emails[rng.random(n_linhas) < 0.02] = ''
+
+    nomes = 'Cliente ' + id_texto
+    nomes[rng.random(n_linhas) < 0.01] = ''
+
+    telefones = pd.Series(rng.integers(11_900_000_000, 11_999_999_999, n_linhas)).astype(str)
+    curtos = rng.random(n_linhas) < 0.01
+    telefones[curtos] = telefones[curtos].str[:6]
+
+    estados = np.array(['SP', 'RJ', 'MG', 'RS', 'PR', 'BA', 'sp', 'S P', 'Rj'])
+    datas = pd.Timestamp('1960-01-01') + pd.to_timedelta(rng.integers(0, 16_000, n_linhas), unit='D')
+
+    return pd.DataFrame({
+        'id_cliente': ids,
+        'nome': nomes,
+        'email': emails,
+        'telefone': telefones,
+        'data_nascimento': datas.strftime('%Y-%m-%d'),
+        'cidade': 'São Paulo',
+        'estado': estados[rng.choice(len(estados), n_linhas, p=[.3, .2, .2, .1, .1, .07, .01, .01, .01])],
+        'data_cadastro': '2023-01-10',
+    })
+
+
+def gerar_produtos(n_linhas: int, seed: int = 43) -> pd.DataFrame:
+    """Gera produtos com ids duplicados, categorias vazias ou grafadas errado e preços/estoques negativos"""
+    rng = np.random.default_rng(seed)
+
+    ids = np.arange(101, 101 + n_linhas)
+    duplicados = rng.random(n_linhas) < 0.01
+    ids[duplicados] = rng.integers(101, 101 + n_linhas, duplicados.sum())
+
+    precos = np.round(rng.uniform(5, 5_000, n_linhas), 2)
+    precos[rng.random(n_linhas) < 0.02] *= -1
+    estoques = rng.integers(0, 500, n_linhas)
+    estoques[rng.random(n_linhas) < 0.02] *= -1
+
+    pesos_categoria = np.array([10] * 10 + [8, 1, 1, 1], dtype=float)
+    return pd.DataFrame({
+        'id_produto': ids,
+        'nome_produto': NOMES_PRODUTOS[rng.integers(len(NOMES_PRODUTOS), size=n_linhas)] + ' ' + ids.astype(str),
+        'categoria': CATEGORIAS[rng.choice(len(CATEGORIAS), n_linhas, p=pesos_categoria / pesos_categoria.sum())],
+        'preco': precos,
+        'estoque': estoques,
+        'data_criacao': DATAS[rng.integers(0, 365, n_linhas)],
+        'ativo': ATIVOS[(rng.random(n_linhas) < 0.1).astype(int)],
+    })
+
+
+def gerar_vendas(inicio: int, n_linhas: int, n_clientes: int, n_produtos: int, seed: int = 44) -> pd.DataFrame:
+    """Gera um bloco de vendas (ids a partir de ``inicio``) com quantidades, totais e referências inválidos
+
+    Clientes e produtos órfãos usam ids logo após os gerados (como o cliente
+    999 do demo); 1% das datas fica no futuro e 0,5% não é data.
+    """
+    rng = np.random.default_rng([seed, inicio])
+
+    id_cliente = rng.integers(1, n_clientes + 1, n_linhas)
+    id_cliente[rng.random(n_linhas) < 0.01] = n_clientes + 999
+    id_produto = rng.integers(101, 101 + n_produtos, n_linhas)
+    id_produto[rng.random(n_linhas) < 0.005] = 101 + n_produtos + 999
+
+    quantidade = rng.integers(1, 6, n_linhas)
+    invalidas = rng.random(n_linhas) < 0.02
+    quantidade[invalidas] = rng.integers(-1, 1, invalidas.sum())
+    valor_unitario = np.round(rng.uniform(5, 5_000, n_linhas), 2)
+    valor_total = np.round(quantidade * valor_unitario, 2)
+    valor_total[rng.random(n_linhas) < 0.03] += 10
+    valor_unitario[rng.random(n_linhas) < 0.01] *= -1
+
+    data_venda = DATAS[rng.integers(365, 1_095, n_linhas)]
+    data_venda[rng.random(n_linhas) < 0.01] = DATAS_FUTURAS[0]
+    data_venda[rng.random(n_linhas) < 0.005] = 'data inválida'
+
+    return pd.DataFrame({
+        'id_venda': np.arange(inicio, inicio + n_linhas),
+        'id_cliente': id_cliente,
+        'id_produto': id_produto,
+        'quantidade': quantidade,
+        'valor_unitario': valor_unitario,
+        'valor_total': valor_total,
+        'data_venda': data_venda,
+        'status': STATUS_VENDA[rng.choice(len(STATUS_VENDA), n_linhas, p=[.45, .25, .15, .1, .02, .02, .01])],
+    })
+
+
+def gerar_logistica(vendas: pd.DataFrame, seed: int = 45) -> pd.DataFrame:
+    """Gera uma entrega por venda do bloco, com transportadoras e datas de envio ausentes,
+    entregas anteriores ao envio e entregas de vendas inexistentes"""
+    n_linhas = len(vendas)
+    inicio = int(vendas['id_venda'].iloc[0]) if n_linhas else 0
+    rng = np.random.default_rng([seed, inicio])
+
+    id_venda = vendas['id_venda'].to_numpy().copy()
+    id_venda[rng.random(n_linhas) < 0.005] = -1
+
+    # Dias das datas de venda no pool (datas futuras ou inválidas enviam no primeiro dia)
+    dia_venda = np.maximum(pd.Index(DATAS).get_indexer(vendas['data_venda']), 0)
+    dia_envio = dia_venda + rng.integers(1, 4, n_linhas)
+    dia_entrega = dia_envio + rng.integers(1, 10, n_linhas)
+    antes_do_envio = rng.random(n_linhas) < 0.02
+    dia_entrega[antes_do_envio] = dia_envio[antes_do_envio] - 2
+
+    data_envio = DATAS[dia_envio]
+    data_envio[rng.random(n_linhas) < 0.03] = ''
+    data_entrega_real = DATAS[dia_entrega]
+    data_entrega_real[rng.random(n_linhas) < 0.2] = ''
+
+    return pd.DataFrame({
+        'id_entrega': np.arange(inicio + 1_000_000_000, inicio + 1_000_000_000 + n_linhas),
+        'id_venda': id_venda,
+        'transportadora': TRANSPORTADORAS[rng.choice(len(TRANSPORTADORAS), n_linhas, p=[.4, .25, .15, .17, .03])],
+        'data_envio': data_envio,
+        'data_entrega_prevista': DATAS[dia_envio + 5],
+        'data_entrega_real': data_entrega_real,
+        'status_entrega': STATUS_ENTREGA[rng.choice(len(STATUS_ENTREGA), n_linhas,
+                                                    p=[.6, .2, .05, .1, .03, .02])],
+    })
+
+
+def gerar_datasets(linhas: int, diretorio: str, seed: int = 42) -> Dict[str, str]:
+    """Grava os quatro CSVs para ``linhas`` vendas em ``diretorio`` e retorna seus caminhos
+
+    Vendas e logística são geradas e acrescentadas ao arquivo em blocos de
+    BLOCO_VENDAS linhas; o resultado depende só de ``linhas`` e ``seed``.
+    """
+    tamanhos = proporcoes(linhas)
+    os.makedirs(diretorio, exist_ok=True)
+    caminhos = {nome: os.path.join(diretorio, f'{nome}.csv') for nome in tamanhos}
+
+    gerar_clientes(tamanhos['clientes'], seed).to_csv(caminhos['clientes'], index=False)
+    gerar_produtos(tamanhos['produtos'], seed + 1).to_csv(caminhos['produtos'], index=False)
+
+    for inicio in range(0, linhas, BLOCO_VENDAS):
+        vendas = gerar_vendas(1_000_001 + inicio, min(BLOCO_VENDAS, linhas - inicio),
+                              tamanhos['clientes'], tamanhos['produtos'], seed + 2)
+        modo, cabecalho = ('w', True) if inicio == 0 else ('a', False)
+        vendas.to_csv(caminhos['vendas'], mode=modo, header=cabecalho, index=False)
+        gerar_logistica(vendas, seed + 3).to_csv(caminhos['logistica'], mode=modo, header=cabecalho, index=False)
+
+    return caminhos
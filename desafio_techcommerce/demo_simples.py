@@ -9,11 +9,17 @@ import os
 from datetime import datetime
 import sys
 
-def criar_datasets():
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from armazenamento import DatasetStorage
+from categorizacao import DEFAULT_CATEGORY_KEYWORDS, KeywordCategorizer
+from perfil import QualityProfiler
+
+def criar_datasets(formato='csv'):
     """Cria os datasets de exemplo com problemas intencionais"""
     print("Criando datasets de exemplo...")
     
-    # Criar diretório
+    # Zona raw no formato escolhido (csv, parquet ou arrow)
+    raw = DatasetStorage('data/raw', formato)
     os.makedirs('data/raw', exist_ok=True)
     
     # Dataset CLIENTES
@@ -29,7 +35,7 @@ def criar_datasets():
     }
     
     df_clientes = pd.DataFrame(clientes_data)
-    df_clientes.to_csv('data/raw/clientes.csv', index=False)
+    raw.write('clientes', df_clientes)
     print(f"OK Clientes: {len(df_clientes)} registros criados")
     
     # Dataset PRODUTOS
@@ -44,71 +50,43 @@ def criar_datasets():
     }
     
     df_produtos = pd.DataFrame(produtos_data)
-    df_produtos.to_csv('data/raw/produtos.csv', index=False)
+    raw.write('produtos', df_produtos)
     print(f"OK Produtos: {len(df_produtos)} registros criados")
     
     return df_clientes, df_produtos
 
-def analisar_problemas(df_clientes, df_produtos):
-    """Analisa problemas de qualidade nos datasets"""
+def analisar_problemas(df_clientes, df_produtos, cache=None):
+    """Analisa problemas de qualidade nos datasets (perfil em uma passada por coluna)"""
     print("\nAnalisando problemas de qualidade...")
     
-    problemas = []
+    frames = {'clientes': df_clientes, 'produtos': df_produtos}
+    if cache is not None:
+        # Partes do perfil com as mesmas colunas de entrada voltam do cache
+        from cache_resultados import CachedProfiler
+        perfil = CachedProfiler(cache=cache).profile(frames)
+    else:
+        perfil = QualityProfiler().profile(frames)
+    descricoes = {
+        'completude': 'vazios',
+        'unicidade': 'duplicados',
+        'validade': 'invalidos',
+        'faixa': 'fora da faixa',
+        'integridade': 'sem referencia',
+    }
     
-    # Análise CLIENTES
-    print("\nCLIENTES:")
-    
-    # Duplicatas
-    duplicatas = df_clientes['id_cliente'].duplicated().sum()
-    if duplicatas > 0:
-        print(f"  ERRO: {duplicatas} registros duplicados")
-        problemas.append(f"Clientes: {duplicatas} duplicatas")
-    
-    # Emails vazios
-    emails_vazios = df_clientes['email'].isnull().sum() + (df_clientes['email'] == '').sum()
-    if emails_vazios > 0:
-        print(f"  ERRO: {emails_vazios} emails vazios")
-        problemas.append(f"Clientes: {emails_vazios} emails vazios")
-    
-    # Nomes vazios
-    nomes_vazios = df_clientes['nome'].isnull().sum() + (df_clientes['nome'] == '').sum()
-    if nomes_vazios > 0:
-        print(f"  ERRO: {nomes_vazios} nomes vazios")
-        problemas.append(f"Clientes: {nomes_vazios} nomes vazios")
-    
-    # Emails inválidos
-    emails_invalidos = 0
-    for email in df_clientes['email'].dropna():
-        if email and '@' not in email or '.' not in email:
-            emails_invalidos += 1
-    if emails_invalidos > 0:
-        print(f"  ERRO: {emails_invalidos} emails invalidos")
-        problemas.append(f"Clientes: {emails_invalidos} emails inválidos")
-    
-    # Análise PRODUTOS
-    print("\nPRODUTOS:")
-    
-    # Categorias vazias
-    categorias_vazias = df_produtos['categoria'].isnull().sum() + (df_produtos['categoria'] == '').sum()
-    if categorias_vazias > 0:
-        print(f"  ERRO: {categorias_vazias} categorias vazias")
-        problemas.append(f"Produtos: {categorias_vazias} categorias vazias")
-    
-    # Preços negativos
-    precos_negativos = (df_produtos['preco'] < 0).sum()
-    if precos_negativos > 0:
-        print(f"  ERRO: {precos_negativos} precos negativos")
-        problemas.append(f"Produtos: {precos_negativos} preços negativos")
-    
-    # Duplicatas de produtos
-    duplicatas_produtos = df_produtos.duplicated(subset=['nome_produto', 'categoria']).sum()
-    if duplicatas_produtos > 0:
-        print(f"  ERRO: {duplicatas_produtos} produtos duplicados")
-        problemas.append(f"Produtos: {duplicatas_produtos} duplicatas")
+    problemas = []
+    for dataset in perfil.rows:
+        print(f"\n{dataset.upper()}:")
+        for metrica in perfil.failures():
+            if metrica['dataset'] != dataset:
+                continue
+            descricao = f"{metrica['column']} {descricoes[metrica['dimension']]} ({metrica['check']})"
+            print(f"  ERRO: {metrica['failed']} {descricao} - chaves {metrica['sample_keys']}")
+            problemas.append(f"{dataset.title()}: {metrica['failed']} {descricao}")
     
     return problemas
 
-def aplicar_correcoes(df_clientes, df_produtos):
+def aplicar_correcoes(df_clientes, df_produtos, formato='csv'):
     """Aplica correções automáticas nos dados"""
     print("\nAplicando correcoes automaticas...")
     
@@ -179,28 +157,62 @@ def aplicar_correcoes(df_clientes, df_produtos):
         print(f"  OK: Corrigidos {count_precos} precos negativos")
         correcoes_aplicadas.append(f"Produtos: {count_precos} preços negativos corrigidos")
     
-    # Preencher categorias vazias
+    # Preencher categorias vazias pelo catálogo de palavras-chave (sem correspondência: Outros)
     categorias_vazias = df_produtos_corrigido['categoria'].isnull() | (df_produtos_corrigido['categoria'] == '')
-    categorias_preenchidas = 0
-    for idx in df_produtos_corrigido[categorias_vazias].index:
-        nome_produto = df_produtos_corrigido.loc[idx, 'nome_produto'].lower()
-        if 'notebook' in nome_produto or 'mouse' in nome_produto or 'teclado' in nome_produto:
-            df_produtos_corrigido.loc[idx, 'categoria'] = 'Informática'
-            categorias_preenchidas += 1
-        elif 'smartphone' in nome_produto:
-            df_produtos_corrigido.loc[idx, 'categoria'] = 'Eletrônicos'
-            categorias_preenchidas += 1
-        else:
-            df_produtos_corrigido.loc[idx, 'categoria'] = 'Outros'
-            categorias_preenchidas += 1
+    nomes = df_produtos_corrigido.loc[categorias_vazias, 'nome_produto'].astype(str)
+    categorias = KeywordCategorizer(DEFAULT_CATEGORY_KEYWORDS).categorize(nomes).fillna('Outros')
+    df_produtos_corrigido.loc[categorias_vazias, 'categoria'] = categorias
+    categorias_preenchidas = len(categorias)
     
     if categorias_preenchidas > 0:
         print(f"  OK: Preenchidas {categorias_preenchidas} categorias vazias")
         correcoes_aplicadas.append(f"Produtos: {categorias_preenchidas} categorias preenchidas")
     
     # Salvar dados corrigidos
-    df_clientes_corrigido.to_csv('data/corrected/clientes_corrected.csv', index=False)
-    df_produtos_corrigido.to_csv('data/corrected/produtos_corrected.csv', index=False)
+    corrected = DatasetStorage('data/corrected', formato, suffix='_corrected')
+    corrected.write('clientes', df_clientes_corrigido)
+    corrected.write('produtos', df_produtos_corrigido)
+    
+    return df_clientes_corrigido, df_produtos_corrigido, correcoes_aplicadas
+
+def aplicar_correcoes_incrementais(df_clientes, df_produtos):
+    """Aplica as regras da engine só nos registros novos ou alterados desde a última execução"""
+    print("\nAplicando correcoes incrementais...")
+    from incremental import IncrementalCorrector
+    
+    os.makedirs('data/quality', exist_ok=True)
+    
+    corretor = IncrementalCorrector(corrected_dir='data/corrected')
+    df_clientes_corrigido = corretor.correct_clientes(df_clientes)
+    df_produtos_corrigido = corretor.correct_produtos(df_produtos)
+    corretor.save()
+    
+    correcoes_aplicadas = []
+    for dataset, estatisticas in corretor.stats.items():
+        print(f"  OK: {dataset}: {estatisticas['corrigidas']} registros corrigidos, "
+              f"{estatisticas['reaproveitadas']} reaproveitados")
+        if estatisticas['corrigidas'] > 0:
+            correcoes_aplicadas.append(f"{dataset.title()}: {estatisticas['corrigidas']} registros corrigidos")
+    
+    return df_clientes_corrigido, df_produtos_corrigido, correcoes_aplicadas
+
+def aplicar_correcoes_com_cache(df_clientes, df_produtos, cache, formato='csv'):
+    """Aplica as regras da engine, reaproveitando do cache as correções de entradas já vistas"""
+    print("\nAplicando correcoes (com cache)...")
+    from cache_resultados import CachedCorrector
+    
+    os.makedirs('data/quality', exist_ok=True)
+    
+    corretor = CachedCorrector(cache=cache)
+    df_clientes_corrigido = corretor.correct_clientes(df_clientes)
+    df_produtos_corrigido = corretor.correct_produtos(df_produtos)
+    corretor.save(DatasetStorage('data/corrected', formato, suffix='_corrected'))
+    
+    correcoes_aplicadas = []
+    for dataset, estatisticas in corretor.stats.items():
+        print(f"  OK: {dataset}: correcao {estatisticas['origem']} ({estatisticas['regras']} regras executadas)")
+    for (dataset, coluna), linhas in corretor.engine.get_correction_summary().get('by_column', {}).items():
+        correcoes_aplicadas.append(f"{dataset.title()}: {linhas} correções em {coluna}")
     
     return df_clientes_corrigido, df_produtos_corrigido, correcoes_aplicadas
 
@@ -275,7 +287,7 @@ Total de correções realizadas: **{len(correcoes_aplicadas)}**
     print("OK: Relatorio salvo em: data/quality/relatorio_qualidade.md")
     return relatorio
 
-def main():
+def main(incremental=False, formato='csv', cache=False):
     """Função principal da demonstração"""
     print("DEMONSTRACAO DATAOPS TECHCOMMERCE")
     print("=" * 50)
@@ -283,13 +295,28 @@ def main():
     
     try:
         # 1. Criar datasets
-        df_clientes, df_produtos = criar_datasets()
+        if incremental and formato != 'csv':
+            print("ERRO: a correcao incremental so grava a zona corrigida em CSV")
+            return False
+        
+        df_clientes, df_produtos = criar_datasets(formato)
+        
+        # --cache: perfil e correções de entradas já vistas voltam de data/cache
+        resultados = None
+        if cache:
+            from cache_resultados import ResultCache
+            resultados = ResultCache('data/cache')
         
         # 2. Analisar problemas
-        problemas = analisar_problemas(df_clientes, df_produtos)
+        problemas = analisar_problemas(df_clientes, df_produtos, resultados)
         
-        # 3. Aplicar correções
-        df_clientes_corrigido, df_produtos_corrigido, correcoes = aplicar_correcoes(df_clientes, df_produtos)
+        # 3. Aplicar correções (--incremental: só registros novos ou alterados)
+        if incremental:
+            df_clientes_corrigido, df_produtos_corrigido, correcoes = aplicar_correcoes_incrementais(df_clientes, df_produtos)
+        elif cache:
+            df_clientes_corrigido, df_produtos_corrigido, correcoes = aplicar_correcoes_com_cache(df_clientes, df_produtos, resultados, formato)
+        else:
+            df_clientes_corrigido, df_produtos_corrigido, correcoes = aplicar_correcoes(df_clientes, df_produtos, formato)
         
         # 4. Gerar relatório
         relatorio = gerar_relatorio_qualidade(problemas, correcoes, df_clientes, df_produtos, df_clientes_corrigido, df_produtos_corrigido)
@@ -302,10 +329,12 @@ def main():
         print(f"Taxa de melhoria: {(len(correcoes) / max(len(problemas), 1)) * 100:.1f}%")
         
         print("\nArquivos gerados:")
-        print("  • data/raw/clientes.csv (dados originais)")
-        print("  • data/raw/produtos.csv (dados originais)")
-        print("  • data/corrected/clientes_corrected.csv (dados corrigidos)")
-        print("  • data/corrected/produtos_corrected.csv (dados corrigidos)")
+        raw = DatasetStorage('data/raw', formato)
+        corrected = DatasetStorage('data/corrected', formato, suffix='_corrected')
+        print(f"  • {raw.path('clientes')} (dados originais)")
+        print(f"  • {raw.path('produtos')} (dados originais)")
+        print(f"  • {corrected.path('clientes')} (dados corrigidos)")
+        print(f"  • {corrected.path('produtos')} (dados corrigidos)")
         print("  • data/quality/relatorio_qualidade.md (relatório)")
         
         print("\nSOLUCAO DATAOPS IMPLEMENTADA COM SUCESSO!")
@@ -321,5 +350,7 @@ def main():
         return False
 
 if __name__ == "__main__":
-    success = main()
+    # Uso: python demo_simples.py [--incremental] [--cache] [--formato csv|parquet|arrow]
+    formato = sys.argv[sys.argv.index('--formato') + 1] if '--formato' in sys.argv else 'csv'
+    success = main(incremental='--incremental' in sys.argv, formato=formato, cache='--cache' in sys.argv)
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,306 @@
+"""
+🗄️ Armazenamento de Datasets - TechCommerce
+Leitura e gravação das zonas de dados (raw, corrected) em CSV, Parquet ou
+Arrow IPC, com projeção de colunas, leitura por memory map dos formatos
+colunares (Parquet e Arrow exigem o pacote pyarrow) e carga com tipos compactos
+"""
+
+import os
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+FORMATS = ("csv", "parquet", "arrow")
+
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+# Opções de leitura de CSV por dataset (telefone como texto para não perder zeros nem virar float)
+READ_OPTIONS: Dict[str, Dict] = {
+    "clientes": {"dtype": {"telefone": str}},
+    "produtos": {},
+    "vendas": {},
+    "logistica": {},
+}
+
+# Tipos compactos por coluna: categorias para domínios pequenos e datas (o texto
+# original chega intacto ao log e cada data distinta é convertida uma vez),
+# inteiros anuláveis para ids e contagens e texto para o telefone
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "clientes": {"id_cliente": "Int64", "telefone": "text", "data_nascimento": "category",
+                 "cidade": "category", "estado": "category", "data_cadastro": "category"},
+    "produtos": {"id_produto": "Int64", "categoria": "category", "estoque": "Int64",
+                 "data_criacao": "category"},
+    "vendas": {"id_venda": "Int64", "id_cliente": "Int64", "id_produto": "Int64", "quantidade": "Int64",
+               "data_venda": "category", "status": "category"},
+    "logistica": {"id_entrega": "Int64", "id_venda": "Int64", "transportadora": "category",
+                  "data_envio": "category", "data_entrega_prevista": "category",
+                  "data_entrega_real": "category", "status_entrega": "category"},
+}
+
+# Colunas de cada referência consultadas pelas regras do dataset
+REFERENCE_COLUMNS: Dict[str, Dict[str, List[str]]] = {
+    "clientes": {},
+    "produtos": {},
+    "vendas": {"clientes": ["id_cliente"], "produtos": ["id_produto"]},
+    "logistica": {"vendas": ["id_venda", "data_venda"]},
+}
+
+
+def _pyarrow(format: str):
+    """Importa o pyarrow sob demanda (só os formatos colunares dependem dele)"""
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(f"O formato {format} requer o pacote pyarrow (pip install pyarrow)") from error
+    return pyarrow
+
+
+def text_dtype() -> pd.StringDtype:
+    """Tipo de texto compacto: string[pyarrow] quando o pyarrow está instalado"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.StringDtype()
+    return pd.StringDtype("pyarrow")
+
+
+def schema_dtypes(dataset: str, columns: Optional[Sequence[str]] = None) -> Dict[str, object]:
+    """dtypes compactos do dataset (só das colunas pedidas, quando informadas)"""
+    dtypes = {column: text_dtype() if kind == "text" else kind
+              for column, kind in SCHEMAS.get(dataset, {}).items()}
+    if columns is not None:
+        dtypes = {column: dtype for column, dtype in dtypes.items() if column in columns}
+    return dtypes
+
+
+def apply_schema(df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+    """Converte as colunas do DataFrame para os tipos compactos do dataset
+
+    Colunas numéricas que não cabem em inteiro (ex.: 2.5 em quantidade) são
+    mantidas como estão, para não perder valores que as regras vão corrigir.
+    """
+    converted = {}
+    for column, dtype in schema_dtypes(dataset, df.columns).items():
+        if df[column].dtype == dtype:
+            continue
+        try:
+            converted[column] = df[column].astype(dtype)
+        except (TypeError, ValueError):
+            continue
+    return df.assign(**converted) if converted else df
+
+
+def format_from_path(path: str, default: Optional[str] = None) -> str:
+    """Formato de um arquivo pela extensão (.csv, .parquet, .arrow/.feather)
+
+    Extensões desconhecidas levantam ValueError, a menos que haja ``default``.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".arrow", ".feather", ".ipc"):
+        return "arrow"
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension == ".csv":
+        return "csv"
+    if default is not None:
+        return default
+    raise ValueError(f"Extensão sem formato conhecido: {path} (use {sorted(EXTENSIONS.values())})")
+
+
+def read_frame(path: str, format: Optional[str] = None, columns: Optional[Sequence[str]] = None,
+               memory_map: bool = False, **csv_options) -> pd.DataFrame:
+    """Lê um arquivo só com as colunas pedidas (None = todas)
+
+    Nos formatos colunares apenas as colunas projetadas são lidas do disco;
+    com ``memory_map`` o arquivo é mapeado em vez de copiado para um buffer,
+    e só as páginas das colunas lidas chegam a ser carregadas. Arrow IPC não
+    comprimido (como gravado por ``write_frame``) é o formato que mais se
+    beneficia. No CSV ``memory_map`` é repassado ao parser do pandas.
+    """
+    format = format or format_from_path(path)
+    columns = list(columns) if columns is not None else None
+    if format == "csv":
+        return pd.read_csv(path, usecols=columns, memory_map=memory_map, **csv_options)
+
+    pyarrow = _pyarrow(format)
+    if format == "parquet":
+        table = pyarrow.parquet.read_table(path, columns=columns, memory_map=memory_map)
+    elif format == "arrow":
+        table = pyarrow.feather.read_table(path, columns=columns, memory_map=memory_map)
+    else:
+        raise ValueError(f"Formato inválido: {format} (use {FORMATS})")
+    return table.to_pandas()
+
+
+def write_frame(df: pd.DataFrame, path: str, format: Optional[str] = None):
+    """Grava o DataFrame (sem índice) preservando os tipos nos formatos colunares
+
+    Arrow IPC é gravado sem compressão para poder ser lido por memory map
+    sem descompactar; Parquet usa a compressão padrão (snappy).
+    """
+    format = format or format_from_path(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if format == "csv":
+        df.to_csv(path, index=False)
+        return
+
+    pyarrow = _pyarrow(format)
+    table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    if format == "parquet":
+        pyarrow.parquet.write_table(table, path)
+    elif format == "arrow":
+        pyarrow.feather.write_feather(table, path, compression="uncompressed")
+    else:
+        raise ValueError(f"Formato inválido: {format} (use {FORMATS})")
+
+
+def read_columns(path: str, format: Optional[str] = None) -> List[str]:
+    """Nomes das colunas do arquivo, lendo só o cabeçalho ou o schema"""
+    format = format or format_from_path(path)
+    if format == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+
+    pyarrow = _pyarrow(format)
+    if format == "parquet":
+        return list(pyarrow.parquet.read_schema(path).names)
+    with pyarrow.memory_map(path) as source:
+        return list(pyarrow.ipc.open_file(source).schema.names)
+
+
+class DatasetStorage:
+    """Uma zona de dados (ex.: data/raw, data/corrected) com um arquivo por dataset
+
+    Os arquivos se chamam ``<dataset><suffix><extensão>``, por exemplo
+    ``DatasetStorage("data/corrected", "parquet", "_corrected")`` lê e grava
+    ``data/corrected/vendas_corrected.parquet``.
+
+    Com ``compact`` os datasets são lidos com os tipos de SCHEMAS (no CSV,
+    já na leitura, sem materializar as colunas como object).
+    """
+
+    def __init__(self, directory: str, format: str = "csv", suffix: str = "", compact: bool = False):
+        if format not in FORMATS:
+            raise ValueError(f"Formato inválido: {format} (use {FORMATS})")
+        if format != "csv":
+            _pyarrow(format)
+
+        self.directory = directory
+        self.format = format
+        self.suffix = suffix
+        self.compact = compact
+
+    def __repr__(self) -> str:
+        compact = ", compact=True" if self.compact else ""
+        return f"DatasetStorage({self.directory!r}, {self.format!r}{compact})"
+
+    def path(self, dataset: str) -> str:
+        """Caminho do arquivo do dataset"""
+        return os.path.join(self.directory, f"{dataset}{self.suffix}{EXTENSIONS[self.format]}")
+
+    def exists(self, dataset: str) -> bool:
+        """Se o dataset existe na zona"""
+        return os.path.exists(self.path(dataset))
+
+    def columns(self, dataset: str) -> List[str]:
+        """Colunas do dataset, sem ler os dados"""
+        return read_columns(self.path(dataset), self.format)
+
+    def read(self, dataset: str, columns: Optional[Sequence[str]] = None,
+             memory_map: bool = False) -> pd.DataFrame:
+        """Lê o dataset, opcionalmente só com algumas colunas"""
+        options = READ_OPTIONS.get(dataset, {}) if self.format == "csv" else {}
+        if columns is not None and "dtype" in options:
+            options = {**options, "dtype": {column: dtype for column, dtype in options["dtype"].items()
+                                            if column in columns}}
+        if not self.compact:
+            return read_frame(self.path(dataset), self.format, columns, memory_map, **options)
+
+        if self.format == "csv":
+            compact = {**options, "dtype": {**options.get("dtype", {}), **schema_dtypes(dataset, columns)}}
+            try:
+                return read_frame(self.path(dataset), self.format, columns, memory_map, **compact)
+            except (TypeError, ValueError):
+                # Algum valor não cabe no tipo (ex.: quantidade 2.5): converte coluna a coluna
+                pass
+        return apply_schema(read_frame(self.path(dataset), self.format, columns, memory_map, **options),
+                            dataset)
+
+    def write(self, dataset: str, df: pd.DataFrame) -> str:
+        """Grava o dataset e retorna o caminho"""
+        path = self.path(dataset)
+        write_frame(df, path, self.format)
+        return path
+
+
+def projected_columns(engine, dataset: str, columns: Sequence[str]) -> List[str]:
+    """Colunas do arquivo que as regras da engine leem ou escrevem, mais a chave
+
+    Com a quarentena ativa nada é projetado: as linhas rejeitadas são
+    gravadas com todas as colunas, para poderem ser reprocessadas.
+    """
+    if getattr(engine, "quarantine", None) is not None:
+        return list(columns)
+    return engine.required_columns(dataset, columns)
+
+
+def attach_columns(corrected: pd.DataFrame, storage: DatasetStorage, dataset: str,
+                   columns: Sequence[str]) -> pd.DataFrame:
+    """Acrescenta à saída corrigida as colunas do arquivo que faltam, na ordem do arquivo
+
+    As regras mantêm o índice das linhas lidas, então as colunas lidas
+    agora se alinham pelo índice às linhas que sobraram na saída.
+    """
+    missing = [column for column in columns if column not in corrected.columns]
+    if not missing:
+        return corrected
+    rest = storage.read(dataset, missing).loc[corrected.index]
+    return pd.concat([corrected, rest], axis=1)[list(columns)]
+
+
+def correct_storage(raw: DatasetStorage, corrected: DatasetStorage, engine=None,
+                    datasets: Sequence[str] = ("clientes", "produtos", "vendas", "logistica"),
+                    log_name: str = "correction_log") -> Dict[str, int]:
+    """Corrige os datasets pedidos de uma zona para outra; retorna os registros gravados
+
+    Referências de datasets que não estão em ``datasets`` (por exemplo,
+    clientes e produtos ao corrigir só vendas) são lidas da zona corrigida
+    apenas com as colunas consultadas pelas regras, por memory map. Os
+    datasets brutos também são lidos só com as colunas das regras
+    (``projected_columns``); as demais são lidas depois e apenas emendadas
+    às linhas que sobraram. O log de correções desta execução é gravado na
+    zona corrigida no mesmo formato, e as linhas rejeitadas vão para a
+    quarentena da engine, se ativa.
+    """
+    # Import tardio: as engines usam este módulo para gravar o log
+    from correcao_vetorizada import VectorizedCorrectionEngine
+
+    engine = engine or VectorizedCorrectionEngine()
+    results: Dict[str, pd.DataFrame] = {}
+    written = {}
+
+    for dataset in ("clientes", "produtos", "vendas", "logistica"):
+        if dataset not in datasets or not raw.exists(dataset):
+            continue
+
+        references = []
+        for reference, columns in REFERENCE_COLUMNS[dataset].items():
+            if reference in results:
+                references.append(results[reference])
+            elif corrected.exists(reference):
+                references.append(corrected.read(reference, columns, memory_map=True))
+            else:
+                raise FileNotFoundError(f"{dataset} precisa de {reference} corrigido em {corrected.path(reference)}")
+
+        raw_columns = raw.columns(dataset)
+        df = raw.read(dataset, projected_columns(engine, dataset, raw_columns))
+        df = getattr(engine, f"correct_{dataset}")(df, *references)
+        results[dataset] = attach_columns(df, raw, dataset, raw_columns)
+        corrected.write(dataset, results[dataset])
+        written[dataset] = len(results[dataset])
+
+    engine.save_correction_log(os.path.join(corrected.directory, log_name + EXTENSIONS[corrected.format]))
+    if getattr(engine, "quarantine", None) is not None:
+        engine.quarantine.flush()
+    return written
@@ -0,0 +1,297 @@
+"""
+📜 Log de Auditoria Colunar - TechCommerce
+Armazena o log de correções em blocos colunares (estilo Arrow), com códigos
+categóricos para dataset, coluna e tipo de correção; cada entrada cobre uma
+linha ou, nas correções registradas por valor, row_count linhas
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+LOG_COLUMNS = ["timestamp", "dataset", "row_id", "column", "old_value", "new_value", "correction_type",
+               "row_count"]
+
+CATEGORICAL_FIELDS = ("dataset", "column", "correction_type")
+
+
+class _Dictionary:
+    """Dicionário de valores categóricos (valor -> código) na ordem de aparição"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        """Retorna o código do valor, criando-o se necessário"""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def encode_many(self, values: Union[str, Sequence[str]]) -> Union[int, np.ndarray]:
+        """Codifica um valor único (escalar) ou uma sequência de valores"""
+        if isinstance(values, str):
+            return self.encode(values)
+        return np.fromiter((self.encode(value) for value in values), dtype=np.int32, count=len(values))
+
+
+class _Chunk:
+    """Bloco de entradas gravado por uma única chamada de append/extend"""
+
+    __slots__ = ("length", "timestamps", "row_ids", "fields", "old_values", "new_values", "row_counts")
+
+    def __init__(self, length, timestamps, row_ids, fields, old_values, new_values, row_counts=1):
+        self.length = length
+        self.timestamps = timestamps   # datetime único ou lista de datetimes
+        self.row_ids = row_ids         # ndarray
+        self.fields = fields           # {campo: código escalar ou ndarray de códigos}
+        self.old_values = old_values   # ndarray ou escalar repetido
+        self.new_values = new_values   # ndarray ou escalar repetido
+        self.row_counts = row_counts   # linhas cobertas por entrada: 1 ou ndarray
+
+
+def _as_column(values, length: int):
+    """Converte valores em array (escalares são mantidos e expandidos só na leitura)
+
+    Arrays e Series numéricos são guardados no dtype original; listas e demais
+    tipos viram arrays object para preservar o tipo de cada valor (str(1) != str(1.0)).
+    """
+    if np.ndim(values) == 0:
+        return values
+    if isinstance(values, (pd.Series, pd.Index)):
+        numeric = isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf"
+        values = values.to_numpy() if numeric else values.tolist()
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biufO":
+        return values
+    array = np.empty(length, dtype=object)
+    array[:] = list(values)
+    return array
+
+
+def _to_text(values, length: int) -> np.ndarray:
+    """Equivalente a str(valor) aplicado a cada elemento, feito uma única vez na leitura"""
+    if np.ndim(values) == 0:
+        return np.full(length, str(values), dtype=object)
+    if values.dtype.kind in "biuf":
+        return values.astype(str).astype(object)
+    return np.array([str(value) for value in values], dtype=object)
+
+
+class CorrectionLog:
+    """Log de correções colunar, alimentado em lote (uma chamada por máscara)
+
+    Cada chamada de ``extend`` vira um bloco com arrays para row_id, old_value e
+    new_value e códigos categóricos para dataset, column e correction_type. A
+    conversão para texto e o timestamp ISO só são produzidos na leitura.
+    """
+
+    def __init__(self):
+        self._chunks: List[_Chunk] = []
+        self._pending: List[Tuple] = []
+        self._length = 0
+        self._rows = 0
+        self._dictionaries = {field: _Dictionary() for field in CATEGORICAL_FIELDS}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Itera as entradas como dicionários (compatibilidade com o log em lista)"""
+        for frame in self.iter_frames():
+            yield from frame.to_dict("records")
+
+    def append(self, dataset: str, row_id, column: str, old_value, new_value,
+               correction_type: str):
+        """Registra uma única correção (caminho linha a linha)"""
+        self._pending.append((datetime.now(), dataset, row_id, column,
+                              old_value, new_value, correction_type))
+        self._length += 1
+        self._rows += 1
+
+    def extend(self, dataset: str, row_ids: Sequence, column: Union[str, Sequence[str]],
+               old_values, new_values, correction_type: Union[str, Sequence[str]], row_counts=1):
+        """Registra em lote as correções de uma máscara
+
+        ``column`` e ``correction_type`` aceitam um valor único ou um valor por
+        entrada; ``old_values``/``new_values`` aceitam um escalar repetido.
+        ``row_counts`` é o número de linhas de cada entrada (correções
+        registradas por valor distinto, sem row_id).
+        """
+        length = len(row_ids)
+        if length == 0:
+            return
+        self._flush_pending()
+
+        fields = {
+            "dataset": self._dictionaries["dataset"].encode(dataset),
+            "column": self._dictionaries["column"].encode_many(column),
+            "correction_type": self._dictionaries["correction_type"].encode_many(correction_type),
+        }
+        if np.ndim(row_counts):
+            row_counts = np.asarray(row_counts, dtype=np.int64)
+        self._chunks.append(_Chunk(length, datetime.now(), _as_column(row_ids, length), fields,
+                                   _as_column(old_values, length), _as_column(new_values, length),
+                                   row_counts))
+        self._length += length
+        self._rows += int(np.sum(row_counts)) if np.ndim(row_counts) else length * row_counts
+
+    def merge(self, other: "CorrectionLog"):
+        """Anexa as entradas de outro log, na ordem em que foram registradas"""
+        other._flush_pending()
+        self._flush_pending()
+        for chunk in other._chunks:
+            fields = {}
+            for field, codes in chunk.fields.items():
+                values = other._dictionaries[field].values
+                if np.ndim(codes) == 0:
+                    fields[field] = self._dictionaries[field].encode(values[codes])
+                else:
+                    remap = np.array([self._dictionaries[field].encode(value) for value in values],
+                                     dtype=np.int32)
+                    fields[field] = remap[codes]
+            self._chunks.append(_Chunk(chunk.length, chunk.timestamps, chunk.row_ids, fields,
+                                       chunk.old_values, chunk.new_values, chunk.row_counts))
+            self._length += chunk.length
+        self._rows += other._rows
+
+    def select(self, field: str, values: Sequence[str], exclude: bool = False) -> "CorrectionLog":
+        """Novo log só com as entradas cujo campo categórico está em ``values`` (fora dele, com exclude)"""
+        self._flush_pending()
+        dictionary = self._dictionaries[field].codes
+        wanted = np.array([dictionary[value] for value in values if value in dictionary], dtype=np.int32)
+
+        # Blocos filtrados ainda com os códigos deste log; o merge os traduz para o log novo
+        part = CorrectionLog()
+        part._dictionaries = self._dictionaries
+        for chunk in self._chunks:
+            codes = chunk.fields[field]
+            keep = np.isin(np.full(chunk.length, codes, dtype=np.int32) if np.ndim(codes) == 0 else codes,
+                           wanted) != exclude
+            if not keep.all():
+                if not keep.any():
+                    continue
+                take = lambda values: values if np.ndim(values) == 0 else values[keep]
+                timestamps = chunk.timestamps
+                if isinstance(timestamps, list):
+                    timestamps = [timestamp for timestamp, kept in zip(timestamps, keep) if kept]
+                chunk = _Chunk(int(keep.sum()), timestamps, chunk.row_ids[keep],
+                               {name: take(field_codes) for name, field_codes in chunk.fields.items()},
+                               take(chunk.old_values), take(chunk.new_values), take(chunk.row_counts))
+            part._chunks.append(chunk)
+            part._length += chunk.length
+            part._rows += int(np.sum(chunk.row_counts)) if np.ndim(chunk.row_counts) \
+                else chunk.length * chunk.row_counts
+
+        selected = CorrectionLog()
+        selected.merge(part)
+        return selected
+
+    def clear(self):
+        """Remove todas as entradas"""
+        self._chunks = []
+        self._pending = []
+        self._length = 0
+        self._rows = 0
+        self._dictionaries = {field: _Dictionary() for field in CATEGORICAL_FIELDS}
+
+    def _flush_pending(self):
+        """Converte as entradas individuais pendentes em um bloco colunar"""
+        if not self._pending:
+            return
+        timestamps, datasets, row_ids, columns, olds, news, types = zip(*self._pending)
+        length = len(self._pending)
+        fields = {
+            "dataset": self._dictionaries["dataset"].encode_many(datasets),
+            "column": self._dictionaries["column"].encode_many(columns),
+            "correction_type": self._dictionaries["correction_type"].encode_many(types),
+        }
+        self._chunks.append(_Chunk(length, list(timestamps), _as_column(row_ids, length), fields,
+                                   _as_column(olds, length), _as_column(news, length)))
+        self._pending = []
+
+    def _codes(self, field: str) -> np.ndarray:
+        """Concatena os códigos de um campo categórico de todos os blocos"""
+        self._flush_pending()
+        parts = [np.full(chunk.length, codes, dtype=np.int32) if np.ndim(codes) == 0 else codes
+                 for chunk in self._chunks for codes in [chunk.fields[field]]]
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate(parts)
+
+    def _row_counts(self) -> np.ndarray:
+        """Linhas cobertas por cada entrada, na ordem do log"""
+        self._flush_pending()
+        parts = [np.full(chunk.length, chunk.row_counts, dtype=np.int64) for chunk in self._chunks]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)
+
+    def rows(self) -> int:
+        """Total de linhas corrigidas (entradas por valor contam todas as suas linhas)"""
+        return self._rows
+
+    def counts(self, field: str) -> Dict[str, int]:
+        """Linhas corrigidas por valor de um campo categórico, em ordem decrescente"""
+        codes = self._codes(field)
+        values = self._dictionaries[field].values
+        totals = np.bincount(codes, weights=self._row_counts(), minlength=len(values)).astype(np.int64)
+        order = sorted(range(len(values)), key=lambda code: -totals[code])
+        return {values[code]: int(totals[code]) for code in order if totals[code]}
+
+    def counts_by(self, fields: Sequence[str]) -> Dict[Tuple[str, ...], int]:
+        """Linhas corrigidas por combinação de campos categóricos, com chaves ordenadas"""
+        codes = [self._codes(field) for field in fields]
+        if not len(codes[0]):
+            return {}
+        combined, inverse = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=self._row_counts(),
+                             minlength=len(combined)).astype(np.int64)
+        result = {}
+        for combination, total in zip(combined, totals):
+            key = tuple(self._dictionaries[field].values[code] for field, code in zip(fields, combination))
+            result[key] = int(total)
+        return dict(sorted(result.items()))
+
+    def _chunk_frame(self, chunk: _Chunk) -> pd.DataFrame:
+        """Materializa um bloco como DataFrame com as colunas do log"""
+        if isinstance(chunk.timestamps, list):
+            timestamps = [timestamp.isoformat() for timestamp in chunk.timestamps]
+        else:
+            timestamps = np.full(chunk.length, chunk.timestamps.isoformat(), dtype=object)
+
+        data = {"timestamp": timestamps}
+        for field in CATEGORICAL_FIELDS:
+            values = np.array(self._dictionaries[field].values, dtype=object)
+            data[field] = values[np.full(chunk.length, chunk.fields[field], dtype=np.int32)]
+        data["row_id"] = pd.Series(chunk.row_ids).infer_objects()
+        data["old_value"] = _to_text(chunk.old_values, chunk.length)
+        data["new_value"] = _to_text(chunk.new_values, chunk.length)
+        data["row_count"] = np.full(chunk.length, chunk.row_counts, dtype=np.int64)
+        return pd.DataFrame(data, columns=LOG_COLUMNS)
+
+    def iter_frames(self) -> Iterator[pd.DataFrame]:
+        """Itera o log bloco a bloco, sem materializar tudo de uma vez"""
+        self._flush_pending()
+        for chunk in self._chunks:
+            yield self._chunk_frame(chunk)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materializa o log completo como DataFrame"""
+        frames = list(self.iter_frames())
+        if not frames:
+            return pd.DataFrame(columns=LOG_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def to_csv(self, output_path: str, append: bool = False):
+        """Grava o log em CSV bloco a bloco (append=True acrescenta sem cabeçalho)"""
+        header = not append
+        for frame in self.iter_frames():
+            frame.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+            header = False
@@ -0,0 +1,551 @@
+"""
+🗃️ Cache de Resultados - TechCommerce
+Guarda em disco local perfis de qualidade, saídas corrigidas e logs de
+correção endereçados pelo conteúdo da entrada (hash do arquivo ou de cada
+coluna) e pela versão das regras: entradas sem alteração voltam do cache e,
+nas alteradas em parte, só as colunas afetadas são recalculadas
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import sys
+import time
+import pandas as pd
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from armazenamento import EXTENSIONS, READ_OPTIONS, REFERENCE_COLUMNS, DatasetStorage
+from auditoria import CorrectionLog
+from correcao_automatica import DataCorrectionEngine
+from correcao_vetorizada import VectorizedCorrectionEngine
+from perfil import DATASETS, QualityProfile, QualityProfiler
+from regras import DATE_DEPENDENT_RULES, ROW, ExecutionPlan, Ref
+
+CACHE_DIR = "data/cache"
+
+# Tamanho máximo do cache em disco; as entradas usadas há mais tempo saem primeiro
+CACHE_MAX_BYTES = 1 << 30
+
+# Versão do formato das entradas (entra em todas as chaves)
+CACHE_FORMAT = 1
+
+# Módulos cujo código decide o resultado das regras e do perfil, além das classes da engine
+RULE_MODULES = ("regras", "normalizacao", "datas", "categorizacao", "integridade", "indice_chaves",
+                "correspondencia", "auditoria", "resolucao")
+PROFILE_MODULES = ("perfil", "integridade", "indice_chaves", "normalizacao")
+
+# Atributos da engine que são estado da execução, não configuração das regras
+ENGINE_STATE = ("logger", "correction_log", "metrics", "fuzzy_matcher", "entity_merges", "entity_resolver",
+                "referential_integrity", "quarantine")
+
+
+def _digest(*parts) -> str:
+    """Hash hexadecimal de partes serializáveis em JSON (ou pela sua repr)"""
+    text = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=repr)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos de 1 MB"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def column_digest(values) -> str:
+    """Hash do conteúdo de uma coluna (ou índice), com o dtype
+
+    Em colunas object com tipos misturados o tipo de cada valor também entra
+    no hash (o hash do pandas converte os valores para texto, 1 e "1" colidiriam).
+    """
+    sha = hashlib.blake2b(str(values.dtype).encode("utf-8"), digest_size=16)
+    sha.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+    if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        sha.update(" ".join(type(value).__name__ for value in values.tolist()).encode("utf-8"))
+    return sha.hexdigest()
+
+
+def frame_digests(df: pd.DataFrame) -> Dict[str, str]:
+    """Hash de cada coluna e do índice (``@index``) de um DataFrame"""
+    digests = {column: column_digest(df[column]) for column in df.columns}
+    digests["@index"] = column_digest(df.index.to_series())
+    return digests
+
+
+def _source_digests(modules: Sequence[str]) -> Dict[str, str]:
+    """Hash do código-fonte dos módulos (o que já foi importado ou está ao lado deste arquivo)"""
+    digests = {}
+    for name in modules:
+        module = sys.modules.get(name)
+        path = getattr(module, "__file__", None) or os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                   f"{name}.py")
+        if path.endswith(".py") and os.path.exists(path):
+            digests[name] = file_digest(path)
+    return digests
+
+
+def ruleset_version(engine: DataCorrectionEngine, plan: Optional[ExecutionPlan] = None) -> str:
+    """Versão do conjunto de regras: código da engine e dos módulos das regras, registro, seleção e listas
+
+    Se o plano (ou, sem plano, o registro inteiro) tem regra que depende da
+    data do dia, a data entra na versão e as entradas expiram na virada do dia.
+    """
+    classes = [cls for cls in type(engine).__mro__ if cls.__module__ not in ("builtins", "abc")]
+    settings = {}
+    for name, value in sorted(vars(engine).items()):
+        if name in ENGINE_STATE or name.startswith("_"):
+            continue  # estado da execução e memorizações internas
+        if isinstance(value, re.Pattern):
+            value = value.pattern
+        if isinstance(value, (str, int, float, bool, list, tuple, dict, type(None))):
+            settings[name] = value
+    registry = {dataset: [(rule.name, rule.inputs, rule.optional_inputs, rule.outputs, rule.scope,
+                           repr(rule.arguments), rule.method) for rule in engine.rule_registry.rules(dataset)]
+                for dataset in engine.rule_registry.datasets()}
+    modules = list(dict.fromkeys([cls.__module__ for cls in classes] + list(RULE_MODULES)))
+    rules = ([rule.name for stage in plan.stages for rule in stage.rules] if plan is not None
+             else [rule[0] for rules in registry.values() for rule in rules])
+    today = date.today().isoformat() if any(rule in DATE_DEPENDENT_RULES for rule in rules) else None
+    return _digest(CACHE_FORMAT, [cls.__qualname__ for cls in classes], _source_digests(modules),
+                   registry, settings, today)
+
+
+def profile_version(profiler: QualityProfiler) -> str:
+    """Versão do perfil: código, verificações, tamanho da amostra e data de referência das datas futuras"""
+    checks = {dataset: {"key": dataset_checks.key, "unique": dataset_checks.unique,
+                        "references": dataset_checks.references,
+                        "columns": {column: repr(check) for column, check in dataset_checks.columns.items()}}
+              for dataset, dataset_checks in profiler.checks.items()}
+    today = (profiler.today or date.today()).isoformat()
+    return _digest(CACHE_FORMAT, _source_digests(PROFILE_MODULES), checks, profiler.sample_size, today)
+
+
+class ResultCache:
+    """Cache em disco endereçado por conteúdo, com limite de tamanho
+
+    Cada entrada é uma pasta ``objects/<chave>`` com os arquivos do resultado;
+    ``index.json`` guarda tamanho, último uso e metadados das entradas, a
+    última entrada de cada série (ex.: correção de clientes com as mesmas
+    regras), usada para recalcular só o que mudou, e o hash dos arquivos de
+    entrada por tamanho e data de modificação (arquivo sem alteração não é
+    relido). Ao passar de ``max_bytes``, as entradas usadas há mais tempo são
+    removidas.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self.stats = {"hits": 0, "partial": 0, "misses": 0, "evicted": 0}
+        self._index = {"entries": {}, "latest": {}, "files": {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self._index = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self._index["entries"])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index["entries"]
+
+    def size(self) -> int:
+        """Bytes ocupados pelas entradas"""
+        return sum(entry["size"] for entry in self._index["entries"].values())
+
+    def path(self, key: str, name: str) -> str:
+        """Arquivo ``name`` da entrada"""
+        return os.path.join(self.directory, "objects", key, name)
+
+    def file_digest(self, path: str) -> str:
+        """Hash do arquivo, recalculado só se o tamanho ou a data de modificação mudaram"""
+        stat = os.stat(path)
+        absolute = os.path.abspath(path)
+        known = self._index["files"].get(absolute)
+        if known is not None and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+        digest = file_digest(path)
+        self._index["files"][absolute] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def get(self, key: str, series: Optional[str] = None) -> Optional[Dict]:
+        """Metadados da entrada (None se não estiver no cache), marcando-a como usada e última da série"""
+        entry = self._index["entries"].get(key)
+        if entry is None:
+            return None
+        entry["last_used"] = time.time()
+        if series is not None:
+            self._index["latest"][series] = key
+        self._save_index()
+        return entry["meta"]
+
+    def latest(self, series: str) -> Optional[Tuple[str, Dict]]:
+        """Chave e metadados da última entrada gravada na série"""
+        key = self._index["latest"].get(series)
+        if key is None or key not in self._index["entries"]:
+            return None
+        return key, self._index["entries"][key]["meta"]
+
+    def put(self, key: str, files: Dict[str, object], meta: Dict, series: Optional[str] = None):
+        """Grava a entrada (objetos em pickle, dicionários em JSON) e aplica o limite de tamanho"""
+        folder = os.path.join(self.directory, "objects", key)
+        temporary = folder + ".tmp"
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        for name, value in files.items():
+            with open(os.path.join(temporary, name), "wb") as handle:
+                if name.endswith(".json"):
+                    handle.write(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+                else:
+                    pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(temporary, folder)
+
+        size = sum(os.path.getsize(os.path.join(folder, name)) for name in files)
+        self._index["entries"][key] = {"size": size, "last_used": time.time(), "meta": meta}
+        if series is not None:
+            self._index["latest"][series] = key
+        self._evict(keep=key)
+        self._save_index()
+
+    def load(self, key: str, name: str):
+        """Conteúdo de um arquivo da entrada"""
+        with open(self.path(key, name), "rb") as handle:
+            if name.endswith(".json"):
+                return json.loads(handle.read().decode("utf-8"))
+            return pickle.load(handle)
+
+    def clear(self):
+        """Remove todas as entradas (os hashes de arquivos continuam valendo)"""
+        shutil.rmtree(os.path.join(self.directory, "objects"), ignore_errors=True)
+        self._index["entries"] = {}
+        self._index["latest"] = {}
+        self._save_index()
+
+    def _evict(self, keep: str):
+        """Remove as entradas usadas há mais tempo até caber em max_bytes (a recém-gravada fica)"""
+        entries = self._index["entries"]
+        total = self.size()
+        for key in sorted(entries, key=lambda key: entries[key]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries.pop(key)["size"]
+            shutil.rmtree(os.path.join(self.directory, "objects", key), ignore_errors=True)
+            self.stats["evicted"] += 1
+        self._index["latest"] = {series: key for series, key in self._index["latest"].items() if key in entries}
+
+    def _save_index(self):
+        """Grava o índice (arquivo temporário + rename)"""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self.index_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(temporary, self.index_path)
+
+
+class CachedProfiler:
+    """QualityProfiler com cache por parte do perfil
+
+    Cada parte (verificações de uma coluna, uma chave única, uma referência)
+    tem a chave formada pelo hash das colunas que lê e pela versão do perfil;
+    partes já calculadas, nesta ou em outra combinação de datasets, voltam do
+    cache e só as demais são recalculadas.
+    """
+
+    def __init__(self, profiler: Optional[QualityProfiler] = None, cache: Optional[ResultCache] = None):
+        self.profiler = profiler or QualityProfiler()
+        self.cache = cache if cache is not None else ResultCache()
+        self.stats: Dict[str, int] = {}
+
+    def profile(self, frames: Dict[str, pd.DataFrame]) -> QualityProfile:
+        """Perfil dos datasets, reaproveitando as partes com as mesmas colunas de entrada"""
+        version = profile_version(self.profiler)
+        digests: Dict[str, str] = {}
+        plan = []
+        for dataset in [name for name in DATASETS if name in frames] + \
+                [name for name in frames if name not in DATASETS]:
+            for name, inputs, compute in self.profiler.profile_units(dataset, frames[dataset], frames):
+                for label in inputs:
+                    if label not in digests:
+                        frame, column = label.split(".", 1)
+                        values = frames[frame].index.to_series() if column == "@index" else frames[frame][column]
+                        digests[label] = column_digest(values)
+                plan.append((_digest(version, dataset, name, [digests[label] for label in inputs]), compute))
+
+        rows = {dataset: len(frames[dataset]) for dataset in frames}
+        key = _digest(version, "perfil", rows, [unit for unit, _ in plan])
+        series = f"perfil:{version}"
+        if self.cache.get(key, series) is not None:
+            self.stats = {"partes": len(plan), "recalculadas": 0}
+            self.cache.stats["hits"] += 1
+            return QualityProfile(self.cache.load(key, "perfil.json")["metrics"], rows)
+
+        previous = self.cache.latest(series)
+        known = self.cache.load(previous[0], "partes.json") if previous is not None else {}
+        units: Dict[str, List[Dict]] = {}
+        for unit, compute in plan:
+            units[unit] = known[unit] if unit in known else json.loads(json.dumps(compute(), default=str))
+        recomputed = sum(unit not in known for unit, _ in plan)
+        self.cache.stats["partial" if recomputed < len(plan) else "misses"] += 1
+        self.stats = {"partes": len(plan), "recalculadas": recomputed}
+
+        metrics = [metric for unit, _ in plan for metric in units[unit]]
+        self.cache.put(key, {"perfil.json": {"rows": rows, "metrics": metrics}, "partes.json": units},
+                       {"kind": "perfil"}, series)
+        return QualityProfile(metrics, rows)
+
+
+class CachedCorrector:
+    """Correção com cache: mesma entrada e mesmas regras devolvem a saída e o log gravados
+
+    A chave é o hash de cada coluna da entrada, do índice e das colunas de
+    referência consultadas pelas regras, mais a versão do conjunto de regras.
+    Se só algumas colunas mudaram desde a última execução com as mesmas
+    regras, apenas as regras que tocam colunas alteradas (e as que dividem
+    colunas com elas, além das globais e de filtro, que decidem as linhas)
+    são executadas; as colunas escritas pelas demais regras e suas entradas
+    no log vêm do cache. As correções entram no ``correction_log`` da engine,
+    como na correção direta.
+    """
+
+    def __init__(self, engine: Optional[DataCorrectionEngine] = None, cache: Optional[ResultCache] = None):
+        self.engine = engine or VectorizedCorrectionEngine()
+        if any(rule.name == "resolve_entities" for rule in self.engine.rule_registry.rules("clientes")):
+            raise ValueError("A resolução de entidades guarda os clientes fundidos na engine: "
+                             "use a correção sem cache")
+        if self.engine.quarantine is not None:
+            raise ValueError("A quarentena recebe as linhas rejeitadas durante as regras, que o cache "
+                             "pula: use a correção sem cache")
+        self.cache = cache if cache is not None else ResultCache()
+        self.logger = self.engine.logger
+        self.results: Dict[str, pd.DataFrame] = {}
+        self.stats: Dict[str, Dict] = {}
+
+    def correct_clientes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige clientes (ou devolve a correção em cache)"""
+        return self._correct("clientes", df, ())
+
+    def correct_produtos(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige produtos (ou devolve a correção em cache)"""
+        return self._correct("produtos", df, ())
+
+    def correct_vendas(self, df: pd.DataFrame, df_clientes: pd.DataFrame,
+                       df_produtos: pd.DataFrame) -> pd.DataFrame:
+        """Corrige vendas (ou devolve a correção em cache)"""
+        return self._correct("vendas", df, (df_clientes, df_produtos))
+
+    def correct_logistica(self, df: pd.DataFrame, df_vendas: pd.DataFrame) -> pd.DataFrame:
+        """Corrige entregas (ou devolve a correção em cache)"""
+        return self._correct("logistica", df, (df_vendas,))
+
+    def save(self, corrected: DatasetStorage, log_name: str = "correction_log"):
+        """Grava as saídas na zona corrigida e o log de correções da engine"""
+        os.makedirs(corrected.directory, exist_ok=True)
+        for dataset, df in self.results.items():
+            corrected.write(dataset, df)
+        self.engine.save_correction_log(os.path.join(corrected.directory, log_name + EXTENSIONS[corrected.format]))
+
+    def _correct(self, dataset: str, df: pd.DataFrame, references: Tuple) -> pd.DataFrame:
+        """Devolve a correção em cache, recalcula só as regras afetadas ou corrige por inteiro"""
+        plan = self.engine.plan(dataset, df.columns)
+        version = ruleset_version(self.engine, plan)
+        digests = frame_digests(df)
+        for reference, frame in zip(REFERENCE_COLUMNS[dataset], references):
+            columns = [column for column in REFERENCE_COLUMNS[dataset][reference] if column in frame.columns]
+            digests[f"@df_{reference}"] = _digest(frame_digests(frame[columns]))
+        key = _digest(version, dataset, list(df.columns), digests)
+        series = f"correcao:{dataset}:{version}:{_digest(list(df.columns))}"
+
+        if self.cache.get(key, series) is not None:
+            corrected, log = self.cache.load(key, "corrigido.pkl"), self.cache.load(key, "log.pkl")
+            self.cache.stats["hits"] += 1
+            self.stats[dataset] = {"linhas": len(df), "origem": "cache", "regras": 0}
+            self.logger.info(f"🗃️ {dataset.upper()}: correção reaproveitada do cache")
+        else:
+            previous = self.cache.latest(series)
+            dirty = self._dirty_rules(plan, digests, previous[1]["digests"]) if previous is not None else None
+            corrected = log = None
+            if dirty is not None and len(dirty) < len(plan.rules):
+                corrected, log = self._correct_partial(dataset, df, references, plan, dirty, previous[0])
+            if corrected is None:
+                corrected, log = self._run(dataset, df, references, None)
+                self.cache.stats["misses"] += 1
+                self.stats[dataset] = {"linhas": len(df), "origem": "completa", "regras": len(plan.rules)}
+            else:
+                self.cache.stats["partial"] += 1
+                self.stats[dataset] = {"linhas": len(df), "origem": "parcial", "regras": len(dirty)}
+                self.logger.info(f"🗃️ {dataset.upper()}: {len(dirty)} de {len(plan.rules)} regras recalculadas")
+            self.cache.put(key, {"corrigido.pkl": corrected, "log.pkl": log},
+                           {"kind": "correcao", "dataset": dataset, "digests": digests}, series)
+
+        self.engine.correction_log.merge(log)
+        self.results[dataset] = corrected
+        return corrected
+
+    def _dirty_rules(self, plan, digests: Dict[str, str], previous: Dict[str, str]) -> Optional[List[int]]:
+        """Posições no plano das regras a executar de novo (None se as linhas podem mudar)
+
+        Executam de novo as regras globais e de filtro, as que leem colunas
+        alteradas e, por fechamento, as que leem ou escrevem alguma coluna
+        tocada por uma regra que executa: as demais só veem colunas iguais às
+        da execução anterior.
+        """
+        if digests.keys() != previous.keys() or digests["@index"] != previous["@index"]:
+            return None
+        changed = {column for column, digest in digests.items() if previous[column] != digest}
+
+        touched = [rule.columns | {f"@{argument.name}" for argument in rule.arguments
+                                   if isinstance(argument, Ref)} for rule in plan.rules]
+        rows = [position for position, rule in enumerate(plan.rules) if rule.scope != ROW]
+        if any(touched[position] & changed for position in rows):
+            return None  # as linhas mantidas podem ser outras
+
+        dirty = set(rows) | {position for position, columns in enumerate(touched) if columns & changed}
+        while True:
+            columns = set().union(*(touched[position] for position in dirty))
+            grown = dirty | {position for position, rule_columns in enumerate(touched) if rule_columns & columns}
+            if grown == dirty:
+                return sorted(dirty)
+            dirty = grown
+
+    def _run(self, dataset: str, df: pd.DataFrame, references: Tuple,
+             include: Optional[List[str]]) -> Tuple[pd.DataFrame, CorrectionLog]:
+        """Executa correct_* com um log só desta chamada (``include`` restringe as regras)"""
+        engine = self.engine
+        main_log, engine.correction_log = engine.correction_log, CorrectionLog()
+        selection = engine.rule_selection.get(dataset)
+        if include is not None:
+            engine.rule_selection[dataset] = {"include": include, "exclude": (selection or {}).get("exclude") or []}
+        try:
+            corrected = getattr(engine, f"correct_{dataset}")(df, *references)
+            return corrected, engine.correction_log
+        finally:
+            engine.correction_log = main_log
+            if selection is None:
+                engine.rule_selection.pop(dataset, None)
+            else:
+                engine.rule_selection[dataset] = selection
+
+    def _correct_partial(self, dataset: str, df: pd.DataFrame, references: Tuple, plan, dirty: List[int],
+                         previous_key: str) -> Tuple[Optional[pd.DataFrame], Optional[CorrectionLog]]:
+        """Executa só as regras sujas e completa com as colunas e o log da entrada anterior
+
+        O log segue a ordem do plano: as entradas de cada coluna vêm da
+        execução nova se a primeira regra que a registra (colunas escritas;
+        nas regras globais e de filtro, as lidas) foi executada, senão do cache.
+        """
+        rules = plan.rules
+        recomputed, log = self._run(dataset, df, references, [rules[position].name for position in dirty])
+        cached = self.cache.load(previous_key, "corrigido.pkl")
+        if not recomputed.index.equals(cached.index) or set(recomputed.columns) != set(cached.columns):
+            return None, None
+        cached_log = self.cache.load(previous_key, "log.pkl")
+
+        corrected = recomputed
+        clean = [position for position in range(len(rules)) if position not in dirty]
+        for column in dict.fromkeys(column for position in clean for column in rules[position].outputs):
+            corrected[column] = cached[column]
+        corrected = corrected[list(cached.columns)]
+
+        merged, taken = CorrectionLog(), set()
+        for position, rule in enumerate(rules):
+            logged = rule.outputs if rule.scope == ROW else rule.inputs
+            columns = [column for column in logged if column not in taken]
+            taken.update(columns)
+            merged.merge((log if position in dirty else cached_log).select("column", columns))
+        merged.merge(log.select("column", sorted(taken), exclude=True))
+        return corrected, merged
+
+
+def profile_directory(raw_dir: str = "data/raw", cache: Optional[ResultCache] = None,
+                      profiler: Optional[QualityProfiler] = None) -> QualityProfile:
+    """Perfil dos CSVs de raw_dir; arquivos sem alteração nem são lidos"""
+    cache = cache if cache is not None else ResultCache()
+    profiler = profiler or QualityProfiler()
+    paths = {name: os.path.join(raw_dir, f"{name}.csv") for name in READ_OPTIONS}
+    files = {name: cache.file_digest(path) for name, path in paths.items() if os.path.exists(path)}
+    key = _digest(profile_version(profiler), "arquivos", files)
+
+    meta = cache.get(key)
+    if meta is not None:
+        cache.stats["hits"] += 1
+        return QualityProfile(cache.load(key, "perfil.json")["metrics"], meta["rows"])
+
+    frames = {name: pd.read_csv(paths[name], **READ_OPTIONS[name]) for name in files}
+    profile = CachedProfiler(profiler, cache).profile(frames)
+    cache.put(key, {"perfil.json": profile.to_dict()}, {"kind": "perfil", "rows": profile.rows})
+    return profile
+
+
+def correct_directory(raw_dir: str = "data/raw", corrected_dir: str = "data/corrected",
+                      engine: Optional[DataCorrectionEngine] = None,
+                      cache: Optional[ResultCache] = None) -> Dict[str, Dict]:
+    """Corrige os CSVs de raw_dir com cache e grava a zona corrigida
+
+    Com os mesmos arquivos e as mesmas regras da execução anterior, nada é
+    lido nem corrigido: as saídas só são regravadas se o arquivo corrigido
+    em disco não for mais o gravado por ela.
+    """
+    cache = cache if cache is not None else ResultCache()
+    corrector = CachedCorrector(engine, cache)
+    raw, corrected = DatasetStorage(raw_dir), DatasetStorage(corrected_dir, suffix="_corrected")
+    files = {name: cache.file_digest(raw.path(name)) for name in READ_OPTIONS if raw.exists(name)}
+    key = _digest(ruleset_version(corrector.engine), "arquivos", files)
+
+    log_path = os.path.join(corrected_dir, "correction_log" + EXTENSIONS[corrected.format])
+    unchanged = lambda path, digest: os.path.exists(path) and cache.file_digest(path) == digest
+
+    meta = cache.get(key)
+    if meta is not None and all(entry in cache for entry in meta["entries"].values()):
+        cache.stats["hits"] += 1
+        for dataset, entry in meta["entries"].items():
+            cache.get(entry)
+            if not unchanged(corrected.path(dataset), meta["outputs"][dataset]):
+                corrected.write(dataset, cache.load(entry, "corrigido.pkl"))
+        if not unchanged(log_path, meta["log"]):
+            for entry in meta["entries"].values():
+                corrector.engine.correction_log.merge(cache.load(entry, "log.pkl"))
+            corrector.engine.save_correction_log(log_path)
+        return {dataset: {"origem": "arquivos"} for dataset in meta["entries"]}
+
+    frames = {name: raw.read(name) for name in files}
+    if "clientes" in frames:
+        corrector.correct_clientes(frames["clientes"])
+    if "produtos" in frames:
+        corrector.correct_produtos(frames["produtos"])
+    if "vendas" in frames and "clientes" in corrector.results and "produtos" in corrector.results:
+        corrector.correct_vendas(frames["vendas"], corrector.results["clientes"], corrector.results["produtos"])
+    if "logistica" in frames and "vendas" in corrector.results:
+        corrector.correct_logistica(frames["logistica"], corrector.results["vendas"])
+    corrector.save(corrected)
+
+    entries = {}
+    for dataset in corrector.results:
+        columns = list(frames[dataset].columns)
+        version = ruleset_version(corrector.engine, corrector.engine.plan(dataset, columns))
+        entries[dataset] = cache.latest(f"correcao:{dataset}:{version}:{_digest(columns)}")[0]
+    outputs = {dataset: cache.file_digest(corrected.path(dataset)) for dataset in corrector.results}
+    log = cache.file_digest(log_path) if os.path.exists(log_path) else None
+    cache.put(key, {}, {"kind": "arquivos", "entries": entries, "outputs": outputs, "log": log})
+    return corrector.stats
+
+
+if __name__ == "__main__":
+    # Uso: python src/cache_resultados.py [data/raw] [data/corrected] [data/cache]
+    raw_dir = sys.argv[1] if len(sys.argv) > 1 else "data/raw"
+    corrected_dir = sys.argv[2] if len(sys.argv) > 2 else "data/corrected"
+    cache = ResultCache(sys.argv[3] if len(sys.argv) > 3 else CACHE_DIR)
+
+    inicio = time.perf_counter()
+    perfil = profile_directory(raw_dir, cache)
+    print(f"🔬 Perfil: {len(perfil.failures())} verificações com falhas")
+    print(f"🔧 Correção: {correct_directory(raw_dir, corrected_dir, cache=cache)}")
+    print(f"🗃️ Cache: {cache.stats} | {len(cache)} entradas, {cache.size() / 1e6:.1f} MB "
+          f"| {time.perf_counter() - inicio:.2f}s")
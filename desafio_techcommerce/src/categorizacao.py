@@ -0,0 +1,135 @@
+"""
+🏷️ Categorização por Palavras-Chave - TechCommerce
+Compila o catálogo de palavras-chave em uma única expressão regular em forma
+de trie e categoriza cada nome de produto distinto uma única vez
+"""
+
+import csv
+import json
+import os
+import re
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Sequence
+
+from normalizacao import factorize_exact
+
+# Catálogo padrão: a ordem das categorias é a prioridade quando um nome tem palavras de várias
+DEFAULT_CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "Eletrônicos": ["smartphone", "celular", "tablet", "tv", "televisão", "som", "fone"],
+    "Informática": ["notebook", "computador", "mouse", "teclado", "monitor", "impressora"],
+    "Casa": ["mesa", "cadeira", "sofá", "cama", "armário", "decoração"],
+    "Moda": ["camisa", "calça", "vestido", "sapato", "tênis", "bolsa"],
+    "Esportes": ["bola", "raquete", "bicicleta", "academia", "fitness"],
+    "Livros": ["livro", "revista", "manual", "guia"],
+    "Beleza": ["perfume", "maquiagem", "creme", "shampoo"],
+    "Automotivo": ["pneu", "óleo", "bateria", "peça"],
+    "Jardim": ["planta", "vaso", "terra", "adubo"],
+    "Brinquedos": ["boneca", "carrinho", "jogo", "puzzle"]
+}
+
+
+def load_keywords(path: str) -> Dict[str, List[str]]:
+    """Lê um catálogo de palavras-chave em JSON ({categoria: [palavras]}) ou CSV (categoria,palavra_chave)
+
+    A ordem do arquivo define a prioridade das categorias; palavras ficam em
+    minúsculas (os nomes são comparados em minúsculas) e vazias são ignoradas.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            catalog = json.load(f)
+        return {category: [keyword.lower() for keyword in keywords if keyword]
+                for category, keywords in catalog.items()}
+
+    if extension != ".csv":
+        raise ValueError(f"Catálogo de palavras-chave deve ser .json ou .csv: {path}")
+
+    catalog: Dict[str, List[str]] = {}
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["palavra_chave"]:
+                catalog.setdefault(row["categoria"], []).append(row["palavra_chave"].lower())
+    return catalog
+
+
+def trie_pattern(keywords: Sequence[str]) -> str:
+    """Alternação das palavras como regex em forma de trie (prefixos comuns fatorados)
+
+    ``mesa|mouse|monitor`` vira ``m(?:esa|o(?:use|nitor))``: em cada posição
+    do texto o motor de regex percorre a trie em vez de testar cada palavra.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        optional = "" in node
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if optional else group
+
+    return build(trie)
+
+
+class KeywordCategorizer:
+    """Categorizador de nomes de produtos por palavras-chave (substring, sem diferenciar caixa)
+
+    O nome recebe a primeira categoria, na ordem do catálogo, com alguma
+    palavra-chave contida nele. A regex em trie de todas as palavras é
+    aplicada em cada posição onde há correspondência: nessa posição ela
+    devolve a palavra mais longa, e as demais palavras que casam ali são
+    prefixos dela, então cada palavra guarda a melhor categoria entre seus
+    prefixos. A busca para na categoria de maior prioridade. Cada nome
+    distinto é avaliado uma única vez.
+    """
+
+    def __init__(self, category_keywords: Dict[str, List[str]]):
+        self.categories = list(category_keywords)
+        rank: Dict[str, int] = {}
+        for position, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                rank.setdefault(keyword.lower(), position)
+
+        # Melhor categoria entre a palavra e as palavras que são prefixo dela
+        self._rank = {keyword: min(rank.get(keyword[:size], position) for size in range(1, len(keyword) + 1))
+                      for keyword, position in rank.items()}
+        self.pattern = re.compile(trie_pattern(list(rank))) if rank else None
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeywordCategorizer":
+        """Categorizador de um catálogo em JSON ou CSV (ver load_keywords)"""
+        return cls(load_keywords(path))
+
+    def __len__(self) -> int:
+        return len(self._rank)
+
+    def _category_rank(self, name: str) -> int:
+        """Posição no catálogo da categoria do nome (-1 sem correspondência)"""
+        best = -1
+        match = self.pattern.search(name)
+        while match:
+            rank = self._rank[match.group()]
+            if best < 0 or rank < best:
+                best = rank
+                if best == 0:
+                    break
+            match = self.pattern.search(name, match.start() + 1)
+        return best
+
+    def categorize(self, names: pd.Series) -> pd.Series:
+        """Categoria de cada nome (None quando nenhuma palavra-chave aparece)"""
+        codes, uniques = factorize_exact(names.str.lower())
+        ranks = np.full(len(uniques) + 1, -1, dtype=np.int64)
+        if self.pattern is not None:
+            ranks[:-1] = np.fromiter(map(self._category_rank, uniques), dtype=np.int64, count=len(uniques))
+
+        categories = np.append(np.array(self.categories, dtype=object), None)
+        return pd.Series(categories[ranks[codes]], index=names.index, dtype=object)
@@ -6,22 +6,58 @@ Implementa correções automáticas para problemas de qualidade de dados
 import pandas as pd
 import numpy as np
 import re
-from datetime import datetime, date
-from typing import Dict, List, Tuple, Optional
+from datetime import date
+from typing import Callable, Dict, List, Tuple, Optional
 import logging
-from difflib import SequenceMatcher
+
+from armazenamento import format_from_path, write_frame
+from auditoria import CorrectionLog
+from categorizacao import DEFAULT_CATEGORY_KEYWORDS, load_keywords
+from correspondencia import FuzzyMatcher
+from datas import is_date
+from metricas import CorrectionMetrics
+from quarentena import QuarantineZone
+from regras import ExecutionPlan, Stage, default_registry, register_entity_resolution
+from resolucao import EntityResolver
 
 class DataCorrectionEngine:
     """Engine para correção automática de problemas de qualidade"""
     
-    def __init__(self):
+    def __init__(self, fuzzy_matcher: Optional[FuzzyMatcher] = None):
         self.logger = self._setup_logging()
-        self.correction_log = []
+        self.correction_log = CorrectionLog()
+        
+        # Tempo, CPU, linhas e memória de cada regra, por dataset
+        self.metrics = CorrectionMetrics()
+        
+        # Regras de cada dataset (declarativas) e seleção opcional por dataset
+        self.rule_registry = default_registry()
+        self.rule_selection: Dict[str, Dict[str, Optional[List[str]]]] = {}
+        
+        # Cache de correspondências fuzzy (pode ser compartilhado entre engines)
+        self.fuzzy_matcher = fuzzy_matcher or FuzzyMatcher()
+        
+        # Chave primária de cada dataset (identifica as linhas no log de correções)
+        self.id_columns = {
+            "clientes": "id_cliente",
+            "produtos": "id_produto",
+            "vendas": "id_venda",
+            "logistica": "id_entrega"
+        }
         
         # Padrões de correção
         self.email_pattern = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
         self.phone_pattern = re.compile(r'^[1-9][1-9][0-9]{9}$')
         
+        # Domínios comuns a completar em emails (aplicados nesta ordem)
+        self.email_fixes = {
+            '@gmail': '@gmail.com',
+            '@hotmail': '@hotmail.com',
+            '@yahoo': '@yahoo.com',
+            '@outlook': '@outlook.com',
+            '.co': '.com'
+        }
+        
         # Listas de referência para correção
         self.valid_states = [
             "AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA",
@@ -37,6 +73,17 @@ class DataCorrectionEngine:
         self.valid_status_venda = ["Concluída", "Pendente", "Cancelada", "Processando"]
         self.valid_status_entrega = ["Entregue", "Em Trânsito", "Cancelada", "Aguardando"]
         
+        # Palavras-chave para categorização
+        self.category_keywords = {category: list(keywords)
+                                  for category, keywords in DEFAULT_CATEGORY_KEYWORDS.items()}
+        
+        # Resolução de entidades (opcional, ver enable_entity_resolution): id removido -> id mantido
+        self.entity_resolver = EntityResolver()
+        self.entity_merges: Dict = {}
+        
+        # Quarentena (opcional, ver enable_quarantine): recebe as linhas rejeitadas pelas regras
+        self.quarantine: Optional[QuarantineZone] = None
+        
     def _setup_logging(self) -> logging.Logger:
         """Configura logging para correções"""
         logger = logging.getLogger('DataCorrection')
@@ -53,125 +100,180 @@ class DataCorrectionEngine:
     def _log_correction(self, dataset: str, row_id: any, column: str, 
                        old_value: any, new_value: any, correction_type: str):
         """Registra correção no log"""
-        correction_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "dataset": dataset,
-            "row_id": row_id,
-            "column": column,
-            "old_value": str(old_value),
-            "new_value": str(new_value),
-            "correction_type": correction_type
-        }
-        self.correction_log.append(correction_entry)
+        self.correction_log.append(dataset, row_id, column, old_value, new_value, correction_type)
+    
+    def _log_corrections(self, dataset: str, row_ids, column, old_values, new_values,
+                         correction_type, row_counts=1):
+        """Registra em lote as correções de uma máscara (uma chamada por regra)"""
+        self.correction_log.extend(dataset, row_ids, column, old_values, new_values, correction_type,
+                                   row_counts)
         
-    def correct_clientes(self, df: pd.DataFrame) -> pd.DataFrame:
+    def correct_clientes(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """Aplica correções específicas para dataset de clientes"""
-        df_corrected = df.copy()
+        # Cópia única na entrada; com copy=False as regras alteram o próprio df
+        df_corrected = df.copy() if copy else df
+        corrections = self.correction_log.rows()
         
         self.logger.info("🔧 Iniciando correções para dataset CLIENTES")
         
-        # 1. REMOVER DUPLICATAS
-        df_corrected = self._remove_duplicates(df_corrected, "clientes", "id_cliente")
-        
-        # 2. CORRIGIR EMAILS
-        df_corrected = self._correct_emails(df_corrected, "clientes")
-        
-        # 3. CORRIGIR TELEFONES
-        df_corrected = self._correct_phones(df_corrected, "clientes")
+        df_corrected = self._run_plan("clientes", df_corrected, {})
         
-        # 4. PADRONIZAR ESTADOS
-        df_corrected = self._standardize_states(df_corrected, "clientes")
-        
-        # 5. PREENCHER CAMPOS VAZIOS
-        df_corrected = self._fill_missing_cliente_data(df_corrected)
-        
-        # 6. PADRONIZAR DATAS
-        df_corrected = self._standardize_dates(df_corrected, "clientes", 
-                                             ["data_nascimento", "data_cadastro"])
-        
-        self.logger.info(f"✅ Correções aplicadas em CLIENTES: {len(self.correction_log)} alterações")
+        self.logger.info(f"✅ Correções aplicadas em CLIENTES: "
+                         f"{self.correction_log.rows() - corrections} alterações")
         return df_corrected
     
-    def correct_produtos(self, df: pd.DataFrame) -> pd.DataFrame:
+    def correct_produtos(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """Aplica correções específicas para dataset de produtos"""
-        df_corrected = df.copy()
+        # Cópia única na entrada; com copy=False as regras alteram o próprio df
+        df_corrected = df.copy() if copy else df
+        corrections = self.correction_log.rows()
         
         self.logger.info("🔧 Iniciando correções para dataset PRODUTOS")
         
-        # 1. REMOVER DUPLICATAS
-        df_corrected = self._remove_duplicates(df_corrected, "produtos", "id_produto")
-        
-        # 2. CORRIGIR PREÇOS NEGATIVOS
-        df_corrected = self._correct_negative_prices(df_corrected)
-        
-        # 3. CATEGORIZAR PRODUTOS SEM CATEGORIA
-        df_corrected = self._auto_categorize_products(df_corrected)
-        
-        # 4. PADRONIZAR CATEGORIAS
-        df_corrected = self._standardize_categories(df_corrected)
-        
-        # 5. CORRIGIR ESTOQUE NEGATIVO
-        df_corrected = self._correct_negative_stock(df_corrected)
+        df_corrected = self._run_plan("produtos", df_corrected, {})
         
-        # 6. PADRONIZAR CAMPO ATIVO
-        df_corrected = self._standardize_boolean_field(df_corrected, "produtos", "ativo")
-        
-        self.logger.info(f"✅ Correções aplicadas em PRODUTOS: {len(self.correction_log)} alterações")
+        self.logger.info(f"✅ Correções aplicadas em PRODUTOS: "
+                         f"{self.correction_log.rows() - corrections} alterações")
         return df_corrected
     
     def correct_vendas(self, df: pd.DataFrame, df_clientes: pd.DataFrame, 
-                      df_produtos: pd.DataFrame) -> pd.DataFrame:
+                      df_produtos: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """Aplica correções específicas para dataset de vendas"""
-        df_corrected = df.copy()
+        # Cópia única na entrada; com copy=False as regras alteram o próprio df
+        df_corrected = df.copy() if copy else df
+        corrections = self.correction_log.rows()
         
         self.logger.info("🔧 Iniciando correções para dataset VENDAS")
         
-        # 1. CORRIGIR QUANTIDADES NEGATIVAS/ZERO
-        df_corrected = self._correct_invalid_quantities(df_corrected)
-        
-        # 2. CORRIGIR VALORES NEGATIVOS
-        df_corrected = self._correct_negative_values(df_corrected)
-        
-        # 3. CORRIGIR CÁLCULO VALOR_TOTAL
-        df_corrected = self._correct_total_calculation(df_corrected)
-        
-        # 4. CORRIGIR REFERÊNCIAS ÓRFÃS
-        df_corrected = self._correct_orphan_references(df_corrected, df_clientes, df_produtos)
+        df_corrected = self._run_plan("vendas", df_corrected,
+                                      {"df_clientes": df_clientes, "df_produtos": df_produtos})
         
-        # 5. CORRIGIR DATAS FUTURAS
-        df_corrected = self._correct_future_dates(df_corrected, "vendas", "data_venda")
-        
-        # 6. PADRONIZAR STATUS
-        df_corrected = self._standardize_status(df_corrected, "vendas", "status", self.valid_status_venda)
-        
-        self.logger.info(f"✅ Correções aplicadas em VENDAS: {len(self.correction_log)} alterações")
+        self.logger.info(f"✅ Correções aplicadas em VENDAS: "
+                         f"{self.correction_log.rows() - corrections} alterações")
         return df_corrected
     
-    def correct_logistica(self, df: pd.DataFrame, df_vendas: pd.DataFrame) -> pd.DataFrame:
+    def correct_logistica(self, df: pd.DataFrame, df_vendas: pd.DataFrame,
+                          copy: bool = True) -> pd.DataFrame:
         """Aplica correções específicas para dataset de logística"""
-        df_corrected = df.copy()
+        # Cópia única na entrada; com copy=False as regras alteram o próprio df
+        df_corrected = df.copy() if copy else df
+        corrections = self.correction_log.rows()
         
         self.logger.info("🔧 Iniciando correções para dataset LOGÍSTICA")
         
-        # 1. PREENCHER TRANSPORTADORAS VAZIAS
-        df_corrected = self._fill_missing_transportadora(df_corrected)
-        
-        # 2. CORRIGIR REFERÊNCIAS ÓRFÃS PARA VENDAS
-        df_corrected = self._correct_logistica_orphan_references(df_corrected, df_vendas)
+        df_corrected = self._run_plan("logistica", df_corrected, {"df_vendas": df_vendas})
         
-        # 3. CORRIGIR INCONSISTÊNCIAS DE DATAS
-        df_corrected = self._correct_date_inconsistencies(df_corrected)
-        
-        # 4. PADRONIZAR STATUS DE ENTREGA
-        df_corrected = self._standardize_status(df_corrected, "logistica", "status_entrega", 
-                                              self.valid_status_entrega)
-        
-        # 5. PREENCHER DATAS DE ENVIO AUSENTES
-        df_corrected = self._fill_missing_shipping_dates(df_corrected, df_vendas)
-        
-        self.logger.info(f"✅ Correções aplicadas em LOGÍSTICA: {len(self.correction_log)} alterações")
+        self.logger.info(f"✅ Correções aplicadas em LOGÍSTICA: "
+                         f"{self.correction_log.rows() - corrections} alterações")
         return df_corrected
     
+    def load_category_keywords(self, path: str):
+        """Substitui o catálogo de palavras-chave da categorização por um arquivo JSON ou CSV"""
+        self.category_keywords = load_keywords(path)
+        self.logger.info(f"Catálogo de categorias carregado de {path}: "
+                         f"{sum(map(len, self.category_keywords.values()))} palavras-chave")
+    
+    def enable_entity_resolution(self, resolver: Optional[EntityResolver] = None):
+        """Ativa a fusão de clientes duplicados com ids diferentes e o remapeamento das suas vendas"""
+        if resolver is not None:
+            self.entity_resolver = resolver
+        register_entity_resolution(self.rule_registry)
+    
+    def enable_quarantine(self, zone: Optional[QuarantineZone] = None) -> QuarantineZone:
+        """Envia à quarentena as linhas rejeitadas pelas regras (grave-as com zone.flush())"""
+        self.quarantine = zone if zone is not None else QuarantineZone()
+        return self.quarantine
+    
+    def select_rules(self, dataset: str, include: Optional[List[str]] = None,
+                     exclude: Optional[List[str]] = None):
+        """Restringe as regras do dataset (include=None roda todas; exclude remove regras)"""
+        self.rule_registry.validate(dataset, list(include or []) + list(exclude or []))
+        self.rule_selection[dataset] = {"include": include, "exclude": list(exclude or [])}
+    
+    def plan(self, dataset: str, columns) -> ExecutionPlan:
+        """Plano de execução do dataset para as colunas dadas, respeitando a seleção de regras"""
+        selection = self.rule_selection.get(dataset, {})
+        return self.rule_registry.plan(dataset, columns, selection.get("include"),
+                                       selection.get("exclude") or [])
+    
+    def required_columns(self, dataset: str, columns) -> List[str]:
+        """Colunas dadas que as regras planejadas leem ou escrevem, mais a chave primária"""
+        needed = self.plan(dataset, columns).columns | {self._id_column(dataset)}
+        return [column for column in columns if column in needed]
+    
+    def _run_plan(self, dataset: str, df: pd.DataFrame, references: Dict) -> pd.DataFrame:
+        """Monta o plano do dataset e executa seus estágios em ordem"""
+        df = self._prepare_frame(df)
+        plan = self.plan(dataset, df.columns)
+        for rule, reason in plan.skipped:
+            self.logger.debug(f"Regra {rule.name} ignorada em {dataset}: {reason}")
+        
+        for stage in plan.stages:
+            df = self._run_stage(dataset, stage, df, references)
+        return df
+    
+    def _prepare_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Converte tipos compactos (categorias, inteiros anuláveis, string) para os tipos padrão
+        
+        As regras linha a linha escrevem célula a célula (valores fora das
+        categorias) e comparam escalares (pd.NA não tem valor booleano).
+        """
+        dtypes = {}
+        for column, dtype in df.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtypes[column] = object
+            elif isinstance(dtype, pd.StringDtype) and dtype.na_value is pd.NA:
+                dtypes[column] = object
+            elif pd.api.types.is_extension_array_dtype(dtype) and pd.api.types.is_integer_dtype(dtype):
+                dtypes[column] = 'float64' if df[column].hasnans else 'int64'
+        if not dtypes:
+            return df
+        
+        df = df.astype(dtypes)
+        for column, dtype in dtypes.items():
+            if dtype is object:
+                df[column] = df[column].where(df[column].notna(), np.nan)
+        return df
+    
+    def _run_stage(self, dataset: str, stage: Stage, df: pd.DataFrame, references: Dict) -> pd.DataFrame:
+        """Executa as regras de um estágio em sequência, cada uma com suas métricas"""
+        for rule in stage.rules:
+            df = self._apply_rule(dataset, getattr(self, rule.method), df, *rule.resolve(self, references))
+        return df
+    
+    def _apply_rule(self, dataset: str, rule: Callable[..., pd.DataFrame], df: pd.DataFrame,
+                    *args) -> pd.DataFrame:
+        """Executa uma regra registrando suas métricas (tempo, CPU, linhas e memória)"""
+        with self.metrics.measure(dataset, rule.__name__.lstrip('_'), len(df)) as measurement:
+            corrections = self._corrections_logged()
+            df_result = rule(df, *args)
+            measurement.rows_changed = self._corrections_logged() - corrections
+            measurement.rows_removed = len(df) - len(df_result)
+        return df_result
+    
+    def _quarantine_rows(self, dataset: str, df: pd.DataFrame, positions, reason: str, columns):
+        """Envia em lote à quarentena as linhas rejeitadas por uma regra (posições em df)"""
+        if self.quarantine is not None and len(positions):
+            self.quarantine.route(dataset, df, positions, reason, columns)
+    
+    def _flag_invalid(self, dataset: str, df: pd.DataFrame, positions, column: str, reason: str):
+        """Sinaliza os valores que continuam fora do padrão após a correção (posições em df)
+
+        Os valores ficam na saída como corrigidos; o total vai para o log
+        da execução e as linhas, para a quarentena, se ativa.
+        """
+        if len(positions):
+            self.logger.warning(f"{len(positions)} valores inválidos em {dataset}.{column} após a correção")
+            self._quarantine_rows(dataset, df, positions, reason, column)
+    
+    def _id_column(self, dataset: str) -> str:
+        """Coluna de chave primária do dataset"""
+        return self.id_columns.get(dataset, f'id_{dataset.rstrip("s")}')
+    
+    def _corrections_logged(self) -> int:
+        """Número de linhas corrigidas registradas até agora"""
+        return self.correction_log.rows()
+    
     def _remove_duplicates(self, df: pd.DataFrame, dataset: str, id_column: str) -> pd.DataFrame:
         """Remove duplicatas mantendo o primeiro registro"""
         initial_count = len(df)
@@ -184,8 +286,7 @@ class DataCorrectionEngine:
         df_clean = df.drop_duplicates(subset=[id_column], keep='first')
         
         # Log das correções
-        for dup_id in duplicate_ids:
-            self._log_correction(dataset, dup_id, id_column, "duplicated", "removed", "DEDUPLICATION")
+        self._log_corrections(dataset, duplicate_ids, id_column, "duplicated", "removed", "DEDUPLICATION")
         
         removed_count = initial_count - len(df_clean)
         if removed_count > 0:
@@ -193,14 +294,29 @@ class DataCorrectionEngine:
         
         return df_clean
     
+    def _resolve_entities(self, df: pd.DataFrame, dataset: str, id_column: str) -> pd.DataFrame:
+        """Funde registros da mesma pessoa com ids diferentes, mantendo o primeiro de cada grupo"""
+        survivors = self.entity_resolver.resolve(df)
+        merged = np.flatnonzero(survivors != np.arange(len(df)))
+        
+        for position in merged:
+            removed_id = df[id_column].iloc[position]
+            survivor_id = df[id_column].iloc[survivors[position]]
+            self._log_correction(dataset, removed_id, id_column, removed_id, survivor_id, "DEDUPLICATION")
+            self.entity_merges[removed_id] = survivor_id
+        
+        if len(merged) > 0:
+            self.logger.info(f"Fundidos {len(merged)} registros duplicados com ids diferentes em {dataset}")
+        
+        return df.iloc[np.flatnonzero(survivors == np.arange(len(df)))]
+    
     def _correct_emails(self, df: pd.DataFrame, dataset: str) -> pd.DataFrame:
         """Corrige emails inválidos"""
         if 'email' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        invalid = []
+        for position, (idx, row) in enumerate(df.iterrows()):
             email = str(row['email'])
             
             if pd.isna(row['email']) or email == 'nan':
@@ -208,13 +324,16 @@ class DataCorrectionEngine:
                 
             # Tentar corrigir emails comuns
             corrected_email = self._fix_common_email_errors(email)
+            if not self.email_pattern.match(corrected_email):
+                invalid.append(position)
             
             if corrected_email != email:
-                df_corrected.at[idx, 'email'] = corrected_email
+                df.at[idx, 'email'] = corrected_email
                 self._log_correction(dataset, row.get('id_cliente', idx), 'email', 
                                    email, corrected_email, "EMAIL_CORRECTION")
         
-        return df_corrected
+        self._flag_invalid(dataset, df, invalid, 'email', "INVALID_EMAIL")
+        return df
     
     def _fix_common_email_errors(self, email: str) -> str:
         """Corrige erros comuns em emails"""
@@ -225,15 +344,7 @@ class DataCorrectionEngine:
         email = email.strip()
         
         # Corrigir domínios comuns
-        common_fixes = {
-            '@gmail': '@gmail.com',
-            '@hotmail': '@hotmail.com',
-            '@yahoo': '@yahoo.com',
-            '@outlook': '@outlook.com',
-            '.co': '.com'
-        }
-        
-        for wrong, correct in common_fixes.items():
+        for wrong, correct in self.email_fixes.items():
             if wrong in email and correct not in email:
                 email = email.replace(wrong, correct)
         
@@ -248,9 +359,8 @@ class DataCorrectionEngine:
         if 'telefone' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        invalid = []
+        for position, (idx, row) in enumerate(df.iterrows()):
             phone = str(row['telefone'])
             
             if pd.isna(row['telefone']) or phone == 'nan':
@@ -261,13 +371,16 @@ class DataCorrectionEngine:
             
             # Tentar corrigir formato
             corrected_phone = self._fix_phone_format(clean_phone)
+            if not self.phone_pattern.match(corrected_phone):
+                invalid.append(position)
             
             if corrected_phone != phone:
-                df_corrected.at[idx, 'telefone'] = corrected_phone
+                df.at[idx, 'telefone'] = corrected_phone
                 self._log_correction(dataset, row.get('id_cliente', idx), 'telefone', 
                                    phone, corrected_phone, "PHONE_CORRECTION")
         
-        return df_corrected
+        self._flag_invalid(dataset, df, invalid, 'telefone', "INVALID_PHONE")
+        return df
     
     def _fix_phone_format(self, phone: str) -> str:
         """Corrige formato de telefone"""
@@ -289,9 +402,7 @@ class DataCorrectionEngine:
         if 'estado' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             state = str(row['estado']).upper().strip()
             
             if state in self.valid_states:
@@ -301,156 +412,149 @@ class DataCorrectionEngine:
             best_match = self._find_best_match(state, self.valid_states)
             
             if best_match and best_match != state:
-                df_corrected.at[idx, 'estado'] = best_match
+                df.at[idx, 'estado'] = best_match
                 self._log_correction(dataset, row.get('id_cliente', idx), 'estado', 
                                    state, best_match, "STATE_STANDARDIZATION")
         
-        return df_corrected
+        return df
     
     def _fill_missing_cliente_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Preenche dados ausentes de clientes usando regras de negócio"""
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             # Preencher nome vazio com base no email
             if pd.isna(row['nome']) or str(row['nome']).strip() == '':
                 if pd.notna(row['email']):
                     name_from_email = str(row['email']).split('@')[0].replace('.', ' ').title()
-                    df_corrected.at[idx, 'nome'] = name_from_email
+                    df.at[idx, 'nome'] = name_from_email
                     self._log_correction("clientes", row.get('id_cliente', idx), 'nome', 
                                        'NULL', name_from_email, "NAME_INFERENCE")
         
-        return df_corrected
+        return df
     
     def _correct_negative_prices(self, df: pd.DataFrame) -> pd.DataFrame:
         """Corrige preços negativos"""
         if 'preco' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             if row['preco'] < 0:
                 # Converter para positivo
                 corrected_price = abs(row['preco'])
-                df_corrected.at[idx, 'preco'] = corrected_price
+                df.at[idx, 'preco'] = corrected_price
                 self._log_correction("produtos", row.get('id_produto', idx), 'preco', 
                                    row['preco'], corrected_price, "NEGATIVE_TO_POSITIVE")
         
-        return df_corrected
+        return df
     
     def _auto_categorize_products(self, df: pd.DataFrame) -> pd.DataFrame:
         """Categoriza automaticamente produtos sem categoria"""
         if 'categoria' not in df.columns or 'nome_produto' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        # Palavras-chave para categorização
-        category_keywords = {
-            "Eletrônicos": ["smartphone", "celular", "tablet", "tv", "televisão", "som", "fone"],
-            "Informática": ["notebook", "computador", "mouse", "teclado", "monitor", "impressora"],
-            "Casa": ["mesa", "cadeira", "sofá", "cama", "armário", "decoração"],
-            "Moda": ["camisa", "calça", "vestido", "sapato", "tênis", "bolsa"],
-            "Esportes": ["bola", "raquete", "bicicleta", "academia", "fitness"],
-            "Livros": ["livro", "revista", "manual", "guia"],
-            "Beleza": ["perfume", "maquiagem", "creme", "shampoo"],
-            "Automotivo": ["pneu", "óleo", "bateria", "peça"],
-            "Jardim": ["planta", "vaso", "terra", "adubo"],
-            "Brinquedos": ["boneca", "carrinho", "jogo", "puzzle"]
-        }
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             if pd.isna(row['categoria']) or str(row['categoria']).strip() == '':
                 product_name = str(row['nome_produto']).lower()
                 
                 # Buscar categoria baseada em palavras-chave
-                for category, keywords in category_keywords.items():
+                for category, keywords in self.category_keywords.items():
                     if any(keyword in product_name for keyword in keywords):
-                        df_corrected.at[idx, 'categoria'] = category
+                        df.at[idx, 'categoria'] = category
                         self._log_correction("produtos", row.get('id_produto', idx), 'categoria', 
                                            'NULL', category, "AUTO_CATEGORIZATION")
                         break
                 else:
                     # Se não encontrou, usar categoria padrão
-                    df_corrected.at[idx, 'categoria'] = "Outros"
+                    df.at[idx, 'categoria'] = "Outros"
                     self._log_correction("produtos", row.get('id_produto', idx), 'categoria', 
                                        'NULL', "Outros", "DEFAULT_CATEGORIZATION")
         
-        return df_corrected
+        return df
     
     def _correct_invalid_quantities(self, df: pd.DataFrame) -> pd.DataFrame:
         """Corrige quantidades inválidas (negativas ou zero)"""
         if 'quantidade' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             if row['quantidade'] <= 0:
                 # Definir quantidade padrão como 1
-                df_corrected.at[idx, 'quantidade'] = 1
+                df.at[idx, 'quantidade'] = 1
                 self._log_correction("vendas", row.get('id_venda', idx), 'quantidade', 
                                    row['quantidade'], 1, "INVALID_QUANTITY_CORRECTION")
         
-        return df_corrected
+        return df
     
     def _correct_total_calculation(self, df: pd.DataFrame) -> pd.DataFrame:
         """Corrige cálculo do valor total"""
         if not all(col in df.columns for col in ['quantidade', 'valor_unitario', 'valor_total']):
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             expected_total = row['quantidade'] * row['valor_unitario']
             
             if abs(row['valor_total'] - expected_total) > 0.01:  # Tolerância de 1 centavo
-                df_corrected.at[idx, 'valor_total'] = expected_total
+                df.at[idx, 'valor_total'] = expected_total
                 self._log_correction("vendas", row.get('id_venda', idx), 'valor_total', 
                                    row['valor_total'], expected_total, "CALCULATION_CORRECTION")
         
-        return df_corrected
+        return df
+    
+    def _remap_merged_clientes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aponta as vendas de clientes fundidos para o cliente mantido"""
+        for idx, row in df.iterrows():
+            if row['id_cliente'] in self.entity_merges:
+                survivor_id = self.entity_merges[row['id_cliente']]
+                df.at[idx, 'id_cliente'] = survivor_id
+                self._log_correction("vendas", row.get('id_venda', idx), 'id_cliente',
+                                   row['id_cliente'], survivor_id, "MERGED_REFERENCE_REMAP")
+        
+        return df
     
     def _correct_orphan_references(self, df_vendas: pd.DataFrame, 
                                  df_clientes: pd.DataFrame, df_produtos: pd.DataFrame) -> pd.DataFrame:
         """Corrige referências órfãs removendo registros inválidos"""
-        df_corrected = df_vendas.copy()
-        
         valid_clientes = set(df_clientes['id_cliente'].unique())
         valid_produtos = set(df_produtos['id_produto'].unique())
         
-        # Marcar registros para remoção
+        # Marcar registros para remoção (uma vez por venda, mesmo com as duas referências órfãs)
         to_remove = []
+        rejected, rejected_columns = [], []
         
-        for idx, row in df_corrected.iterrows():
+        for position, (idx, row) in enumerate(df_vendas.iterrows()):
+            orphan_columns = []
+            
             if row['id_cliente'] not in valid_clientes:
-                to_remove.append(idx)
+                orphan_columns.append('id_cliente')
                 self._log_correction("vendas", row.get('id_venda', idx), 'id_cliente', 
                                    row['id_cliente'], 'REMOVED', "ORPHAN_REFERENCE_REMOVAL")
             
             if row['id_produto'] not in valid_produtos:
-                to_remove.append(idx)
+                orphan_columns.append('id_produto')
                 self._log_correction("vendas", row.get('id_venda', idx), 'id_produto', 
                                    row['id_produto'], 'REMOVED', "ORPHAN_REFERENCE_REMOVAL")
+            
+            if orphan_columns:
+                to_remove.append(idx)
+                rejected.append(position)
+                rejected_columns.append(','.join(orphan_columns))
         
-        # Remover registros com referências órfãs
-        df_corrected = df_corrected.drop(to_remove)
+        # Remover registros com referências órfãs (enviados à quarentena, se ativa)
+        self._quarantine_rows("vendas", df_vendas, rejected, "ORPHAN_REFERENCE", rejected_columns)
+        df_vendas = df_vendas.drop(to_remove)
         
         if to_remove:
             self.logger.info(f"Removidos {len(to_remove)} registros com referências órfãs")
         
-        return df_corrected
+        return df_vendas
     
     def _standardize_dates(self, df: pd.DataFrame, dataset: str, date_columns: List[str]) -> pd.DataFrame:
         """Padroniza formato de datas"""
-        df_corrected = df.copy()
-        
         for col in date_columns:
             if col not in df.columns:
                 continue
             
-            for idx, row in df_corrected.iterrows():
+            unparseable = []
+            for position, (idx, row) in enumerate(df.iterrows()):
                 if pd.notna(row[col]):
                     try:
                         # Tentar converter para datetime e depois para string padronizada
@@ -458,39 +562,28 @@ class DataCorrectionEngine:
                         standardized_date = date_obj.strftime('%Y-%m-%d')
                         
                         if str(row[col]) != standardized_date:
-                            df_corrected.at[idx, col] = standardized_date
-                            self._log_correction(dataset, row.get(f'id_{dataset.rstrip("s")}', idx), 
+                            df.at[idx, col] = standardized_date
+                            self._log_correction(dataset, row.get(self._id_column(dataset), idx), 
                                                col, row[col], standardized_date, "DATE_STANDARDIZATION")
-                    except:
-                        # Se não conseguir converter, manter original
-                        pass
+                    except (ValueError, TypeError):
+                        # Se não conseguir converter, manter original (e enviar a linha à quarentena)
+                        if not is_date(row[col]):
+                            unparseable.append(position)
+            
+            self._quarantine_rows(dataset, df, unparseable, "UNPARSEABLE_DATE", col)
         
-        return df_corrected
+        return df
     
     def _find_best_match(self, target: str, options: List[str], threshold: float = 0.6) -> Optional[str]:
-        """Encontra a melhor correspondência em uma lista de opções"""
-        if not target or not options:
-            return None
-        
-        best_match = None
-        best_ratio = 0
-        
-        for option in options:
-            ratio = SequenceMatcher(None, target.upper(), option.upper()).ratio()
-            if ratio > best_ratio and ratio >= threshold:
-                best_ratio = ratio
-                best_match = option
-        
-        return best_match
+        """Encontra a melhor correspondência em uma lista de opções (memoizada)"""
+        return self.fuzzy_matcher.match(target, options, threshold)
     
     def _standardize_categories(self, df: pd.DataFrame) -> pd.DataFrame:
         """Padroniza categorias usando correspondência fuzzy"""
         if 'categoria' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             if pd.notna(row['categoria']):
                 category = str(row['categoria']).strip()
                 
@@ -498,36 +591,32 @@ class DataCorrectionEngine:
                     best_match = self._find_best_match(category, self.valid_categories)
                     
                     if best_match:
-                        df_corrected.at[idx, 'categoria'] = best_match
+                        df.at[idx, 'categoria'] = best_match
                         self._log_correction("produtos", row.get('id_produto', idx), 'categoria', 
                                            category, best_match, "CATEGORY_STANDARDIZATION")
         
-        return df_corrected
+        return df
     
     def _correct_negative_stock(self, df: pd.DataFrame) -> pd.DataFrame:
         """Corrige estoque negativo"""
         if 'estoque' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             if row['estoque'] < 0:
                 # Definir estoque como 0
-                df_corrected.at[idx, 'estoque'] = 0
+                df.at[idx, 'estoque'] = 0
                 self._log_correction("produtos", row.get('id_produto', idx), 'estoque', 
                                    row['estoque'], 0, "NEGATIVE_STOCK_CORRECTION")
         
-        return df_corrected
+        return df
     
     def _standardize_boolean_field(self, df: pd.DataFrame, dataset: str, column: str) -> pd.DataFrame:
         """Padroniza campos booleanos"""
         if column not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             value = str(row[column]).lower().strip()
             
             if value in ['true', '1', 'sim', 'yes', 'ativo']:
@@ -538,38 +627,36 @@ class DataCorrectionEngine:
                 continue  # Manter valor original se não conseguir interpretar
             
             if row[column] != standardized:
-                df_corrected.at[idx, column] = standardized
-                self._log_correction(dataset, row.get(f'id_{dataset.rstrip("s")}', idx), 
+                df.at[idx, column] = standardized
+                self._log_correction(dataset, row.get(self._id_column(dataset), idx), 
                                    column, row[column], standardized, "BOOLEAN_STANDARDIZATION")
         
-        return df_corrected
+        return df
     
     def _correct_negative_values(self, df: pd.DataFrame) -> pd.DataFrame:
         """Corrige valores negativos em vendas"""
         if 'valor_total' not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             if row['valor_total'] < 0:
                 # Converter para positivo
                 corrected_value = abs(row['valor_total'])
-                df_corrected.at[idx, 'valor_total'] = corrected_value
+                df.at[idx, 'valor_total'] = corrected_value
                 self._log_correction("vendas", row.get('id_venda', idx), 'valor_total', 
                                    row['valor_total'], corrected_value, "NEGATIVE_VALUE_CORRECTION")
         
-        return df_corrected
+        return df
     
     def _correct_future_dates(self, df: pd.DataFrame, dataset: str, date_column: str) -> pd.DataFrame:
         """Corrige datas futuras"""
         if date_column not in df.columns:
             return df
         
-        df_corrected = df.copy()
         today = date.today()
+        unparseable = []
         
-        for idx, row in df_corrected.iterrows():
+        for position, (idx, row) in enumerate(df.iterrows()):
             if pd.notna(row[date_column]):
                 try:
                     date_value = pd.to_datetime(row[date_column]).date()
@@ -577,14 +664,16 @@ class DataCorrectionEngine:
                     if date_value > today:
                         # Definir como hoje
                         corrected_date = today.strftime('%Y-%m-%d')
-                        df_corrected.at[idx, date_column] = corrected_date
-                        self._log_correction(dataset, row.get(f'id_{dataset.rstrip("s")}', idx), 
+                        df.at[idx, date_column] = corrected_date
+                        self._log_correction(dataset, row.get(self._id_column(dataset), idx), 
                                            date_column, row[date_column], corrected_date, 
                                            "FUTURE_DATE_CORRECTION")
-                except:
-                    pass
+                except (ValueError, TypeError):
+                    if not is_date(row[date_column]):
+                        unparseable.append(position)
         
-        return df_corrected
+        self._quarantine_rows(dataset, df, unparseable, "UNPARSEABLE_DATE", date_column)
+        return df
     
     def _standardize_status(self, df: pd.DataFrame, dataset: str, 
                           status_column: str, valid_statuses: List[str]) -> pd.DataFrame:
@@ -592,9 +681,7 @@ class DataCorrectionEngine:
         if status_column not in df.columns:
             return df
         
-        df_corrected = df.copy()
-        
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             if pd.notna(row[status_column]):
                 status = str(row[status_column]).strip()
                 
@@ -602,73 +689,82 @@ class DataCorrectionEngine:
                     best_match = self._find_best_match(status, valid_statuses)
                     
                     if best_match:
-                        df_corrected.at[idx, status_column] = best_match
-                        self._log_correction(dataset, row.get(f'id_{dataset.rstrip("s")}', idx), 
+                        df.at[idx, status_column] = best_match
+                        self._log_correction(dataset, row.get(self._id_column(dataset), idx), 
                                            status_column, status, best_match, "STATUS_STANDARDIZATION")
         
-        return df_corrected
+        return df
     
     def _fill_missing_transportadora(self, df: pd.DataFrame) -> pd.DataFrame:
         """Preenche transportadoras ausentes"""
         if 'transportadora' not in df.columns:
             return df
         
-        df_corrected = df.copy()
         default_transportadora = "Correios"  # Transportadora padrão
         
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df.iterrows():
             if pd.isna(row['transportadora']) or str(row['transportadora']).strip() == '':
-                df_corrected.at[idx, 'transportadora'] = default_transportadora
+                df.at[idx, 'transportadora'] = default_transportadora
                 self._log_correction("logistica", row.get('id_entrega', idx), 'transportadora', 
                                    'NULL', default_transportadora, "DEFAULT_TRANSPORTADORA")
         
-        return df_corrected
+        return df
     
     def _correct_logistica_orphan_references(self, df_logistica: pd.DataFrame, 
                                            df_vendas: pd.DataFrame) -> pd.DataFrame:
         """Corrige referências órfãs na logística"""
-        df_corrected = df_logistica.copy()
         valid_vendas = set(df_vendas['id_venda'].unique())
         
         to_remove = []
+        rejected = []
         
-        for idx, row in df_corrected.iterrows():
+        for position, (idx, row) in enumerate(df_logistica.iterrows()):
             if row['id_venda'] not in valid_vendas:
                 to_remove.append(idx)
+                rejected.append(position)
                 self._log_correction("logistica", row.get('id_entrega', idx), 'id_venda', 
                                    row['id_venda'], 'REMOVED', "ORPHAN_REFERENCE_REMOVAL")
         
-        df_corrected = df_corrected.drop(to_remove)
+        self._quarantine_rows("logistica", df_logistica, rejected, "ORPHAN_REFERENCE", 'id_venda')
+        df_logistica = df_logistica.drop(to_remove)
         
         if to_remove:
             self.logger.info(f"Removidos {len(to_remove)} registros de logística com referências órfãs")
         
-        return df_corrected
+        return df_logistica
     
     def _correct_date_inconsistencies(self, df: pd.DataFrame) -> pd.DataFrame:
         """Corrige inconsistências entre datas de envio e entrega"""
         if not all(col in df.columns for col in ['data_envio', 'data_entrega_real']):
             return df
         
-        df_corrected = df.copy()
+        date_columns = ['data_envio', 'data_entrega_real']
+        rejected, rejected_columns = [], []
         
-        for idx, row in df_corrected.iterrows():
+        for position, (idx, row) in enumerate(df.iterrows()):
             if pd.notna(row['data_envio']) and pd.notna(row['data_entrega_real']):
                 try:
                     data_envio = pd.to_datetime(row['data_envio'])
                     data_entrega = pd.to_datetime(row['data_entrega_real'])
+                    if pd.isna(data_envio) or pd.isna(data_entrega):
+                        raise ValueError("data não reconhecida")
                     
                     if data_entrega < data_envio:
                         # Corrigir data de entrega para ser igual à data de envio
                         corrected_date = data_envio.strftime('%Y-%m-%d')
-                        df_corrected.at[idx, 'data_entrega_real'] = corrected_date
+                        df.at[idx, 'data_entrega_real'] = corrected_date
                         self._log_correction("logistica", row.get('id_entrega', idx), 
                                            'data_entrega_real', row['data_entrega_real'], 
                                            corrected_date, "DATE_CONSISTENCY_CORRECTION")
-                except:
-                    pass
+                except (ValueError, TypeError):
+                    # Sem comparação possível: datas não reconhecidas vão para a quarentena
+                    unparseable = [col for col in date_columns if not is_date(row[col])]
+                    if unparseable:
+                        rejected.append(position)
+                        rejected_columns.append(','.join(unparseable))
         
-        return df_corrected
+        self._quarantine_rows("logistica", df, rejected, "UNPARSEABLE_DATE", rejected_columns)
+        return df
     
     def _fill_missing_shipping_dates(self, df_logistica: pd.DataFrame, 
                                    df_vendas: pd.DataFrame) -> pd.DataFrame:
@@ -676,12 +772,10 @@ class DataCorrectionEngine:
         if 'data_envio' not in df_logistica.columns:
             return df_logistica
         
-        df_corrected = df_logistica.copy()
-        
         # Criar mapeamento de venda para data
         venda_to_date = dict(zip(df_vendas['id_venda'], df_vendas['data_venda']))
         
-        for idx, row in df_corrected.iterrows():
+        for idx, row in df_logistica.iterrows():
             if pd.isna(row['data_envio']) or str(row['data_envio']).strip() == '':
                 if row['id_venda'] in venda_to_date:
                     try:
@@ -689,36 +783,51 @@ class DataCorrectionEngine:
                         venda_date = pd.to_datetime(venda_to_date[row['id_venda']])
                         envio_date = (venda_date + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
                         
-                        df_corrected.at[idx, 'data_envio'] = envio_date
+                        df_logistica.at[idx, 'data_envio'] = envio_date
                         self._log_correction("logistica", row.get('id_entrega', idx), 
                                            'data_envio', 'NULL', envio_date, 
                                            "SHIPPING_DATE_INFERENCE")
-                    except:
+                    except (ValueError, TypeError):
                         pass
         
-        return df_corrected
+        return df_logistica
     
     def get_correction_summary(self) -> Dict:
         """Retorna resumo das correções aplicadas"""
         if not self.correction_log:
             return {"total_corrections": 0, "by_type": {}, "by_dataset": {}}
         
-        df_log = pd.DataFrame(self.correction_log)
-        
+        # Contagens calculadas direto dos códigos categóricos do log colunar
         summary = {
-            "total_corrections": len(self.correction_log),
-            "by_type": df_log['correction_type'].value_counts().to_dict(),
-            "by_dataset": df_log['dataset'].value_counts().to_dict(),
-            "by_column": df_log.groupby(['dataset', 'column']).size().to_dict()
+            "total_corrections": self.correction_log.rows(),
+            "by_type": self.correction_log.counts('correction_type'),
+            "by_dataset": self.correction_log.counts('dataset'),
+            "by_column": self.correction_log.counts_by(['dataset', 'column'])
         }
         
         return summary
     
+    def get_rule_metrics(self) -> List[Dict]:
+        """Retorna as métricas de cada regra por dataset (tempo, CPU, linhas e memória)"""
+        return self.metrics.to_records()
+    
+    def save_rule_metrics(self, output_path: str, format: str = "jsonl"):
+        """Salva as métricas das regras em JSON lines ou no formato texto do Prometheus"""
+        if self.metrics:
+            self.metrics.save(output_path, format)
+            self.logger.info(f"Métricas das regras salvas em: {output_path}")
+    
     def save_correction_log(self, output_path: str):
-        """Salva log de correções em arquivo"""
+        """Salva log de correções em arquivo (CSV, ou Parquet/Arrow pela extensão)"""
         if self.correction_log:
-            df_log = pd.DataFrame(self.correction_log)
-            df_log.to_csv(output_path, index=False)
+            if format_from_path(output_path, default="csv") == "csv":
+                self.correction_log.to_csv(output_path)
+            else:
+                log = self.correction_log.to_frame()
+                if log["row_id"].dtype == object:
+                    # Ids de tipos diferentes não cabem em uma coluna tipada
+                    log["row_id"] = log["row_id"].astype(str)
+                write_frame(log, output_path)
             self.logger.info(f"Log de correções salvo em: {output_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,611 @@
+"""
+⚡ Correção Vetorizada - TechCommerce
+Reimplementa as regras do DataCorrectionEngine com máscaras booleanas e
+operações de coluna inteira, sem iterrows() nem escrita célula a célula
+"""
+
+import pandas as pd
+import numpy as np
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from categorizacao import KeywordCategorizer
+from correcao_automatica import DataCorrectionEngine
+from correspondencia import FuzzyMatcher
+from datas import DateParser, ParsedDates
+from integridade import ReferentialIntegrity
+from normalizacao import ContactNormalizer, factorize_exact
+
+# Tudo o que não é dígito, removido dos telefones antes de _fix_phone_format
+NON_DIGITS = re.compile(r'[^\d]')
+
+
+class VectorizedCorrectionEngine(DataCorrectionEngine):
+    """Engine de correção vetorizada (mesma saída e mesmo log do modo linha a linha)
+
+    Cada regra calcula uma máscara booleana sobre a coluna e aplica a correção
+    de uma vez nas posições selecionadas, alterando apenas a coluna que corrige.
+    Os pipelines correct_* são herdados sem alteração, portanto a ordem das
+    regras e do log é preservada. Datas são convertidas pelo DateParser, que
+    converte cada valor distinto uma única vez e é compartilhado entre as regras.
+    Estados, status e categorias também são avaliados por valor distinto; com
+    ``log_by_value`` essas regras registram uma entrada por valor corrigido
+    (com row_count) em vez de uma por linha.
+    """
+
+    def __init__(self, fuzzy_matcher: Optional[FuzzyMatcher] = None, log_by_value: bool = False):
+        super().__init__(fuzzy_matcher)
+        self.log_by_value = log_by_value
+        self._keyword_categorizer: Optional[KeywordCategorizer] = None
+        self._categorizer_keywords: Optional[Dict[str, List[str]]] = None
+        self.date_parser = DateParser()
+        self.referential_integrity = ReferentialIntegrity()
+        self.contact_normalizer = ContactNormalizer(
+            self._fix_common_email_errors, lambda phone: self._fix_phone_format(NON_DIGITS.sub('', phone)),
+            self.email_pattern, self.phone_pattern)
+
+    def _prepare_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Mantém os tipos compactos: as regras vetorizadas tratam categorias e inteiros anuláveis"""
+        return df
+
+    def _as_text(self, series: pd.Series) -> pd.Series:
+        """Equivalente vetorizado de str(valor) para cada célula da coluna"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Texto de cada categoria espalhado pelos códigos (-1, ausente, vira 'nan')
+            categories = self._as_text(pd.Series(series.cat.categories)).to_numpy()
+            text = np.append(categories, str(np.nan))[series.cat.codes.to_numpy()]
+            return pd.Series(text, index=series.index, dtype=object)
+
+        text = series.astype(str).astype(object)
+        missing = series.isna().to_numpy()
+        if missing.any():
+            text[missing] = [str(value) for value in series[missing]]
+        return text
+
+    def _mask(self, condition: pd.Series) -> np.ndarray:
+        """Converte uma condição em máscara numpy (valores ausentes viram False)"""
+        return condition.to_numpy(dtype=bool, na_value=False)
+
+    def _row_ids(self, df: pd.DataFrame, positions: np.ndarray, id_column: str):
+        """Identificadores das linhas selecionadas (índice quando não há coluna de id)"""
+        if id_column in df.columns:
+            return df[id_column].iloc[positions]
+        return df.index[positions]
+
+    def _assign(self, df: pd.DataFrame, positions: np.ndarray, column: str, values):
+        """Escreve valores nas posições indicadas, promovendo a coluna para object se preciso
+
+        Em colunas categóricas os valores novos são acrescentados às categorias.
+        """
+        col = df.columns.get_loc(column)
+        if len(positions) and isinstance(df[column].dtype, pd.CategoricalDtype):
+            new = pd.unique(np.atleast_1d(np.asarray(values, dtype=object)))
+            new = [value for value in new if not pd.isna(value) and value not in df[column].cat.categories]
+            if new:
+                df[column] = df[column].cat.add_categories(new)
+        try:
+            df.iloc[positions, col] = values
+        except (TypeError, ValueError):
+            df[column] = df[column].astype(object)
+            df.iloc[positions, col] = values
+
+    def _domain(self, series: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+        """Valores distintos da coluna e o código de cada linha nessa tabela
+
+        Em colunas categóricas são as categorias; nas demais, os valores
+        fatorados. O valor ausente ocupa a última posição da tabela, para que
+        as regras o avaliem como o modo linha a linha avalia str(nan).
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy().astype(np.int64)
+            uniques = series.cat.categories.to_numpy(dtype=object)
+        else:
+            codes, uniques = factorize_exact(series)
+
+        domain = pd.Series(np.append(uniques, np.nan), dtype=object)
+        return domain, np.where(codes < 0, len(uniques), codes)
+
+    def _standardize_domain(self, df: pd.DataFrame, dataset: str, column: str, id_column: str,
+                            codes: np.ndarray, positions: np.ndarray, original: pd.Series,
+                            corrected: pd.Series, correction_type: str):
+        """Aplica correções calculadas uma vez por valor distinto (posições de _domain)
+
+        Numa coluna categórica cada categoria corrigida é trocada pelo valor
+        novo (fundindo categorias que passam a ser iguais) remapeando os
+        códigos; nas demais só as linhas afetadas, achadas pelos códigos, são
+        escritas. Com ``log_by_value`` o log recebe uma entrada por valor
+        corrigido com o número de linhas, sem custo por linha.
+        """
+        # Tabelas por posição do domínio: valor antigo e novo de cada valor corrigido
+        size = int(positions.max(initial=-1)) + 1
+        old_values = np.full(size, None, dtype=object)
+        new_values = np.full(size, None, dtype=object)
+        old_values[positions] = original.tolist()
+        new_values[positions] = corrected.tolist()
+
+        series = df[column]
+        categorical = isinstance(series.dtype, pd.CategoricalDtype)
+        rows = None
+        if not categorical or not self.log_by_value:
+            rows = np.flatnonzero(np.isin(codes, positions, kind='table')) if size else positions
+
+        if self.log_by_value:
+            counts = np.bincount(codes, minlength=size)[positions]
+            used = positions[counts > 0]
+            self._log_corrections(dataset, np.full(len(used), None, dtype=object), column,
+                                  old_values[used], new_values[used], correction_type, counts[counts > 0])
+        else:
+            self._log_corrections(dataset, self._row_ids(df, rows, id_column), column,
+                                  old_values[codes[rows]], new_values[codes[rows]], correction_type)
+
+        if not categorical:
+            self._assign(df, rows, column, new_values[codes[rows]].tolist())
+            return
+
+        # Ausentes (última posição do domínio) voltam a -1 na fatoração, a menos que corrigidos
+        table = np.append(series.cat.categories.to_numpy(dtype=object), np.nan)
+        table[positions] = new_values[positions]
+        remap, remapped = pd.factorize(table)
+        df[column] = pd.Categorical.from_codes(remap[codes], remapped)
+
+    def _categorizer(self) -> KeywordCategorizer:
+        """Categorizador compilado de category_keywords (recompilado quando o catálogo muda)"""
+        if self._categorizer_keywords != self.category_keywords:
+            self._keyword_categorizer = KeywordCategorizer(self.category_keywords)
+            self._categorizer_keywords = {category: list(keywords)
+                                          for category, keywords in self.category_keywords.items()}
+        return self._keyword_categorizer
+
+    def _parse_dates(self, values: pd.Series, dataset: str, column: str) -> ParsedDates:
+        """Converte uma coluna de datas e registra quantos valores não foram reconhecidos"""
+        parsed = self.date_parser.parse(values)
+        unparseable = int(parsed.unparseable.sum())
+        if unparseable:
+            self.logger.info(f"{unparseable} valores não reconhecidos como data em {dataset}.{column}")
+        return parsed
+
+    def _remove_duplicates(self, df: pd.DataFrame, dataset: str, id_column: str) -> pd.DataFrame:
+        """Remove duplicatas mantendo o primeiro registro"""
+        duplicates = df.duplicated(subset=[id_column], keep='first')
+        duplicate_ids = df.loc[duplicates, id_column]
+
+        # take() evita que o resultado fique marcado como fatia do frame original
+        df_clean = df.take(np.flatnonzero(~self._mask(duplicates)))
+
+        self._log_corrections(dataset, duplicate_ids, id_column, "duplicated", "removed",
+                              "DEDUPLICATION")
+
+        if len(duplicate_ids):
+            self.logger.info(f"Removidas {len(duplicate_ids)} duplicatas em {dataset}")
+
+        return df_clean
+
+    def _resolve_entities(self, df: pd.DataFrame, dataset: str, id_column: str) -> pd.DataFrame:
+        """Funde registros da mesma pessoa com ids diferentes, mantendo o primeiro de cada grupo"""
+        survivors = self.entity_resolver.resolve(df)
+        merged = np.flatnonzero(survivors != np.arange(len(df)))
+        removed_ids = self._row_ids(df, merged, id_column)
+        survivor_ids = self._row_ids(df, survivors[merged], id_column)
+
+        self._log_corrections(dataset, removed_ids, id_column, removed_ids, survivor_ids, "DEDUPLICATION")
+        self.entity_merges.update(zip(removed_ids.tolist(), survivor_ids.tolist()))
+
+        if len(merged):
+            self.logger.info(f"Fundidos {len(merged)} registros duplicados com ids diferentes em {dataset}")
+
+        return df.take(np.flatnonzero(survivors == np.arange(len(df))))
+
+    def _correct_emails(self, df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+        """Corrige emails inválidos"""
+        if 'email' not in df.columns:
+            return df
+
+        emails = self._as_text(df['email'])
+        candidates = np.flatnonzero(self._mask(df['email'].notna() & (emails != 'nan')))
+
+        original = emails.iloc[candidates]
+        corrected, valid = self.contact_normalizer.normalize_emails(original)
+        changed = self._mask(corrected != original)
+        positions = candidates[changed]
+
+        self._assign(df, positions, 'email', corrected[changed].tolist())
+        self._log_corrections(dataset, self._row_ids(df, positions, 'id_cliente'), 'email',
+                              original[changed].tolist(), corrected[changed].tolist(), "EMAIL_CORRECTION")
+        self._flag_invalid(dataset, df, candidates[~valid], 'email', "INVALID_EMAIL")
+
+        return df
+
+    def _correct_phones(self, df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+        """Corrige telefones inválidos"""
+        if 'telefone' not in df.columns:
+            return df
+
+        phones = self._as_text(df['telefone'])
+        candidates = np.flatnonzero(self._mask(df['telefone'].notna() & (phones != 'nan')))
+
+        original = phones.iloc[candidates]
+        corrected, valid = self.contact_normalizer.normalize_phones(original)
+        changed = self._mask(corrected != original)
+        positions = candidates[changed]
+
+        self._assign(df, positions, 'telefone', corrected[changed].tolist())
+        self._log_corrections(dataset, self._row_ids(df, positions, 'id_cliente'), 'telefone',
+                              original[changed].tolist(), corrected[changed].tolist(), "PHONE_CORRECTION")
+        self._flag_invalid(dataset, df, candidates[~valid], 'telefone', "INVALID_PHONE")
+
+        return df
+
+    def _standardize_states(self, df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+        """Padroniza códigos de estado"""
+        if 'estado' not in df.columns:
+            return df
+
+        domain, codes = self._domain(df['estado'])
+        states = self._as_text(domain).str.upper().str.strip()
+        candidates = np.flatnonzero(~self._mask(states.isin(self.valid_states)))
+
+        original = states.iloc[candidates]
+        best = self.fuzzy_matcher.map(original, self.valid_states)
+        changed = self._mask(best.notna() & (best != original))
+
+        self._standardize_domain(df, dataset, 'estado', 'id_cliente', codes, candidates[changed],
+                                 original[changed], best[changed], "STATE_STANDARDIZATION")
+
+        return df
+
+    def _fill_missing_cliente_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Preenche dados ausentes de clientes usando regras de negócio"""
+        nomes = df['nome']
+        blank = nomes.isna() | (self._as_text(nomes).str.strip() == '')
+        positions = np.flatnonzero(self._mask(blank & df['email'].notna()))
+
+        emails = self._as_text(df['email'].iloc[positions])
+        names = emails.str.split('@').str[0].str.replace('.', ' ', regex=False).str.title().tolist()
+
+        self._assign(df, positions, 'nome', names)
+        self._log_corrections("clientes", self._row_ids(df, positions, 'id_cliente'), 'nome',
+                              'NULL', names, "NAME_INFERENCE")
+
+        return df
+
+    def _correct_negative_prices(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige preços negativos"""
+        if 'preco' not in df.columns:
+            return df
+
+        positions = np.flatnonzero(self._mask(df['preco'] < 0))
+
+        original = df['preco'].iloc[positions]
+        corrected = original.abs()
+
+        self._assign(df, positions, 'preco', corrected.to_numpy())
+        self._log_corrections("produtos", self._row_ids(df, positions, 'id_produto'), 'preco',
+                              original.to_numpy(), corrected.to_numpy(), "NEGATIVE_TO_POSITIVE")
+
+        return df
+
+    def _auto_categorize_products(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Categoriza automaticamente produtos sem categoria"""
+        if 'categoria' not in df.columns or 'nome_produto' not in df.columns:
+            return df
+
+        categorias = df['categoria']
+        blank = categorias.isna() | (self._as_text(categorias).str.strip() == '')
+        positions = np.flatnonzero(self._mask(blank))
+
+        # Primeira categoria (na ordem do catálogo) com alguma palavra-chave no nome
+        found = self._categorizer().categorize(self._as_text(df['nome_produto'].iloc[positions]))
+
+        matched = self._mask(found.notna())
+        new_values = found.fillna("Outros").tolist()
+        correction_types = np.where(matched, "AUTO_CATEGORIZATION", "DEFAULT_CATEGORIZATION")
+
+        self._assign(df, positions, 'categoria', new_values)
+        self._log_corrections("produtos", self._row_ids(df, positions, 'id_produto'), 'categoria',
+                              'NULL', new_values, correction_types.tolist())
+
+        return df
+
+    def _correct_invalid_quantities(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige quantidades inválidas (negativas ou zero)"""
+        if 'quantidade' not in df.columns:
+            return df
+
+        positions = np.flatnonzero(self._mask(df['quantidade'] <= 0))
+        original = df['quantidade'].iloc[positions].to_numpy()
+
+        self._assign(df, positions, 'quantidade', 1)
+        self._log_corrections("vendas", self._row_ids(df, positions, 'id_venda'), 'quantidade',
+                              original, 1, "INVALID_QUANTITY_CORRECTION")
+
+        return df
+
+    def _correct_total_calculation(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige cálculo do valor total"""
+        if not all(col in df.columns for col in ['quantidade', 'valor_unitario', 'valor_total']):
+            return df
+
+        expected = df['quantidade'] * df['valor_unitario']
+        divergent = (df['valor_total'] - expected).abs() > 0.01  # Tolerância de 1 centavo
+        positions = np.flatnonzero(self._mask(divergent))
+
+        original = df['valor_total'].iloc[positions].to_numpy()
+        corrected = expected.iloc[positions]
+
+        self._assign(df, positions, 'valor_total', corrected.to_numpy())
+        self._log_corrections("vendas", self._row_ids(df, positions, 'id_venda'), 'valor_total',
+                              original, corrected.to_numpy(), "CALCULATION_CORRECTION")
+
+        return df
+
+    def _remap_merged_clientes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aponta as vendas de clientes fundidos para o cliente mantido"""
+        survivor_ids = df['id_cliente'].map(pd.Series(self.entity_merges, dtype=object))
+        positions = np.flatnonzero(self._mask(survivor_ids.notna()))
+
+        self._log_corrections("vendas", self._row_ids(df, positions, 'id_venda'), 'id_cliente',
+                              df['id_cliente'].iloc[positions], survivor_ids.iloc[positions],
+                              "MERGED_REFERENCE_REMAP")
+        self._assign(df, positions, 'id_cliente', survivor_ids.iloc[positions].tolist())
+
+        return df
+
+    def _correct_orphan_references(self, df_vendas: pd.DataFrame,
+                                 df_clientes: pd.DataFrame, df_produtos: pd.DataFrame) -> pd.DataFrame:
+        """Corrige referências órfãs removendo registros inválidos"""
+        orphan_cliente = self.referential_integrity.orphans(df_vendas['id_cliente'], df_clientes, 'id_cliente')
+        orphan_produto = self.referential_integrity.orphans(df_vendas['id_produto'], df_produtos, 'id_produto')
+
+        # Log intercalado por linha (cliente antes de produto), como no modo linha a linha
+        cliente_positions = np.flatnonzero(orphan_cliente)
+        produto_positions = np.flatnonzero(orphan_produto)
+        positions = np.concatenate([cliente_positions, produto_positions])
+        order = np.argsort(positions, kind='stable')
+        positions = positions[order]
+
+        columns = np.array(['id_cliente'] * len(cliente_positions) + ['id_produto'] * len(produto_positions),
+                           dtype=object)[order]
+        old_values = np.concatenate([df_vendas['id_cliente'].to_numpy(dtype=object)[cliente_positions],
+                                     df_vendas['id_produto'].to_numpy(dtype=object)[produto_positions]])[order]
+
+        self._log_corrections("vendas", self._row_ids(df_vendas, positions, 'id_venda'), columns,
+                              old_values, 'REMOVED', "ORPHAN_REFERENCE_REMOVAL")
+
+        # Linhas removidas vão em lote para a quarentena (se ativa), com as colunas órfãs de cada uma
+        orphan = orphan_cliente | orphan_produto
+        rejected = np.flatnonzero(orphan)
+        if self.quarantine is not None:
+            both = orphan_cliente[rejected] & orphan_produto[rejected]
+            self._quarantine_rows("vendas", df_vendas, rejected, "ORPHAN_REFERENCE",
+                                  np.where(both, 'id_cliente,id_produto',
+                                           np.where(orphan_cliente[rejected], 'id_cliente', 'id_produto')))
+        df_corrected = df_vendas.take(np.flatnonzero(~orphan))
+
+        # Cada venda conta uma vez, mesmo com cliente e produto órfãos
+        removed = int(orphan.sum())
+        if removed:
+            self.logger.info(f"Removidos {removed} registros com referências órfãs")
+
+        return df_corrected
+
+    def _standardize_dates(self, df: pd.DataFrame, dataset: str, date_columns: List[str]) -> pd.DataFrame:
+        """Padroniza formato de datas"""
+        id_column = self._id_column(dataset)
+
+        for col in date_columns:
+            if col not in df.columns:
+                continue
+
+            parsed = self._parse_dates(df[col], dataset, col)
+            candidates = np.flatnonzero(parsed.valid)
+            standardized = np.array(parsed.strftime(candidates), dtype=object)
+            original = df[col].iloc[candidates]
+            changed = self._mask(self._as_text(original) != standardized)
+            positions = candidates[changed]
+
+            self._assign(df, positions, col, standardized[changed].tolist())
+            self._log_corrections(dataset, self._row_ids(df, positions, id_column), col,
+                                  original[changed].tolist(), standardized[changed].tolist(),
+                                  "DATE_STANDARDIZATION")
+            self._quarantine_rows(dataset, df, np.flatnonzero(parsed.unparseable), "UNPARSEABLE_DATE", col)
+
+        return df
+
+    def _standardize_categories(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Padroniza categorias usando correspondência fuzzy"""
+        if 'categoria' not in df.columns:
+            return df
+
+        return self._standardize_against(df, "produtos", 'categoria', 'id_produto',
+                                         self.valid_categories, "CATEGORY_STANDARDIZATION")
+
+    def _correct_negative_stock(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige estoque negativo"""
+        if 'estoque' not in df.columns:
+            return df
+
+        positions = np.flatnonzero(self._mask(df['estoque'] < 0))
+        original = df['estoque'].iloc[positions].to_numpy()
+
+        self._assign(df, positions, 'estoque', 0)
+        self._log_corrections("produtos", self._row_ids(df, positions, 'id_produto'), 'estoque',
+                              original, 0, "NEGATIVE_STOCK_CORRECTION")
+
+        return df
+
+    def _standardize_boolean_field(self, df: pd.DataFrame, dataset: str, column: str) -> pd.DataFrame:
+        """Padroniza campos booleanos"""
+        if column not in df.columns:
+            return df
+
+        values = self._as_text(df[column]).str.lower().str.strip()
+        mapping = {value: True for value in ['true', '1', 'sim', 'yes', 'ativo']}
+        mapping.update({value: False for value in ['false', '0', 'não', 'no', 'inativo']})
+
+        candidates = np.flatnonzero(self._mask(values.isin(list(mapping))))
+        original = df[column].iloc[candidates].to_numpy(dtype=object)
+        standardized = values.iloc[candidates].map(mapping).to_numpy(dtype=object)
+        changed = original != standardized
+        positions = candidates[changed]
+
+        self._assign(df, positions, column, standardized[changed].tolist())
+        self._log_corrections(dataset, self._row_ids(df, positions, self._id_column(dataset)),
+                              column, original[changed].tolist(), standardized[changed].tolist(),
+                              "BOOLEAN_STANDARDIZATION")
+
+        return df
+
+    def _correct_negative_values(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige valores negativos em vendas"""
+        if 'valor_total' not in df.columns:
+            return df
+
+        positions = np.flatnonzero(self._mask(df['valor_total'] < 0))
+
+        original = df['valor_total'].iloc[positions]
+        corrected = original.abs()
+
+        self._assign(df, positions, 'valor_total', corrected.to_numpy())
+        self._log_corrections("vendas", self._row_ids(df, positions, 'id_venda'), 'valor_total',
+                              original.to_numpy(), corrected.to_numpy(), "NEGATIVE_VALUE_CORRECTION")
+
+        return df
+
+    def _correct_future_dates(self, df: pd.DataFrame, dataset: str, date_column: str) -> pd.DataFrame:
+        """Corrige datas futuras"""
+        if date_column not in df.columns:
+            return df
+
+        today = date.today()
+
+        parsed = self._parse_dates(df[date_column], dataset, date_column)
+        positions = np.flatnonzero(parsed.after(today))
+        original = df[date_column].iloc[positions]
+
+        corrected_date = today.strftime('%Y-%m-%d')
+        self._assign(df, positions, date_column, corrected_date)
+        self._log_corrections(dataset, self._row_ids(df, positions, self._id_column(dataset)),
+                              date_column, original.tolist(), corrected_date,
+                              "FUTURE_DATE_CORRECTION")
+        self._quarantine_rows(dataset, df, np.flatnonzero(parsed.unparseable), "UNPARSEABLE_DATE", date_column)
+
+        return df
+
+    def _standardize_status(self, df: pd.DataFrame, dataset: str,
+                          status_column: str, valid_statuses: List[str]) -> pd.DataFrame:
+        """Padroniza valores de status"""
+        if status_column not in df.columns:
+            return df
+
+        return self._standardize_against(df, dataset, status_column, self._id_column(dataset),
+                                         valid_statuses, "STATUS_STANDARDIZATION")
+
+    def _standardize_against(self, df: pd.DataFrame, dataset: str, column: str, id_column: str,
+                             valid_values: List[str], correction_type: str) -> pd.DataFrame:
+        """Substitui valores fora da lista válida pela correspondência fuzzy mais próxima"""
+        domain, codes = self._domain(df[column])
+        candidates = np.flatnonzero(self._mask(domain.notna()))
+        values = self._as_text(domain.iloc[candidates]).str.strip()
+        invalid = ~self._mask(values.isin(valid_values))
+        candidates, values = candidates[invalid], values[invalid]
+
+        best = self.fuzzy_matcher.map(values, valid_values)
+        changed = self._mask(best.notna())
+
+        self._standardize_domain(df, dataset, column, id_column, codes, candidates[changed],
+                                 values[changed], best[changed], correction_type)
+
+        return df
+
+    def _fill_missing_transportadora(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Preenche transportadoras ausentes"""
+        if 'transportadora' not in df.columns:
+            return df
+
+        default_transportadora = "Correios"  # Transportadora padrão
+
+        transportadoras = df['transportadora']
+        blank = transportadoras.isna() | (self._as_text(transportadoras).str.strip() == '')
+        positions = np.flatnonzero(self._mask(blank))
+
+        self._assign(df, positions, 'transportadora', default_transportadora)
+        self._log_corrections("logistica", self._row_ids(df, positions, 'id_entrega'),
+                              'transportadora', 'NULL',
+                              default_transportadora, "DEFAULT_TRANSPORTADORA")
+
+        return df
+
+    def _correct_logistica_orphan_references(self, df_logistica: pd.DataFrame,
+                                           df_vendas: pd.DataFrame) -> pd.DataFrame:
+        """Corrige referências órfãs na logística"""
+        orphan = self.referential_integrity.orphans(df_logistica['id_venda'], df_vendas, 'id_venda')
+        positions = np.flatnonzero(orphan)
+
+        self._log_corrections("logistica", self._row_ids(df_logistica, positions, 'id_entrega'), 'id_venda',
+                              df_logistica['id_venda'].iloc[positions],
+                              'REMOVED', "ORPHAN_REFERENCE_REMOVAL")
+
+        self._quarantine_rows("logistica", df_logistica, positions, "ORPHAN_REFERENCE", 'id_venda')
+        df_corrected = df_logistica.take(np.flatnonzero(~orphan))
+
+        if len(positions):
+            self.logger.info(f"Removidos {len(positions)} registros de logística com referências órfãs")
+
+        return df_corrected
+
+    def _correct_date_inconsistencies(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige inconsistências entre datas de envio e entrega"""
+        if not all(col in df.columns for col in ['data_envio', 'data_entrega_real']):
+            return df
+
+        envio = self._parse_dates(df['data_envio'], "logistica", 'data_envio')
+        entrega = self._parse_dates(df['data_entrega_real'], "logistica", 'data_entrega_real')
+
+        # Entrega antes do envio: a data de entrega passa a ser a de envio
+        positions = np.flatnonzero(entrega.before(envio))
+        new_values = envio.strftime(positions)
+
+        original = df['data_entrega_real'].iloc[positions].tolist()
+        self._assign(df, positions, 'data_entrega_real', new_values)
+        self._log_corrections("logistica", self._row_ids(df, positions, 'id_entrega'),
+                              'data_entrega_real', original, new_values, "DATE_CONSISTENCY_CORRECTION")
+
+        # Com as duas datas presentes, uma não reconhecida impede a comparação: linha para a quarentena
+        present = ~envio.missing & ~entrega.missing
+        rejected = np.flatnonzero(present & (envio.unparseable | entrega.unparseable))
+        if self.quarantine is not None:
+            both = envio.unparseable[rejected] & entrega.unparseable[rejected]
+            self._quarantine_rows("logistica", df, rejected, "UNPARSEABLE_DATE",
+                                  np.where(both, 'data_envio,data_entrega_real',
+                                           np.where(envio.unparseable[rejected], 'data_envio', 'data_entrega_real')))
+
+        return df
+
+    def _fill_missing_shipping_dates(self, df_logistica: pd.DataFrame,
+                                   df_vendas: pd.DataFrame) -> pd.DataFrame:
+        """Preenche datas de envio ausentes baseadas na data da venda"""
+        if 'data_envio' not in df_logistica.columns:
+            return df_logistica
+
+        # Linha da venda de cada entrega (última ocorrência prevalece, como no dict);
+        # o índice é o mesmo usado na checagem de órfãos
+        venda_rows = self.referential_integrity.index(df_vendas, 'id_venda').lookup(df_logistica['id_venda'])
+
+        envios = df_logistica['data_envio']
+        blank = envios.isna() | (self._as_text(envios).str.strip() == '')
+        candidates = np.flatnonzero(self._mask(blank) & (venda_rows >= 0))
+
+        # Data da venda + 1 dia como data de envio
+        venda_dates = self._parse_dates(df_vendas['data_venda'].iloc[venda_rows[candidates]],
+                                        "vendas", 'data_venda')
+        changed = venda_dates.shifted_valid(1)
+        positions = candidates[changed]
+        new_values = venda_dates.strftime(np.flatnonzero(changed), days=1)
+
+        self._assign(df_logistica, positions, 'data_envio', new_values)
+        self._log_corrections("logistica", self._row_ids(df_logistica, positions, 'id_entrega'),
+                              'data_envio', 'NULL', new_values,
+                              "SHIPPING_DATE_INFERENCE")
+
+        return df_logistica
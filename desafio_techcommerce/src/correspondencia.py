@@ -0,0 +1,214 @@
+"""
+🔎 Correspondência Fuzzy - TechCommerce
+Resolve cada valor distinto uma única vez contra a lista de valores válidos,
+com cache LRU limitado, estatísticas de acerto e persistência em disco;
+vocabulários grandes usam um índice invertido de n-gramas
+"""
+
+import json
+import os
+import pandas as pd
+import numpy as np
+from collections import OrderedDict, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def best_match(target: str, options: Sequence[str], threshold: float = 0.6) -> Optional[str]:
+    """Encontra a melhor correspondência em uma lista de opções (varredura com SequenceMatcher)"""
+    if not target or not options:
+        return None
+
+    best_option = None
+    best_ratio = 0
+
+    for option in options:
+        ratio = SequenceMatcher(None, target.upper(), option.upper()).ratio()
+        if ratio > best_ratio and ratio >= threshold:
+            best_ratio = ratio
+            best_option = option
+
+    return best_option
+
+
+class NGramIndex:
+    """Índice invertido de n-gramas para vocabulários de referência grandes
+
+    Em vez de comparar o valor com todas as opções, junta as listas das
+    opções que compartilham n-gramas com ele, descarta as que nem pelo
+    comprimento alcançariam o limiar (limite de real_quick_ratio) e verifica
+    com SequenceMatcher apenas as ``max_candidates`` com mais n-gramas em
+    comum. É aproximado: uma opção sem n-grama em comum, ou fora das mais
+    votadas, não é considerada.
+    """
+
+    def __init__(self, options: Sequence[str], n: int = 3, max_candidates: int = 50):
+        self.options = list(options)
+        self.n = n
+        self.max_candidates = max_candidates
+        self._lengths = np.array([len(option) for option in self.options], dtype=np.int64)
+
+        postings = defaultdict(list)
+        for option_id, option in enumerate(self.options):
+            for gram in self._grams(option):
+                postings[gram].append(option_id)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.options)
+
+    def _grams(self, value: str) -> set:
+        """N-gramas distintos do valor em maiúsculas, com bordas marcadas por espaços"""
+        padded = " " * (self.n - 1) + value.upper() + " " * (self.n - 1)
+        return {padded[i:i + self.n] for i in range(len(padded) - self.n + 1)}
+
+    def candidates(self, target: str, threshold: float = 0.6) -> np.ndarray:
+        """Ids das opções candidatas, em ordem do vocabulário"""
+        lists = [self._postings[gram] for gram in self._grams(target) if gram in self._postings]
+        if not lists:
+            return np.empty(0, dtype=np.int32)
+
+        ids, shared = np.unique(np.concatenate(lists), return_counts=True)
+
+        # 2*min(la, lb)/(la + lb) é o maior ratio possível só pelos comprimentos
+        target_length = len(target)
+        lengths = self._lengths[ids]
+        reachable = 2 * np.minimum(target_length, lengths) >= threshold * (target_length + lengths)
+        ids, shared = ids[reachable], shared[reachable]
+
+        if len(ids) > self.max_candidates:
+            top = np.argpartition(-shared, self.max_candidates - 1)[:self.max_candidates]
+            ids = np.sort(ids[top])
+        return ids
+
+    def best_match(self, target: str, threshold: float = 0.6) -> Optional[str]:
+        """Melhor correspondência entre os candidatos (empates ficam com a opção que vem antes)"""
+        if not target or not self.options:
+            return None
+        return best_match(target, [self.options[i] for i in self.candidates(target, threshold)], threshold)
+
+
+class FuzzyMatcher:
+    """Cache LRU de correspondências fuzzy compartilhado entre regras e execuções
+
+    Cada lista de opções recebe um id de vocabulário e a chave do cache é
+    (vocabulário, limiar, valor), então estados, categorias e status convivem
+    no mesmo cache. Com ``max_size`` entradas o valor usado há mais tempo é
+    descartado. Vocabulários com pelo menos ``index_min_options`` opções são
+    resolvidos por um NGramIndex (construído uma vez) em vez da varredura.
+    """
+
+    def __init__(self, max_size: int = 100_000, index_min_options: int = 1_000):
+        self.max_size = max_size
+        self.index_min_options = index_min_options
+        self._cache: "OrderedDict[Tuple[int, float, str], Optional[str]]" = OrderedDict()
+        self._vocabulary_ids: Dict[Tuple[str, ...], int] = {}
+        self._vocabularies: List[Tuple[str, ...]] = []
+        self._indexes: Dict[int, NGramIndex] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _vocabulary(self, options: Sequence[str]) -> int:
+        """Id do vocabulário (a lista de opções é convertida e hasheada uma vez por chamada)"""
+        options = tuple(options)
+        vocabulary_id = self._vocabulary_ids.get(options)
+        if vocabulary_id is None:
+            vocabulary_id = self._vocabulary_ids[options] = len(self._vocabularies)
+            self._vocabularies.append(options)
+        return vocabulary_id
+
+    def match(self, target: str, options: Sequence[str], threshold: float = 0.6) -> Optional[str]:
+        """Melhor correspondência para um valor, consultando o cache antes de calcular"""
+        return self._match(target, self._vocabulary(options), threshold)
+
+    def _match(self, target: str, vocabulary_id: int, threshold: float) -> Optional[str]:
+        """Consulta o cache e, na falta, resolve por varredura ou pelo índice"""
+        key = (vocabulary_id, threshold, target)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        self.misses += 1
+        options = self._vocabularies[vocabulary_id]
+        if len(options) >= self.index_min_options:
+            result = self._index(vocabulary_id).best_match(target, threshold)
+        else:
+            result = best_match(target, options, threshold)
+        self._store(key, result)
+        return result
+
+    def _index(self, vocabulary_id: int) -> NGramIndex:
+        """Índice de n-gramas do vocabulário, construído na primeira consulta"""
+        index = self._indexes.get(vocabulary_id)
+        if index is None:
+            index = self._indexes[vocabulary_id] = NGramIndex(self._vocabularies[vocabulary_id])
+        return index
+
+    def map(self, values: pd.Series, options: Sequence[str], threshold: float = 0.6) -> pd.Series:
+        """Resolve cada valor distinto da coluna uma vez e espalha o resultado por códigos
+
+        Valores ausentes resultam em None, como valores sem correspondência.
+        """
+        vocabulary_id = self._vocabulary(options)
+        codes, uniques = pd.factorize(values)
+        resolved = np.empty(len(uniques) + 1, dtype=object)
+        resolved[:-1] = [self._match(value, vocabulary_id, threshold) for value in uniques]
+        resolved[-1] = None  # código -1 (ausente) aponta para a última posição
+
+        return pd.Series(resolved[codes], index=values.index, dtype=object)
+
+    def stats(self) -> Dict[str, float]:
+        """Estatísticas de uso do cache"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Esvazia o cache e zera as estatísticas (vocabulários e índices são mantidos)"""
+        self._cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def _store(self, key: Tuple, result: Optional[str]):
+        """Guarda um resultado, descartando o menos usado se o cache estiver cheio"""
+        self._cache[key] = result
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def save(self, path: str):
+        """Grava o cache em JSON (cada lista de opções é guardada uma vez)"""
+        entries = [[vocabulary_id, threshold, target, result]
+                   for (vocabulary_id, threshold, target), result in self._cache.items()
+                   if isinstance(target, str)]
+        vocabularies = [list(options) for options in self._vocabularies]
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"vocabularies": vocabularies, "entries": entries}, handle, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, max_size: int = 100_000, index_min_options: int = 1_000) -> "FuzzyMatcher":
+        """Carrega um cache salvo com save(); arquivo inexistente gera um cache vazio"""
+        matcher = cls(max_size=max_size, index_min_options=index_min_options)
+        if not os.path.exists(path):
+            return matcher
+
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+
+        vocabulary_ids = [matcher._vocabulary(options) for options in data["vocabularies"]]
+        for vocabulary_id, threshold, target, result in data["entries"]:
+            matcher._store((vocabulary_ids[vocabulary_id], threshold, target), result)
+        matcher.evictions = 0
+        return matcher
@@ -0,0 +1,169 @@
+"""
+📅 Datas Vetorizadas - TechCommerce
+Converte colunas de datas uma única vez por valor distinto, com inferência
+de formato por elemento, e expõe valores não reconhecidos como máscara
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import date
+from typing import List, Optional
+
+# Resolução em microssegundos cobre datas como 0001-01-01 e 9999-12-31
+DATE_UNIT = "datetime64[us]"
+NOT_A_TIME = np.datetime64("NaT", "us")
+MAX_DATE = np.datetime64("10000-01-01", "us")
+
+
+def _parse_scalar(value) -> Optional[pd.Timestamp]:
+    """Converte um valor isolado (fallback para o que a conversão em lote não reconhece)"""
+    try:
+        parsed = pd.to_datetime(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return None if pd.isna(parsed) else parsed
+
+
+def is_date(value) -> bool:
+    """Se um valor isolado é uma data reconhecível (mesmo critério do fallback do DateParser)"""
+    return _parse_scalar(value) is not None
+
+
+class ParsedDates:
+    """Resultado da conversão de uma coluna de datas
+
+    ``wall`` guarda data e hora locais (o que strftime e .date() enxergam) e
+    ``instant`` o instante em UTC para valores com fuso, usado nas
+    comparações. ``missing`` marca valores ausentes e ``unparseable`` os
+    presentes que não são datas reconhecíveis.
+    """
+
+    def __init__(self, wall: np.ndarray, instant: np.ndarray, aware: np.ndarray,
+                 missing: np.ndarray, unparseable: np.ndarray):
+        self.wall = wall
+        self.instant = instant
+        self.aware = aware
+        self.missing = missing
+        self.unparseable = unparseable
+
+    def __len__(self) -> int:
+        return len(self.wall)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Máscara das datas reconhecidas"""
+        return ~(self.missing | self.unparseable)
+
+    def strftime(self, positions: np.ndarray, days: int = 0) -> List[str]:
+        """Datas nas posições indicadas (mais ``days`` dias) no padrão YYYY-MM-DD"""
+        values = self.wall[positions] + np.timedelta64(days, "D")
+        return pd.DatetimeIndex(values).strftime('%Y-%m-%d').tolist()
+
+    def after(self, limit: date) -> np.ndarray:
+        """Máscara das datas válidas cujo dia (local) é posterior ao limite"""
+        next_day = np.datetime64(limit, "us") + np.timedelta64(1, "D")
+        return self.valid & (self.wall >= next_day)
+
+    def before(self, other: "ParsedDates") -> np.ndarray:
+        """Máscara das posições em que esta data é anterior à outra
+
+        Como na comparação de Timestamps, datas com e sem fuso não são
+        comparáveis e ficam fora da máscara.
+        """
+        comparable = self.valid & other.valid & (self.aware == other.aware)
+        return comparable & (self.instant < other.instant)
+
+    def shifted_valid(self, days: int) -> np.ndarray:
+        """Máscara das datas que continuam representáveis após somar ``days`` dias"""
+        return self.valid & (self.wall + np.timedelta64(days, "D") < MAX_DATE)
+
+
+class DateParser:
+    """Conversor de datas com cache por valor distinto, compartilhado entre regras
+
+    Cada valor distinto é convertido uma única vez por execução: a coluna é
+    fatorada, os valores ainda não vistos são convertidos em lote com
+    ``format='mixed'`` e apenas os que voltam vazios são reconvertidos um a um
+    (datas fora do intervalo em nanossegundos, fusos mistos). Nenhuma exceção
+    é engolida silenciosamente: o que não é data vira ``unparseable``.
+    """
+
+    def __init__(self):
+        self._keys = pd.Index([], dtype=object)
+        self._wall = np.empty(0, dtype=DATE_UNIT)
+        self._instant = np.empty(0, dtype=DATE_UNIT)
+        self._aware = np.empty(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def parse(self, values: pd.Series) -> ParsedDates:
+        """Converte a coluna inteira, reaproveitando valores já convertidos"""
+        if pd.api.types.is_datetime64_dtype(values.dtype):
+            # Coluna já convertida (sem fuso): nada a inferir
+            wall = values.to_numpy().astype(DATE_UNIT)
+            missing = np.isnat(wall)
+            return ParsedDates(wall, wall, np.zeros(len(wall), dtype=bool), missing,
+                               np.zeros(len(wall), dtype=bool))
+
+        codes, uniques = pd.factorize(values)
+        uniques = pd.Index(uniques, dtype=object)
+        positions = self._keys.get_indexer(uniques)
+
+        unseen = positions == -1
+        if unseen.any():
+            self._add(uniques[unseen])
+            positions = self._keys.get_indexer(uniques)
+
+        # Código -1 (ausente) aponta para a posição extra no fim de cada tabela
+        positions = np.append(positions, -1)[codes]
+        wall = np.append(self._wall, NOT_A_TIME)[positions]
+        instant = np.append(self._instant, NOT_A_TIME)[positions]
+        aware = np.append(self._aware, False)[positions]
+        missing = codes == -1
+
+        return ParsedDates(wall, instant, aware, missing, ~missing & np.isnat(wall))
+
+    def clear(self):
+        """Descarta o cache de valores convertidos"""
+        self.__init__()
+
+    def _add(self, keys: pd.Index):
+        """Converte valores novos e acrescenta ao cache"""
+        wall = np.full(len(keys), NOT_A_TIME)
+        instant = np.full(len(keys), NOT_A_TIME)
+        aware = np.zeros(len(keys), dtype=bool)
+
+        text = np.array([isinstance(key, str) for key in keys], dtype=bool)
+        retry = ~text
+        if text.any():
+            try:
+                parsed = pd.to_datetime(pd.Index(keys[text]), format='mixed', errors='coerce')
+            except (ValueError, TypeError, OverflowError):
+                parsed = None  # fusos mistos no lote: tudo cai no fallback
+            if parsed is not None and parsed.tz is None:
+                wall[text] = parsed.as_unit("us").to_numpy()
+                instant[text] = wall[text]
+                retry |= text & np.isnat(wall)
+            else:
+                retry |= text
+
+        for position in np.flatnonzero(retry):
+            parsed = _parse_scalar(keys[position])
+            if parsed is None:
+                continue
+            try:
+                if parsed.tzinfo is None:
+                    wall[position] = instant[position] = np.datetime64(parsed.as_unit("us").asm8, "us")
+                else:
+                    wall[position] = np.datetime64(parsed.tz_localize(None).as_unit("us").asm8, "us")
+                    instant[position] = np.datetime64(parsed.tz_convert("UTC").tz_localize(None)
+                                                      .as_unit("us").asm8, "us")
+                    aware[position] = True
+            except (ValueError, OverflowError):
+                wall[position] = instant[position] = NOT_A_TIME
+
+        self._keys = self._keys.append(keys)
+        self._wall = np.concatenate([self._wall, wall])
+        self._instant = np.concatenate([self._instant, instant])
+        self._aware = np.concatenate([self._aware, aware])
@@ -0,0 +1,441 @@
+"""
+📐 Esboços de Qualidade em Streaming - TechCommerce
+Métricas de unicidade, completude e distribuição com memória limitada:
+HyperLogLog para contagem de distintos, filtro de Bloom para chaves
+primárias repetidas e t-digest para quantis de preço e valor total. Cada
+esboço é atualizado por bloco ou partição e mesclado com os demais
+"""
+
+import json
+import os
+import sys
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+
+from armazenamento import READ_OPTIONS
+from indice_chaves import encode_keys
+
+# Colunas com quantis acompanhados por dataset
+QUANTILE_COLUMNS = {"produtos": ["preco"], "vendas": ["valor_total"]}
+
+# Quantis relatados por padrão
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Bits de cada bloco do filtro de Bloom (uma linha de cache)
+BLOOM_BLOCK_BITS = 512
+
+# Metas da política de governança
+COMPLETENESS_TARGET = 0.98
+DUPLICATE_TARGET = 0.0
+
+
+def hash_values(values) -> np.ndarray:
+    """Hash de 64 bits dos valores preenchidos (ids inteiros e floats integrais têm o mesmo hash)"""
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values[values.notna()]
+    else:
+        values = np.asarray(values)
+        values = values[pd.notna(values)]
+    return pd.util.hash_array(encode_keys(values))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Número de bits significativos de cada uint64 (0 para zero)
+
+    As metades de 32 bits são convertidas para float sem arredondamento e o
+    expoente do frexp é o comprimento em bits.
+    """
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1]).astype(np.int64)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """Segundo hash independente (finalizador do splitmix64)"""
+    with np.errstate(over="ignore"):
+        values = values ^ np.uint64(0x9E3779B97F4A7C15)
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class HyperLogLog:
+    """Contagem aproximada de valores distintos em 2^precision registradores de 1 byte
+
+    O erro padrão é 1,04/√(2^precision): 0,8% com a precisão 14 (16 KB).
+    Dois esboços de mesma precisão se mesclam pelo máximo dos registradores,
+    então blocos e partições podem ser contados separadamente.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"Precisão do HyperLogLog deve estar entre 4 e 18: {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def __repr__(self) -> str:
+        return f"HyperLogLog(precision={self.precision}, estimate={self.estimate():.0f})"
+
+    def add(self, values) -> "HyperLogLog":
+        """Acrescenta os valores preenchidos"""
+        self.add_hashes(hash_values(values))
+        return self
+
+    def add_hashes(self, hashes: np.ndarray):
+        """Acrescenta hashes de 64 bits já calculados"""
+        if not len(hashes):
+            return
+        shift = np.uint64(64 - self.precision)
+        buckets = (hashes >> shift).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        ranks = 64 - self.precision + 1 - _bit_length(rest)
+
+        # Maior rank por registrador: marca (registrador, rank) numa tabela e pega a última coluna marcada
+        seen = np.zeros((len(self.registers), 66 - self.precision), dtype=bool)
+        seen[buckets, ranks] = True
+        highest = seen.shape[1] - 1 - np.argmax(seen[:, ::-1], axis=1)
+        np.maximum(self.registers, np.where(seen.any(axis=1), highest, 0).astype(np.uint8), out=self.registers)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Incorpora outro esboço de mesma precisão"""
+        if other.precision != self.precision:
+            raise ValueError(f"HyperLogLog com precisões diferentes: {self.precision} e {other.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        """Número estimado de valores distintos (contagem linear enquanto há registradores vazios)"""
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * size and empty:
+            return size * float(np.log(size / empty))
+        return float(estimate)
+
+
+def _blocked_false_positive_rate(bits_per_key: float, hashes: int) -> float:
+    """Taxa de falso positivo de um filtro em blocos de BLOOM_BLOCK_BITS bits
+
+    A ocupação de cada bloco segue uma Poisson; blocos mais cheios que a
+    média pesam mais que no filtro clássico, por isso o filtro em blocos
+    precisa de alguns bits a mais por chave para a mesma taxa.
+    """
+    mean = BLOOM_BLOCK_BITS / bits_per_key
+    loads = np.arange(int(mean * 4 + 50))
+    log_poisson = loads * np.log(mean) - mean - np.cumsum(np.log(np.maximum(loads, 1)))
+    rates = (1 - (1 - 1 / BLOOM_BLOCK_BITS) ** (hashes * loads)) ** hashes
+    return float(np.sum(np.exp(log_poisson) * rates))
+
+
+class BloomFilter:
+    """Filtro de Bloom em blocos de 512 bits, dimensionado por capacidade e taxa de falso positivo
+
+    Todos os bits de uma chave ficam no mesmo bloco (uma linha de cache): a
+    consulta lê 8 palavras vizinhas e a inserção agrupa as chaves do lote por
+    bloco, sem um acesso aleatório à memória por função de hash. Com a taxa
+    padrão de 1e-4 ocupa cerca de 3 bytes por chave (10M chaves em ~30 MB).
+    ``add`` devolve as chaves provavelmente já vistas, inclusive repetições
+    dentro do próprio lote; filtros de mesmo tamanho se mesclam por OU bit a bit.
+    """
+
+    def __init__(self, capacity: int = 10_000_000, error_rate: float = 1e-4):
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        # Menor número de bits por chave (e hashes ótimos) que atinge a taxa no filtro em blocos
+        bits_per_key = -np.log(error_rate) / np.log(2) ** 2
+        self.hashes = max(1, int(round(bits_per_key * np.log(2))))
+        while _blocked_false_positive_rate(bits_per_key, self.hashes) > error_rate:
+            bits_per_key *= 1.05
+            self.hashes = max(1, int(round(bits_per_key * np.log(2))))
+
+        self.blocks = max(1, int(np.ceil(capacity * bits_per_key / BLOOM_BLOCK_BITS)))
+        self.size = self.blocks * BLOOM_BLOCK_BITS
+        self.words = np.zeros((self.blocks, BLOOM_BLOCK_BITS // 64), dtype=np.uint64)
+
+    def __repr__(self) -> str:
+        return (f"BloomFilter(capacity={self.capacity}, error_rate={self.error_rate}, "
+                f"bits={self.size}, hashes={self.hashes})")
+
+    def _masks(self, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Bloco de cada hash e seus bits no bloco, cada bit de uma fatia de 9 bits de hashes derivados"""
+        blocks = (hashes % np.uint64(self.blocks)).astype(np.int64)
+        words = BLOOM_BLOCK_BITS // 64
+        masks = np.zeros(len(hashes) * words, dtype=np.uint64)
+        rows = np.arange(len(hashes)) * words
+
+        derived = hashes
+        for index in range(self.hashes):
+            if index % 7 == 0:
+                derived = _mix(derived)
+            bits = ((derived >> np.uint64(9 * (index % 7))) & np.uint64(BLOOM_BLOCK_BITS - 1)).astype(np.int64)
+            masks[rows + (bits >> 6)] |= np.uint64(1) << (bits & 63).astype(np.uint64)
+        return blocks, masks.reshape(len(hashes), words)
+
+    def _contains_masks(self, blocks: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        """Se todos os bits de cada máscara já estão ligados no bloco"""
+        return ((self.words[blocks] & masks) == masks).all(axis=1)
+
+    def contains_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """Máscara dos hashes provavelmente presentes"""
+        return self._contains_masks(*self._masks(hashes))
+
+    def add_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """Insere os hashes e retorna a máscara dos que já tinham sido vistos (no filtro ou antes no lote)"""
+        blocks, masks = self._masks(hashes)
+        seen = self._contains_masks(blocks, masks) | pd.Series(hashes).duplicated().to_numpy()
+        if len(hashes):
+            # Máscaras do mesmo bloco combinadas antes da escrita, que então não repete índices
+            order = np.argsort(blocks, kind="stable")
+            sorted_blocks = blocks[order]
+            starts = np.flatnonzero(np.append(True, sorted_blocks[1:] != sorted_blocks[:-1]))
+            self.words[sorted_blocks[starts]] |= np.bitwise_or.reduceat(masks[order], starts, axis=0)
+        return seen
+
+    def contains(self, values) -> np.ndarray:
+        """Máscara dos valores preenchidos provavelmente presentes"""
+        return self.contains_hashes(hash_values(values))
+
+    def add(self, values) -> np.ndarray:
+        """Insere os valores preenchidos (ver add_hashes)"""
+        return self.add_hashes(hash_values(values))
+
+    def fill_ratio(self) -> float:
+        """Fração de bits ligados"""
+        return float(np.bitwise_count(self.words).sum(dtype=np.int64)) / self.size
+
+    def _block_fill(self) -> np.ndarray:
+        """Fração de bits ligados em cada bloco"""
+        return np.bitwise_count(self.words).sum(axis=1, dtype=np.int64) / BLOOM_BLOCK_BITS
+
+    def false_positive_rate(self) -> float:
+        """Probabilidade atual de uma chave nova ser dada como vista (média sobre os blocos)"""
+        return float(np.mean(self._block_fill() ** self.hashes))
+
+    def approximate_count(self) -> float:
+        """Número estimado de chaves inseridas, pelos bits ligados de cada bloco (Swamidass-Baldi)"""
+        fill = np.minimum(self._block_fill(), 1 - 1 / BLOOM_BLOCK_BITS)
+        return float(-BLOOM_BLOCK_BITS / self.hashes * np.log1p(-fill).sum())
+
+    def merge(self, other: "BloomFilter") -> "BloomFilter":
+        """Incorpora outro filtro de mesmo tamanho e número de hashes"""
+        if (other.size, other.hashes) != (self.size, self.hashes):
+            raise ValueError("Filtros de Bloom com tamanhos diferentes não podem ser mesclados")
+        np.bitwise_or(self.words, other.words, out=self.words)
+        return self
+
+
+class TDigest:
+    """Quantis aproximados com no máximo ~compression/2 centróides
+
+    Cada atualização ordena os centróides junto com os novos valores e
+    agrupa os vizinhos cujo quantil cai no mesmo passo da função de escala
+    arco-seno, que deixa os centróides das caudas pequenos: p99 e p1 ficam
+    bem mais precisos que a mediana. Com a compressão padrão o erro de rank
+    fica abaixo de 0,1% (o valor devolvido para q está entre os quantis
+    exatos q - 0,001 e q + 0,001). Mesclar é reagrupar os centróides dos dois.
+    """
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def __repr__(self) -> str:
+        return f"TDigest(compression={self.compression}, count={self.count:.0f}, centroids={len(self.means)})"
+
+    @property
+    def count(self) -> float:
+        """Número de valores acrescentados"""
+        return float(self.weights.sum())
+
+    def add(self, values) -> "TDigest":
+        """Acrescenta os valores numéricos finitos (textos são convertidos; inválidos ignorados)"""
+        values = pd.to_numeric(pd.Series(values, copy=False), errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan)
+        values = values[np.isfinite(values)]
+        if len(values):
+            self.minimum = min(self.minimum, float(values.min()))
+            self.maximum = max(self.maximum, float(values.max()))
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Incorpora os centróides de outro digest"""
+        if len(other.means):
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        """Agrupa os pontos ordenados por passo inteiro da escala k(q) = δ/2π·arcsin(2q - 1)"""
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        middle = (cumulative - weights / 2) / cumulative[-1]
+        steps = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * middle - 1)).astype(np.int64)
+
+        starts = np.flatnonzero(np.append(True, steps[1:] != steps[:-1]))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """Valor aproximado do(s) quantil(is) ``q`` (NaN sem valores)"""
+        if not len(self.means):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        result = np.interp(np.asarray(q, dtype=np.float64) * total,
+                           np.concatenate([[0.0], centers, [total]]),
+                           np.concatenate([[self.minimum], self.means, [self.maximum]]))
+        return result if np.ndim(q) else float(result)
+
+
+class StreamingQualityMetrics:
+    """Métricas de qualidade de um dataset atualizadas bloco a bloco, com memória limitada
+
+    Completude das colunas obrigatórias (contagens exatas), chaves primárias
+    repetidas (filtro de Bloom), valores distintos por coluna (HyperLogLog) e
+    quantis das colunas de QUANTILE_COLUMNS (t-digest). Métricas de blocos ou
+    partições do mesmo dataset se mesclam com ``merge``. Repetições dentro de
+    um fluxo são detectadas chave a chave; as entre partições mescladas são
+    estimadas pela sobreposição dos filtros (ruído de ~0,02% das chaves) e
+    relatadas à parte, em ``cross_partition_duplicates``.
+    """
+
+    def __init__(self, dataset: str, checks=None, capacity: int = 10_000_000, error_rate: float = 1e-4,
+                 precision: int = 14, compression: int = 200, sample_size: int = 5):
+        if checks is None:
+            # Import tardio: as verificações padrão instanciam a engine de correção
+            from perfil import default_checks
+            checks = default_checks()[dataset]
+        self.dataset = dataset
+        self.key = checks.key
+        self.required = [column for column, check in checks.columns.items() if check.required]
+        self.sample_size = sample_size
+
+        self.rows = 0
+        self.missing: Dict[str, int] = {column: 0 for column in self.required}
+        self.duplicates = 0
+        self.cross_duplicates = 0
+        self.expected_false_positives = 0.0
+        self.sample_keys: List = []
+        self.keys = BloomFilter(capacity, error_rate)
+        self.distinct = {column: HyperLogLog(precision) for column in checks.columns}
+        self.quantiles = {column: TDigest(compression) for column in QUANTILE_COLUMNS.get(dataset, [])}
+
+    def __repr__(self) -> str:
+        return f"StreamingQualityMetrics({self.dataset!r}, rows={self.rows}, duplicates={self.duplicates})"
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingQualityMetrics":
+        """Acrescenta um bloco de linhas do dataset"""
+        self.rows += len(chunk)
+        for column in self.required:
+            values = chunk[column] if column in chunk.columns else pd.Series(index=chunk.index, dtype=object)
+            blank = values.isna()
+            if not pd.api.types.is_numeric_dtype(values.dtype):
+                blank |= values.astype(str).str.strip() == ""
+            self.missing[column] += int(blank.sum())
+
+        if self.key in chunk.columns:
+            keys = chunk[self.key]
+            filled = keys[keys.notna()]
+            hashes = hash_values(filled)
+            self.expected_false_positives += len(hashes) * self.keys.false_positive_rate()
+            repeated = self.keys.add_hashes(hashes)
+            self.duplicates += int(repeated.sum())
+            if len(self.sample_keys) < self.sample_size:
+                self.sample_keys.extend(filled[repeated].iloc[:self.sample_size - len(self.sample_keys)].tolist())
+
+        for column, sketch in self.distinct.items():
+            if column in chunk.columns:
+                sketch.add(chunk[column])
+        for column, digest in self.quantiles.items():
+            if column in chunk.columns:
+                digest.add(chunk[column])
+        return self
+
+    def merge(self, other: "StreamingQualityMetrics") -> "StreamingQualityMetrics":
+        """Incorpora as métricas de outro bloco ou partição do mesmo dataset"""
+        if other.dataset != self.dataset:
+            raise ValueError(f"Métricas de datasets diferentes: {self.dataset} e {other.dataset}")
+        # Chaves nas duas partições: |A| + |B| - |A ∪ B|, estimados pelos bits de cada filtro
+        separate = self.keys.approximate_count() + other.keys.approximate_count()
+        self.keys.merge(other.keys)
+        overlap = max(0, int(round(separate - self.keys.approximate_count())))
+
+        self.rows += other.rows
+        for column in self.missing:
+            self.missing[column] += other.missing.get(column, 0)
+        self.duplicates += other.duplicates
+        self.cross_duplicates += other.cross_duplicates + overlap
+        self.expected_false_positives += other.expected_false_positives
+        self.sample_keys.extend(other.sample_keys[:self.sample_size - len(self.sample_keys)])
+        for column, sketch in self.distinct.items():
+            if column in other.distinct:
+                sketch.merge(other.distinct[column])
+        for column, digest in self.quantiles.items():
+            if column in other.quantiles:
+                digest.merge(other.quantiles[column])
+        return self
+
+    def report(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+        """Métricas e atendimento das metas de completude (≥ 98%) e unicidade (0% de repetições)"""
+        completeness = {column: round(1 - missing / self.rows, 6) if self.rows else 1.0
+                        for column, missing in self.missing.items()}
+        duplicate_rate = (self.duplicates + self.cross_duplicates) / self.rows if self.rows else 0.0
+        return {
+            "dataset": self.dataset,
+            "rows": self.rows,
+            "completeness": completeness,
+            "uniqueness": {
+                "key": self.key,
+                "duplicates": self.duplicates,
+                "cross_partition_duplicates": self.cross_duplicates,
+                "duplicate_rate": round(duplicate_rate, 6),
+                "expected_false_positives": round(self.expected_false_positives, 1),
+                "sample_keys": self.sample_keys,
+            },
+            "distinct": {column: int(round(sketch.estimate())) for column, sketch in self.distinct.items()},
+            "quantiles": {
+                column: {"min": digest.minimum, "max": digest.maximum,
+                         **{f"p{q * 100:g}": round(digest.quantile(q), 4) for q in quantiles}}
+                for column, digest in self.quantiles.items() if digest.count
+            },
+            "targets": {
+                "completeness": all(rate >= COMPLETENESS_TARGET for rate in completeness.values()),
+                "uniqueness": duplicate_rate <= DUPLICATE_TARGET,
+            },
+        }
+
+
+def sketch_csv(path: str, dataset: str, chunksize: int = 100_000, **options) -> StreamingQualityMetrics:
+    """Métricas de um CSV lido em blocos (``options`` vão para StreamingQualityMetrics)"""
+    metrics = StreamingQualityMetrics(dataset, **options)
+    for chunk in pd.read_csv(path, chunksize=chunksize, **READ_OPTIONS.get(dataset, {})):
+        metrics.update(chunk)
+    return metrics
+
+
+def sketch_directory(raw_dir: str, chunksize: int = 100_000) -> Dict[str, Dict]:
+    """Relatório das métricas de cada dataset disponível em raw_dir"""
+    reports = {}
+    for dataset in READ_OPTIONS:
+        path = os.path.join(raw_dir, f"{dataset}.csv")
+        if os.path.exists(path):
+            reports[dataset] = sketch_csv(path, dataset, chunksize).report()
+    return reports
+
+
+if __name__ == "__main__":
+    # Uso: python src/esbocos.py [data/raw] [chunksize]
+    raw_dir = sys.argv[1] if len(sys.argv) > 1 else "data/raw"
+    chunksize = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    print(json.dumps(sketch_directory(raw_dir, chunksize), ensure_ascii=False, indent=2, default=str))
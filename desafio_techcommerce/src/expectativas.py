@@ -0,0 +1,455 @@
+"""
+✅ Validação de Expectativas - TechCommerce
+Executa suites no formato do Great Expectations 0.18 sem o contexto do GE:
+cada coluna é fatorada uma vez por bloco e todas as expectativas dela são
+avaliadas sobre os valores distintos, com resultado no mesmo JSON do GE
+"""
+
+import json
+import re
+import sys
+import traceback
+import pandas as pd
+import numpy as np
+from datetime import datetime, timezone
+from dateutil.parser import parse as parse_date
+from typing import Dict, Iterable, List, Optional, Union
+
+from normalizacao import factorize_exact
+
+# Versão do Great Expectations cujo formato de suite e de resultado é reproduzido
+GE_VERSION = "0.18.8"
+
+# Valores inesperados listados em partial_unexpected_list (como no GE)
+PARTIAL_UNEXPECTED = 20
+
+# Argumentos posicionais de cada expectativa, na ordem dos métodos do Validator do GE
+POSITIONAL_ARGUMENTS = {
+    "expect_table_row_count_to_equal": ("value",),
+    "expect_column_to_exist": ("column",),
+    "expect_column_values_to_not_be_null": ("column",),
+    "expect_column_values_to_be_unique": ("column",),
+    "expect_column_values_to_match_regex": ("column", "regex"),
+    "expect_column_values_to_be_in_set": ("column", "value_set"),
+    "expect_column_values_to_be_between": ("column", "min_value", "max_value"),
+    "expect_column_values_to_be_dateutil_parseable": ("column",),
+    "expect_column_value_lengths_to_equal": ("column", "value"),
+}
+
+# Expectativas avaliadas valor a valor (contagens de inesperados e ``mostly``)
+MAP_EXPECTATIONS = set(POSITIONAL_ARGUMENTS) - {"expect_table_row_count_to_equal", "expect_column_to_exist"}
+
+
+class ExpectationSuite:
+    """Suite de expectativas no formato JSON do Great Expectations
+
+    Aceita os mesmos métodos ``expect_*`` do Validator do GE (argumentos
+    posicionais ou nomeados), então as células dos notebooks podem montar a
+    suite sem o contexto; ``{"$PARAMETER": nome}`` nos argumentos é
+    substituído pelos parâmetros de avaliação na validação.
+    """
+
+    def __init__(self, name: str = "default", expectations: Optional[List[Dict]] = None,
+                 meta: Optional[Dict] = None):
+        self.name = name
+        self.expectations = expectations or []
+        self.meta = meta or {"great_expectations_version": GE_VERSION}
+
+    def __len__(self) -> int:
+        return len(self.expectations)
+
+    def __repr__(self) -> str:
+        return f"ExpectationSuite({self.name!r}, {len(self.expectations)} expectativas)"
+
+    def __getattr__(self, name: str):
+        if name not in POSITIONAL_ARGUMENTS:
+            raise AttributeError(f"'{type(self).__name__}' não tem o atributo '{name}'")
+        return lambda *args, **kwargs: self.add_expectation(name, *args, **kwargs)
+
+    def add_expectation(self, expectation_type: str, *args, **kwargs) -> Dict:
+        """Acrescenta uma expectativa e retorna sua configuração"""
+        if expectation_type not in POSITIONAL_ARGUMENTS:
+            raise ValueError(f"Expectativa não suportada: {expectation_type}")
+        names = POSITIONAL_ARGUMENTS[expectation_type]
+        if len(args) > len(names):
+            raise TypeError(f"{expectation_type} aceita até {len(names)} argumentos posicionais")
+        kwargs = {**dict(zip(names, args)), **kwargs}
+        configuration = {"expectation_type": expectation_type, "kwargs": kwargs, "meta": {}}
+        self.expectations.append(configuration)
+        return configuration
+
+    def to_dict(self) -> Dict:
+        """Suite no formato JSON do GE"""
+        return {"expectation_suite_name": self.name, "expectations": self.expectations,
+                "meta": self.meta, "data_asset_type": None, "ge_cloud_id": None}
+
+    def save(self, path: str):
+        """Grava a suite em JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def from_dict(cls, suite: Dict) -> "ExpectationSuite":
+        """Suite a partir do JSON do GE (expectativas não suportadas são rejeitadas)"""
+        expectations = [dict(expectation, kwargs=dict(expectation.get("kwargs", {})),
+                             meta=dict(expectation.get("meta", {})))
+                        for expectation in suite.get("expectations", [])]
+        unsupported = sorted({e["expectation_type"] for e in expectations} - set(POSITIONAL_ARGUMENTS))
+        if unsupported:
+            raise ValueError(f"Expectativas não suportadas: {', '.join(unsupported)}")
+        return cls(suite.get("expectation_suite_name", "default"), expectations, suite.get("meta"))
+
+    @classmethod
+    def load(cls, path: str) -> "ExpectationSuite":
+        """Lê uma suite gravada pelo GE (great_expectations/expectations/*.json) ou por ``save``"""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def _to_python(value):
+    """Escalar numpy/pandas como tipo Python serializável em JSON"""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+class _ColumnBatch:
+    """Uma coluna de um bloco fatorada uma vez: códigos por linha (-1 = nulo) e valores distintos"""
+
+    def __init__(self, values: pd.Series):
+        self.values = values
+        self.numeric = pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype)
+        if pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype):
+            self.codes, uniques = factorize_exact(values)
+        else:
+            self.codes, uniques = pd.factorize(values)
+        self.uniques = pd.Series(uniques, dtype=values.dtype if self.numeric else object)
+        self.counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.uniques))
+        self.element_count = len(values)
+        self.missing_count = int(np.count_nonzero(self.codes < 0))
+
+
+class _MapAccumulator:
+    """Contagens de uma expectativa valor a valor acumuladas entre blocos"""
+
+    def __init__(self, configuration: Dict, kwargs: Dict):
+        self.configuration = configuration
+        self.kwargs = kwargs
+        self.expectation_type = configuration["expectation_type"]
+        self.element_count = 0
+        self.missing_count = 0
+        self.unexpected_count = 0
+        self.partial: List = []
+        self.partial_index: List = []
+        self.unexpected_counts: Dict = {}
+        self.value_counts: List[pd.Series] = []
+        self.exception: Optional[BaseException] = None
+        if self.expectation_type == "expect_column_values_to_match_regex":
+            self.pattern = re.compile(kwargs["regex"])
+
+    def update(self, batch: _ColumnBatch):
+        """Avalia a expectativa nos valores distintos do bloco e acumula as contagens"""
+        self.element_count += batch.element_count
+        self.missing_count += batch.missing_count
+
+        if self.expectation_type == "expect_column_values_to_not_be_null":
+            nulls = np.flatnonzero(batch.codes < 0)
+            self.unexpected_count += len(nulls)
+            self._remember(batch, nulls, [None] * min(len(nulls), PARTIAL_UNEXPECTED))
+            if len(nulls):
+                self.unexpected_counts[None] = self.unexpected_counts.get(None, 0) + len(nulls)
+            return
+
+        if self.expectation_type == "expect_column_values_to_be_unique":
+            # Repetições só são conhecidas no fim do fluxo: guarda as contagens por valor
+            self.value_counts.append(pd.Series(batch.counts, index=pd.Index(batch.uniques, dtype=object)))
+            return
+
+        unexpected = self._unexpected_values(batch)
+        self.unexpected_count += int(batch.counts[unexpected].sum())
+        for value, count in zip(batch.uniques[unexpected].tolist(), batch.counts[unexpected].tolist()):
+            self.unexpected_counts[value] = self.unexpected_counts.get(value, 0) + count
+
+        if len(self.partial) < PARTIAL_UNEXPECTED and unexpected.any():
+            rows = np.flatnonzero(np.append(unexpected, False)[batch.codes])[:PARTIAL_UNEXPECTED - len(self.partial)]
+            self._remember(batch, rows, batch.values.iloc[rows].tolist())
+
+    def _remember(self, batch: _ColumnBatch, rows: np.ndarray, values: List):
+        """Guarda os primeiros valores inesperados e seus índices, na ordem das linhas"""
+        room = PARTIAL_UNEXPECTED - len(self.partial)
+        if room > 0:
+            self.partial.extend(values[:room])
+            self.partial_index.extend(batch.values.index[rows[:room]].tolist())
+
+    def _unexpected_values(self, batch: _ColumnBatch) -> np.ndarray:
+        """Máscara dos valores distintos do bloco que violam a expectativa (mesma semântica do GE para pandas)"""
+        uniques = batch.uniques
+        if self.expectation_type == "expect_column_values_to_match_regex":
+            # GE: column.astype(str).str.contains(regex), isto é, re.search
+            return np.array([self.pattern.search(value) is None for value in uniques.astype(str).tolist()],
+                            dtype=bool)
+
+        if self.expectation_type == "expect_column_values_to_be_in_set":
+            return ~uniques.isin(self.kwargs["value_set"]).to_numpy(dtype=bool)
+
+        if self.expectation_type == "expect_column_values_to_be_between":
+            return ~self._between(uniques)
+
+        if self.expectation_type == "expect_column_value_lengths_to_equal":
+            if batch.numeric:
+                raise AttributeError("Can only use .str accessor with string values!")
+            lengths = np.array([len(value) if isinstance(value, str) else -1 for value in uniques.tolist()])
+            return lengths != self.kwargs["value"]
+
+        if self.expectation_type == "expect_column_values_to_be_dateutil_parseable":
+            return np.array([not self._parseable(value) for value in uniques.tolist()], dtype=bool)
+
+        raise ValueError(f"Expectativa não suportada: {self.expectation_type}")
+
+    def _between(self, uniques: pd.Series) -> np.ndarray:
+        """min_value ≤ valor ≤ max_value (limites estritos com strict_min/strict_max, limites None ignorados)"""
+        minimum, maximum = self.kwargs.get("min_value"), self.kwargs.get("max_value")
+        if minimum is None and maximum is None:
+            raise ValueError("min_value and max_value cannot both be None")
+        if minimum is not None and maximum is not None and minimum > maximum:
+            raise ValueError("min_value cannot be greater than max_value")
+
+        inside = np.ones(len(uniques), dtype=bool)
+        if minimum is not None:
+            inside &= (uniques > minimum if self.kwargs.get("strict_min") else uniques >= minimum).to_numpy(dtype=bool)
+        if maximum is not None:
+            inside &= (uniques < maximum if self.kwargs.get("strict_max") else uniques <= maximum).to_numpy(dtype=bool)
+        return inside
+
+    @staticmethod
+    def _parseable(value) -> bool:
+        """Se o texto é reconhecido pelo dateutil (valores que não são texto são erro, como no GE)"""
+        if not isinstance(value, str):
+            raise TypeError("Values passed to expect_column_values_to_be_dateutil_parseable must be of type "
+                            "string.\nIf you want to validate a column of dates or timestamps, please call the "
+                            "expectation before converting from string format.")
+        try:
+            parse_date(value)
+            return True
+        except (ValueError, OverflowError):
+            return False
+
+    def _finish_unique(self):
+        """Valores que aparecem mais de uma vez no fluxo: todas as ocorrências são inesperadas (como no GE)"""
+        if not self.value_counts:
+            return
+        counts = pd.concat(self.value_counts).groupby(level=0, sort=False).sum() \
+            if len(self.value_counts) > 1 else self.value_counts[0]
+        repeated = counts[counts > 1]
+        self.unexpected_count = int(repeated.sum())
+        self.unexpected_counts = dict(zip(repeated.index.tolist(), repeated.tolist()))
+        for value, count in self.unexpected_counts.items():
+            self.partial.extend([value] * min(count, PARTIAL_UNEXPECTED - len(self.partial)))
+            if len(self.partial) >= PARTIAL_UNEXPECTED:
+                break
+
+    def result(self, result_format: str) -> Dict:
+        """Resultado da expectativa no formato do GE"""
+        if self.exception is not None:
+            return _exception_result(self.configuration, self.exception)
+        if self.expectation_type == "expect_column_values_to_be_unique":
+            self._finish_unique()
+
+        mostly = self.kwargs.get("mostly", 1)
+        if self.expectation_type == "expect_column_values_to_not_be_null":
+            evaluated = self.element_count
+            result = {"element_count": self.element_count, "unexpected_count": self.unexpected_count,
+                      "unexpected_percent": _percent(self.unexpected_count, evaluated),
+                      "unexpected_percent_total": _percent(self.unexpected_count, self.element_count)}
+        else:
+            evaluated = self.element_count - self.missing_count
+            result = {"element_count": self.element_count, "missing_count": self.missing_count,
+                      "missing_percent": _percent(self.missing_count, self.element_count),
+                      "unexpected_count": self.unexpected_count,
+                      "unexpected_percent": _percent(self.unexpected_count, evaluated),
+                      "unexpected_percent_total": _percent(self.unexpected_count, self.element_count),
+                      "unexpected_percent_nonmissing": _percent(self.unexpected_count, evaluated)}
+        result["partial_unexpected_list"] = [_to_python(value) for value in self.partial]
+
+        if result_format in ("SUMMARY", "COMPLETE"):
+            result["partial_unexpected_index_list"] = [_to_python(index) for index in self.partial_index]
+            top = sorted(self.unexpected_counts.items(), key=lambda item: -item[1])[:PARTIAL_UNEXPECTED]
+            result["partial_unexpected_counts"] = [{"value": _to_python(value), "count": int(count)}
+                                                   for value, count in top]
+
+        success = evaluated == 0 or (evaluated - self.unexpected_count) / evaluated >= mostly
+        return _expectation_result(self.configuration, bool(success), result)
+
+
+def _percent(count: int, total: int) -> Optional[float]:
+    """Percentual como no GE (None sem linhas avaliadas)"""
+    return 100.0 * count / total if total else None
+
+
+def _expectation_result(configuration: Dict, success: bool, result: Dict) -> Dict:
+    """ExpectationValidationResult serializado"""
+    return {
+        "success": success,
+        "expectation_config": configuration,
+        "result": result,
+        "meta": {},
+        "exception_info": {"raised_exception": False, "exception_message": None, "exception_traceback": None},
+    }
+
+
+def _exception_result(configuration: Dict, exception: BaseException) -> Dict:
+    """Resultado de uma expectativa que levantou erro (catch_exceptions do GE)"""
+    result = _expectation_result(configuration, False, {})
+    result["exception_info"] = {
+        "raised_exception": True,
+        "exception_message": f"{type(exception).__name__}: {exception}",
+        "exception_traceback": "".join(traceback.format_exception(type(exception), exception,
+                                                                  exception.__traceback__)),
+    }
+    return result
+
+
+class NativeValidator:
+    """Valida DataFrames (ou blocos de um fluxo) contra uma ExpectationSuite, sem o Great Expectations
+
+    Cada coluna citada pela suite é fatorada uma vez por bloco e todas as
+    expectativas dela são avaliadas sobre os valores distintos; contagens e
+    valores inesperados são espalhados pelos códigos. O resultado tem o mesmo
+    JSON de ``validator.validate()`` do GE 0.18 (``success``, ``results``,
+    ``statistics``, ``meta``). Em fluxos, ``expect_column_values_to_be_unique``
+    guarda as contagens por valor distinto até o fim, e a lista parcial de
+    repetidos segue a ordem da primeira ocorrência.
+    """
+
+    def __init__(self, suite: Union[ExpectationSuite, Dict, str], result_format: str = "BASIC",
+                 catch_exceptions: bool = True):
+        if isinstance(suite, str):
+            suite = ExpectationSuite.load(suite)
+        elif isinstance(suite, dict):
+            suite = ExpectationSuite.from_dict(suite)
+        self.suite = suite
+        self.result_format = result_format
+        self.catch_exceptions = catch_exceptions
+
+    def validate(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+                 evaluation_parameters: Optional[Dict] = None, run_name: Optional[str] = None) -> Dict:
+        """Valida um DataFrame ou um iterável de blocos e retorna o resultado no formato do GE"""
+        evaluation_parameters = evaluation_parameters or {}
+        started = datetime.now(timezone.utc)
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+
+        accumulators: List[Optional[_MapAccumulator]] = []
+        results: Dict[int, Dict] = {}
+        for position, configuration in enumerate(self.suite.expectations):
+            try:
+                kwargs = self._resolve(configuration["kwargs"], evaluation_parameters)
+                accumulator = _MapAccumulator(configuration, kwargs) \
+                    if configuration["expectation_type"] in MAP_EXPECTATIONS else None
+            except Exception as exception:
+                results[position] = self._failed(configuration, exception)
+                accumulator = None
+            accumulators.append(accumulator)
+
+        rows = 0
+        columns_seen: set = set()
+        for chunk in chunks:
+            rows += len(chunk)
+            columns_seen.update(chunk.columns)
+            batches: Dict[str, _ColumnBatch] = {}
+            for position, accumulator in enumerate(accumulators):
+                if accumulator is None or accumulator.exception is not None:
+                    continue
+                column = accumulator.kwargs.get("column")
+                try:
+                    if column not in chunk.columns:
+                        raise KeyError(f"The column '{column}' in BatchData does not exist.")
+                    if column not in batches:
+                        batches[column] = _ColumnBatch(chunk[column])
+                    accumulator.update(batches[column])
+                except Exception as exception:
+                    if not self.catch_exceptions:
+                        raise
+                    accumulator.exception = exception
+
+        for position, configuration in enumerate(self.suite.expectations):
+            if position in results:
+                continue
+            accumulator = accumulators[position]
+            if accumulator is not None:
+                results[position] = accumulator.result(self.result_format)
+            else:
+                results[position] = self._table_result(configuration, evaluation_parameters, rows, columns_seen)
+
+        ordered = [results[position] for position in range(len(self.suite.expectations))]
+        successful = sum(result["success"] for result in ordered)
+        return {
+            "success": successful == len(ordered),
+            "results": ordered,
+            "evaluation_parameters": evaluation_parameters,
+            "statistics": {
+                "evaluated_expectations": len(ordered),
+                "successful_expectations": successful,
+                "unsuccessful_expectations": len(ordered) - successful,
+                "success_percent": 100.0 * successful / len(ordered) if ordered else None,
+            },
+            "meta": {
+                "great_expectations_version": GE_VERSION,
+                "expectation_suite_name": self.suite.name,
+                "run_id": {"run_name": run_name, "run_time": started.isoformat()},
+                "validation_time": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ"),
+                "validator": "native",
+            },
+        }
+
+    def _failed(self, configuration: Dict, exception: BaseException) -> Dict:
+        """Resultado de erro (ou a exceção, sem catch_exceptions)"""
+        if not self.catch_exceptions:
+            raise exception
+        return _exception_result(configuration, exception)
+
+    def _resolve(self, kwargs: Dict, evaluation_parameters: Dict) -> Dict:
+        """Substitui {"$PARAMETER": nome} pelos parâmetros de avaliação"""
+        resolved = {}
+        for name, value in kwargs.items():
+            if isinstance(value, dict) and "$PARAMETER" in value:
+                parameter = value["$PARAMETER"]
+                if parameter not in evaluation_parameters:
+                    raise KeyError(f"Parâmetro de avaliação não informado: {parameter}")
+                value = evaluation_parameters[parameter]
+            resolved[name] = value
+        return resolved
+
+    def _table_result(self, configuration: Dict, evaluation_parameters: Dict, rows: int,
+                      columns: set) -> Dict:
+        """Expectativas de tabela: número de linhas e existência de coluna"""
+        try:
+            kwargs = self._resolve(configuration["kwargs"], evaluation_parameters)
+            if configuration["expectation_type"] == "expect_table_row_count_to_equal":
+                return _expectation_result(configuration, rows == kwargs["value"], {"observed_value": rows})
+            return _expectation_result(configuration, kwargs["column"] in columns, {})
+        except Exception as exception:
+            return self._failed(configuration, exception)
+
+
+def validate_csv(suite: Union[ExpectationSuite, Dict, str], path: str, chunksize: Optional[int] = None,
+                 evaluation_parameters: Optional[Dict] = None, result_format: str = "BASIC") -> Dict:
+    """Valida um CSV inteiro ou lido em blocos de ``chunksize`` linhas"""
+    data = pd.read_csv(path, chunksize=chunksize) if chunksize else pd.read_csv(path)
+    return NativeValidator(suite, result_format).validate(data, evaluation_parameters)
+
+
+if __name__ == "__main__":
+    # Uso: python src/expectativas.py suite.json dados.csv [chunksize] [parametro=valor ...]
+    arguments = sys.argv[3:]
+    chunksize = int(arguments.pop(0)) if arguments and arguments[0].isdigit() else None
+    parameters = dict(argument.split("=", 1) for argument in arguments)
+
+    validation = validate_csv(sys.argv[1], sys.argv[2], chunksize, parameters)
+    print(json.dumps(validation, ensure_ascii=False, indent=2, default=str))
+    sys.exit(0 if validation["success"] else 1)
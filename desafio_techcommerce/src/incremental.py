@@ -0,0 +1,412 @@
+"""
+♻️ Correção Incremental - TechCommerce
+Corrige apenas os registros novos ou alterados desde a última execução,
+comparando o hash de cada linha bruta por chave primária com o estado
+persistido, e mescla o resultado nos CSVs corrigidos e no log de auditoria
+"""
+
+import os
+import sys
+import pandas as pd
+import numpy as np
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from armazenamento import READ_OPTIONS
+from auditoria import LOG_COLUMNS
+from correcao_automatica import DataCorrectionEngine
+from correcao_vetorizada import VectorizedCorrectionEngine
+from indice_chaves import encode_keys
+from integridade import ReferenceIndex
+from regras import DATE_DEPENDENT_RULES, Stage
+
+# Colunas de cada dataset que apontam para chaves de outro dataset já corrigido
+DEPENDENCIES: Dict[str, Dict[str, str]] = {
+    "clientes": {},
+    "produtos": {},
+    "vendas": {"id_cliente": "clientes", "id_produto": "produtos"},
+    "logistica": {"id_venda": "vendas"},
+}
+
+# Tipos de correção registrados pelas regras globais, refeitas a cada execução sobre o dataset inteiro
+GLOBAL_CORRECTION_TYPES = ("DEDUPLICATION",)
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Hash de 64 bits do conteúdo de cada linha (sem o índice)"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def csv_lines(df: pd.DataFrame) -> np.ndarray:
+    """Cada registro formatado como no to_csv, sem índice nem cabeçalho"""
+    lines = df.to_csv(index=False, header=False, lineterminator="\n").split("\n")[:-1]
+    if len(lines) != len(df):
+        # Campos com quebra de linha: formata registro a registro
+        lines = [df.iloc[i:i + 1].to_csv(index=False, header=False, lineterminator="\n")[:-1]
+                 for i in range(len(df))]
+    return np.array(lines, dtype=object)
+
+
+def read_csv_lines(path: str, rows: int) -> Optional[Tuple[str, np.ndarray]]:
+    """Cabeçalho e registros de um CSV como texto (None se não houver uma linha por registro)"""
+    with open(path, encoding="utf-8", newline="") as handle:
+        lines = handle.read().split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    if len(lines) != rows + 1:
+        return None
+    return lines[0], np.array(lines[1:], dtype=object)
+
+
+def write_csv_lines(path: str, header: str, lines: Sequence[str]):
+    """Grava cabeçalho e registros já formatados (arquivo temporário + rename)"""
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8", newline="") as handle:
+        handle.write(header + "\n")
+        if len(lines):
+            handle.write("\n".join(lines) + "\n")
+    os.replace(temporary, path)
+
+
+class RowState:
+    """Hash da linha bruta de cada chave processada em uma execução
+
+    ``present`` indica se a linha chegou à saída corrigida ou foi descartada
+    por uma regra de remoção (ex.: referência órfã). Guarda também as colunas
+    da entrada, as regras do plano e, se alguma regra depende da data do dia,
+    a data da execução: se qualquer uma mudar, o estado deixa de valer e o
+    dataset é corrigido por inteiro.
+    """
+
+    def __init__(self, keys, hashes: np.ndarray, present: np.ndarray, columns: List[str], rules: List[str],
+                 today: str = ""):
+        self.codes = encode_keys(keys)
+        self.hashes = np.asarray(hashes, dtype=np.uint64)
+        self.present = np.asarray(present, dtype=bool)
+        self.columns = list(columns)
+        self.rules = list(rules)
+        self.today = today
+        self._index = ReferenceIndex(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def matches(self, columns: List[str], rules: List[str]) -> bool:
+        """Se o estado foi gerado com as mesmas colunas de entrada e as mesmas regras"""
+        return self.columns == list(columns) and self.rules == list(rules)
+
+    def compare(self, keys, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Máscaras das chaves com o mesmo hash de antes e das que estavam na saída anterior"""
+        positions = self._index.lookup(keys)
+        found = positions >= 0
+        same = np.zeros(len(positions), dtype=bool)
+        present = np.zeros(len(positions), dtype=bool)
+        same[found] = self.hashes[positions[found]] == hashes[found]
+        present[found] = self.present[positions[found]]
+        return same, present
+
+    def save(self, path: str):
+        """Grava o estado em .npz (arquivo temporário + rename, nunca fica pela metade)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temporary = path + ".tmp.npz"
+        np.savez(temporary, codes=self.codes, hashes=self.hashes, present=self.present,
+                 columns=np.array(self.columns, dtype=str), rules=np.array(self.rules, dtype=str),
+                 today=np.array(self.today))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["RowState"]:
+        """Carrega um estado gravado (None se o arquivo não existir)"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            today = str(data["today"]) if "today" in data.files else ""
+            return cls(data["codes"], data["hashes"], data["present"],
+                       data["columns"].tolist(), data["rules"].tolist(), today)
+
+
+class IncrementalCorrector:
+    """Corrige só as linhas inseridas ou alteradas desde a execução anterior
+
+    Para cada dataset, as regras globais do início do plano (deduplicação)
+    rodam sobre a entrada inteira; depois, apenas as linhas cujo hash bruto
+    mudou, as chaves novas e as que referenciam chaves tocadas no dataset de
+    referência passam pelas demais regras. As outras linhas vêm do CSV
+    corrigido anterior, assim como suas entradas no log de auditoria.
+
+    Os arquivos são regravados emendando o texto das linhas mantidas, copiado
+    do CSV anterior, com as linhas recorrigidas; datasets sem alteração não
+    são regravados.
+
+    Sem estado válido (primeira execução, colunas ou regras diferentes, regra
+    dependente da data rodada em outro dia, CSV corrigido ausente) o dataset
+    é corrigido por inteiro. Nada é gravado até ``save``, que escreve CSVs,
+    log e, por último, os estados.
+    """
+
+    def __init__(self, engine: Optional[DataCorrectionEngine] = None,
+                 corrected_dir: str = "data/corrected", state_dir: Optional[str] = None):
+        self.engine = engine or VectorizedCorrectionEngine()
+        if getattr(self.engine, "log_by_value", False):
+            raise ValueError("A correção incremental reaproveita o log por row_id: use log_by_value=False")
+        if any(rule.name == "resolve_entities" for rule in self.engine.rule_registry.rules("clientes")):
+            raise ValueError("A resolução de entidades compara cada cliente com todos os demais: "
+                             "use a correção completa")
+        if self.engine.quarantine is not None:
+            raise ValueError("A quarentena recebe as linhas rejeitadas durante as regras, que não rodam "
+                             "nos registros reaproveitados: use a correção completa")
+        self.logger = self.engine.logger
+        self.corrected_dir = corrected_dir
+        self.state_dir = state_dir or os.path.join(corrected_dir, "state")
+        self.log_path = os.path.join(corrected_dir, "correction_log.csv")
+
+        self.results: Dict[str, pd.DataFrame] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._states: Dict[str, RowState] = {}
+        self._touched: Dict[str, Optional[np.ndarray]] = {}
+        self._splices: Dict[str, Tuple[np.ndarray, pd.DataFrame, int]] = {}
+        self._reused_log: Dict[str, np.ndarray] = {}
+        self._previous_log: Optional[pd.DataFrame] = None
+
+    def output_path(self, dataset: str) -> str:
+        """CSV corrigido do dataset"""
+        return os.path.join(self.corrected_dir, f"{dataset}_corrected.csv")
+
+    def state_path(self, dataset: str) -> str:
+        """Estado (hashes por chave) do dataset"""
+        return os.path.join(self.state_dir, f"{dataset}.npz")
+
+    def correct_clientes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige clientes novos ou alterados"""
+        return self._correct("clientes", df, ())
+
+    def correct_produtos(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Corrige produtos novos ou alterados"""
+        return self._correct("produtos", df, ())
+
+    def correct_vendas(self, df: pd.DataFrame, df_clientes: pd.DataFrame,
+                       df_produtos: pd.DataFrame) -> pd.DataFrame:
+        """Corrige vendas novas, alteradas ou que apontam para clientes/produtos tocados"""
+        return self._correct("vendas", df, (df_clientes, df_produtos))
+
+    def correct_logistica(self, df: pd.DataFrame, df_vendas: pd.DataFrame) -> pd.DataFrame:
+        """Corrige entregas novas, alteradas ou de vendas tocadas"""
+        return self._correct("logistica", df, (df_vendas,))
+
+    def _correct(self, dataset: str, df: pd.DataFrame, references: Tuple) -> pd.DataFrame:
+        """Decide entre correção incremental e completa e guarda o resultado para ``save``"""
+        id_column = self.engine._id_column(dataset)
+        plan = self.engine.plan(dataset, df.columns)
+        rules = [rule.name for rule in plan.rules]
+        today = date.today().isoformat() if any(rule in DATE_DEPENDENT_RULES for rule in rules) else ""
+        global_stages = plan.leading_global_stages()
+
+        state = RowState.load(self.state_path(dataset))
+        reason = None
+        if state is None:
+            reason = "sem estado anterior"
+        elif not state.matches(list(df.columns), rules):
+            reason = "colunas ou regras diferentes do estado anterior"
+        elif state.today != today:
+            reason = f"regras dependentes da data executadas em {state.today or 'outro dia'}"
+        elif global_stages is None:
+            reason = "regra global depois de regras locais"
+        elif not os.path.exists(self.output_path(dataset)):
+            reason = "CSV corrigido anterior ausente"
+        elif any(parent in self._touched and self._touched[parent] is None
+                 for parent in DEPENDENCIES[dataset].values()):
+            reason = "referências corrigidas por inteiro"
+
+        if reason is None:
+            corrected, keys, hashes = self._correct_incremental(dataset, df, id_column, references,
+                                                                global_stages, state)
+        else:
+            self.logger.info(f"♻️ {dataset.upper()}: correção completa ({reason})")
+            corrected = getattr(self.engine, f"correct_{dataset}")(df, *references)
+            first = df.drop_duplicates(subset=[id_column], keep='first')
+            keys, hashes = first[id_column], row_hashes(first)
+            self._touched[dataset] = None
+            self._splices.pop(dataset, None)
+            self._reused_log[dataset] = np.zeros(len(self._log_frame()), dtype=bool)
+            self.stats[dataset] = {"linhas": len(df), "corrigidas": len(first), "reaproveitadas": 0}
+
+        self.results[dataset] = corrected
+        if corrected[id_column].is_unique:
+            present = ReferenceIndex(corrected[id_column]).contains(keys)
+            self._states[dataset] = RowState(keys, hashes, present, list(df.columns), rules, today)
+        else:
+            self._states.pop(dataset, None)
+            self.logger.warning(f"Chaves repetidas em {dataset}.{id_column}: estado incremental não será salvo")
+        return corrected
+
+    def _correct_incremental(self, dataset: str, df: pd.DataFrame, id_column: str, references: Tuple,
+                             global_stages: List[Stage], state: RowState) -> Tuple[pd.DataFrame, pd.Series, np.ndarray]:
+        """Corrige só as linhas tocadas e mescla com a saída anterior, na ordem da entrada
+
+        Retorna a saída mesclada e as chaves e hashes de todas as linhas da
+        entrada deduplicada (inclusive as descartadas), para o novo estado.
+        """
+        engine = self.engine
+        rows = len(df)
+
+        # Regras globais sobre a entrada inteira (deduplicação)
+        for stage in global_stages:
+            df = engine._run_stage(dataset, stage, df, {})
+        if not df[id_column].is_unique:
+            raise ValueError(f"Chaves repetidas em {dataset}.{id_column} após as regras globais")
+
+        # Linhas a corrigir: hash novo/alterado ou referência a chave tocada no dataset de referência
+        hashes = row_hashes(df)
+        same, was_present = state.compare(df[id_column], hashes)
+        dirty = ~same
+        for column, parent in DEPENDENCIES[dataset].items():
+            touched = self._touched.get(parent)
+            if touched is not None and len(touched) and column in df.columns:
+                dirty |= ReferenceIndex(touched).contains(df[column])
+
+        # Linhas mantidas vêm do CSV anterior (round_trip: floats voltam exatamente como gravados)
+        previous = pd.read_csv(self.output_path(dataset), float_precision="round_trip",
+                               **READ_OPTIONS.get(dataset, {}))
+        previous_rows = ReferenceIndex(previous[id_column]).lookup(df[id_column])
+        dirty |= was_present & (previous_rows < 0)
+        kept = ~dirty & was_present
+
+        # Demais regras apenas nas linhas tocadas, sem repetir as globais
+        selection = engine.rule_selection.get(dataset)
+        exclude = list((selection or {}).get("exclude") or [])
+        exclude += [rule.name for stage in global_stages for rule in stage.rules]
+        engine.rule_selection[dataset] = {"include": (selection or {}).get("include"), "exclude": exclude}
+        try:
+            recomputed = getattr(engine, f"correct_{dataset}")(df[dirty], *references, copy=False)
+        finally:
+            if selection is None:
+                engine.rule_selection.pop(dataset, None)
+            else:
+                engine.rule_selection[dataset] = selection
+
+        # Saída anterior das linhas mantidas + linhas recorrigidas, na ordem da entrada deduplicada
+        order = np.arange(len(df))
+        reused = previous.take(previous_rows[kept])
+        reused.index = df.index[kept]
+        positions = np.concatenate([order[kept], order[dirty][ReferenceIndex(
+            df[id_column][dirty]).lookup(recomputed[id_column])]])
+        merge_order = np.argsort(positions, kind='stable')
+        merged = pd.concat([reused, recomputed]).iloc[merge_order]
+
+        # Linha do CSV anterior de cada registro da saída (-1 = recorrigido), usada por save
+        sources = np.concatenate([previous_rows[kept], np.full(len(recomputed), -1)])[merge_order]
+        self._splices[dataset] = (sources, recomputed, len(previous))
+
+        # Chaves tocadas: recorrigidas ou que estavam na saída anterior e saíram
+        gone = ~ReferenceIndex(merged[id_column]).contains(previous[id_column])
+        self._touched[dataset] = np.concatenate([encode_keys(df[id_column][dirty]),
+                                                 encode_keys(previous[id_column][gone])])
+
+        # Log anterior reaproveitado para as chaves não recorrigidas (mantidas ou descartadas de novo)
+        log = self._log_frame()
+        self._reused_log[dataset] = ((log["dataset"] == dataset).to_numpy()
+                                     & ReferenceIndex(df[id_column][~dirty].astype(str)).contains(log["row_id"])
+                                     & ~log["correction_type"].isin(GLOBAL_CORRECTION_TYPES).to_numpy())
+
+        corrected, reused_rows = int(dirty.sum()), int((~dirty).sum())
+        self.stats[dataset] = {"linhas": rows, "corrigidas": corrected, "reaproveitadas": reused_rows}
+        self.logger.info(f"♻️ {dataset.upper()}: {corrected} linhas corrigidas, "
+                         f"{reused_rows} reaproveitadas da execução anterior")
+        return merged, df[id_column], hashes
+
+    def _log_frame(self) -> pd.DataFrame:
+        """Campos do log de auditoria anterior usados para decidir o que reaproveitar, como texto"""
+        if self._previous_log is None:
+            if os.path.exists(self.log_path):
+                self._previous_log = pd.read_csv(self.log_path, usecols=["dataset", "row_id", "correction_type"],
+                                                 dtype=str, keep_default_na=False)
+            else:
+                self._previous_log = pd.DataFrame(columns=["dataset", "row_id", "correction_type"], dtype=str)
+        return self._previous_log
+
+    def _previous_lines(self, path: str, rows: int, read, header: Optional[str] = None) -> np.ndarray:
+        """Registros de um CSV anterior como texto (relidos e formatados se não der para separar as linhas)
+
+        Com ``header``, um arquivo de cabeçalho diferente também é relido.
+        """
+        lines = read_csv_lines(path, rows)
+        if lines is None or (header is not None and lines[0] != header):
+            return csv_lines(read())
+        return lines[1]
+
+    def _save_dataset(self, dataset: str, corrected: pd.DataFrame):
+        """Grava o CSV corrigido, emendando as linhas mantidas do arquivo anterior"""
+        path = self.output_path(dataset)
+        splice = self._splices.get(dataset)
+        if splice is None:
+            corrected.to_csv(path, index=False)
+            return
+
+        sources, recomputed, previous_rows = splice
+        if np.array_equal(sources, np.arange(previous_rows)):
+            return  # mesmas linhas, na mesma ordem: o arquivo anterior continua valendo
+
+        previous = self._previous_lines(path, previous_rows, lambda: pd.read_csv(
+            path, float_precision="round_trip", **READ_OPTIONS.get(dataset, {})))
+        lines = np.empty(len(sources), dtype=object)
+        lines[sources >= 0] = previous[sources[sources >= 0]]
+        lines[sources < 0] = csv_lines(recomputed)
+        write_csv_lines(path, corrected.iloc[0:0].to_csv(index=False).rstrip("\n"), lines)
+
+    def _save_log(self):
+        """Grava o log: datasets não processados, depois, por dataset, entradas reaproveitadas e novas"""
+        log = self._log_frame()
+        previous = np.empty(0, dtype=object)
+        if len(log):
+            # Logs anteriores à coluna row_count têm uma linha por entrada
+            previous = self._previous_lines(self.log_path, len(log), lambda: pd.read_csv(
+                self.log_path, dtype=str, keep_default_na=False).reindex(columns=LOG_COLUMNS, fill_value="1"),
+                ",".join(LOG_COLUMNS))
+
+        current = self.engine.correction_log.to_frame()
+        parts = [previous[~log["dataset"].isin(list(self._reused_log)).to_numpy()]]
+        for dataset, reused in self._reused_log.items():
+            parts.append(previous[reused])
+            parts.append(csv_lines(current[current["dataset"] == dataset]))
+        write_csv_lines(self.log_path, ",".join(LOG_COLUMNS), np.concatenate(parts))
+
+    def save(self):
+        """Grava os CSVs corrigidos, o log de auditoria e, por último, os estados"""
+        os.makedirs(self.corrected_dir, exist_ok=True)
+        for dataset, corrected in self.results.items():
+            self._save_dataset(dataset, corrected)
+        self._save_log()
+        for dataset in self.results:
+            if dataset in self._states:
+                self._states[dataset].save(self.state_path(dataset))
+            elif os.path.exists(self.state_path(dataset)):
+                os.remove(self.state_path(dataset))
+        self.logger.info(f"✅ Correção incremental gravada em {self.corrected_dir}")
+
+def correct_directory(raw_dir: str, corrected_dir: str,
+                      engine: Optional[DataCorrectionEngine] = None) -> Dict[str, Dict[str, int]]:
+    """Corrige incrementalmente os datasets disponíveis em raw_dir"""
+    corrector = IncrementalCorrector(engine, corrected_dir)
+    raw = {name: os.path.join(raw_dir, f"{name}.csv") for name in READ_OPTIONS}
+    frames = {name: pd.read_csv(path, **READ_OPTIONS[name]) for name, path in raw.items() if os.path.exists(path)}
+
+    if "clientes" in frames:
+        corrector.correct_clientes(frames["clientes"])
+    if "produtos" in frames:
+        corrector.correct_produtos(frames["produtos"])
+    if "vendas" in frames and "clientes" in corrector.results and "produtos" in corrector.results:
+        corrector.correct_vendas(frames["vendas"], corrector.results["clientes"], corrector.results["produtos"])
+    if "logistica" in frames and "vendas" in corrector.results:
+        corrector.correct_logistica(frames["logistica"], corrector.results["vendas"])
+
+    corrector.save()
+    return corrector.stats
+
+
+if __name__ == "__main__":
+    # Uso: python src/incremental.py [data/raw] [data/corrected]
+    raw_dir = sys.argv[1] if len(sys.argv) > 1 else "data/raw"
+    corrected_dir = sys.argv[2] if len(sys.argv) > 2 else "data/corrected"
+
+    print(f"♻️ Correção incremental: {raw_dir} -> {corrected_dir}")
+    print(correct_directory(raw_dir, corrected_dir))
@@ -0,0 +1,90 @@
+"""
+🔑 Índice Compacto de Chaves - TechCommerce
+Conjunto de chaves em arrays int64 ordenados, usado por regras globais
+(deduplicação, referências órfãs) quando os dados chegam em blocos
+"""
+
+import pandas as pd
+import numpy as np
+from typing import List
+
+
+def encode_keys(keys) -> np.ndarray:
+    """Converte chaves em códigos int64
+
+    Chaves inteiras (inclusive floats integrais, como ids lidos com NaN na
+    coluna) são guardadas exatamente; as demais viram o hash de 64 bits do pandas.
+    """
+    if isinstance(keys, (pd.Series, pd.Index)):
+        keys = keys.to_numpy()
+    keys = np.asarray(keys)
+
+    if keys.dtype.kind in "biu":
+        return keys.astype(np.int64, copy=False)
+
+    if keys.dtype.kind == "f":
+        integral = np.isfinite(keys) & (np.floor(keys) == keys)
+        codes = np.zeros(len(keys), dtype=np.int64)
+        codes[integral] = keys[integral].astype(np.int64)
+        if not integral.all():
+            codes[~integral] = pd.util.hash_array(keys[~integral]).view(np.int64)
+        return codes
+
+    return pd.util.hash_array(keys.astype(object)).view(np.int64)
+
+
+class KeyIndex:
+    """Conjunto compacto de chaves (8 bytes por chave distinta)
+
+    As chaves ficam em "runs" ordenados e disjuntos; cada inserção cria um run
+    novo, que é mesclado com os anteriores enquanto eles não forem bem maiores,
+    mantendo O(log n) runs e custo amortizado O(n log n) para n chaves.
+    """
+
+    def __init__(self, keys=None):
+        self._runs: List[np.ndarray] = []
+        self._size = 0
+        if keys is not None:
+            self.add(keys)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _contains_codes(self, codes: np.ndarray) -> np.ndarray:
+        """Máscara de códigos já presentes no índice"""
+        found = np.zeros(len(codes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, codes)
+            positions[positions == len(run)] = 0
+            found |= run[positions] == codes
+        return found
+
+    def contains(self, keys) -> np.ndarray:
+        """Máscara booleana indicando quais chaves existem no índice"""
+        return self._contains_codes(encode_keys(keys))
+
+    def add(self, keys) -> np.ndarray:
+        """Insere as chaves e retorna a máscara das que eram novas
+
+        Apenas a primeira ocorrência de cada chave nova no lote é marcada, o
+        que equivale a ``duplicated(keep='first')`` acumulado entre lotes.
+        """
+        codes = encode_keys(keys)
+        new = np.zeros(len(codes), dtype=bool)
+        if not len(codes):
+            return new
+
+        unique_codes, first_positions = np.unique(codes, return_index=True)
+        unseen = ~self._contains_codes(unique_codes)
+        new[first_positions[unseen]] = True
+
+        if unseen.any():
+            self._insert_run(unique_codes[unseen])
+        return new
+
+    def _insert_run(self, run: np.ndarray):
+        """Adiciona um run ordenado e mescla com os anteriores de tamanho parecido"""
+        self._size += len(run)
+        while self._runs and len(self._runs[-1]) <= 2 * len(run):
+            run = np.sort(np.concatenate([self._runs.pop(), run]), kind="mergesort")
+        self._runs.append(run)
@@ -0,0 +1,124 @@
+"""
+🔗 Integridade Referencial - TechCommerce
+Índices ordenados das chaves das tabelas de referência, construídos uma vez
+por execução e reaproveitados por correct_vendas e correct_logistica
+"""
+
+import weakref
+import pandas as pd
+import numpy as np
+from typing import Dict, Tuple, Union
+
+from indice_chaves import KeyIndex, encode_keys
+
+# Chaves consultadas por bloco, limitando os temporários em tabelas muito grandes
+PROBE_BLOCK = 10_000_000
+
+# Chaves inteiras com intervalo até esse múltiplo do número de chaves usam uma tabela direta
+DENSE_SPAN_FACTOR = 4
+
+
+class ReferenceIndex:
+    """Chaves de uma tabela de referência ordenadas, com a posição da linha de cada uma
+
+    Cada chave aponta para sua última ocorrência, como em
+    ``dict(zip(chaves, valores))``. Consultas são buscas binárias vetorizadas
+    (anti-join sem tabela hash de objetos Python): 10M chaves ocupam 160 MB.
+    Ids quase contíguos são consultados por acesso direto a uma tabela.
+    """
+
+    def __init__(self, keys):
+        codes = encode_keys(keys)
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+
+        last = np.append(sorted_codes[1:] != sorted_codes[:-1], True) if len(codes) else np.empty(0, dtype=bool)
+        self._codes = sorted_codes[last]
+        self._positions = order[last]
+        self._dense = None
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def lookup(self, keys) -> np.ndarray:
+        """Posição na referência da linha de cada chave (-1 quando a chave não existe)"""
+        codes = encode_keys(keys)
+        positions = np.full(len(codes), -1, dtype=np.int64)
+        if not len(self._codes):
+            return positions
+
+        dense = self._dense_table()
+        for start in range(0, len(codes), PROBE_BLOCK):
+            block = codes[start:start + PROBE_BLOCK]
+            if dense is not None:
+                offsets = block - self._codes[0]
+                inside = (offsets >= 0) & (offsets < len(dense))
+                positions[start:start + PROBE_BLOCK][inside] = dense[offsets[inside]]
+                continue
+            slots = np.searchsorted(self._codes, block)
+            slots[slots == len(self._codes)] = 0
+            found = self._codes[slots] == block
+            positions[start:start + PROBE_BLOCK][found] = self._positions[slots[found]]
+        return positions
+
+    def _dense_table(self):
+        """Posição por chave indexada pelo deslocamento, quando as chaves são ids quase contíguos
+
+        Ids sequenciais (o caso das chaves primárias) cabem em uma tabela de
+        até DENSE_SPAN_FACTOR entradas por chave, e cada consulta vira um
+        acesso direto em vez de uma busca binária; chaves esparsas ou hashes
+        de texto continuam na busca binária.
+        """
+        if self._dense is None and len(self._codes):
+            span = int(self._codes[-1]) - int(self._codes[0]) + 1
+            if span <= DENSE_SPAN_FACTOR * len(self._codes):
+                self._dense = np.full(span, -1, dtype=np.int64)
+                self._dense[self._codes - self._codes[0]] = self._positions
+            else:
+                self._dense = np.empty(0, dtype=np.int64)
+        return self._dense if self._dense is not None and len(self._dense) else None
+
+    def contains(self, keys) -> np.ndarray:
+        """Máscara booleana indicando quais chaves existem na referência"""
+        return self.lookup(keys) >= 0
+
+
+class ReferentialIntegrity:
+    """Cache de índices de referência por (DataFrame, coluna)
+
+    O índice de um DataFrame é reaproveitado enquanto o mesmo objeto, com o
+    mesmo número de linhas, for passado de novo (por exemplo, as vendas
+    corrigidas consultadas pelas regras de logística ou por vários blocos);
+    a entrada some quando o DataFrame é coletado. Referências não devem ter
+    a coluna de chave alterada entre as chamadas.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[Tuple[int, str], Tuple[weakref.ref, int, ReferenceIndex]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def index(self, reference: Union[pd.DataFrame, KeyIndex, ReferenceIndex],
+              column: str) -> Union[KeyIndex, ReferenceIndex]:
+        """Índice das chaves da referência (índices prontos são devolvidos como estão)"""
+        if isinstance(reference, (KeyIndex, ReferenceIndex)):
+            return reference
+
+        key = (id(reference), column)
+        cached = self._indexes.get(key)
+        if cached is not None and cached[0]() is reference and cached[1] == len(reference):
+            return cached[2]
+
+        index = ReferenceIndex(reference[column])
+        self._indexes[key] = (weakref.ref(reference, lambda _: self._indexes.pop(key, None)),
+                              len(reference), index)
+        return index
+
+    def orphans(self, keys: pd.Series, reference, column: str) -> np.ndarray:
+        """Máscara das chaves sem correspondência na referência (anti-join)"""
+        return ~self.index(reference, column).contains(keys)
+
+    def clear(self):
+        """Descarta os índices construídos"""
+        self._indexes.clear()
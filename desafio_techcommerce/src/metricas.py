@@ -0,0 +1,202 @@
+"""
+📈 Métricas por Regra - TechCommerce
+Mede tempo de parede, tempo de CPU, linhas lidas/alteradas/removidas e pico
+de memória de cada regra de correção, por dataset, com exportação em
+JSON lines e no formato texto do Prometheus
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+METRIC_PREFIX = "techcommerce_rule"
+
+# (nome, tipo, descrição, campo) das séries exportadas para o Prometheus
+PROMETHEUS_SERIES = [
+    ("calls_total", "counter", "Execuções da regra", "calls"),
+    ("wall_seconds_total", "counter", "Tempo de parede acumulado da regra", "wall_time_s"),
+    ("cpu_seconds_total", "counter", "Tempo de CPU do processo acumulado durante a regra", "cpu_time_s"),
+    ("rows_scanned_total", "counter", "Linhas recebidas pela regra", "rows_scanned"),
+    ("rows_changed_total", "counter", "Entradas registradas no log pela regra", "rows_changed"),
+    ("rows_removed_total", "counter", "Linhas removidas pela regra", "rows_removed"),
+    ("peak_memory_bytes", "gauge", "Maior pico de memória acima do início da regra", "peak_memory_bytes"),
+]
+
+# Picos dos trechos medidos em aberto, para que medições aninhadas não se anulem
+_peak_stack: List[List[int]] = []
+
+
+class MemoryPeak:
+    """Pico de memória alocada (tracemalloc) acima do início de um trecho
+
+    Só mede quando o tracemalloc está ativo (``tracemalloc.start()``), pois
+    rastrear alocações deixa o código bem mais lento; caso contrário
+    ``delta`` fica None. Trechos aninhados são suportados: o pico do trecho
+    interno também conta para o externo.
+    """
+
+    def __init__(self):
+        self.delta: Optional[int] = None
+        self._tracing = False
+
+    def __enter__(self) -> "MemoryPeak":
+        self._tracing = tracemalloc.is_tracing()
+        if self._tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if _peak_stack:
+                _peak_stack[-1][1] = max(_peak_stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            _peak_stack.append([current, current])
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self._tracing:
+            return
+        start, peak = _peak_stack.pop()
+        if tracemalloc.is_tracing():
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        if _peak_stack:
+            _peak_stack[-1][1] = max(_peak_stack[-1][1], peak)
+        self.delta = peak - start
+
+
+class RuleMetrics:
+    """Acumulado das execuções de uma regra em um dataset"""
+
+    __slots__ = ("dataset", "rule", "calls", "wall_time_s", "cpu_time_s", "rows_scanned",
+                 "rows_changed", "rows_removed", "peak_memory_bytes")
+
+    def __init__(self, dataset: str, rule: str):
+        self.dataset = dataset
+        self.rule = rule
+        self.calls = 0
+        self.wall_time_s = 0.0
+        self.cpu_time_s = 0.0
+        self.rows_scanned = 0
+        self.rows_changed = 0
+        self.rows_removed = 0
+        self.peak_memory_bytes: Optional[int] = None
+
+    def add(self, calls: int, wall_time_s: float, cpu_time_s: float, rows_scanned: int,
+            rows_changed: int, rows_removed: int, peak_memory_bytes: Optional[int]):
+        """Soma uma ou mais execuções (o pico de memória fica com o maior)"""
+        self.calls += calls
+        self.wall_time_s += wall_time_s
+        self.cpu_time_s += cpu_time_s
+        self.rows_scanned += rows_scanned
+        self.rows_changed += rows_changed
+        self.rows_removed += rows_removed
+        if peak_memory_bytes is not None:
+            self.peak_memory_bytes = max(self.peak_memory_bytes or 0, peak_memory_bytes)
+
+    def to_dict(self) -> Dict:
+        """Campos da regra como dicionário"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class _Measurement:
+    """Medição em andamento de uma execução de regra (ver CorrectionMetrics.measure)"""
+
+    def __init__(self, metrics: "CorrectionMetrics", dataset: str, rule: str, rows_scanned: int):
+        self.metrics = metrics
+        self.dataset = dataset
+        self.rule = rule
+        self.rows_scanned = rows_scanned
+        self.rows_changed = 0
+        self.rows_removed = 0
+        self._memory = MemoryPeak()
+
+    def __enter__(self) -> "_Measurement":
+        self._memory.__enter__()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall_time_s = time.perf_counter() - self._wall
+        cpu_time_s = time.process_time() - self._cpu
+        self._memory.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.metrics.rule(self.dataset, self.rule).add(
+                1, wall_time_s, cpu_time_s, self.rows_scanned, self.rows_changed,
+                self.rows_removed, self._memory.delta)
+
+
+class CorrectionMetrics:
+    """Métricas das regras de correção, acumuladas por (dataset, regra)
+
+    ``rows_changed`` conta as entradas que a regra registrou no log de
+    correções (uma por linha e coluna alterada); ``rows_removed`` as linhas
+    que a regra descartou. O tempo de CPU é o do processo inteiro durante a
+    regra. As regras aparecem na ordem da primeira execução.
+    """
+
+    def __init__(self):
+        self._rules: Dict[Tuple[str, str], RuleMetrics] = {}
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def rule(self, dataset: str, rule: str) -> RuleMetrics:
+        """Métricas de uma regra, criadas na primeira consulta"""
+        metrics = self._rules.get((dataset, rule))
+        if metrics is None:
+            metrics = self._rules[(dataset, rule)] = RuleMetrics(dataset, rule)
+        return metrics
+
+    def measure(self, dataset: str, rule: str, rows_scanned: int) -> _Measurement:
+        """Contexto que mede uma execução da regra (preencha rows_changed e rows_removed nele)"""
+        return _Measurement(self, dataset, rule, rows_scanned)
+
+    def merge(self, other: "CorrectionMetrics"):
+        """Soma as métricas de outra instância (por exemplo, de uma partição)"""
+        for (dataset, rule), metrics in other._rules.items():
+            self.rule(dataset, rule).add(metrics.calls, metrics.wall_time_s, metrics.cpu_time_s,
+                                         metrics.rows_scanned, metrics.rows_changed,
+                                         metrics.rows_removed, metrics.peak_memory_bytes)
+
+    def clear(self):
+        """Descarta as métricas acumuladas"""
+        self._rules.clear()
+
+    def to_records(self) -> List[Dict]:
+        """Uma entrada por (dataset, regra)"""
+        return [metrics.to_dict() for metrics in self._rules.values()]
+
+    def to_prometheus(self) -> str:
+        """Métricas no formato texto de exposição do Prometheus"""
+        lines = []
+        for name, kind, description, field in PROMETHEUS_SERIES:
+            samples = [(metrics, getattr(metrics, field)) for metrics in self._rules.values()]
+            samples = [(metrics, value) for metrics, value in samples if value is not None]
+            if not samples:
+                continue
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for metrics, value in samples:
+                lines.append(f'{METRIC_PREFIX}_{name}{{dataset="{metrics.dataset}",rule="{metrics.rule}"}} '
+                             f'{value}')
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def save(self, path: str, format: str = "jsonl"):
+        """Grava as métricas: ``jsonl`` acrescenta uma linha por regra; ``prometheus`` sobrescreve"""
+        if format not in ("jsonl", "prometheus"):
+            raise ValueError(f"Formato de métricas inválido: {format} (use 'jsonl' ou 'prometheus')")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if format == "prometheus":
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(self.to_prometheus())
+            return
+
+        timestamp = datetime.now().isoformat()
+        with open(path, "a", encoding="utf-8") as handle:
+            for record in self.to_records():
+                handle.write(json.dumps({"timestamp": timestamp, **record}, ensure_ascii=False) + "\n")
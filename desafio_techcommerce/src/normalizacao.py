@@ -0,0 +1,70 @@
+"""
+📧 Normalização de Contatos - TechCommerce
+Corrige emails e telefones coluna a coluna, processando cada valor distinto
+uma única vez e validando o resultado com os padrões da engine
+"""
+
+import re
+import pandas as pd
+import numpy as np
+from typing import Callable, Tuple
+
+
+def factorize_exact(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """pd.factorize sem colisões: códigos por linha (-1 = ausente) e valores distintos
+
+    A tabela hash do pandas compara textos só até o primeiro NUL; as linhas
+    que colidem ganham cada uma um valor distinto próprio no fim da tabela.
+    """
+    originals = values.to_numpy(dtype=object)
+    textual = pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype)
+    if textual and not isinstance(values.dtype, pd.CategoricalDtype):
+        # Texto: o array de objetos já materializado é fatorado direto, sem a verificação de nulos da Series
+        codes, uniques = pd.factorize(originals)
+    else:
+        codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques, dtype=object)
+
+    present = np.flatnonzero(codes >= 0)
+    collided = present[originals[present] != uniques[codes[present]]]
+    if len(collided):
+        codes[collided] = len(uniques) + np.arange(len(collided))
+        uniques = np.concatenate([uniques, originals[collided]])
+    return codes, uniques
+
+
+class ContactNormalizer:
+    """Normalizador de emails e telefones por valor distinto
+
+    Aplica as funções escalares do DataCorrectionEngine
+    (_fix_common_email_errors e _fix_phone_format) uma vez por valor distinto
+    da coluna, valida cada resultado com email_pattern/phone_pattern e
+    espalha resultado e validade pelas linhas. Sem pyarrow os acessores .str
+    do pandas também são laços em Python, e encadear vários deles sai mais
+    caro que uma passada com as funções escalares.
+    """
+
+    def __init__(self, fix_email: Callable[[str], str], fix_phone: Callable[[str], str],
+                 email_pattern: re.Pattern, phone_pattern: re.Pattern):
+        self.fix_email = fix_email
+        self.fix_phone = fix_phone
+        self.email_pattern = email_pattern
+        self.phone_pattern = phone_pattern
+
+    def normalize_emails(self, emails: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+        """Emails corrigidos e máscara dos que passam no email_pattern (entrada em texto, sem nulos)"""
+        return self._by_distinct(emails, self.fix_email, self.email_pattern)
+
+    def normalize_phones(self, phones: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+        """Telefones corrigidos e máscara dos que passam no phone_pattern (entrada em texto, sem nulos)"""
+        return self._by_distinct(phones, self.fix_phone, self.phone_pattern)
+
+    def _by_distinct(self, values: pd.Series, fix: Callable[[str], str],
+                     pattern: re.Pattern) -> Tuple[pd.Series, np.ndarray]:
+        """Corrige e valida os valores distintos e espalha o resultado por códigos"""
+        codes, uniques = factorize_exact(values)
+        fixed = np.empty(len(uniques), dtype=object)
+        fixed[:] = [fix(value) for value in uniques]
+        match = pattern.match
+        valid = np.fromiter((match(value) is not None for value in fixed), dtype=bool, count=len(fixed))
+        return pd.Series(fixed[codes], index=values.index, dtype=object), valid[codes]
@@ -0,0 +1,189 @@
+"""
+⚡ Orquestração Assíncrona - TechCommerce
+Lê os datasets ao mesmo tempo (parsing em threads) e corrige cada um assim
+que suas entradas ficam prontas, como um grafo de dependências: clientes e
+produtos logo após a leitura, vendas com os índices de chaves dos dois e
+logística com as vendas corrigidas
+"""
+
+import asyncio
+import os
+import sys
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from armazenamento import EXTENSIONS, REFERENCE_COLUMNS, DatasetStorage, attach_columns, projected_columns
+from auditoria import CorrectionLog
+from correcao_vetorizada import VectorizedCorrectionEngine
+
+DATASETS = ("clientes", "produtos", "vendas", "logistica")
+
+# Datasets corrigidos de que cada correção depende (na ordem dos argumentos de correct_*)
+DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "clientes": (),
+    "produtos": (),
+    "vendas": ("clientes", "produtos"),
+    "logistica": ("vendas",),
+}
+
+# Chave de cada dataset consultada pelas correções dependentes
+KEY_COLUMNS = {"clientes": "id_cliente", "produtos": "id_produto", "vendas": "id_venda"}
+
+
+class AsyncCorrectionPipeline:
+    """Corrige os datasets de uma zona como um grafo de tarefas asyncio
+
+    Leituras, gravações e a construção dos índices de chaves rodam em um
+    pool de threads (o parser de CSV e as ordenações do numpy liberam o GIL).
+    As correções rodam uma de cada vez em uma thread própria, porque a engine
+    não é thread-safe, mas começam assim que suas entradas ficam prontas: a
+    correção de clientes não espera a leitura de vendas, e a leitura e a
+    gravação dos demais datasets continuam enquanto ela roda. Cada dataset
+    é corrigido com um log próprio, mesclado no fim na ordem clientes,
+    produtos, vendas, logística, então o log é o mesmo da execução sequencial.
+    """
+
+    def __init__(self, engine=None, io_workers: int = 4):
+        self.engine = engine or VectorizedCorrectionEngine()
+        self.logger = self.engine.logger
+        self.io_workers = io_workers
+        self.timings: List[Tuple[str, str, float, float]] = []
+        self._started = 0.0
+
+    async def run(self, raw: DatasetStorage, corrected: Optional[DatasetStorage] = None,
+                  datasets: Sequence[str] = DATASETS, log_name: str = "correction_log"
+                  ) -> Dict[str, pd.DataFrame]:
+        """Corrige os datasets pedidos e retorna os DataFrames corrigidos
+
+        Com ``corrected`` cada resultado é gravado assim que fica pronto e o
+        log de correções é gravado no fim; referências fora de ``datasets``
+        são lidas de lá apenas com as colunas consultadas, por memory map.
+        Os datasets brutos são lidos só com as colunas das regras e as demais
+        colunas são emendadas depois da correção, como em ``correct_storage``.
+        As linhas rejeitadas vão para a quarentena da engine, se ativa.
+        """
+        loop = asyncio.get_running_loop()
+        self.timings = []
+        self._started = time.perf_counter()
+        datasets = [dataset for dataset in DATASETS if dataset in datasets and raw.exists(dataset)]
+
+        with ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="io") as io, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="correcao") as correction:
+            reads = {dataset: asyncio.ensure_future(self._timed(
+                "leitura", dataset, loop.run_in_executor(io, self._read_raw, raw, dataset))) for dataset in datasets}
+
+            tasks: Dict[str, asyncio.Future] = {}
+            logs: Dict[str, CorrectionLog] = {}
+            writes: List[asyncio.Future] = []
+            for dataset in DATASETS:
+                references = []
+                for reference in DEPENDENCIES[dataset]:
+                    if reference in tasks:
+                        references.append(tasks[reference])
+                    elif dataset in datasets:
+                        references.append(asyncio.ensure_future(
+                            self._read_reference(loop, io, corrected, dataset, reference)))
+                if dataset in datasets:
+                    tasks[dataset] = asyncio.ensure_future(self._correct(
+                        loop, io, correction, dataset, raw, reads[dataset], references, logs, corrected, writes))
+
+            results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+            await asyncio.gather(*writes)
+
+        for dataset in datasets:
+            self.engine.correction_log.merge(logs[dataset])
+        if corrected is not None:
+            self.engine.save_correction_log(os.path.join(corrected.directory, log_name + EXTENSIONS[corrected.format]))
+        if getattr(self.engine, "quarantine", None) is not None:
+            self.engine.quarantine.flush()
+        return results
+
+    async def _timed(self, stage: str, dataset: str, awaitable):
+        """Aguarda uma etapa registrando início e fim (segundos desde o começo da execução)"""
+        start = time.perf_counter() - self._started
+        result = await awaitable
+        self.timings.append((stage, dataset, start, time.perf_counter() - self._started))
+        return result
+
+    def _read_raw(self, raw: DatasetStorage, dataset: str) -> Tuple[pd.DataFrame, List[str]]:
+        """Dataset bruto só com as colunas das regras, e todas as colunas do arquivo (roda no pool de I/O)"""
+        columns = raw.columns(dataset)
+        return raw.read(dataset, projected_columns(self.engine, dataset, columns)), columns
+
+    async def _read_reference(self, loop, io: ThreadPoolExecutor, corrected: Optional[DatasetStorage],
+                              dataset: str, reference: str) -> pd.DataFrame:
+        """Referência já corrigida em uma execução anterior, só com as colunas consultadas"""
+        if corrected is None or not corrected.exists(reference):
+            location = corrected.path(reference) if corrected is not None else "uma zona corrigida"
+            raise FileNotFoundError(f"{dataset} precisa de {reference} corrigido em {location}")
+        columns = REFERENCE_COLUMNS[dataset][reference]
+        return await self._timed("leitura", reference, loop.run_in_executor(
+            io, lambda: corrected.read(reference, columns, memory_map=True)))
+
+    async def _correct(self, loop, io: ThreadPoolExecutor, correction: ThreadPoolExecutor, dataset: str,
+                       raw: DatasetStorage, read: asyncio.Future, references: List[asyncio.Future], logs: Dict[str, CorrectionLog],
+                       storage: Optional[DatasetStorage], writes: List[asyncio.Future]) -> pd.DataFrame:
+        """Corrige o dataset quando a leitura e as referências ficam prontas
+
+        As colunas que as regras não usam são emendadas no pool de I/O.
+        Em seguida a gravação começa em segundo plano e o índice da chave é
+        construído fora da thread de correção, enquanto ela segue com outro
+        dataset; as correções dependentes recebem o índice já pronto (o cache
+        da integridade referencial devolve o mesmo índice para o DataFrame).
+        """
+        df, columns = await read
+        reference_frames = await asyncio.gather(*references)
+
+        method = getattr(self.engine, f"correct_{dataset}")
+        df_corrected, logs[dataset] = await self._timed("correção", dataset, loop.run_in_executor(
+            correction, self._correct_with_own_log, method, df, reference_frames))
+        if len(df_corrected.columns) < len(columns):
+            df_corrected = await self._timed("leitura", dataset, loop.run_in_executor(
+                io, attach_columns, df_corrected, raw, dataset, columns))
+
+        if storage is not None:
+            writes.append(asyncio.ensure_future(self._timed(
+                "gravação", dataset, loop.run_in_executor(io, storage.write, dataset, df_corrected))))
+
+        integrity = getattr(self.engine, "referential_integrity", None)
+        if integrity is not None and dataset in KEY_COLUMNS:
+            await self._timed("índice", dataset, loop.run_in_executor(
+                io, integrity.index, df_corrected, KEY_COLUMNS[dataset]))
+        return df_corrected
+
+    def _correct_with_own_log(self, method, df: pd.DataFrame, references: Sequence[pd.DataFrame]
+                              ) -> Tuple[pd.DataFrame, CorrectionLog]:
+        """Executa correct_* com um log só do dataset (roda na thread de correção)"""
+        main_log, self.engine.correction_log = self.engine.correction_log, CorrectionLog()
+        try:
+            corrected = method(df, *references, copy=False)
+            return corrected, self.engine.correction_log
+        finally:
+            self.engine.correction_log = main_log
+
+    def describe_timings(self) -> str:
+        """Linha do tempo da última execução (início e fim de cada etapa)"""
+        lines = []
+        for stage, dataset, start, end in sorted(self.timings, key=lambda timing: timing[2]):
+            lines.append(f"  {start:7.2f}s → {end:7.2f}s  {stage:<9} {dataset}")
+        return "\n".join(lines)
+
+
+def correct_concurrently(raw: DatasetStorage, corrected: Optional[DatasetStorage] = None, engine=None,
+                         datasets: Sequence[str] = DATASETS, io_workers: int = 4) -> Dict[str, pd.DataFrame]:
+    """Executa o AsyncCorrectionPipeline fora de um event loop (ver AsyncCorrectionPipeline.run)"""
+    return asyncio.run(AsyncCorrectionPipeline(engine, io_workers).run(raw, corrected, datasets))
+
+
+if __name__ == "__main__":
+    # Uso: python src/orquestracao.py [data/raw] [data/corrected]
+    raw_dir = sys.argv[1] if len(sys.argv) > 1 else "data/raw"
+    corrected_dir = sys.argv[2] if len(sys.argv) > 2 else "data/corrected"
+
+    print(f"⚡ Correção assíncrona: {raw_dir} -> {corrected_dir}")
+    pipeline = AsyncCorrectionPipeline()
+    results = asyncio.run(pipeline.run(DatasetStorage(raw_dir), DatasetStorage(corrected_dir, suffix="_corrected")))
+    print({dataset: len(df) for dataset, df in results.items()})
+    print(pipeline.describe_timings())
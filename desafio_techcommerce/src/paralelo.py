@@ -0,0 +1,273 @@
+"""
+🧵 Correção Paralela - TechCommerce
+Particiona os datasets por faixa de linhas ou por hash do id e aplica as regras
+de cada partição em um pool de processos, mesclando resultados e logs de forma
+determinística
+"""
+
+import logging
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from auditoria import CorrectionLog
+from correspondencia import FuzzyMatcher
+from correcao_vetorizada import VectorizedCorrectionEngine
+from indice_chaves import encode_keys
+from metricas import CorrectionMetrics
+from quarentena import QuarantineZone
+from regras import Stage
+
+PARTITIONING_MODES = ("range", "hash")
+
+
+class _PartitionEngine(VectorizedCorrectionEngine):
+    """Engine dos processos do pool: guarda o log de cada chamada de regra separadamente
+
+    Toda regra vetorizada registra seu lote com exatamente uma chamada de
+    _log_corrections (mesmo vazia), então o k-ésimo lote corresponde à mesma
+    etapa do pipeline em todas as partições.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.steps: List[CorrectionLog] = []
+
+        # O processo principal resume cada dataset; nas partições só avisos e erros
+        self.logger = logging.getLogger('DataCorrection.particao')
+        self.logger.setLevel(logging.WARNING)
+
+    def _log_corrections(self, dataset: str, row_ids, column, old_values, new_values,
+                         correction_type, row_counts=1):
+        """Registra o lote da regra em um log próprio da etapa"""
+        step = CorrectionLog()
+        step.extend(dataset, row_ids, column, old_values, new_values, correction_type, row_counts)
+        self.steps.append(step)
+
+    def _corrections_logged(self) -> int:
+        """Linhas corrigidas registradas nas etapas desta partição"""
+        return sum(step.rows() for step in self.steps)
+
+
+_WORKER_ENGINE: Optional[_PartitionEngine] = None
+
+
+def _correct_partition(method: str, partition: pd.DataFrame, references: Tuple, settings: Dict
+                       ) -> Tuple[pd.DataFrame, List[CorrectionLog], CorrectionMetrics,
+                                  Optional[QuarantineZone], Dict]:
+    """Executa um pipeline correct_* sobre uma partição (roda no processo do pool)
+
+    ``settings`` traz os atributos da engine principal que mudam as regras
+    (registro, seleção, modo do log, catálogo de categorias, resolvedor e
+    clientes fundidos) e uma zona de quarentena vazia, devolvida com as linhas
+    rejeitadas na partição. Os clientes fundidos voltam junto, já que a
+    resolução de entidades roda no pool quando o dataset vai inteiro.
+    """
+    global _WORKER_ENGINE
+    if _WORKER_ENGINE is None:
+        _WORKER_ENGINE = _PartitionEngine()
+
+    _WORKER_ENGINE.steps = []
+    _WORKER_ENGINE.metrics = CorrectionMetrics()
+    for name, value in settings.items():
+        setattr(_WORKER_ENGINE, name, value)
+    corrected = getattr(_WORKER_ENGINE, method)(partition, *references, copy=False)
+    return (corrected, _WORKER_ENGINE.steps, _WORKER_ENGINE.metrics, _WORKER_ENGINE.quarantine,
+            _WORKER_ENGINE.entity_merges)
+
+
+def partition_positions(df: pd.DataFrame, id_column: str, n_partitions: int,
+                        partitioning: str = "range") -> List[np.ndarray]:
+    """Divide as posições das linhas em partições por faixa ou por hash do id"""
+    if partitioning == "range":
+        return np.array_split(np.arange(len(df)), n_partitions)
+
+    buckets = pd.util.hash_array(encode_keys(df[id_column])) % np.uint64(n_partitions)
+    return [np.flatnonzero(buckets == bucket) for bucket in range(n_partitions)]
+
+
+class _PendingDataset:
+    """Partições de um dataset já submetidas ao pool"""
+
+    def __init__(self, dataset: str, index: pd.Index, futures: List[Future], prelog: CorrectionLog):
+        self.dataset = dataset
+        self.index = index
+        self.futures = futures
+        self.prelog = prelog
+
+
+class ParallelCorrectionEngine(VectorizedCorrectionEngine):
+    """Engine de correção paralela (mesmas regras do modo vetorizado)
+
+    As regras globais do início do plano (deduplicação) rodam no processo
+    principal; as demais são locais à linha (ou só consultam referências) e
+    rodam por partição, com o mesmo registro e a mesma seleção de regras.
+    Datasets com regra global depois de uma local são corrigidos sem particionar.
+    Em correct_all, clientes e produtos sem partições vão inteiros ao pool, cada
+    um como uma tarefa, e são corrigidos ao mesmo tempo.
+    As partições voltam na ordem original das linhas e os logs são mesclados
+    por etapa do pipeline e, dentro da etapa, na ordem das partições, o que
+    com particionamento por faixa reproduz exatamente o log sequencial. As
+    métricas das partições são somadas por regra (o tempo de parede vira a
+    soma do tempo gasto pelos processos).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, partitioning: str = "range",
+                 min_partition_rows: int = 50_000, fuzzy_matcher: Optional[FuzzyMatcher] = None,
+                 log_by_value: bool = False):
+        super().__init__(fuzzy_matcher, log_by_value)
+        if partitioning not in PARTITIONING_MODES:
+            raise ValueError(f"Particionamento inválido: {partitioning} (use {PARTITIONING_MODES})")
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.partitioning = partitioning
+        self.min_partition_rows = min_partition_rows
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self):
+        """Encerra o pool de processos"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Pool de processos criado na primeira utilização"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _n_partitions(self, n_rows: int) -> int:
+        """Número de partições (1 quando o dataset é pequeno demais para compensar)"""
+        return max(1, min(self.max_workers, n_rows // self.min_partition_rows))
+
+    def _parent_stages(self, dataset: str, df: pd.DataFrame) -> Optional[List[Stage]]:
+        """Estágios globais do início do plano (None se houver regra global mais adiante)"""
+        return self.plan(dataset, df.columns).leading_global_stages()
+
+    def _partitioned(self, dataset: str, df: pd.DataFrame) -> bool:
+        """Se o dataset será corrigido por partições"""
+        return self._n_partitions(len(df)) > 1 and self._parent_stages(dataset, df) is not None
+
+    def correct_clientes(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """Aplica correções de clientes em paralelo"""
+        if not self._partitioned("clientes", df):
+            return super().correct_clientes(df, copy=copy)
+        return self._collect(self._submit("clientes", df, "id_cliente", ()))
+
+    def correct_produtos(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """Aplica correções de produtos em paralelo"""
+        if not self._partitioned("produtos", df):
+            return super().correct_produtos(df, copy=copy)
+        return self._collect(self._submit("produtos", df, "id_produto", ()))
+
+    def correct_vendas(self, df: pd.DataFrame, df_clientes: pd.DataFrame,
+                       df_produtos: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """Aplica correções de vendas em paralelo (referências enviadas como índices de chaves)"""
+        if not self._partitioned("vendas", df):
+            return super().correct_vendas(df, df_clientes, df_produtos, copy=copy)
+
+        references = (self.referential_integrity.index(df_clientes, 'id_cliente'),
+                      self.referential_integrity.index(df_produtos, 'id_produto'))
+        return self._collect(self._submit("vendas", df, "id_venda", references))
+
+    def correct_logistica(self, df: pd.DataFrame, df_vendas: pd.DataFrame,
+                          copy: bool = True) -> pd.DataFrame:
+        """Aplica correções de logística em paralelo"""
+        if not self._partitioned("logistica", df):
+            return super().correct_logistica(df, df_vendas, copy=copy)
+
+        # Só id_venda e data_venda são consultados (órfãos e inferência de envio)
+        references = (df_vendas[['id_venda', 'data_venda']],)
+        return self._collect(self._submit("logistica", df, "id_entrega", references))
+
+    def correct_all(self, df_clientes: pd.DataFrame, df_produtos: pd.DataFrame,
+                    df_vendas: pd.DataFrame, df_logistica: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Corrige os quatro datasets: clientes e produtos juntos, depois vendas e logística
+
+        Clientes e produtos são independentes: os dois são submetidos ao pool
+        antes de qualquer espera, particionados ou, se não compensar, inteiros
+        em uma única tarefa cada.
+        """
+        pending = [self._submit(dataset, df, id_column, (), whole=not self._partitioned(dataset, df))
+                   for dataset, df, id_column in [("clientes", df_clientes, "id_cliente"),
+                                                  ("produtos", df_produtos, "id_produto")]]
+
+        # Coleta na ordem de submissão para que o log siga a ordem clientes, produtos
+        results = {item.dataset: self._collect(item) for item in pending}
+
+        results["vendas"] = self.correct_vendas(df_vendas, results["clientes"], results["produtos"])
+        results["logistica"] = self.correct_logistica(df_logistica, results["vendas"])
+        return results
+
+    def _submit(self, dataset: str, df: pd.DataFrame, id_column: str,
+                references: Tuple, whole: bool = False) -> _PendingDataset:
+        """Particiona o dataset e envia cada partição ao pool (com whole, o dataset inteiro e o plano todo)"""
+        self.logger.info(f"🔧 Iniciando correções paralelas para dataset {dataset.upper()}")
+
+        # Regras globais (deduplicação) antes de particionar, com log próprio para mesclar na ordem certa
+        prelog = CorrectionLog()
+        parent_stages = [] if whole else self._parent_stages(dataset, df)
+        main_log, self.correction_log = self.correction_log, prelog
+        try:
+            for stage in parent_stages:
+                df = self._run_stage(dataset, stage, df, {})
+        finally:
+            self.correction_log = main_log
+
+        # As partições rodam o restante do plano
+        selection = dict(self.rule_selection.get(dataset, {}))
+        selection["exclude"] = list(selection.get("exclude") or []) + \
+            [rule.name for stage in parent_stages for rule in stage.rules]
+
+        settings = {"rule_registry": self.rule_registry, "rule_selection": {dataset: selection},
+                    "log_by_value": self.log_by_value, "category_keywords": self.category_keywords,
+                    "entity_resolver": self.entity_resolver, "entity_merges": self.entity_merges,
+                    "quarantine": self.quarantine.spawn() if self.quarantine is not None else None}
+        n_partitions = 1 if whole else self._n_partitions(len(df))
+        futures = []
+        for positions in partition_positions(df, id_column, n_partitions, self.partitioning):
+            # Índice posicional para recompor a ordem original após a correção
+            partition = df.take(positions)
+            partition.index = positions
+            futures.append(self._pool().submit(_correct_partition, f"correct_{dataset}", partition,
+                                               references, settings))
+
+        return _PendingDataset(dataset, df.index, futures, prelog)
+
+    def _collect(self, pending: _PendingDataset) -> pd.DataFrame:
+        """Aguarda as partições, recompõe o DataFrame e mescla os logs por etapa"""
+        results = [future.result() for future in pending.futures]
+
+        corrections = self.correction_log.rows()
+        self.correction_log.merge(pending.prelog)
+        steps = [partition_steps for _, partition_steps, _, _, _ in results]
+        for step in range(max(len(partition_steps) for partition_steps in steps)):
+            for partition_steps in steps:
+                if step < len(partition_steps):
+                    self.correction_log.merge(partition_steps[step])
+
+        for _, _, partition_metrics, partition_quarantine, entity_merges in results:
+            self.metrics.merge(partition_metrics)
+            if partition_quarantine is not None:
+                self.quarantine.merge(partition_quarantine)
+            self.entity_merges.update(entity_merges)
+
+        df_corrected = pd.concat([corrected for corrected, _, _, _, _ in results])
+        positions = df_corrected.index.to_numpy()
+        if self.partitioning == "hash":
+            order = np.argsort(positions, kind='stable')
+            df_corrected = df_corrected.take(order)
+            positions = positions[order]
+        df_corrected.index = pending.index[positions]
+
+        self.logger.info(f"✅ Correções aplicadas em {pending.dataset.upper()} com "
+                         f"{len(results)} partições: {self.correction_log.rows() - corrections} alterações")
+        return df_corrected
@@ -0,0 +1,359 @@
+"""
+🔬 Perfil de Qualidade - TechCommerce
+Mede completude, unicidade, validade, faixa e integridade referencial dos
+quatro datasets em uma única passada por coluna: cada coluna de texto é
+fatorada uma vez e as verificações rodam sobre os valores distintos; cada
+coluna numérica é convertida uma vez e as verificações são máscaras numpy
+"""
+
+import json
+import os
+import re
+import pandas as pd
+import numpy as np
+from datetime import date
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from integridade import ReferenceIndex
+from normalizacao import factorize_exact
+
+DATASETS = ("clientes", "produtos", "vendas", "logistica")
+
+# Formato de data da política de governança (YYYY-MM-DD)
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+
+# Dimensões da política de qualidade medidas pelo perfil
+DIMENSIONS = ("completude", "unicidade", "validade", "faixa", "integridade")
+
+
+class ColumnCheck:
+    """Verificações declaradas para uma coluna
+
+    ``required`` mede a completude (ausente ou só espaços conta como vazio);
+    ``pattern``, ``allowed`` e ``date`` a validade dos valores preenchidos;
+    ``minimum``, ``maximum`` e ``not_future`` (datas) a faixa.
+    """
+
+    def __init__(self, required: bool = False, pattern: Optional[str] = None,
+                 allowed: Optional[Sequence] = None, date: bool = False,
+                 minimum: Optional[float] = None, maximum: Optional[float] = None,
+                 not_future: bool = False):
+        self.required = required
+        self.pattern = pattern
+        self.allowed = list(allowed) if allowed is not None else None
+        self.date = date
+        self.minimum = minimum
+        self.maximum = maximum
+        self.not_future = not_future
+
+    def __repr__(self) -> str:
+        fields = {name: value for name, value in vars(self).items() if value not in (None, False)}
+        return f"ColumnCheck({', '.join(f'{name}={value!r}' for name, value in fields.items())})"
+
+    @property
+    def numeric(self) -> bool:
+        """Se a coluna é verificada como número (limites de faixa)"""
+        return self.minimum is not None or self.maximum is not None
+
+
+class DatasetChecks:
+    """Verificações de um dataset: chave primária, chaves únicas, colunas e referências
+
+    ``references`` mapeia a coluna para (dataset, coluna) referenciados.
+    """
+
+    def __init__(self, key: str, columns: Dict[str, ColumnCheck], unique: Sequence[Sequence[str]] = (),
+                 references: Optional[Dict[str, Tuple[str, str]]] = None):
+        self.key = key
+        self.columns = columns
+        self.unique = [list(key_columns) for key_columns in unique] or [[key]]
+        self.references = references or {}
+
+
+def default_checks(engine=None) -> Dict[str, DatasetChecks]:
+    """Verificações da política de governança, com as listas de valores válidos da engine"""
+    if engine is None:
+        # Import tardio: só as listas de referência da engine são usadas
+        from correcao_automatica import DataCorrectionEngine
+        engine = DataCorrectionEngine()
+
+    email = engine.email_pattern.pattern
+    phone = engine.phone_pattern.pattern
+    return {
+        "clientes": DatasetChecks("id_cliente", {
+            "id_cliente": ColumnCheck(required=True),
+            "nome": ColumnCheck(required=True),
+            "email": ColumnCheck(required=True, pattern=email),
+            "telefone": ColumnCheck(required=True, pattern=phone),
+            "data_nascimento": ColumnCheck(date=True, not_future=True),
+            "estado": ColumnCheck(required=True, allowed=engine.valid_states),
+            "data_cadastro": ColumnCheck(date=True, not_future=True),
+        }),
+        "produtos": DatasetChecks("id_produto", {
+            "id_produto": ColumnCheck(required=True),
+            "nome_produto": ColumnCheck(required=True),
+            "categoria": ColumnCheck(required=True, allowed=engine.valid_categories),
+            "preco": ColumnCheck(required=True, minimum=0),
+            "estoque": ColumnCheck(minimum=0),
+            "data_criacao": ColumnCheck(date=True, not_future=True),
+        }, unique=[["id_produto"], ["nome_produto", "categoria"]]),
+        "vendas": DatasetChecks("id_venda", {
+            "id_venda": ColumnCheck(required=True),
+            "id_cliente": ColumnCheck(required=True),
+            "id_produto": ColumnCheck(required=True),
+            "quantidade": ColumnCheck(required=True, minimum=1),
+            "valor_unitario": ColumnCheck(minimum=0),
+            "valor_total": ColumnCheck(required=True, minimum=0),
+            "data_venda": ColumnCheck(required=True, date=True, not_future=True),
+            "status": ColumnCheck(required=True, allowed=engine.valid_status_venda),
+        }, references={"id_cliente": ("clientes", "id_cliente"), "id_produto": ("produtos", "id_produto")}),
+        "logistica": DatasetChecks("id_entrega", {
+            "id_entrega": ColumnCheck(required=True),
+            "id_venda": ColumnCheck(required=True),
+            "transportadora": ColumnCheck(required=True),
+            "data_envio": ColumnCheck(date=True),
+            "data_entrega_prevista": ColumnCheck(date=True),
+            "data_entrega_real": ColumnCheck(date=True),
+            "status_entrega": ColumnCheck(required=True, allowed=engine.valid_status_entrega),
+        }, references={"id_venda": ("vendas", "id_venda")}),
+    }
+
+
+class QualityProfile:
+    """Resultado do perfil: uma métrica por (dataset, coluna, verificação)
+
+    Cada métrica traz a dimensão da política, as linhas avaliadas, as que
+    falharam, a taxa de conformidade e uma amostra das chaves primárias das
+    linhas que falharam.
+    """
+
+    def __init__(self, metrics: List[Dict], rows: Dict[str, int]):
+        self.metrics = metrics
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.metrics)
+
+    def failures(self) -> List[Dict]:
+        """Métricas com alguma linha fora da regra"""
+        return [metric for metric in self.metrics if metric["failed"]]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Menor taxa de conformidade por dataset e dimensão"""
+        summary: Dict[str, Dict[str, float]] = {}
+        for metric in self.metrics:
+            rates = summary.setdefault(metric["dataset"], {})
+            rates[metric["dimension"]] = min(rates.get(metric["dimension"], 1.0), metric["rate"])
+        return summary
+
+    def to_frame(self) -> pd.DataFrame:
+        """Métricas como DataFrame (uma linha por verificação)"""
+        return pd.DataFrame(self.metrics, columns=["dataset", "column", "dimension", "check", "evaluated",
+                                                   "failed", "rate", "sample_keys"])
+
+    def to_dict(self) -> Dict:
+        """Resultado serializável em JSON"""
+        return {"rows": self.rows, "metrics": self.metrics}
+
+    def save(self, path: str):
+        """Grava o perfil em JSON"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+
+
+class QualityProfiler:
+    """Calcula o perfil de qualidade dos datasets em uma passada por coluna
+
+    Colunas de texto (e categóricas) são fatoradas uma única vez; vazio,
+    regex, domínio, formato e limite de datas são avaliados por valor
+    distinto e contados pelos códigos com um bincount. Colunas numéricas
+    são convertidas uma vez e avaliadas com máscaras. Chaves únicas reusam
+    os códigos já calculados para a coluna, e referências são buscas no
+    índice ordenado das chaves do dataset referenciado.
+    """
+
+    def __init__(self, checks: Optional[Dict[str, DatasetChecks]] = None, sample_size: int = 5,
+                 today: Optional[date] = None):
+        self.checks = checks if checks is not None else default_checks()
+        self.sample_size = sample_size
+        self.today = today
+
+    def profile(self, frames: Dict[str, pd.DataFrame]) -> QualityProfile:
+        """Perfil dos datasets informados (referências só são verificadas se o dataset referenciado veio junto)"""
+        metrics: List[Dict] = []
+        rows = {}
+        for dataset in [name for name in DATASETS if name in frames] + \
+                [name for name in frames if name not in DATASETS]:
+            rows[dataset] = len(frames[dataset])
+            metrics.extend(self.profile_dataset(dataset, frames[dataset], frames))
+        return QualityProfile(metrics, rows)
+
+    def profile_dataset(self, dataset: str, df: pd.DataFrame,
+                        references: Optional[Dict[str, pd.DataFrame]] = None) -> List[Dict]:
+        """Métricas de um dataset; ``references`` traz os datasets referenciados pelas suas colunas"""
+        return [metric for _, _, compute in self.profile_units(dataset, df, references) for metric in compute()]
+
+    def profile_units(self, dataset: str, df: pd.DataFrame, references: Optional[Dict[str, pd.DataFrame]] = None
+                      ) -> List[Tuple[str, List[str], Callable[[], List[Dict]]]]:
+        """Partes independentes do perfil do dataset: (nome, colunas lidas, cálculo das métricas)
+
+        As colunas lidas vêm como ``dataset.coluna`` (``dataset.@index`` quando
+        a chave primária não está no DataFrame): as métricas de uma parte só
+        mudam se alguma delas mudar. Executadas em ordem, as partes reaproveitam
+        a fatoração das colunas já perfiladas.
+        """
+        checks = self.checks.get(dataset)
+        if checks is None:
+            return []
+
+        key_label = f"{dataset}.{checks.key}" if checks.key in df.columns else f"{dataset}.@index"
+        keys = df[checks.key] if checks.key in df.columns else pd.Series(df.index, index=df.index)
+        codes: Dict[str, np.ndarray] = {}
+        units = []
+        for column, check in checks.columns.items():
+            if column in df.columns:
+                units.append((f"column:{column}", [f"{dataset}.{column}", key_label],
+                              partial(self._profile_column, dataset, df[column], column, check, keys, codes)))
+
+        for key_columns in checks.unique:
+            if all(column in df.columns for column in key_columns):
+                units.append((f"unique:{'+'.join(key_columns)}",
+                              [f"{dataset}.{column}" for column in key_columns] + [key_label],
+                              lambda key_columns=key_columns: [self._uniqueness(dataset, df, key_columns, keys,
+                                                                                codes)]))
+
+        for column, (reference, reference_column) in checks.references.items():
+            frame = (references or {}).get(reference)
+            if column in df.columns and frame is not None and reference_column in frame.columns:
+                units.append((f"reference:{column}",
+                              [f"{dataset}.{column}", f"{reference}.{reference_column}", key_label],
+                              lambda column=column, values=frame[reference_column]: [
+                                  self._reference(dataset, df[column], column, values, keys)]))
+        return units
+
+    def _metric(self, dataset: str, column: str, dimension: str, check: str, evaluated: int,
+                failing: np.ndarray, keys: pd.Series) -> Dict:
+        """Métrica de uma verificação a partir da máscara das linhas que falharam"""
+        positions = np.flatnonzero(failing)
+        failed = len(positions)
+        return {
+            "dataset": dataset,
+            "column": column,
+            "dimension": dimension,
+            "check": check,
+            "evaluated": int(evaluated),
+            "failed": failed,
+            "rate": round(1 - failed / evaluated, 6) if evaluated else 1.0,
+            "sample_keys": keys.iloc[positions[:self.sample_size]].tolist(),
+        }
+
+    def _profile_column(self, dataset: str, values: pd.Series, column: str, check: ColumnCheck,
+                        keys: pd.Series, codes: Dict[str, np.ndarray]) -> List[Dict]:
+        """Todas as verificações da coluna a partir de uma única fatoração (ou conversão numérica)"""
+        textual = check.pattern is not None or check.allowed is not None or check.date
+        if check.numeric or (pd.api.types.is_numeric_dtype(values.dtype) and not textual):
+            return self._profile_numeric(dataset, values, column, check, keys, codes)
+
+        column_codes, uniques = factorize_exact(values)
+        codes[column] = column_codes
+
+        # Tabelas por valor distinto; a última posição representa o valor ausente
+        distinct = pd.Series(np.append(uniques, None), dtype=object)
+        text = distinct.iloc[:-1].astype(str).str.strip()
+        blank = np.append((text == "").to_numpy(), True)
+        row_codes = np.where(column_codes < 0, len(uniques), column_codes)
+
+        metrics = []
+        if check.required:
+            metrics.append(self._metric(dataset, column, "completude", "not_null", len(values),
+                                        blank[row_codes], keys))
+
+        filled = ~blank[row_codes]
+        evaluated = int(filled.sum())
+        invalid = []
+        if check.pattern is not None:
+            invalid.append(("pattern", ~self._matches(text, check.pattern)))
+        if check.allowed is not None:
+            invalid.append(("allowed", ~text.isin([str(value) for value in check.allowed]).to_numpy()))
+        if check.date or check.not_future:
+            parsed = pd.to_datetime(text.where(text.str.match(DATE_PATTERN)), format="%Y-%m-%d", errors="coerce")
+            if check.date:
+                invalid.append(("date", parsed.isna().to_numpy()))
+            if check.not_future:
+                today = pd.Timestamp(self.today or date.today())
+                future = (parsed > today).to_numpy(dtype=bool, na_value=False)
+                metrics.append(self._metric(dataset, column, "faixa", "not_future", evaluated,
+                                            np.append(future, False)[row_codes], keys))
+
+        for name, bad in invalid:
+            metrics.append(self._metric(dataset, column, "validade", name, evaluated,
+                                        np.append(bad & ~blank[:-1], False)[row_codes], keys))
+        return metrics
+
+    def _profile_numeric(self, dataset: str, values: pd.Series, column: str, check: ColumnCheck,
+                         keys: pd.Series, codes: Dict[str, np.ndarray]) -> List[Dict]:
+        """Verificações de uma coluna numérica sobre um único array float"""
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            missing = np.isnan(numbers)
+            not_numeric = np.zeros(len(values), dtype=bool)
+        else:
+            # Texto: cada valor distinto convertido uma vez; vazio conta como ausente
+            column_codes, uniques = factorize_exact(values)
+            codes[column] = column_codes
+            text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+            converted = pd.to_numeric(text.where(text != ""), errors="coerce").to_numpy(dtype=np.float64)
+            row_codes = np.where(column_codes < 0, len(uniques), column_codes)
+            numbers = np.append(converted, np.nan)[row_codes]
+            missing = np.append((text == "").to_numpy(), True)[row_codes]
+            not_numeric = np.isnan(numbers) & ~missing
+
+        metrics = []
+        if check.required:
+            metrics.append(self._metric(dataset, column, "completude", "not_null", len(values), missing, keys))
+
+        evaluated = len(values) - int(missing.sum())
+        if not_numeric.any():
+            metrics.append(self._metric(dataset, column, "validade", "numeric", evaluated, not_numeric, keys))
+        with np.errstate(invalid="ignore"):
+            if check.minimum is not None:
+                metrics.append(self._metric(dataset, column, "faixa", "minimum", evaluated,
+                                            numbers < check.minimum, keys))
+            if check.maximum is not None:
+                metrics.append(self._metric(dataset, column, "faixa", "maximum", evaluated,
+                                            numbers > check.maximum, keys))
+        return metrics
+
+    def _matches(self, text: pd.Series, pattern: str) -> np.ndarray:
+        """Se cada valor distinto casa com a regex inteira"""
+        compiled = re.compile(pattern)
+        return np.fromiter((compiled.fullmatch(value) is not None for value in text.tolist()), dtype=bool,
+                           count=len(text))
+
+    def _uniqueness(self, dataset: str, df: pd.DataFrame, key_columns: List[str], keys: pd.Series,
+                    codes: Dict[str, np.ndarray]) -> Dict:
+        """Linhas que repetem uma chave já vista (ausentes contam como um valor, como em duplicated)"""
+        if len(key_columns) == 1 and key_columns[0] not in codes:
+            duplicated = df[key_columns[0]].duplicated().to_numpy()
+        else:
+            combined = None
+            for column in key_columns:
+                column_codes = codes.get(column)
+                if column_codes is None:
+                    column_codes = pd.factorize(df[column])[0]
+                column_codes = np.where(column_codes < 0, column_codes.max(initial=-1) + 1, column_codes)
+                if combined is None:
+                    combined = column_codes.astype(np.int64)
+                else:
+                    combined = pd.factorize(combined * (int(column_codes.max(initial=0)) + 1) + column_codes)[0]
+            duplicated = pd.Series(combined).duplicated().to_numpy()
+        return self._metric(dataset, "+".join(key_columns), "unicidade", "unique", len(df), duplicated, keys)
+
+    def _reference(self, dataset: str, values: pd.Series, column: str, reference: pd.Series,
+                   keys: pd.Series) -> Dict:
+        """Chaves preenchidas sem correspondência no dataset referenciado (órfãs)"""
+        filled = values.notna().to_numpy()
+        orphan = filled & ~ReferenceIndex(reference).contains(values)
+        return self._metric(dataset, column, "integridade", "reference", int(filled.sum()), orphan, keys)
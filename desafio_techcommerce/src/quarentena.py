@@ -0,0 +1,275 @@
+"""
+🚧 Zona de Quarentena - TechCommerce
+Recebe em lote as linhas rejeitadas pelas regras de correção (referências
+órfãs, datas não reconhecidas, contatos inválidos) com o código do motivo,
+grava cada execução em data/quarantine/dataset=<dataset>/run=<execução>/ em
+formato colunar e reexecuta as correções só nessas linhas depois que as
+referências forem corrigidas
+"""
+
+import json
+import logging
+import os
+import sys
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from armazenamento import (EXTENSIONS, READ_OPTIONS, REFERENCE_COLUMNS, DatasetStorage, _pyarrow,
+                           read_frame, write_frame)
+
+QUARANTINE_DIR = "data/quarantine"
+
+DATASETS = ("clientes", "produtos", "vendas", "logistica")
+
+# Códigos de motivo. Linhas com motivo de remoção saem da saída corrigida e podem
+# ser reprocessadas (replay); as demais continuam na saída e ficam aqui para revisão
+REASONS: Dict[str, str] = {
+    "ORPHAN_REFERENCE": "referência a registro inexistente (linha removida da saída)",
+    "UNPARSEABLE_DATE": "data presente mas não reconhecida (valor original mantido na saída)",
+    "INVALID_EMAIL": "email fora do padrão mesmo após a correção (valor corrigido mantido na saída)",
+    "INVALID_PHONE": "telefone fora do padrão mesmo após a correção (valor corrigido mantido na saída)",
+}
+REMOVAL_REASONS = ("ORPHAN_REFERENCE",)
+
+# Colunas acrescentadas às linhas em quarentena (a execução vem da partição, na leitura)
+REASON_COLUMN = "quarentena_motivo"
+FIELD_COLUMN = "quarentena_coluna"
+RUN_COLUMN = "quarentena_execucao"
+QUARANTINE_COLUMNS = (REASON_COLUMN, FIELD_COLUMN, RUN_COLUMN)
+
+
+def default_format() -> str:
+    """Parquet quando o pyarrow está instalado; senão CSV"""
+    try:
+        _pyarrow("parquet")
+    except ImportError:
+        return "csv"
+    return "parquet"
+
+
+def new_run_id() -> str:
+    """Identificador de execução ordenável pelo horário (ex.: 20240115T103000123456)"""
+    return datetime.now().strftime("%Y%m%dT%H%M%S%f")
+
+
+class QuarantineZone:
+    """Linhas rejeitadas pelas regras, particionadas por dataset e execução
+
+    ``route`` é chamado uma vez por regra com as posições da máscara de
+    rejeição e só guarda essas linhas (um ``take``); nada é convertido nem
+    gravado no caminho das regras. ``flush`` grava as linhas pendentes de
+    cada dataset em ``dataset=<dataset>/run=<run_id>/part-NNNNN`` (Parquet
+    com motivo e coluna como categorias quando há pyarrow, CSV caso
+    contrário) e o manifesto da execução em ``_runs/<run_id>.json``.
+    """
+
+    def __init__(self, directory: str = QUARANTINE_DIR, format: Optional[str] = None,
+                 run_id: Optional[str] = None, replay_of: Optional[str] = None):
+        format = format or default_format()
+        if format not in EXTENSIONS:
+            raise ValueError(f"Formato inválido: {format} (use {tuple(EXTENSIONS)})")
+        if format != "csv":
+            _pyarrow(format)
+
+        self.directory = directory
+        self.format = format
+        self.run_id = run_id or new_run_id()
+        self.replay_of = replay_of
+        self.logger = logging.getLogger('DataCorrection')
+
+        # Linhas gravadas nesta execução, por dataset
+        self.counts: Dict[str, int] = {}
+        self._pending: Dict[str, List[Tuple[pd.DataFrame, str, object]]] = {}
+
+    def __repr__(self) -> str:
+        return f"QuarantineZone({self.directory!r}, {self.format!r}, run_id={self.run_id!r})"
+
+    def __len__(self) -> int:
+        return self.pending()
+
+    def route(self, dataset: str, df: pd.DataFrame, positions, reason: str, columns):
+        """Guarda as linhas das posições dadas com o motivo e a coluna (ou uma por linha)"""
+        if reason not in REASONS:
+            raise ValueError(f"Motivo de quarentena inválido: {reason} (use {list(REASONS)})")
+        self._pending.setdefault(dataset, []).append((df.take(positions), reason, columns))
+
+    def pending(self, dataset: Optional[str] = None) -> int:
+        """Linhas ainda não gravadas (de um dataset ou de todos)"""
+        datasets = [dataset] if dataset is not None else list(self._pending)
+        return sum(len(rows) for name in datasets for rows, _, _ in self._pending.get(name, []))
+
+    def spawn(self) -> "QuarantineZone":
+        """Zona vazia da mesma execução (para processos do pool, mesclada depois com ``merge``)"""
+        return QuarantineZone(self.directory, self.format, self.run_id, self.replay_of)
+
+    def merge(self, other: "QuarantineZone"):
+        """Acrescenta as linhas pendentes de outra zona"""
+        for dataset, batches in other._pending.items():
+            self._pending.setdefault(dataset, []).extend(batches)
+
+    def frame(self, dataset: str) -> pd.DataFrame:
+        """Linhas pendentes do dataset com as colunas de motivo e coluna rejeitada"""
+        parts = [rows.reset_index(drop=True).assign(**{REASON_COLUMN: reason, FIELD_COLUMN: columns})
+                 for rows, reason, columns in self._pending.get(dataset, []) if len(rows)]
+        if not parts:
+            return pd.DataFrame(columns=[REASON_COLUMN, FIELD_COLUMN])
+        df = pd.concat(parts, ignore_index=True)
+        return df.astype({REASON_COLUMN: "category", FIELD_COLUMN: "category"})
+
+    def flush(self) -> Dict[str, str]:
+        """Grava as linhas pendentes e o manifesto da execução; retorna os arquivos por dataset"""
+        written = {}
+        for dataset in list(self._pending):
+            df = self.frame(dataset)
+            if len(df):
+                path = self._next_part(dataset)
+                temporary = path + ".tmp"
+                write_frame(df, temporary, self.format)
+                os.replace(temporary, path)
+                self.counts[dataset] = self.counts.get(dataset, 0) + len(df)
+                written[dataset] = path
+                self.logger.info(f"🚧 {len(df)} linhas de {dataset} em quarentena: {path}")
+        self._pending.clear()
+
+        # Replays sempre gravam o manifesto, que marca a execução de origem como reprocessada
+        if written or self.replay_of is not None:
+            self._save_manifest()
+        return written
+
+    def partition(self, dataset: str, run_id: Optional[str] = None) -> str:
+        """Diretório da partição do dataset em uma execução (padrão: a desta zona)"""
+        return os.path.join(self.directory, f"dataset={dataset}", f"run={run_id or self.run_id}")
+
+    def runs(self) -> List[Dict]:
+        """Manifestos das execuções gravadas, da mais antiga para a mais recente"""
+        manifests = os.path.join(self.directory, "_runs")
+        if not os.path.isdir(manifests):
+            return []
+        runs = []
+        for name in sorted(os.listdir(manifests)):
+            if name.endswith(".json"):
+                with open(os.path.join(manifests, name), encoding="utf-8") as file:
+                    runs.append(json.load(file))
+        return runs
+
+    def pending_run(self) -> Optional[str]:
+        """Execução mais recente ainda não reprocessada por um replay"""
+        runs = self.runs()
+        replayed = {run.get("replay_of") for run in runs}
+        candidates = [run["run_id"] for run in runs if run["run_id"] not in replayed]
+        return candidates[-1] if candidates else None
+
+    def read(self, dataset: str, run_id: Optional[str] = None,
+             reasons: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Linhas em quarentena do dataset (de uma execução ou de todas), com a execução"""
+        root = os.path.join(self.directory, f"dataset={dataset}")
+        runs = [run_id] if run_id is not None else sorted(
+            name.split("=", 1)[1] for name in (os.listdir(root) if os.path.isdir(root) else [])
+            if name.startswith("run="))
+
+        options = READ_OPTIONS.get(dataset, {}) if self.format == "csv" else {}
+        frames = []
+        for run in runs:
+            partition = self.partition(dataset, run)
+            if not os.path.isdir(partition):
+                continue
+            for name in sorted(os.listdir(partition)):
+                if name.startswith("part-") and name.endswith(EXTENSIONS[self.format]):
+                    df = read_frame(os.path.join(partition, name), self.format, **options)
+                    frames.append(df.assign(**{RUN_COLUMN: run}))
+
+        if not frames:
+            return pd.DataFrame(columns=list(QUARANTINE_COLUMNS))
+        df = pd.concat(frames, ignore_index=True)
+        if reasons is not None:
+            df = df[df[REASON_COLUMN].isin(list(reasons))].reset_index(drop=True)
+        return df
+
+    def _next_part(self, dataset: str) -> str:
+        """Próximo arquivo da partição (cada flush da execução grava uma parte nova)"""
+        partition = self.partition(dataset)
+        os.makedirs(partition, exist_ok=True)
+        parts = [name for name in os.listdir(partition) if name.startswith("part-")]
+        return os.path.join(partition, f"part-{len(parts):05d}{EXTENSIONS[self.format]}")
+
+    def _save_manifest(self):
+        """Grava o manifesto da execução (contagens por dataset e execução reprocessada)"""
+        manifests = os.path.join(self.directory, "_runs")
+        os.makedirs(manifests, exist_ok=True)
+        path = os.path.join(manifests, f"{self.run_id}.json")
+        manifest = {"run_id": self.run_id, "format": self.format, "replay_of": self.replay_of,
+                    "updated_at": datetime.now().isoformat(timespec="seconds"), "rows": self.counts}
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        os.replace(temporary, path)
+
+
+def replay_quarantine(engine, references: Dict[str, pd.DataFrame], zone: Optional[QuarantineZone] = None,
+                      run_id: Optional[str] = None,
+                      reasons: Sequence[str] = REMOVAL_REASONS) -> Dict[str, pd.DataFrame]:
+    """Reexecuta as correções só nas linhas em quarentena de uma execução
+
+    Por padrão reprocessa a execução mais recente ainda não reprocessada e
+    só as linhas removidas da saída (motivos de REMOVAL_REASONS). Cada
+    dataset passa pelo seu pipeline correct_* com as referências dadas
+    (já corrigidas); as vendas recuperadas entram na referência da
+    logística. Linhas que continuam rejeitadas voltam para a quarentena em
+    uma execução nova, marcada como replay da original. Retorna as linhas
+    recuperadas por dataset, para acrescentar à zona corrigida.
+    """
+    source = zone if zone is not None else QuarantineZone()
+    run_id = run_id or source.pending_run()
+    if run_id is None:
+        source.logger.info("🚧 Nenhuma execução em quarentena para reprocessar")
+        return {}
+
+    target = QuarantineZone(source.directory, source.format, replay_of=run_id)
+    references = dict(references)
+    recovered = {}
+
+    previous, engine.quarantine = engine.quarantine, target
+    try:
+        for dataset in DATASETS:
+            rows = source.read(dataset, run_id, reasons)
+            if rows.empty:
+                continue
+            missing = [reference for reference in REFERENCE_COLUMNS[dataset] if reference not in references]
+            if missing:
+                raise ValueError(f"O replay de {dataset} precisa das referências corrigidas: {missing}")
+
+            rows = rows.drop(columns=list(QUARANTINE_COLUMNS))
+            corrected = getattr(engine, f"correct_{dataset}")(
+                rows, *[references[reference] for reference in REFERENCE_COLUMNS[dataset]])
+            recovered[dataset] = corrected
+            if dataset in references:
+                references[dataset] = pd.concat([references[dataset], corrected], ignore_index=True)
+            engine.logger.info(f"♻️ {dataset}: {len(corrected)} de {len(rows)} linhas "
+                               f"da quarentena {run_id} recuperadas")
+    finally:
+        engine.quarantine = previous
+
+    target.flush()
+    return recovered
+
+
+if __name__ == "__main__":
+    # Uso: python src/quarentena.py [data/corrected] [data/quarantine] [run_id]
+    from correcao_vetorizada import VectorizedCorrectionEngine
+
+    corrected = DatasetStorage(sys.argv[1] if len(sys.argv) > 1 else "data/corrected", suffix="_corrected")
+    zone = QuarantineZone(sys.argv[2] if len(sys.argv) > 2 else QUARANTINE_DIR)
+    run_id = sys.argv[3] if len(sys.argv) > 3 else None
+
+    engine = VectorizedCorrectionEngine()
+    references = {dataset: corrected.read(dataset) for dataset in DATASETS if corrected.exists(dataset)}
+    recovered = replay_quarantine(engine, references, zone, run_id)
+
+    # Linhas recuperadas entram na zona corrigida; o log do replay fica ao lado do log principal
+    for dataset, rows in recovered.items():
+        merged = pd.concat([references[dataset], rows], ignore_index=True) if dataset in references else rows
+        corrected.write(dataset, merged)
+    if recovered:
+        engine.save_correction_log(os.path.join(corrected.directory, "correction_log_replay.csv"))
+    print(f"♻️ Replay da quarentena: { {dataset: len(rows) for dataset, rows in recovered.items()} }")
@@ -0,0 +1,326 @@
+"""
+📋 Registro de Regras - TechCommerce
+Descreve cada regra de correção (colunas lidas e escritas, alcance) e monta
+o plano de execução de cada dataset: regras selecionadas, na ordem, regras
+ignoradas por falta de colunas e estágios que agrupam regras locais à linha
+que compartilham colunas. O plano só ordena e agrupa: cada regra continua
+fazendo a sua própria passada pelo DataFrame (não há fusão de regras)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Alcance das regras
+ROW = "row"        # altera colunas olhando só a própria linha (e referências)
+FILTER = "filter"  # remove linhas, decidindo cada uma isoladamente (e por referências)
+GLOBAL = "global"  # depende de outras linhas do mesmo dataset (ex.: deduplicação)
+
+SCOPES = (ROW, FILTER, GLOBAL)
+
+# Regras cujo resultado depende da data do dia (datas futuras viram hoje)
+DATE_DEPENDENT_RULES = ("correct_future_dates",)
+
+
+class Ref:
+    """Argumento resolvido a partir das referências passadas ao correct_* (ex.: df_clientes)"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Ref({self.name!r})"
+
+
+class Attr:
+    """Argumento resolvido a partir de um atributo da engine (ex.: valid_status_venda)"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Attr({self.name!r})"
+
+
+class Rule:
+    """Declaração de uma regra: método da engine, colunas e argumentos
+
+    ``inputs`` precisam existir para a regra rodar; de ``optional_inputs``
+    basta existir uma. ``arguments`` são passados ao método depois do
+    DataFrame, com Ref e Attr resolvidos na execução (a declaração continua
+    serializável, o que permite enviá-la aos processos do modo paralelo).
+    """
+
+    def __init__(self, name: str, dataset: str, inputs: Sequence[str] = (),
+                 outputs: Sequence[str] = (), scope: str = ROW,
+                 optional_inputs: Sequence[str] = (), arguments: Sequence[Any] = (),
+                 method: Optional[str] = None):
+        if scope not in SCOPES:
+            raise ValueError(f"Alcance inválido para a regra {name}: {scope} (use {SCOPES})")
+
+        self.name = name
+        self.dataset = dataset
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.scope = scope
+        self.optional_inputs = tuple(optional_inputs)
+        self.arguments = tuple(arguments)
+        self.method = method or f"_{name}"
+
+    def __repr__(self) -> str:
+        return f"Rule({self.dataset}.{self.name}, {self.scope})"
+
+    @property
+    def columns(self) -> set:
+        """Colunas lidas ou escritas pela regra"""
+        return set(self.inputs) | set(self.optional_inputs) | set(self.outputs)
+
+    def missing(self, columns: Iterable[str]) -> List[str]:
+        """Colunas que faltam para a regra rodar (vazio quando pode rodar)"""
+        columns = set(columns)
+        missing = [column for column in self.inputs if column not in columns]
+        if self.optional_inputs and not columns & set(self.optional_inputs):
+            missing.append(" | ".join(self.optional_inputs))
+        return missing
+
+    def resolve(self, engine, references: Dict[str, Any]) -> Tuple:
+        """Argumentos do método, com Ref e Attr substituídos pelos valores"""
+        values = []
+        for argument in self.arguments:
+            if isinstance(argument, Ref):
+                values.append(references[argument.name])
+            elif isinstance(argument, Attr):
+                values.append(getattr(engine, argument.name))
+            else:
+                values.append(argument)
+        return tuple(values)
+
+
+class Stage:
+    """Grupo lógico de regras do plano, executadas uma após a outra
+
+    Regras locais à linha consecutivas que compartilham colunas formam um
+    único estágio; regras de remoção e globais ficam sempre sozinhas. O
+    estágio não funde as regras: cada uma percorre o DataFrame de novo. Ele
+    marca onde o plano pode ser dividido (ex.: regras globais do início,
+    usadas pela correção incremental e pelo modo paralelo).
+    """
+
+    def __init__(self, scope: str, rules: List[Rule]):
+        self.scope = scope
+        self.rules = rules
+
+    def __repr__(self) -> str:
+        return f"Stage({self.scope}, {[rule.name for rule in self.rules]})"
+
+    @property
+    def columns(self) -> set:
+        """Colunas lidas ou escritas por alguma regra do estágio"""
+        return set().union(*(rule.columns for rule in self.rules))
+
+
+class ExecutionPlan:
+    """Plano de correção de um dataset: estágios a executar e regras ignoradas com o motivo"""
+
+    def __init__(self, dataset: str, stages: List[Stage], skipped: List[Tuple[Rule, str]]):
+        self.dataset = dataset
+        self.stages = stages
+        self.skipped = skipped
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @property
+    def rules(self) -> List[Rule]:
+        """Regras a executar, na ordem"""
+        return [rule for stage in self.stages for rule in stage.rules]
+
+    @property
+    def columns(self) -> set:
+        """Colunas lidas ou escritas por alguma regra do plano"""
+        return set().union(*(stage.columns for stage in self.stages))
+
+    def leading_global_stages(self) -> Optional[List[Stage]]:
+        """Estágios globais do início do plano (None se houver regra global mais adiante)
+
+        São as regras que precisam ver o dataset inteiro antes que o restante
+        do plano possa rodar sobre qualquer subconjunto das linhas.
+        """
+        leading = 0
+        while leading < len(self.stages) and self.stages[leading].scope == GLOBAL:
+            leading += 1
+        if any(stage.scope == GLOBAL for stage in self.stages[leading:]):
+            return None
+        return self.stages[:leading]
+
+    def describe(self) -> str:
+        """Texto legível do plano (estágios numerados e regras ignoradas)"""
+        lines = [f"Plano de correção para {self.dataset.upper()}:"]
+        for number, stage in enumerate(self.stages, 1):
+            # Estágios são lógicos: as regras de cada um rodam em sequência
+            lines.append(f"  {number}. [{stage.scope}] " + " + ".join(rule.name for rule in stage.rules))
+        for rule, reason in self.skipped:
+            lines.append(f"  - {rule.name}: ignorada ({reason})")
+        return "\n".join(lines)
+
+
+class RuleRegistry:
+    """Regras de cada dataset, na ordem de execução"""
+
+    def __init__(self, rules: Iterable[Rule] = ()):
+        self._rules: Dict[str, List[Rule]] = {}
+        for rule in rules:
+            self.register(rule)
+
+    def __len__(self) -> int:
+        return sum(len(rules) for rules in self._rules.values())
+
+    def datasets(self) -> List[str]:
+        """Datasets com regras registradas"""
+        return list(self._rules)
+
+    def rules(self, dataset: str) -> List[Rule]:
+        """Regras do dataset, na ordem de execução"""
+        return list(self._rules.get(dataset, []))
+
+    def get(self, dataset: str, name: str) -> Rule:
+        """Regra pelo nome"""
+        for rule in self._rules.get(dataset, []):
+            if rule.name == name:
+                return rule
+        raise KeyError(f"Regra desconhecida para {dataset}: {name}")
+
+    def register(self, rule: Rule, before: Optional[str] = None, after: Optional[str] = None):
+        """Acrescenta uma regra ao fim do dataset ou antes/depois de outra regra"""
+        rules = self._rules.setdefault(rule.dataset, [])
+        if any(existing.name == rule.name for existing in rules):
+            raise ValueError(f"Regra já registrada para {rule.dataset}: {rule.name}")
+
+        if before is not None:
+            rules.insert(rules.index(self.get(rule.dataset, before)), rule)
+        elif after is not None:
+            rules.insert(rules.index(self.get(rule.dataset, after)) + 1, rule)
+        else:
+            rules.append(rule)
+
+    def unregister(self, dataset: str, name: str):
+        """Remove uma regra do dataset"""
+        self._rules[dataset].remove(self.get(dataset, name))
+
+    def copy(self) -> "RuleRegistry":
+        """Cópia independente (as declarações das regras são compartilhadas)"""
+        return RuleRegistry(rule for rules in self._rules.values() for rule in rules)
+
+    def validate(self, dataset: str, names: Iterable[str]):
+        """Garante que todos os nomes são regras do dataset"""
+        known = {rule.name for rule in self._rules.get(dataset, [])}
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise ValueError(f"Regras desconhecidas para {dataset}: {unknown}")
+
+    def plan(self, dataset: str, columns: Iterable[str], include: Optional[Sequence[str]] = None,
+             exclude: Sequence[str] = ()) -> ExecutionPlan:
+        """Monta o plano do dataset para um DataFrame com as colunas dadas
+
+        ``include`` restringe às regras nomeadas (None = todas) e ``exclude``
+        remove regras; a ordem é sempre a do registro. Regras sem as colunas
+        de que precisam são ignoradas com o motivo registrado no plano.
+        """
+        self.validate(dataset, list(include or []) + list(exclude))
+
+        available = set(columns)
+        stages: List[Stage] = []
+        skipped: List[Tuple[Rule, str]] = []
+        for rule in self._rules.get(dataset, []):
+            if (include is not None and rule.name not in include) or rule.name in exclude:
+                skipped.append((rule, "não selecionada"))
+                continue
+
+            missing = rule.missing(available)
+            if missing:
+                skipped.append((rule, "colunas ausentes: " + ", ".join(missing)))
+                continue
+
+            available |= set(rule.outputs)
+            last = stages[-1] if stages else None
+            if rule.scope == ROW and last is not None and last.scope == ROW and rule.columns & last.columns:
+                last.rules.append(rule)
+            else:
+                stages.append(Stage(rule.scope, [rule]))
+
+        return ExecutionPlan(dataset, stages, skipped)
+
+
+def default_registry() -> RuleRegistry:
+    """Registro com as regras padrão dos quatro datasets, na ordem histórica dos pipelines"""
+    return RuleRegistry([
+        # CLIENTES
+        Rule("remove_duplicates", "clientes", inputs=["id_cliente"], scope=GLOBAL,
+             arguments=["clientes", "id_cliente"]),
+        Rule("correct_emails", "clientes", inputs=["email"], outputs=["email"], arguments=["clientes"]),
+        Rule("correct_phones", "clientes", inputs=["telefone"], outputs=["telefone"], arguments=["clientes"]),
+        Rule("standardize_states", "clientes", inputs=["estado"], outputs=["estado"], arguments=["clientes"]),
+        Rule("fill_missing_cliente_data", "clientes", inputs=["nome", "email"], outputs=["nome"]),
+        Rule("standardize_dates", "clientes", optional_inputs=["data_nascimento", "data_cadastro"],
+             outputs=["data_nascimento", "data_cadastro"],
+             arguments=["clientes", ["data_nascimento", "data_cadastro"]]),
+
+        # PRODUTOS
+        Rule("remove_duplicates", "produtos", inputs=["id_produto"], scope=GLOBAL,
+             arguments=["produtos", "id_produto"]),
+        Rule("correct_negative_prices", "produtos", inputs=["preco"], outputs=["preco"]),
+        Rule("auto_categorize_products", "produtos", inputs=["categoria", "nome_produto"],
+             outputs=["categoria"]),
+        Rule("standardize_categories", "produtos", inputs=["categoria"], outputs=["categoria"]),
+        Rule("correct_negative_stock", "produtos", inputs=["estoque"], outputs=["estoque"]),
+        Rule("standardize_boolean_field", "produtos", inputs=["ativo"], outputs=["ativo"],
+             arguments=["produtos", "ativo"]),
+
+        # VENDAS
+        Rule("correct_invalid_quantities", "vendas", inputs=["quantidade"], outputs=["quantidade"]),
+        Rule("correct_negative_values", "vendas", inputs=["valor_total"], outputs=["valor_total"]),
+        Rule("correct_total_calculation", "vendas", inputs=["quantidade", "valor_unitario", "valor_total"],
+             outputs=["valor_total"]),
+        Rule("correct_orphan_references", "vendas", inputs=["id_cliente", "id_produto"], scope=FILTER,
+             arguments=[Ref("df_clientes"), Ref("df_produtos")]),
+        Rule("correct_future_dates", "vendas", inputs=["data_venda"], outputs=["data_venda"],
+             arguments=["vendas", "data_venda"]),
+        Rule("standardize_status", "vendas", inputs=["status"], outputs=["status"],
+             arguments=["vendas", "status", Attr("valid_status_venda")]),
+
+        # LOGÍSTICA
+        Rule("fill_missing_transportadora", "logistica", inputs=["transportadora"],
+             outputs=["transportadora"]),
+        Rule("correct_logistica_orphan_references", "logistica", inputs=["id_venda"], scope=FILTER,
+             arguments=[Ref("df_vendas")]),
+        Rule("correct_date_inconsistencies", "logistica", inputs=["data_envio", "data_entrega_real"],
+             outputs=["data_entrega_real"]),
+        Rule("standardize_status", "logistica", inputs=["status_entrega"], outputs=["status_entrega"],
+             arguments=["logistica", "status_entrega", Attr("valid_status_entrega")]),
+        Rule("fill_missing_shipping_dates", "logistica", inputs=["id_venda", "data_envio"],
+             outputs=["data_envio"], arguments=[Ref("df_vendas")]),
+    ])
+
+
+def register_entity_resolution(registry: RuleRegistry):
+    """Acrescenta a resolução de entidades de clientes e o remapeamento das vendas dos clientes fundidos
+
+    A resolução roda logo após a deduplicação por id (ainda no início do
+    plano, como regra global) e as vendas passam a apontar para o cliente
+    mantido antes da remoção de órfãos. Registrar de novo não tem efeito.
+    """
+    clientes = [rule.name for rule in registry.rules("clientes")]
+    if "resolve_entities" not in clientes:
+        rule = Rule("resolve_entities", "clientes", inputs=["id_cliente", "nome"],
+                    optional_inputs=["email", "telefone", "data_nascimento"], scope=GLOBAL,
+                    arguments=["clientes", "id_cliente"])
+        if "remove_duplicates" in clientes:
+            registry.register(rule, after="remove_duplicates")
+        else:
+            registry.register(rule, before=clientes[0] if clientes else None)
+
+    vendas = [rule.name for rule in registry.rules("vendas")]
+    if "remap_merged_clientes" not in vendas:
+        rule = Rule("remap_merged_clientes", "vendas", inputs=["id_cliente"], outputs=["id_cliente"])
+        if "correct_orphan_references" in vendas:
+            registry.register(rule, before="correct_orphan_references")
+        else:
+            registry.register(rule)
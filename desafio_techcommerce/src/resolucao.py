@@ -0,0 +1,212 @@
+"""
+🧬 Resolução de Entidades - TechCommerce
+Encontra o mesmo cliente cadastrado com ids diferentes: blocos por email,
+por data de nascimento + prefixo do telefone e por data de nascimento +
+domínio do email, vizinhança ordenada por nome dentro de cada bloco e
+pontuação só dos pares candidatos, sem comparar todos contra todos
+"""
+
+import pandas as pd
+import numpy as np
+from difflib import SequenceMatcher
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from normalizacao import factorize_exact
+
+# Acentos e demais marcas que a decomposição NFKD separa das letras
+COMBINING_MARKS = "[\u0300-\u036f]"
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Nomes em minúsculas, sem acentos e com espaços simples (ausente quando vazios)"""
+    names = names.str.normalize("NFKD").str.replace(COMBINING_MARKS, "", regex=True)
+    names = names.str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+    return names.where(names != "")
+
+
+def normalize_emails(emails: pd.Series) -> pd.Series:
+    """Emails em minúsculas e sem espaços nas pontas (ausente quando falta usuário ou domínio)"""
+    emails = emails.str.strip().str.lower()
+    return emails.where(emails.str.contains(r"^[^@]+@.", regex=True))
+
+
+def phone_digits(phones: pd.Series) -> pd.Series:
+    """Só os dígitos dos telefones (ausente quando não há nenhum)"""
+    digits = phones.str.replace(r"\D", "", regex=True)
+    return digits.where(digits != "")
+
+
+def strip_blank(values: pd.Series) -> pd.Series:
+    """Textos sem espaços nas pontas (ausente quando vazios)"""
+    values = values.str.strip()
+    return values.where(values != "")
+
+
+def key_codes(values: pd.Series, key: Callable[[pd.Series], pd.Series], sort: bool = False
+              ) -> Tuple[np.ndarray, np.ndarray]:
+    """Código por linha da chave derivada de cada valor distinto (-1 sem chave) e as chaves distintas
+
+    ``key`` recebe os valores distintos como texto e é aplicada uma vez a
+    eles; com ``sort`` os códigos seguem a ordem das chaves.
+    """
+    codes, uniques = factorize_exact(values)
+    distinct_codes, distinct = pd.factorize(key(pd.Series(uniques, dtype=object).astype(str)), sort=sort)
+    return np.append(distinct_codes, -1)[codes], np.asarray(distinct, dtype=object)
+
+
+def combine_codes(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Código do par de chaves (-1 quando falta alguma delas)"""
+    combined = first * (int(second.max(initial=-1)) + 1) + second
+    return np.where((first >= 0) & (second >= 0), combined, -1)
+
+
+def connected_components(size: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Menor posição do componente de cada nó, dadas as arestas (left, right)
+
+    Propagação do menor rótulo pelas arestas alternada com saltos de ponteiro
+    (rótulo do rótulo), tudo em operações vetorizadas sobre arrays.
+    """
+    labels = np.arange(size)
+    while len(left):
+        previous = labels.copy()
+        lowest = np.minimum(labels[left], labels[right])
+        np.minimum.at(labels, left, lowest)
+        np.minimum.at(labels, right, lowest)
+
+        jumped = labels[labels]
+        while not np.array_equal(jumped, labels):
+            labels = jumped
+            jumped = labels[labels]
+        if np.array_equal(labels, previous):
+            break
+    return labels
+
+
+class EntityResolver:
+    """Agrupa registros de clientes que descrevem a mesma pessoa
+
+    Candidatos são gerados em três blocagens: email normalizado; data de
+    nascimento + prefixo do telefone; data de nascimento + domínio do email.
+    Dentro de cada bloco os registros são ordenados pelo nome normalizado (e
+    pelo nome invertido, para erros no começo do nome) e cada um é comparado
+    só com os ``window - 1`` seguintes, então o custo cresce com n e não com
+    n². Um par é a mesma pessoa quando os nomes são quase idênticos
+    (SequenceMatcher ≥ ``name_threshold``, calculado uma vez por par de nomes
+    distintos) e ao menos ``min_agreement`` campos entre email, telefone e
+    data de nascimento são iguais. Os pares formam grupos por transitividade.
+    """
+
+    def __init__(self, name_threshold: float = 0.9, min_agreement: int = 2, window: int = 4,
+                 phone_prefix: int = 6):
+        self.name_threshold = name_threshold
+        self.min_agreement = min_agreement
+        self.window = window
+        self.phone_prefix = phone_prefix
+
+    def __repr__(self) -> str:
+        return (f"EntityResolver(name_threshold={self.name_threshold}, min_agreement={self.min_agreement}, "
+                f"window={self.window}, phone_prefix={self.phone_prefix})")
+
+    def resolve(self, df: pd.DataFrame) -> np.ndarray:
+        """Posição do registro mantido para cada linha (a própria posição quando não é duplicata)
+
+        O registro mantido é o primeiro do grupo, como na deduplicação por id.
+        """
+        if "nome" not in df.columns or len(df) < 2:
+            return np.arange(len(df))
+
+        names, distinct_names = key_codes(df["nome"], normalize_names, sort=True)
+        keys = self._keys(df)
+        fields = [keys[field] for field in ("email", "telefone", "data_nascimento") if field in keys]
+        lengths = np.fromiter(map(len, distinct_names), dtype=np.int64, count=len(distinct_names))
+
+        # Posição de cada nome na ordem dos nomes invertidos
+        reversed_order = np.argsort(np.array([name[::-1] for name in distinct_names], dtype=object))
+        reversed_rank = np.empty(len(distinct_names), dtype=np.int64)
+        reversed_rank[reversed_order] = np.arange(len(distinct_names))
+        reversed_names = np.where(names >= 0, reversed_rank[names], -1)
+
+        ratios: Dict[Tuple[int, int], bool] = {}
+        left, right = [], []
+        for block in self._blocks(keys):
+            for order_key in (names, reversed_names):
+                for first, second in self._window_pairs(block, names, order_key):
+                    keep = self._agreement(fields, first, second) >= self.min_agreement
+                    first, second = first[keep], second[keep]
+                    keep = self._similar_names(names[first], names[second], distinct_names, lengths, ratios)
+                    left.append(first[keep])
+                    right.append(second[keep])
+
+        if not left:
+            return np.arange(len(df))
+        return connected_components(len(df), np.concatenate(left), np.concatenate(right))
+
+    def _keys(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Códigos por linha das chaves de comparação e de blocagem presentes no DataFrame"""
+        keys = {}
+        if "email" in df.columns:
+            keys["email"], emails = key_codes(df["email"], normalize_emails)
+            keys["dominio"] = self._derived(keys["email"], pd.Series(emails).str.split("@", n=1).str[1])
+        if "telefone" in df.columns:
+            keys["telefone"], phones = key_codes(df["telefone"], phone_digits)
+            keys["prefixo"] = self._derived(keys["telefone"], pd.Series(phones).str[:self.phone_prefix])
+        if "data_nascimento" in df.columns:
+            keys["data_nascimento"], _ = key_codes(df["data_nascimento"], strip_blank)
+        return keys
+
+    def _derived(self, codes: np.ndarray, derived: pd.Series) -> np.ndarray:
+        """Códigos por linha de uma chave derivada das chaves distintas (ex.: domínio do email)"""
+        derived_codes, _ = pd.factorize(derived)
+        return np.append(derived_codes, -1)[codes]
+
+    def _blocks(self, keys: Dict[str, np.ndarray]) -> Iterator[np.ndarray]:
+        """Código de bloco por linha em cada blocagem (-1 fora do bloco)"""
+        if "email" in keys:
+            yield keys["email"]
+        if "data_nascimento" in keys and "prefixo" in keys:
+            yield combine_codes(keys["data_nascimento"], keys["prefixo"])
+        if "data_nascimento" in keys and "dominio" in keys:
+            yield combine_codes(keys["data_nascimento"], keys["dominio"])
+
+    def _window_pairs(self, block: np.ndarray, names: np.ndarray, order_key: np.ndarray
+                      ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Pares de posições no mesmo bloco a até ``window - 1`` passos na ordem dos nomes"""
+        candidates = np.flatnonzero((block >= 0) & (names >= 0))
+        order = candidates[np.lexsort((order_key[candidates], block[candidates]))]
+        sorted_block = block[order]
+        for step in range(1, min(self.window, len(order))):
+            same = sorted_block[step:] == sorted_block[:-step]
+            yield order[:-step][same], order[step:][same]
+
+    def _agreement(self, fields: List[np.ndarray], first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """Quantos campos presentes nos dois registros são iguais, por par"""
+        agreement = np.zeros(len(first), dtype=np.int64)
+        for codes in fields:
+            agreement += (codes[first] >= 0) & (codes[first] == codes[second])
+        return agreement
+
+    def _similar_names(self, first: np.ndarray, second: np.ndarray, distinct_names: np.ndarray,
+                       lengths: np.ndarray, ratios: Dict[Tuple[int, int], bool]) -> np.ndarray:
+        """Se os nomes (códigos) de cada par são quase idênticos
+
+        Nomes iguais não são comparados; pares cujos comprimentos já impedem o
+        limiar (2·min/(soma), o maior ratio possível) são descartados sem
+        SequenceMatcher, e cada par de nomes distintos é pontuado uma única vez.
+        """
+        similar = first == second
+        pending = np.flatnonzero(~similar)
+        if not len(pending):
+            return similar
+
+        low = np.minimum(first[pending], second[pending])
+        high = np.maximum(first[pending], second[pending])
+        reachable = (2 * np.minimum(lengths[low], lengths[high]) >=
+                     self.name_threshold * (lengths[low] + lengths[high]))
+        pending, low, high = pending[reachable], low[reachable], high[reachable]
+
+        for position, pair in zip(pending, zip(low.tolist(), high.tolist())):
+            if pair not in ratios:
+                ratio = SequenceMatcher(None, distinct_names[pair[0]], distinct_names[pair[1]]).ratio()
+                ratios[pair] = ratio >= self.name_threshold
+            similar[position] = ratios[pair]
+        return similar
@@ -0,0 +1,146 @@
+"""
+🌊 Correção em Streaming - TechCommerce
+Corrige CSVs maiores que a memória lendo e gravando em blocos; regras globais
+(deduplicação e referências órfãs) usam índices compactos de chaves
+"""
+
+import os
+import sys
+import pandas as pd
+import numpy as np
+from typing import Callable, Dict, Optional
+
+from armazenamento import READ_OPTIONS
+from correcao_vetorizada import VectorizedCorrectionEngine
+from indice_chaves import KeyIndex
+
+
+class StreamingCorrector:
+    """Aplica o DataCorrectionEngine bloco a bloco, com memória constante
+
+    Apenas os índices de chaves crescem com o arquivo (8 bytes por chave
+    distinta). O log de correções pode ser descarregado em disco a cada bloco
+    passando ``log_path``; caso contrário ele acumula em ``engine.correction_log``.
+    """
+
+    def __init__(self, engine: Optional[VectorizedCorrectionEngine] = None,
+                 chunksize: int = 100_000, log_path: Optional[str] = None):
+        self.engine = engine or VectorizedCorrectionEngine()
+        self.logger = self.engine.logger
+        self.chunksize = chunksize
+        self.log_path = log_path
+        self._log_started = False
+
+    def build_key_index(self, path: str, id_column: str) -> KeyIndex:
+        """Constrói o índice de chaves de um CSV lendo apenas a coluna de id"""
+        index = KeyIndex()
+        for chunk in pd.read_csv(path, usecols=[id_column], chunksize=self.chunksize):
+            index.add(chunk[id_column])
+        return index
+
+    def correct_clientes(self, input_path: str, output_path: str) -> int:
+        """Corrige clientes em blocos; retorna o número de registros gravados"""
+        seen = KeyIndex()
+        return self._stream("clientes", input_path, output_path,
+                            lambda chunk: self.engine.correct_clientes(
+                                self._drop_seen(chunk, "clientes", "id_cliente", seen), copy=False))
+
+    def correct_produtos(self, input_path: str, output_path: str) -> int:
+        """Corrige produtos em blocos; retorna o número de registros gravados"""
+        seen = KeyIndex()
+        return self._stream("produtos", input_path, output_path,
+                            lambda chunk: self.engine.correct_produtos(
+                                self._drop_seen(chunk, "produtos", "id_produto", seen), copy=False))
+
+    def correct_vendas(self, input_path: str, output_path: str,
+                       clientes_path: str, produtos_path: str) -> int:
+        """Corrige vendas em blocos contra os índices de clientes e produtos corrigidos"""
+        clientes = self.build_key_index(clientes_path, "id_cliente")
+        produtos = self.build_key_index(produtos_path, "id_produto")
+        return self._stream("vendas", input_path, output_path,
+                            lambda chunk: self.engine.correct_vendas(chunk, clientes, produtos, copy=False))
+
+    def correct_logistica(self, input_path: str, output_path: str, vendas_path: str) -> int:
+        """Corrige logística em blocos contra as vendas corrigidas
+
+        Além do índice de id_venda, a inferência de data de envio precisa da
+        data de cada venda, então apenas as colunas id_venda e data_venda são carregadas.
+        """
+        df_vendas = pd.read_csv(vendas_path, usecols=["id_venda", "data_venda"])
+        return self._stream("logistica", input_path, output_path,
+                            lambda chunk: self.engine.correct_logistica(chunk, df_vendas, copy=False))
+
+    def _drop_seen(self, chunk: pd.DataFrame, dataset: str, id_column: str,
+                   seen: KeyIndex) -> pd.DataFrame:
+        """Remove registros cujo id já apareceu em blocos anteriores"""
+        # Todas as ocorrências de ids vistos antes saem; repetições dentro do bloco ficam para _remove_duplicates
+        repeated = seen.contains(chunk[id_column])
+        seen.add(chunk[id_column])
+        if not repeated.any():
+            return chunk
+
+        self.engine._log_corrections(dataset, chunk[id_column].to_numpy()[repeated], id_column,
+                                     "duplicated", "removed", "DEDUPLICATION")
+        self.logger.info(f"Removidas {int(repeated.sum())} duplicatas entre blocos em {dataset}")
+        return chunk.take(np.flatnonzero(~repeated))
+
+    def _stream(self, dataset: str, input_path: str, output_path: str,
+                correct: Callable[[pd.DataFrame], pd.DataFrame]) -> int:
+        """Lê o CSV em blocos, corrige cada bloco e grava incrementalmente"""
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        written = 0
+        header = True
+
+        reader = pd.read_csv(input_path, chunksize=self.chunksize, **READ_OPTIONS.get(dataset, {}))
+        for chunk in reader:
+            corrected = correct(chunk)
+            corrected.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+            written += len(corrected)
+            self._flush_log()
+
+        if header:
+            # Arquivo sem registros: grava apenas o cabeçalho
+            pd.read_csv(input_path, nrows=0).to_csv(output_path, index=False)
+
+        self.logger.info(f"✅ {dataset.upper()} em streaming: {written} registros gravados em {output_path}")
+        return written
+
+    def _flush_log(self):
+        """Descarrega o log de correções em disco, se configurado"""
+        if self.log_path is None or not self.engine.correction_log:
+            return
+        self.engine.correction_log.to_csv(self.log_path, append=self._log_started)
+        self.engine.correction_log.clear()
+        self._log_started = True
+
+
+def correct_directory(raw_dir: str, corrected_dir: str, chunksize: int = 100_000) -> Dict[str, int]:
+    """Corrige os datasets disponíveis em raw_dir gravando *_corrected.csv em corrected_dir"""
+    corrector = StreamingCorrector(chunksize=chunksize,
+                                   log_path=os.path.join(corrected_dir, "correction_log.csv"))
+    raw = {name: os.path.join(raw_dir, f"{name}.csv") for name in READ_OPTIONS}
+    out = {name: os.path.join(corrected_dir, f"{name}_corrected.csv") for name in READ_OPTIONS}
+    results = {}
+
+    if os.path.exists(raw["clientes"]):
+        results["clientes"] = corrector.correct_clientes(raw["clientes"], out["clientes"])
+    if os.path.exists(raw["produtos"]):
+        results["produtos"] = corrector.correct_produtos(raw["produtos"], out["produtos"])
+    if os.path.exists(raw["vendas"]) and "clientes" in results and "produtos" in results:
+        results["vendas"] = corrector.correct_vendas(raw["vendas"], out["vendas"],
+                                                     out["clientes"], out["produtos"])
+    if os.path.exists(raw["logistica"]) and "vendas" in results:
+        results["logistica"] = corrector.correct_logistica(raw["logistica"], out["logistica"], out["vendas"])
+
+    return results
+
+
+if __name__ == "__main__":
+    # Uso: python src/streaming.py [data/raw] [data/corrected] [chunksize]
+    raw_dir = sys.argv[1] if len(sys.argv) > 1 else "data/raw"
+    corrected_dir = sys.argv[2] if len(sys.argv) > 2 else "data/corrected"
+    chunksize = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+
+    print(f"🌊 Correção em streaming: {raw_dir} -> {corrected_dir}")
+    print(correct_directory(raw_dir, corrected_dir, chunksize))
@@ -0,0 +1,49 @@
+"""
+🧪 Configuração dos Testes - TechCommerce
+Coloca src/ e benchmarks/ no caminho de importação e oferece os datasets
+do notebook e dos geradores sintéticos como fixtures
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NOTEBOOK_DATASETS = os.path.join(os.path.dirname(PROJECT_DIR), "notebooks", "datasets")
+
+for directory in ("src", "benchmarks"):
+    path = os.path.join(PROJECT_DIR, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from geradores import gerar_clientes, gerar_logistica, gerar_produtos, gerar_vendas, proporcoes  # noqa: E402
+
+
+def object_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Colunas de texto como object, como nas versões do pandas sem o tipo str padrão
+
+    A engine linha a linha compara e escreve célula a célula e é a referência
+    dos testes de paridade; ela trabalha com texto em colunas object.
+    """
+    text = [column for column, dtype in df.dtypes.items() if isinstance(dtype, pd.StringDtype)]
+    return df.astype({column: object for column in text}) if text else df
+
+
+@pytest.fixture(scope="session")
+def notebook_datasets():
+    """Clientes, produtos, vendas e logística do notebook de análise"""
+    return {name: object_strings(pd.read_csv(os.path.join(NOTEBOOK_DATASETS, f"{name}.csv")))
+            for name in ("clientes", "produtos", "vendas", "logistica")}
+
+
+@pytest.fixture(scope="session")
+def synthetic_datasets():
+    """Datasets dos geradores dos benchmarks (3 mil vendas, com o mix de defeitos do demo)"""
+    tamanhos = proporcoes(3_000)
+    vendas = gerar_vendas(1_000_001, tamanhos['vendas'], tamanhos['clientes'], tamanhos['produtos'], 3)
+    return {"clientes": object_strings(gerar_clientes(tamanhos['clientes'], 1)),
+            "produtos": object_strings(gerar_produtos(tamanhos['produtos'], 2)),
+            "vendas": object_strings(vendas),
+            "logistica": object_strings(gerar_logistica(vendas, 4))}
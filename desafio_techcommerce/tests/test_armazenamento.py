@@ -0,0 +1,120 @@
+"""
+🧪 Armazenamento - TechCommerce
+As zonas leem dos datasets brutos só as colunas das regras sem mudar a
+saída, e Parquet/Arrow devolvem os dados e os tipos gravados
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from armazenamento import DatasetStorage, correct_storage, read_columns, read_frame, write_frame
+from correcao_vetorizada import VectorizedCorrectionEngine
+from orquestracao import correct_concurrently
+from quarentena import QuarantineZone
+
+logging.getLogger('DataCorrection').setLevel(logging.WARNING)
+
+DATASETS = ("clientes", "produtos", "vendas", "logistica")
+
+
+@pytest.fixture
+def raw_zone(tmp_path, synthetic_datasets):
+    raw = DatasetStorage(str(tmp_path / "raw"))
+    for dataset, df in synthetic_datasets.items():
+        raw.write(dataset, df)
+    return raw
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Colunas pedidas em cada leitura de DatasetStorage, por dataset"""
+    calls = {}
+    original = DatasetStorage.read
+
+    def read(self, dataset, columns=None, memory_map=False):
+        calls.setdefault((self.directory, dataset), []).append(None if columns is None else list(columns))
+        return original(self, dataset, columns, memory_map)
+
+    monkeypatch.setattr(DatasetStorage, "read", read)
+    return calls
+
+
+def direct_correction(raw: DatasetStorage):
+    """Saída da engine sobre os datasets brutos lidos por inteiro"""
+    engine = VectorizedCorrectionEngine()
+    frames = {dataset: raw.read(dataset) for dataset in DATASETS}
+    clientes = engine.correct_clientes(frames["clientes"])
+    produtos = engine.correct_produtos(frames["produtos"])
+    vendas = engine.correct_vendas(frames["vendas"], clientes, produtos)
+    logistica = engine.correct_logistica(frames["logistica"], vendas)
+    return {"clientes": clientes, "produtos": produtos, "vendas": vendas, "logistica": logistica}
+
+
+@pytest.mark.parametrize("entry_point", ["storage", "async"])
+def test_leitura_bruta_projetada_nas_colunas_das_regras(tmp_path, raw_zone, reads, entry_point):
+    expected = direct_correction(raw_zone)
+    reads.clear()
+    corrected = DatasetStorage(str(tmp_path / entry_point), suffix="_corrected")
+    engine = VectorizedCorrectionEngine()
+    if entry_point == "storage":
+        correct_storage(raw_zone, corrected, engine)
+    else:
+        correct_concurrently(raw_zone, corrected, engine)
+
+    # Clientes: cidade não é usada pelas regras e só é lida depois, para a saída
+    first, *rest = reads[(raw_zone.directory, "clientes")]
+    assert first == engine.required_columns("clientes", raw_zone.columns("clientes"))
+    assert "cidade" not in first
+    assert rest == [["cidade"]]
+    # Vendas: todas as colunas são usadas, uma única leitura
+    assert reads[(raw_zone.directory, "vendas")] == [raw_zone.columns("vendas")]
+
+    for dataset in DATASETS:
+        with open(corrected.path(dataset)) as handle:
+            assert handle.read() == expected[dataset].to_csv(index=False), dataset
+
+
+def test_quarentena_le_todas_as_colunas(tmp_path, raw_zone, reads):
+    engine = VectorizedCorrectionEngine()
+    zone = engine.enable_quarantine(QuarantineZone(str(tmp_path / "quarentena"), "csv"))
+    correct_storage(raw_zone, DatasetStorage(str(tmp_path / "corrected"), suffix="_corrected"), engine)
+
+    # Entregas órfãs vão para a quarentena com a coluna que as regras não usam
+    assert reads[(raw_zone.directory, "logistica")] == [raw_zone.columns("logistica")]
+    rejected = zone.read("logistica")
+    assert len(rejected) > 0
+    assert "data_entrega_prevista" in rejected.columns
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_ida_e_volta_colunar(tmp_path, format):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"id_produto": [1, 2, 3], "nome_produto": ["Mouse", None, "Teclado"],
+                       "preco": [10.5, -1.0, 99.99], "ativo": [True, False, True]})
+    path = str(tmp_path / f"produtos.{format}")
+    write_frame(df, path)
+
+    assert read_columns(path) == list(df.columns)
+    pd.testing.assert_frame_equal(read_frame(path, memory_map=True), df, check_dtype=False)
+    assert read_frame(path)["ativo"].dtype == bool
+    projected = read_frame(path, columns=["preco", "id_produto"])
+    assert list(projected.columns) == ["preco", "id_produto"]
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_correcao_colunar_mantem_linhas_e_colunas(tmp_path, raw_zone, format):
+    pytest.importorskip("pyarrow")
+    raw = DatasetStorage(str(tmp_path / f"raw_{format}"), format)
+    for dataset in DATASETS:
+        raw.write(dataset, raw_zone.read(dataset))
+    corrected = DatasetStorage(str(tmp_path / format), format, suffix="_corrected")
+    correct_storage(raw, corrected)
+
+    expected = direct_correction(raw_zone)
+    for dataset in DATASETS:
+        result = corrected.read(dataset, memory_map=True)
+        assert list(result.columns) == list(expected[dataset].columns), dataset
+        id_column = result.columns[0]
+        assert result[id_column].tolist() == expected[dataset][id_column].tolist(), dataset
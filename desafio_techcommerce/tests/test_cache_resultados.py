@@ -0,0 +1,77 @@
+"""
+🧪 Cache de Resultados - TechCommerce
+Correções em cache devem ser idênticas à correção direta, inclusive quando
+a data do dia muda o resultado das regras
+"""
+
+import logging
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import cache_resultados
+import correcao_vetorizada
+from cache_resultados import CachedCorrector, ResultCache
+from correcao_vetorizada import VectorizedCorrectionEngine
+
+logging.getLogger('DataCorrection').setLevel(logging.WARNING)
+
+
+def fixed_today(monkeypatch, day: date):
+    """Fixa date.today() na engine vetorizada e no cache"""
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return day
+    monkeypatch.setattr(correcao_vetorizada, "date", FixedDate)
+    monkeypatch.setattr(cache_resultados, "date", FixedDate)
+
+
+def log_frame(engine) -> pd.DataFrame:
+    return engine.correction_log.to_frame().drop(columns=["timestamp"]).astype(str)
+
+
+def test_acerto_do_cache_igual_a_correcao_direta(tmp_path, synthetic_datasets):
+    cache = ResultCache(str(tmp_path / "cache"))
+    clientes = synthetic_datasets["clientes"]
+
+    first = CachedCorrector(VectorizedCorrectionEngine(), cache)
+    first.correct_clientes(clientes)
+    second = CachedCorrector(VectorizedCorrectionEngine(), cache)
+    cached = second.correct_clientes(clientes)
+
+    direct_engine = VectorizedCorrectionEngine()
+    direct = direct_engine.correct_clientes(clientes)
+    assert second.stats["clientes"]["origem"] == "cache"
+    assert cached.to_csv() == direct.to_csv()
+    pd.testing.assert_frame_equal(log_frame(second.engine), log_frame(direct_engine))
+
+
+def test_datas_futuras_expiram_na_virada_do_dia(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / "cache"))
+    clientes = pd.DataFrame({"id_cliente": [1]})
+    produtos = pd.DataFrame({"id_produto": [10]})
+    vendas = pd.DataFrame({"id_venda": [100], "id_cliente": [1], "id_produto": [10],
+                           "data_venda": ["2026-10-20"]})
+
+    fixed_today(monkeypatch, date(2026, 10, 18))
+    antes = CachedCorrector(VectorizedCorrectionEngine(), cache).correct_vendas(vendas, clientes, produtos)
+    assert antes["data_venda"].tolist() == ["2026-10-18"]
+
+    fixed_today(monkeypatch, date(2026, 10, 25))
+    corretor = CachedCorrector(VectorizedCorrectionEngine(), cache)
+    depois = corretor.correct_vendas(vendas, clientes, produtos)
+    assert corretor.stats["vendas"]["origem"] != "cache"
+    assert depois["data_venda"].tolist() == ["2026-10-20"]
+    assert not len(corretor.engine.correction_log.select("correction_type", ["FUTURE_DATE_CORRECTION"]))
+
+
+@pytest.mark.parametrize("dataset", ["clientes", "produtos"])
+def test_versao_sem_datas_futuras_nao_depende_do_dia(monkeypatch, dataset):
+    engine = VectorizedCorrectionEngine()
+    plan = engine.plan(dataset, ["id_cliente", "id_produto", "email", "preco"])
+    fixed_today(monkeypatch, date(2026, 10, 18))
+    before = cache_resultados.ruleset_version(engine, plan)
+    fixed_today(monkeypatch, date(2026, 10, 25))
+    assert cache_resultados.ruleset_version(engine, plan) == before
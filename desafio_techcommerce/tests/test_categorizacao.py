@@ -0,0 +1,88 @@
+"""
+🧪 Categorização por Palavras-Chave - TechCommerce
+Nomes com palavras de várias categorias ficam com a primeira do catálogo,
+inclusive quando uma palavra é prefixo de outra, nomes sem correspondência
+ou nulos ficam sem categoria e os catálogos JSON e CSV são lidos em ordem
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from categorizacao import DEFAULT_CATEGORY_KEYWORDS, KeywordCategorizer, load_keywords
+
+
+def reference_category(name, category_keywords):
+    """Primeira categoria do catálogo com alguma palavra contida no nome (laço simples)"""
+    if not isinstance(name, str):
+        return None
+    lowered = name.lower()
+    for category, keywords in category_keywords.items():
+        if any(keyword.lower() in lowered for keyword in keywords):
+            return category
+    return None
+
+
+def test_prioridade_do_catalogo():
+    categorizer = KeywordCategorizer(DEFAULT_CATEGORY_KEYWORDS)
+    names = pd.Series(["Mouse para mesa", "Mesa para mouse", "Tênis de mesa", "Livro de jogo",
+                       "Guia do celular", "TECLADO GAMER"], dtype=object)
+
+    assert categorizer.categorize(names).tolist() == ["Informática", "Informática", "Casa",
+                                                      "Livros", "Eletrônicos", "Informática"]
+
+
+@pytest.mark.parametrize("catalog, expected", [
+    # A palavra mais longa casa na posição, mas o prefixo "som" é de categoria anterior
+    ({"Eletrônicos": ["som"], "Moda": ["sombrinha"]}, ["Eletrônicos", "Eletrônicos", None]),
+    ({"Moda": ["sombrinha"], "Eletrônicos": ["som"]}, ["Moda", "Eletrônicos", None]),
+    # Palavra repetida fica com a primeira categoria em que aparece
+    ({"Esportes": ["bola", "raquete"], "Brinquedos": ["bola", "sombrinha"]}, ["Brinquedos", None, "Esportes"]),
+])
+def test_palavra_prefixo_de_outra(catalog, expected):
+    names = pd.Series(["Sombrinha xadrez", "Caixa de som", "Bola de vôlei"], dtype=object)
+    assert KeywordCategorizer(catalog).categorize(names).tolist() == expected
+
+
+def test_sem_correspondencia_e_nulos():
+    categorizer = KeywordCategorizer(DEFAULT_CATEGORY_KEYWORDS)
+    names = pd.Series(["Produto genérico", None, np.nan, "", "Cadeira"], index=[5, 3, 9, 1, 7], dtype=object)
+    categories = categorizer.categorize(names)
+
+    assert categories.tolist() == [None, None, None, None, "Casa"]
+    assert categories.index.tolist() == [5, 3, 9, 1, 7]
+    assert KeywordCategorizer({}).categorize(names).tolist() == [None] * 5
+
+
+def test_igual_ao_laco_por_categoria():
+    rng = np.random.default_rng(7)
+    words = [keyword for keywords in DEFAULT_CATEGORY_KEYWORDS.values() for keyword in keywords]
+    words += ["azul", "premium", "sem", "so", "te"]
+    names = pd.Series([" ".join(rng.choice(words, size=rng.integers(1, 4))).title() for _ in range(500)] + [None],
+                      dtype=object)
+
+    expected = [reference_category(name, DEFAULT_CATEGORY_KEYWORDS) for name in names]
+    assert KeywordCategorizer(DEFAULT_CATEGORY_KEYWORDS).categorize(names).tolist() == expected
+
+
+def test_catalogo_json_e_csv(tmp_path):
+    json_path = tmp_path / "catalogo.json"
+    json_path.write_text(json.dumps({"Informática": ["Mouse", "teclado", ""], "Casa": ["mesa"]},
+                                    ensure_ascii=False), encoding="utf-8")
+    csv_path = tmp_path / "catalogo.csv"
+    csv_path.write_text("categoria,palavra_chave\nInformática,Mouse\nCasa,mesa\nInformática,teclado\n"
+                        "Casa,\n", encoding="utf-8")
+
+    expected = {"Informática": ["mouse", "teclado"], "Casa": ["mesa"]}
+    for path in (json_path, csv_path):
+        catalog = load_keywords(str(path))
+        assert catalog == expected
+        assert list(catalog) == ["Informática", "Casa"]
+
+        names = pd.Series(["Mesa com teclado", "MOUSE"], dtype=object)
+        assert KeywordCategorizer.from_file(str(path)).categorize(names).tolist() == ["Informática", "Informática"]
+
+    with pytest.raises(ValueError):
+        load_keywords(str(tmp_path / "catalogo.txt"))
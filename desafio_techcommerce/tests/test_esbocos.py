@@ -0,0 +1,111 @@
+"""
+🧪 Esboços de Qualidade - TechCommerce
+HyperLogLog e t-digest dentro dos erros documentados, filtro de Bloom sem
+falsos negativos e esboços mesclados iguais aos construídos sobre a união
+"""
+
+import numpy as np
+import pytest
+
+from esbocos import BloomFilter, HyperLogLog, TDigest
+
+QUANTILES = np.array([0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999])
+
+
+def distinct_keys(rng, size: int) -> np.ndarray:
+    """``size`` inteiros distintos em ordem aleatória"""
+    return rng.permutation(np.unique(rng.integers(0, 2 ** 62, size + size // 10)))[:size]
+
+
+@pytest.mark.parametrize("distinct", [1_000, 50_000, 400_000])
+def test_hyperloglog_dentro_do_erro_padrao(distinct):
+    rng = np.random.default_rng(distinct)
+    values = distinct_keys(rng, distinct)
+    sketch = HyperLogLog(14).add(np.concatenate([values, values[: distinct // 2]]))
+
+    # Erro padrão 1,04/√2^14 ≈ 0,8%; quatro erros padrão nunca falham na prática
+    standard_error = 1.04 / np.sqrt(2 ** 14)
+    assert abs(sketch.estimate() - distinct) / distinct < 4 * standard_error
+
+
+def test_hyperloglog_mesclado_igual_a_uniao():
+    rng = np.random.default_rng(1)
+    first, second = rng.integers(0, 10 ** 6, 30_000), rng.integers(0, 10 ** 6, 30_000)
+    merged = HyperLogLog().add(first).merge(HyperLogLog().add(second))
+    union = HyperLogLog().add(np.concatenate([first, second]))
+    np.testing.assert_array_equal(merged.registers, union.registers)
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(14))
+
+
+def test_bloom_sem_falsos_negativos_e_taxa_documentada():
+    rng = np.random.default_rng(2)
+    keys = distinct_keys(rng, 200_000)
+    inserted, absent = keys[:100_000], keys[100_000:]
+    bloom = BloomFilter(capacity=100_000, error_rate=1e-3)
+    for block in np.array_split(inserted, 7):
+        bloom.add(block)
+
+    assert bloom.contains(inserted).all()
+    assert bloom.contains(absent).mean() < 2e-3
+
+
+def test_bloom_add_marca_repeticoes():
+    bloom = BloomFilter(capacity=1_000)
+    assert bloom.add([1, 2, 2, 3]).tolist() == [False, False, True, False]
+    assert bloom.add([3, 4, 1.0]).tolist() == [True, False, True]
+
+
+def test_bloom_mesclado_igual_a_uniao():
+    first, second = np.arange(0, 20_000), np.arange(15_000, 40_000)
+    merged = BloomFilter(capacity=50_000)
+    merged.add(first)
+    other = BloomFilter(capacity=50_000)
+    other.add(second)
+    merged.merge(other)
+    union = BloomFilter(capacity=50_000)
+    union.add(np.concatenate([first, second]))
+
+    np.testing.assert_array_equal(merged.words, union.words)
+    assert merged.contains(np.concatenate([first, second])).all()
+    with pytest.raises(ValueError):
+        merged.merge(BloomFilter(capacity=10))
+
+
+def rank_errors(digest: TDigest, values: np.ndarray) -> np.ndarray:
+    """Distância entre o rank do valor devolvido e o quantil pedido"""
+    ranks = np.searchsorted(np.sort(values), digest.quantile(QUANTILES)) / len(values)
+    return np.abs(ranks - QUANTILES)
+
+
+@pytest.mark.parametrize("distribution", ["lognormal", "uniform", "normal"])
+def test_tdigest_dentro_do_erro_de_rank(distribution):
+    rng = np.random.default_rng(3)
+    values = getattr(rng, distribution)(size=200_000)
+    digest = TDigest()
+    for block in np.array_split(values, 20):
+        digest.add(block)
+
+    assert rank_errors(digest, values).max() < 1e-3
+    assert digest.count == len(values)
+    assert (digest.minimum, digest.maximum) == (values.min(), values.max())
+
+
+def test_tdigest_mesclado_igual_a_uniao():
+    rng = np.random.default_rng(4)
+    first, second = rng.lognormal(size=100_000), rng.lognormal(3, size=50_000)
+    union = np.concatenate([first, second])
+    merged = TDigest().add(first).merge(TDigest().add(second))
+    built = TDigest().add(union)
+
+    assert merged.count == built.count == len(union)
+    assert rank_errors(merged, union).max() < 1e-3
+    assert rank_errors(built, union).max() < 1e-3
+    np.testing.assert_allclose(merged.quantile(QUANTILES), built.quantile(QUANTILES), rtol=0.01)
+
+
+def test_tdigest_vazio_e_textos():
+    assert np.isnan(TDigest().quantile(0.5))
+    digest = TDigest().add(["10", "abc", None, 30.0, np.inf])
+    assert digest.count == 2
+    assert digest.quantile(0.5) == pytest.approx(20.0)
@@ -0,0 +1,101 @@
+"""
+🧪 Validação de Expectativas - TechCommerce
+O resultado do validador nativo tem o JSON de validator.validate() do Great
+Expectations, tanto para suites que passam quanto para as que falham
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from expectativas import GE_VERSION, ExpectationSuite, NativeValidator
+
+RESULT_KEYS = {"success", "results", "evaluation_parameters", "statistics", "meta"}
+EXPECTATION_RESULT_KEYS = {"success", "expectation_config", "result", "meta", "exception_info"}
+STATISTICS_KEYS = {"evaluated_expectations", "successful_expectations", "unsuccessful_expectations",
+                   "success_percent"}
+
+
+@pytest.fixture
+def clientes() -> pd.DataFrame:
+    return pd.DataFrame({"id_cliente": [1, 2, 3, 3],
+                         "email": ["ana@gmail.com", "bia@hotmail", None, "caio@yahoo.com"],
+                         "estado": ["SP", "RJ", "XX", "MG"]})
+
+
+def suite(passing: bool) -> ExpectationSuite:
+    suite = ExpectationSuite("clientes_suite")
+    suite.expect_table_row_count_to_equal(4)
+    suite.expect_column_to_exist("email")
+    if passing:
+        suite.expect_column_values_to_not_be_null("id_cliente")
+        suite.expect_column_values_to_be_in_set("estado", ["SP", "RJ", "MG", "XX"])
+    else:
+        suite.expect_column_values_to_be_unique("id_cliente")
+        suite.expect_column_values_to_match_regex("email", r"^[\w\.-]+@[\w\.-]+\.\w+$")
+        suite.expect_column_values_to_be_in_set("estado", ["SP", "RJ", "MG"], mostly=0.9)
+    return suite
+
+
+def assert_ge_shape(validation: dict, suite: ExpectationSuite):
+    assert set(validation) == RESULT_KEYS
+    assert set(validation["statistics"]) == STATISTICS_KEYS
+    assert validation["meta"]["great_expectations_version"] == GE_VERSION
+    assert validation["meta"]["expectation_suite_name"] == suite.name
+    assert len(validation["results"]) == len(suite)
+    for result, configuration in zip(validation["results"], suite.expectations):
+        assert set(result) == EXPECTATION_RESULT_KEYS
+        assert result["expectation_config"] == configuration
+        assert set(result["expectation_config"]) == {"expectation_type", "kwargs", "meta"}
+        assert isinstance(result["success"], bool)
+        assert result["exception_info"]["raised_exception"] is False
+    json.dumps(validation)  # serializável sem default=str
+
+
+def test_suite_que_passa(clientes):
+    passing = suite(True)
+    validation = NativeValidator(passing).validate(clientes)
+
+    assert_ge_shape(validation, passing)
+    assert validation["success"] is True
+    assert validation["statistics"] == {"evaluated_expectations": 4, "successful_expectations": 4,
+                                        "unsuccessful_expectations": 0, "success_percent": 100.0}
+
+
+def test_suite_que_falha(clientes):
+    failing = suite(False)
+    validation = NativeValidator(failing, result_format="SUMMARY").validate(clientes)
+
+    assert_ge_shape(validation, failing)
+    assert validation["success"] is False
+    assert validation["statistics"] == {"evaluated_expectations": 5, "successful_expectations": 2,
+                                        "unsuccessful_expectations": 3, "success_percent": 40.0}
+
+    unique, regex, in_set = validation["results"][2:]
+    assert unique["result"]["unexpected_count"] == 2
+    assert unique["result"]["partial_unexpected_list"] == [3, 3]
+    assert regex["result"]["missing_count"] == 1
+    assert regex["result"]["partial_unexpected_list"] == ["bia@hotmail"]
+    assert regex["result"]["partial_unexpected_index_list"] == [1]
+    assert in_set["result"]["unexpected_percent"] == 25.0
+
+
+def test_erro_de_expectativa_vira_exception_info(clientes):
+    broken = ExpectationSuite("quebrada")
+    broken.expect_column_values_to_not_be_null("coluna_inexistente")
+    validation = NativeValidator(broken).validate(clientes)
+
+    result = validation["results"][0]
+    assert set(result) == EXPECTATION_RESULT_KEYS
+    assert result["success"] is False
+    assert result["exception_info"]["raised_exception"] is True
+    assert "coluna_inexistente" in result["exception_info"]["exception_message"]
+
+
+def test_blocos_iguais_ao_dataframe_inteiro(clientes):
+    failing = suite(False)
+    whole = NativeValidator(failing).validate(clientes)
+    chunked = NativeValidator(failing).validate([clientes.iloc[:2], clientes.iloc[2:]])
+    assert [r["result"] for r in chunked["results"]] == [r["result"] for r in whole["results"]]
+    assert chunked["statistics"] == whole["statistics"]
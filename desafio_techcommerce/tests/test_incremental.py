@@ -0,0 +1,105 @@
+"""
+🧪 Correção Incremental - TechCommerce
+Depois de alterar parte dos dados brutos, a correção incremental deve gravar
+os mesmos CSVs e o mesmo log (em qualquer ordem) que a correção completa
+"""
+
+import logging
+import shutil
+from datetime import date
+
+import pandas as pd
+
+import correcao_vetorizada
+import incremental
+from armazenamento import READ_OPTIONS
+from geradores import gerar_datasets
+from incremental import correct_directory
+
+logging.getLogger('DataCorrection').setLevel(logging.WARNING)
+
+
+def read_log(directory) -> pd.DataFrame:
+    log = pd.read_csv(directory / "correction_log.csv", dtype=str, keep_default_na=False)
+    log = log.drop(columns=["timestamp"])
+    return log.sort_values(list(log.columns)).reset_index(drop=True)
+
+
+def assert_same_zone(result, expected):
+    for dataset in READ_OPTIONS:
+        name = f"{dataset}_corrected.csv"
+        assert (result / name).read_text() == (expected / name).read_text(), dataset
+    pd.testing.assert_frame_equal(read_log(result), read_log(expected))
+
+
+def full_correction(raw, directory):
+    shutil.rmtree(directory, ignore_errors=True)
+    return correct_directory(str(raw), str(directory))
+
+
+def fixed_today(monkeypatch, day: date):
+    """Fixa date.today() na engine vetorizada e no estado incremental"""
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return day
+    monkeypatch.setattr(correcao_vetorizada, "date", FixedDate)
+    monkeypatch.setattr(incremental, "date", FixedDate)
+
+
+def test_incremental_igual_a_correcao_completa(tmp_path):
+    raw = tmp_path / "raw"
+    gerar_datasets(3_000, str(raw))
+    incremental = tmp_path / "incremental"
+    correct_directory(str(raw), str(incremental))
+
+    # Sem mudanças nada é corrigido de novo
+    stats = correct_directory(str(raw), str(incremental))
+    assert all(dataset["corrigidas"] == 0 for dataset in stats.values())
+
+    # Clientes alterados, removidos e novos; vendas com quantidades inválidas
+    clientes = pd.read_csv(raw / "clientes.csv", **READ_OPTIONS["clientes"])
+    clientes.loc[clientes.index[:10], "email"] = "novo@hotmail"
+    clientes = clientes.drop(index=clientes.index[20:25])
+    novos = clientes.tail(3).copy()
+    novos["id_cliente"] += 10 ** 6
+    pd.concat([clientes, novos]).to_csv(raw / "clientes.csv", index=False)
+    vendas = pd.read_csv(raw / "vendas.csv")
+    vendas.loc[vendas.index[:30], "quantidade"] = -1
+    vendas.to_csv(raw / "vendas.csv", index=False)
+
+    stats = correct_directory(str(raw), str(incremental))
+    assert 0 < stats["clientes"]["corrigidas"] < stats["clientes"]["linhas"]
+    assert stats["vendas"]["reaproveitadas"] > 0
+
+    full_correction(raw, tmp_path / "completa")
+    assert_same_zone(incremental, tmp_path / "completa")
+
+
+def test_datas_futuras_recorrigidas_na_virada_do_dia(tmp_path, monkeypatch):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    pd.DataFrame({"id_cliente": [1], "nome": ["Ana"]}).to_csv(raw / "clientes.csv", index=False)
+    pd.DataFrame({"id_produto": [10], "nome_produto": ["Mouse"]}).to_csv(raw / "produtos.csv", index=False)
+    pd.DataFrame({"id_venda": [100, 101], "id_cliente": [1, 1], "id_produto": [10, 10],
+                  "data_venda": ["2031-06-01", "2029-03-15"]}).to_csv(raw / "vendas.csv", index=False)
+    pd.DataFrame({"id_entrega": [200], "id_venda": [101],
+                  "data_envio": ["2029-03-16"]}).to_csv(raw / "logistica.csv", index=False)
+    incremental_dir = tmp_path / "incremental"
+
+    fixed_today(monkeypatch, date(2030, 1, 1))
+    correct_directory(str(raw), str(incremental_dir))
+    vendas = pd.read_csv(incremental_dir / "vendas_corrected.csv")
+    assert vendas["data_venda"].tolist() == ["2030-01-01", "2029-03-15"]
+
+    # No mesmo dia nada muda; no dia seguinte as vendas são corrigidas de novo
+    assert correct_directory(str(raw), str(incremental_dir))["vendas"]["corrigidas"] == 0
+    fixed_today(monkeypatch, date(2030, 1, 5))
+    stats = correct_directory(str(raw), str(incremental_dir))
+    assert stats["vendas"]["corrigidas"] == 2
+    assert stats["clientes"]["corrigidas"] == 0
+
+    full_correction(raw, tmp_path / "completa")
+    vendas = pd.read_csv(incremental_dir / "vendas_corrected.csv")
+    assert vendas["data_venda"].tolist() == ["2030-01-05", "2029-03-15"]
+    assert_same_zone(incremental_dir, tmp_path / "completa")
@@ -0,0 +1,63 @@
+"""
+🧪 Normalização de Contatos - TechCommerce
+Emails e telefones corrigidos por valor distinto iguais às funções escalares,
+e valores que continuam fora do padrão sinalizados nas duas engines
+"""
+
+import logging
+import re
+
+import pandas as pd
+import pytest
+
+from correcao_automatica import DataCorrectionEngine
+from correcao_vetorizada import VectorizedCorrectionEngine
+from quarentena import REASON_COLUMN, QuarantineZone
+
+logging.getLogger('DataCorrection').setLevel(logging.WARNING)
+
+EMAILS = [" ana@gmail ", "bia@hotmail.com", "caio@yahoo", "duda@empresa.co", "sem-arroba.com",
+          "ana@gmail ", "eva@outlook.com.br", "x\x00y@gmail", "joão@gmail", ""]
+PHONES = ["(11) 3456-7890", "11987654321", "123", "01 98765-4321", "11 3456 7890",
+          "١١٩٨٧٦٥٤٣٢١", "tel: 21 2345-6789", ""]
+
+
+def test_igual_as_funcoes_escalares():
+    engine = VectorizedCorrectionEngine()
+    emails, valid_emails = engine.contact_normalizer.normalize_emails(pd.Series(EMAILS, dtype=object))
+    phones, valid_phones = engine.contact_normalizer.normalize_phones(pd.Series(PHONES, dtype=object))
+
+    assert emails.tolist() == [engine._fix_common_email_errors(email) for email in EMAILS]
+    assert phones.tolist() == [engine._fix_phone_format(re.sub(r'[^\d]', '', phone)) for phone in PHONES]
+    assert emails.tolist()[:4] == ["ana@gmail.com", "bia@hotmail.com", "caio@yahoo.com", "duda@empresa.com"]
+    assert phones.tolist()[0] == "11934567890"
+    assert valid_emails.tolist() == [True, True, True, True, False, True, True, False, True, False]
+    assert valid_phones.tolist() == [True, True, False, False, True, False, True, False]
+
+
+def clientes() -> pd.DataFrame:
+    return pd.DataFrame({"id_cliente": range(1, len(EMAILS) + 1), "nome": ["Cliente"] * len(EMAILS),
+                         "email": EMAILS,
+                         "telefone": PHONES + [None] * (len(EMAILS) - len(PHONES))}).astype(object)
+
+
+@pytest.mark.parametrize("engine_class", [DataCorrectionEngine, VectorizedCorrectionEngine])
+def test_invalidos_sinalizados(tmp_path, caplog, engine_class):
+    engine = engine_class()
+    zone = engine.enable_quarantine(QuarantineZone(str(tmp_path), "csv"))
+    with caplog.at_level(logging.WARNING, logger='DataCorrection'):
+        corrected = engine.correct_clientes(clientes())
+
+    assert "3 valores inválidos em clientes.email" in caplog.text
+    assert "4 valores inválidos em clientes.telefone" in caplog.text
+
+    flagged = zone.frame("clientes")
+    emails = flagged[flagged[REASON_COLUMN] == "INVALID_EMAIL"]
+    phones = flagged[flagged[REASON_COLUMN] == "INVALID_PHONE"]
+    assert emails["id_cliente"].tolist() == [5, 8, 10]
+    assert phones["id_cliente"].tolist() == [3, 4, 6, 8]
+
+    # Os valores continuam na saída, já com a correção aplicada
+    assert len(corrected) == len(EMAILS)
+    assert corrected.set_index("id_cliente").loc[5, "email"] == "sem-arroba.com"
+    assert emails["email"].tolist() == corrected.set_index("id_cliente").loc[[5, 8, 10], "email"].tolist()
@@ -0,0 +1,97 @@
+"""
+🧪 Correção Paralela - TechCommerce
+As partições devem reproduzir a saída e, com particionamento por faixa, o
+log da correção sequencial
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from correcao_vetorizada import VectorizedCorrectionEngine
+from paralelo import ParallelCorrectionEngine
+
+logging.getLogger('DataCorrection').setLevel(logging.WARNING)
+
+DATASETS = ("clientes", "produtos", "vendas", "logistica")
+
+
+def log_frame(engine) -> pd.DataFrame:
+    return engine.correction_log.to_frame().drop(columns=["timestamp"]).astype(str)
+
+
+@pytest.mark.parametrize("partitioning", ["range", "hash"])
+def test_paralelo_igual_ao_sequencial(synthetic_datasets, partitioning):
+    sequential = VectorizedCorrectionEngine()
+    clientes = sequential.correct_clientes(synthetic_datasets["clientes"])
+    produtos = sequential.correct_produtos(synthetic_datasets["produtos"])
+    vendas = sequential.correct_vendas(synthetic_datasets["vendas"], clientes, produtos)
+    expected = {"clientes": clientes, "produtos": produtos, "vendas": vendas,
+                "logistica": sequential.correct_logistica(synthetic_datasets["logistica"], vendas)}
+
+    with ParallelCorrectionEngine(max_workers=2, partitioning=partitioning, min_partition_rows=500) as engine:
+        result = engine.correct_all(*(synthetic_datasets[dataset] for dataset in DATASETS))
+        log = log_frame(engine)
+
+    for dataset in DATASETS:
+        assert result[dataset].to_csv() == expected[dataset].to_csv(), dataset
+
+    expected_log = log_frame(sequential)
+    if partitioning == "hash":
+        # Por hash as partições intercalam as linhas: o log tem as mesmas entradas em outra ordem
+        columns = list(expected_log.columns)
+        log = log.sort_values(columns).reset_index(drop=True)
+        expected_log = expected_log.sort_values(columns).reset_index(drop=True)
+    pd.testing.assert_frame_equal(log, expected_log)
+
+
+class RecordingPool:
+    """Pool que registra, em ordem, as submissões e as esperas por resultado"""
+
+    def __init__(self, pool, events):
+        self.pool = pool
+        self.events = events
+
+    def submit(self, fn, method, *args):
+        self.events.append(("submit", method))
+        future = self.pool.submit(fn, method, *args)
+        wait = future.result
+
+        def result(timeout=None):
+            self.events.append(("result", method))
+            return wait(timeout)
+
+        future.result = result
+        return future
+
+
+def test_clientes_e_produtos_pequenos_despachados_juntos(synthetic_datasets, monkeypatch):
+    # Um cliente repetido com outro id, fundido pela resolução de entidades que roda no pool
+    datasets = dict(synthetic_datasets)
+    repeated = datasets["clientes"].iloc[[0]].assign(id_cliente=datasets["clientes"]["id_cliente"].max() + 1)
+    datasets["clientes"] = pd.concat([datasets["clientes"], repeated], ignore_index=True)
+
+    sequential = VectorizedCorrectionEngine()
+    sequential.enable_entity_resolution()
+    clientes = sequential.correct_clientes(datasets["clientes"])
+    produtos = sequential.correct_produtos(datasets["produtos"])
+
+    events = []
+    pool = ParallelCorrectionEngine._pool
+    monkeypatch.setattr(ParallelCorrectionEngine, "_pool", lambda self: RecordingPool(pool(self), events))
+    # Datasets abaixo de min_partition_rows: nenhum é particionado
+    with ParallelCorrectionEngine(max_workers=2) as engine:
+        engine.enable_entity_resolution()
+        result = engine.correct_all(*(datasets[dataset] for dataset in DATASETS))
+        log = log_frame(engine)
+
+    # As duas tarefas estão no pool antes da primeira espera; vendas e logística rodam no processo principal
+    assert events == [("submit", "correct_clientes"), ("submit", "correct_produtos"),
+                      ("result", "correct_clientes"), ("result", "correct_produtos")]
+    assert result["clientes"].to_csv() == clientes.to_csv()
+    assert result["produtos"].to_csv() == produtos.to_csv()
+    merged = {repeated["id_cliente"].iloc[0]: clientes["id_cliente"].iloc[0]}
+    assert engine.entity_merges == sequential.entity_merges == merged
+    expected_log = log_frame(sequential)
+    pd.testing.assert_frame_equal(log.iloc[:len(expected_log)], expected_log)
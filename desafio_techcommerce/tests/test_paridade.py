@@ -0,0 +1,61 @@
+"""
+🧪 Paridade entre Engines - TechCommerce
+A engine vetorizada deve produzir os mesmos DataFrames e o mesmo log de
+correções (exceto o timestamp) que a engine linha a linha
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from correcao_automatica import DataCorrectionEngine
+from correcao_vetorizada import VectorizedCorrectionEngine
+
+logging.getLogger('DataCorrection').setLevel(logging.WARNING)
+
+
+def correct_all(engine, datasets):
+    """Corrige os quatro datasets em ordem de dependência; retorna os resultados e o log"""
+    clientes = engine.correct_clientes(datasets["clientes"])
+    produtos = engine.correct_produtos(datasets["produtos"])
+    vendas = engine.correct_vendas(datasets["vendas"], clientes, produtos)
+    logistica = engine.correct_logistica(datasets["logistica"], vendas)
+    log = engine.correction_log.to_frame().drop(columns=["timestamp"])
+    return {"clientes": clientes, "produtos": produtos, "vendas": vendas, "logistica": logistica}, log
+
+
+def assert_parity(datasets):
+    """Compara saída e log das duas engines sobre cópias dos mesmos dados"""
+    expected, expected_log = correct_all(DataCorrectionEngine(), {k: v.copy() for k, v in datasets.items()})
+    result, result_log = correct_all(VectorizedCorrectionEngine(), {k: v.copy() for k, v in datasets.items()})
+
+    for name in expected:
+        assert result[name].to_csv() == expected[name].to_csv(), name
+    assert len(expected_log) > 0
+    pd.testing.assert_frame_equal(result_log.astype(str), expected_log.astype(str))
+
+
+def test_paridade_datasets_do_notebook(notebook_datasets):
+    assert_parity(notebook_datasets)
+
+
+def test_paridade_dados_sinteticos(synthetic_datasets):
+    assert_parity(synthetic_datasets)
+
+
+@pytest.mark.parametrize("dataset", ["clientes", "produtos"])
+def test_paridade_sem_copia(synthetic_datasets, dataset):
+    # copy=False altera o próprio DataFrame e devolve o mesmo resultado da cópia
+    engine = VectorizedCorrectionEngine()
+    method = getattr(engine, f"correct_{dataset}")
+    copied = method(synthetic_datasets[dataset])
+    in_place = method(synthetic_datasets[dataset].copy(), copy=False)
+    assert in_place.to_csv() == copied.to_csv()
+
+
+def test_entradas_nao_sao_alteradas(synthetic_datasets):
+    snapshot = {name: df.copy() for name, df in synthetic_datasets.items()}
+    correct_all(VectorizedCorrectionEngine(), synthetic_datasets)
+    for name, df in synthetic_datasets.items():
+        pd.testing.assert_frame_equal(df, snapshot[name])
@@ -0,0 +1,103 @@
+"""
+🧪 Quarentena - TechCommerce
+Linhas rejeitadas vão para a quarentena nas duas engines e em todos os
+pontos de entrada, e o replay recupera as que passam com referências corrigidas
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from armazenamento import DatasetStorage, correct_storage
+from correcao_automatica import DataCorrectionEngine
+from correcao_vetorizada import VectorizedCorrectionEngine
+from orquestracao import correct_concurrently
+from quarentena import QuarantineZone, replay_quarantine
+
+logging.getLogger('DataCorrection').setLevel(logging.WARNING)
+
+DATASETS = ("clientes", "produtos", "vendas", "logistica")
+
+
+def correct_all(engine, datasets):
+    clientes = engine.correct_clientes(datasets["clientes"])
+    produtos = engine.correct_produtos(datasets["produtos"])
+    vendas = engine.correct_vendas(datasets["vendas"], clientes, produtos)
+    logistica = engine.correct_logistica(datasets["logistica"], vendas)
+    return {"clientes": clientes, "produtos": produtos, "vendas": vendas, "logistica": logistica}
+
+
+@pytest.mark.parametrize("fixture", ["notebook_datasets", "synthetic_datasets"])
+def test_mesmas_linhas_em_quarentena_nas_duas_engines(tmp_path, request, fixture):
+    datasets = request.getfixturevalue(fixture)
+    zones = {}
+    for name, engine_class in (("linha", DataCorrectionEngine), ("vetorizada", VectorizedCorrectionEngine)):
+        engine = engine_class()
+        zones[name] = engine.enable_quarantine(QuarantineZone(str(tmp_path / name), "csv"))
+        correct_all(engine, {dataset: df.copy() for dataset, df in datasets.items()})
+
+    assert zones["vetorizada"].pending("vendas") > 0
+    for dataset in DATASETS:
+        expected = zones["linha"].frame(dataset).astype(str)
+        result = zones["vetorizada"].frame(dataset).astype(str)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_quarentena_nao_altera_a_saida(synthetic_datasets, tmp_path):
+    engine = VectorizedCorrectionEngine()
+    engine.enable_quarantine(QuarantineZone(str(tmp_path), "csv"))
+    with_quarantine = correct_all(engine, synthetic_datasets)
+    without = correct_all(VectorizedCorrectionEngine(), synthetic_datasets)
+    for dataset in DATASETS:
+        assert with_quarantine[dataset].to_csv() == without[dataset].to_csv()
+
+
+@pytest.fixture
+def raw_zone(tmp_path, synthetic_datasets):
+    raw = DatasetStorage(str(tmp_path / "raw"))
+    for dataset, df in synthetic_datasets.items():
+        raw.write(dataset, df)
+    return raw
+
+
+@pytest.mark.parametrize("entry_point", ["storage", "async"])
+def test_pontos_de_entrada_gravam_a_quarentena(tmp_path, raw_zone, entry_point):
+    corrected = DatasetStorage(str(tmp_path / "corrected"), suffix="_corrected")
+    engine = VectorizedCorrectionEngine()
+    zone = engine.enable_quarantine(QuarantineZone(str(tmp_path / "quarantine"), "csv"))
+
+    if entry_point == "storage":
+        correct_storage(raw_zone, corrected, engine)
+    else:
+        correct_concurrently(raw_zone, corrected, engine)
+
+    assert zone.pending() == 0
+    assert zone.counts["vendas"] > 0
+    assert [run["run_id"] for run in zone.runs()] == [zone.run_id]
+    assert len(zone.read("vendas", zone.run_id)) == zone.counts["vendas"]
+
+
+def test_replay_recupera_vendas_apos_corrigir_clientes(tmp_path, synthetic_datasets):
+    datasets = synthetic_datasets
+    ausentes = datasets["clientes"]["id_cliente"].isin(datasets["vendas"]["id_cliente"].head(20))
+
+    engine = VectorizedCorrectionEngine()
+    zone = engine.enable_quarantine(QuarantineZone(str(tmp_path), "csv"))
+    parcial = correct_all(engine, {**datasets, "clientes": datasets["clientes"][~ausentes]})
+    zone.flush()
+    completo = correct_all(VectorizedCorrectionEngine(), datasets)
+
+    references = {"clientes": completo["clientes"], "produtos": completo["produtos"], "vendas": parcial["vendas"]}
+    recovered = replay_quarantine(VectorizedCorrectionEngine(), references, QuarantineZone(str(tmp_path), "csv"))
+
+    assert len(recovered["vendas"]) > 0
+    vendas = pd.concat([parcial["vendas"]["id_venda"], recovered["vendas"]["id_venda"]])
+    assert sorted(vendas) == sorted(completo["vendas"]["id_venda"])
+    logistica = pd.concat([parcial["logistica"]["id_entrega"], recovered["logistica"]["id_entrega"]])
+    assert sorted(logistica) == sorted(completo["logistica"]["id_entrega"])
+
+    # A execução original fica marcada como reprocessada; a do replay passa a ser a pendente
+    runs = QuarantineZone(str(tmp_path), "csv").runs()
+    assert runs[-1]["replay_of"] == zone.run_id
+    assert QuarantineZone(str(tmp_path), "csv").pending_run() == runs[-1]["run_id"]
@@ -0,0 +1,91 @@
+"""
+🧪 Resolução de Entidades - TechCommerce
+Clientes com ids diferentes são fundidos por transitividade no primeiro
+registro do grupo, as vendas seguem o cliente mantido e quem não é a mesma
+pessoa continua separado
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from correcao_automatica import DataCorrectionEngine
+from correcao_vetorizada import VectorizedCorrectionEngine
+from resolucao import EntityResolver, connected_components
+
+logging.getLogger('DataCorrection').setLevel(logging.WARNING)
+
+
+def clientes() -> pd.DataFrame:
+    return pd.DataFrame([
+        # 10, 11 e 12: mesma pessoa; 10 e 12 não têm email nem telefone em comum,
+        # mas 11 concorda com 10 no email e com 12 no telefone
+        (10, "Maria da Silva", "maria@gmail.com", "11987654321", "1990-05-01"),
+        (11, "Maria da Silva ", "MARIA@gmail.com", "(11) 98765-4321", "1990-05-01"),
+        (12, "María da Silva", "msilva@empresa.com", "11 98765-4321", "1990-05-01"),
+        # Erro no começo do nome: a ordem pelo nome invertido aproxima os dois
+        (20, "Xoao Pereira", "joao.p@hotmail.com", "21912345678", "1985-01-20"),
+        (21, "Joao Pereira", "joao.p@hotmail.com", "21912345678", "1985-01-20"),
+        # Mesmo email de família, nomes diferentes
+        (30, "Carlos Souza", "familia@gmail.com", "31900000001", "1970-03-03"),
+        (31, "Ana Souza", "familia@gmail.com", "31900000002", "1972-04-04"),
+        # Mesmo nome e email, mas só um campo em comum (nascimento e telefone diferentes)
+        (40, "Pedro Lima", "pedro@yahoo.com", "41911111111", "1980-01-01"),
+        (41, "Pedro Lima", "pedro@yahoo.com", "41922222222", "1999-09-09"),
+    ], columns=["id_cliente", "nome", "email", "telefone", "data_nascimento"]).astype(
+        {"nome": object, "email": object, "telefone": object, "data_nascimento": object})
+
+
+@pytest.mark.parametrize("engine_class", [DataCorrectionEngine, VectorizedCorrectionEngine])
+def test_fusao_transitiva_no_primeiro_registro(engine_class):
+    engine = engine_class()
+    engine.enable_entity_resolution()
+    engine.select_rules("clientes", include=["remove_duplicates", "resolve_entities"])
+    df = clientes()
+    corrected = engine.correct_clientes(df)
+
+    assert engine.entity_merges == {11: 10, 12: 10, 21: 20}
+    assert corrected["id_cliente"].tolist() == [10, 20, 30, 31, 40, 41]
+    # Sobrevivência: o registro mantido é o primeiro do grupo, sem campos trocados pelos fundidos
+    pd.testing.assert_frame_equal(corrected.set_index("id_cliente").loc[[10, 20]],
+                                  df.set_index("id_cliente").loc[[10, 20]])
+
+    log = engine.correction_log.select("correction_type", ["DEDUPLICATION"]).to_frame()
+    assert log["old_value"].astype(str).tolist() == ["11", "12", "21"]
+    assert log["new_value"].astype(str).tolist() == ["10", "10", "20"]
+
+
+@pytest.mark.parametrize("engine_class", [DataCorrectionEngine, VectorizedCorrectionEngine])
+def test_vendas_dos_fundidos_apontam_para_o_mantido(engine_class):
+    engine = engine_class()
+    engine.enable_entity_resolution()
+    df_clientes = engine.correct_clientes(clientes())
+    df_produtos = pd.DataFrame({"id_produto": [1]})
+    vendas = pd.DataFrame({"id_venda": [100, 101, 102, 103], "id_cliente": [12, 10, 21, 31],
+                           "id_produto": [1, 1, 1, 1]})
+    corrected = engine.correct_vendas(vendas, df_clientes, df_produtos)
+
+    assert corrected["id_cliente"].tolist() == [10, 10, 20, 31]
+    remaps = engine.correction_log.select("correction_type", ["MERGED_REFERENCE_REMAP"]).to_frame()
+    assert remaps["row_id"].astype(str).tolist() == ["100", "102"]
+
+
+def test_limiares_do_resolvedor():
+    df = clientes()
+    default = EntityResolver().resolve(df)
+    assert default.tolist() == [0, 0, 0, 3, 3, 5, 6, 7, 8]
+
+    # Exigindo os três campos, só 10/11 (email, telefone e nascimento iguais) e 20/21 se fundem
+    strict = EntityResolver(min_agreement=3).resolve(df)
+    assert strict.tolist() == [0, 0, 2, 3, 3, 5, 6, 7, 8]
+
+    # Com limiar de nome exato, o erro de digitação em "Xoao" separa 20 e 21
+    exact = EntityResolver(name_threshold=1.0).resolve(df)
+    assert exact[3:5].tolist() == [3, 4]
+
+
+def test_componentes_conexos():
+    labels = connected_components(7, np.array([5, 1, 3, 6]), np.array([6, 2, 2, 0]))
+    assert labels.tolist() == [0, 1, 1, 1, 4, 0, 0]
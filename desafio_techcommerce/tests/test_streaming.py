@@ -0,0 +1,40 @@
+"""
+🧪 Correção em Streaming - TechCommerce
+Deduplicação entre blocos e equivalência com a correção do arquivo inteiro
+"""
+
+import pandas as pd
+
+from correcao_vetorizada import VectorizedCorrectionEngine
+from streaming import StreamingCorrector
+
+
+def write_clientes(path, ids):
+    pd.DataFrame({"id_cliente": ids, "nome": [f"Cliente {i}" for i in range(len(ids))],
+                  "email": "a@b.com", "telefone": "11999887766", "estado": "SP"}).to_csv(path, index=False)
+
+
+def test_id_repetido_em_bloco_posterior_e_removido(tmp_path):
+    # O id 1 aparece no primeiro bloco e duas vezes no segundo: nenhuma repetição pode passar
+    write_clientes(tmp_path / "clientes.csv", [1, 2, 3, 1, 1, 4])
+    corrector = StreamingCorrector(chunksize=3)
+    written = corrector.correct_clientes(str(tmp_path / "clientes.csv"), str(tmp_path / "out.csv"))
+
+    corrected = pd.read_csv(tmp_path / "out.csv")
+    assert corrected["id_cliente"].tolist() == [1, 2, 3, 4]
+    assert written == 4
+    assert corrected["nome"].tolist() == ["Cliente 0", "Cliente 1", "Cliente 2", "Cliente 5"]
+
+
+def test_streaming_mantem_os_mesmos_registros_da_correcao_completa(tmp_path, synthetic_datasets):
+    clientes = synthetic_datasets["clientes"]
+    clientes.to_csv(tmp_path / "clientes.csv", index=False)
+
+    written = StreamingCorrector(chunksize=37).correct_clientes(str(tmp_path / "clientes.csv"),
+                                                                str(tmp_path / "out.csv"))
+    expected = VectorizedCorrectionEngine().correct_clientes(pd.read_csv(tmp_path / "clientes.csv"))
+
+    corrected = pd.read_csv(tmp_path / "out.csv")
+    assert written == len(expected)
+    assert corrected["id_cliente"].is_unique
+    assert corrected["id_cliente"].tolist() == expected["id_cliente"].tolist()